@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { useNavigate, Link } from 'react-router-dom'
 import './AdminPage.css'
 
@@ -18,6 +18,10 @@ export default function AdminPage() {
   const [page, setPage] = useState(1)
   const [total, setTotal] = useState(0)
   const [pages, setPages] = useState(1)
+  const [totalIsEstimate, setTotalIsEstimate] = useState(false)
+  const [hasNext, setHasNext] = useState(false)
+  // cursors.current[i] fetches page i + 1; the server pages by cursor, not offset
+  const cursors = useRef([null])
 
   const authToken = localStorage.getItem('auth_token')
 
@@ -28,8 +32,10 @@ export default function AdminPage() {
   const fetchUsers = useCallback(async (pageNum, searchTerm) => {
     setLoading(true)
     try {
-      const params = new URLSearchParams({ page: pageNum, page_size: PAGE_SIZE })
+      const params = new URLSearchParams({ page_size: PAGE_SIZE })
       if (searchTerm) params.set('search', searchTerm)
+      const cursor = cursors.current[pageNum - 1]
+      if (cursor) params.set('cursor', cursor)
       const res = await fetch(`${LOBBY_URL}/api/admin/users?${params}`, {
         headers: { Authorization: `Bearer ${authToken}` },
       })
@@ -42,6 +48,9 @@ export default function AdminPage() {
       setUsers(data.users)
       setTotal(data.total)
       setPages(data.pages)
+      setTotalIsEstimate(Boolean(data.total_is_estimate))
+      setHasNext(Boolean(data.next_cursor))
+      cursors.current = [...cursors.current.slice(0, pageNum), data.next_cursor ?? null]
       setEditStacks({})
       setPendingDelete(new Set())
     } catch (err) {
@@ -55,6 +64,7 @@ export default function AdminPage() {
   useEffect(() => {
     const timer = setTimeout(() => {
       setSearch(searchInput)
+      cursors.current = [null]
       setPage(1)
     }, 300)
     return () => clearTimeout(timer)
@@ -181,7 +191,7 @@ export default function AdminPage() {
         />
         {!loading && (
           <span className="admin-user-count">
-            {total} {total === 1 ? 'user' : 'users'}{search ? ' found' : ''}
+            {total}{totalIsEstimate ? '+' : ''} {total === 1 ? 'user' : 'users'}{search ? ' found' : ''}
           </span>
         )}
       </div>
@@ -260,7 +270,7 @@ export default function AdminPage() {
             </table>
           </div>
 
-          {pages > 1 && (
+          {(hasNext || page > 1) && (
             <div className="admin-pagination">
               <button
                 className="btn-page"
@@ -269,10 +279,10 @@ export default function AdminPage() {
               >
                 ← Prev
               </button>
-              <span className="admin-page-info">Page {page} of {pages}</span>
+              <span className="admin-page-info">Page {page} of {totalIsEstimate ? '~' : ''}{Math.max(pages, page)}</span>
               <button
                 className="btn-page"
-                disabled={page >= pages}
+                disabled={!hasNext}
                 onClick={() => setPage(p => p + 1)}
               >
                 Next →
@@ -21,7 +21,14 @@ const SAMPLE_USERS = [
 ]
 
 function pagedResponse(users = SAMPLE_USERS, { page = 1, pages = 1 } = {}) {
-  return { users, total: users.length, page, page_size: 20, pages }
+  return {
+    users,
+    total: users.length,
+    total_is_estimate: false,
+    page_size: 20,
+    pages,
+    next_cursor: page < pages ? `cursor-${page}` : null,
+  }
 }
 
 function renderAdmin() {
@@ -26,7 +26,7 @@ function isTokenExpired(token) {
 
 export default function Lobby() {
   const navigate = useNavigate()
-  const { tables, loading, error, fetchTables } = useLobby()
+  const { tables, loading, error, watchTables } = useLobby()
   const [showCreateModal, setShowCreateModal] = useState(false)
   const [showLoginModal, setShowLoginModal] = useState(false)
   const [authToken, setAuthToken] = useState(null)
@@ -60,12 +60,8 @@ export default function Lobby() {
     }
   }, [])
 
-  useEffect(() => {
-    fetchTables()
-    // Refresh table list every 5 seconds
-    const interval = setInterval(fetchTables, 5000)
-    return () => clearInterval(interval)
-  }, [fetchTables])
+  // Live table list (event stream, or polling without EventSource)
+  useEffect(() => watchTables(), [watchTables])
 
   // Fetch chip count when authenticated
   useEffect(() => {
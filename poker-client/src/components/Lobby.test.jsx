@@ -44,6 +44,8 @@ function createTestToken(expiresInSeconds) {
 
 describe('Lobby Component', () => {
   const mockFetchTables = vi.fn()
+  const mockStopWatching = vi.fn()
+  const mockWatchTables = vi.fn(() => mockStopWatching)
   const user = userEvent.setup()
 
   beforeEach(() => {
@@ -72,6 +74,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -85,6 +88,7 @@ describe('Lobby Component', () => {
       loading: true,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -97,6 +101,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: 'Failed to fetch tables',
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -109,6 +114,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -141,6 +147,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -150,25 +157,22 @@ describe('Lobby Component', () => {
     expect(screen.getByText('$1/$2')).toBeInTheDocument()
   })
 
-  it('fetches tables on mount and sets up auto-refresh', async () => {
+  it('watches tables while mounted', async () => {
     useLobby.mockReturnValue({
       tables: [],
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
-    renderLobby()
-    
-    expect(mockFetchTables).toHaveBeenCalledTimes(1)
+    const { unmount } = renderLobby()
 
-    // Fast-forward 5 seconds
-    vi.advanceTimersByTime(5000)
-    expect(mockFetchTables).toHaveBeenCalledTimes(2)
+    expect(mockWatchTables).toHaveBeenCalledTimes(1)
+    expect(mockStopWatching).not.toHaveBeenCalled()
 
-    // Fast-forward another 5 seconds
-    vi.advanceTimersByTime(5000)
-    expect(mockFetchTables).toHaveBeenCalledTimes(3)
+    unmount()
+    expect(mockStopWatching).toHaveBeenCalledTimes(1)
   })
 
   it('opens create table modal when create button is clicked', async () => {
@@ -180,6 +184,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -202,6 +207,7 @@ describe('Lobby Component', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
 
     renderLobby()
@@ -223,6 +229,8 @@ describe('Lobby Component', () => {
 
 describe('Lobby Component - Authentication', () => {
   const mockFetchTables = vi.fn()
+  const mockStopWatching = vi.fn()
+  const mockWatchTables = vi.fn(() => mockStopWatching)
 
   beforeEach(() => {
     vi.clearAllMocks()
@@ -233,6 +241,7 @@ describe('Lobby Component - Authentication', () => {
       loading: false,
       error: null,
       fetchTables: mockFetchTables,
+      watchTables: mockWatchTables,
     })
   })
 
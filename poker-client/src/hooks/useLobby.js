@@ -4,6 +4,7 @@
 import { useState, useCallback } from 'react'
 
 const LOBBY_API_BASE = import.meta.env.VITE_LOBBY_URL || 'http://localhost:8000'
+const POLL_INTERVAL_MS = 5000
 
 export function useLobby() {
   const [tables, setTables] = useState([])
@@ -61,5 +62,38 @@ export function useLobby() {
     }
   }, [fetchTables])
 
-  return { tables, loading, error, fetchTables, createTable, deleteTable }
+  /**
+   * Keep `tables` up to date from the lobby's event stream (snapshot, then
+   * create/delete/update events). EventSource reconnects on its own and
+   * resumes with Last-Event-ID. Falls back to polling where EventSource is
+   * unavailable. Returns a cleanup function.
+   */
+  const watchTables = useCallback(() => {
+    if (typeof EventSource === 'undefined') {
+      fetchTables()
+      const interval = setInterval(fetchTables, POLL_INTERVAL_MS)
+      return () => clearInterval(interval)
+    }
+
+    const source = new EventSource(`${LOBBY_API_BASE}/api/tables/stream`)
+    const on = (type, apply) => source.addEventListener(type, (event) => {
+      setTables((current) => apply(current, JSON.parse(event.data)))
+    })
+
+    on('snapshot', (_, snapshot) => snapshot)
+    on('create', (current, table) => [
+      ...current.filter((t) => t.table_id !== table.table_id),
+      table,
+    ])
+    on('delete', (current, { table_id }) => current.filter((t) => t.table_id !== table_id))
+    on('update', (current, change) => current.map((t) => (
+      t.table_id === change.table_id ? { ...t, ...change } : t
+    )))
+    source.addEventListener('open', () => setError(null))
+    source.addEventListener('error', () => setError('Lost connection to lobby, reconnecting...'))
+
+    return () => source.close()
+  }, [fetchTables])
+
+  return { tables, loading, error, fetchTables, createTable, deleteTable, watchTables }
 }
@@ -140,4 +140,70 @@ describe('useLobby Hook', () => {
     expect(success).toBe(false)
     expect(result.current.error).toBe('Failed to delete table')
   })
+
+  it('polls for tables when EventSource is unavailable', async () => {
+    vi.useFakeTimers()
+    global.fetch.mockResolvedValue({ ok: true, json: async () => [] })
+
+    const { result } = renderHook(() => useLobby())
+
+    let stop
+    await act(async () => {
+      stop = result.current.watchTables()
+    })
+    expect(global.fetch).toHaveBeenCalledTimes(1)
+
+    await act(async () => {
+      vi.advanceTimersByTime(5000)
+    })
+    expect(global.fetch).toHaveBeenCalledTimes(2)
+
+    stop()
+    vi.advanceTimersByTime(5000)
+    expect(global.fetch).toHaveBeenCalledTimes(2)
+    vi.useRealTimers()
+  })
+
+  it('applies snapshot, create, update and delete events from the stream', () => {
+    const sources = []
+    class FakeEventSource {
+      constructor(url) {
+        this.url = url
+        this.listeners = {}
+        this.close = vi.fn()
+        sources.push(this)
+      }
+      addEventListener(type, fn) {
+        this.listeners[type] = fn
+      }
+      emit(type, data) {
+        this.listeners[type]({ data: JSON.stringify(data) })
+      }
+    }
+    vi.stubGlobal('EventSource', FakeEventSource)
+
+    const { result } = renderHook(() => useLobby())
+    let stop
+    act(() => {
+      stop = result.current.watchTables()
+    })
+    const source = sources[0]
+    expect(source.url).toMatch(/\/api\/tables\/stream$/)
+
+    act(() => source.emit('snapshot', [{ table_id: 't1', seated: 0 }]))
+    act(() => source.emit('create', { table_id: 't2', seated: 0 }))
+    act(() => source.emit('update', { table_id: 't1', seated: 4 }))
+    expect(result.current.tables).toEqual([
+      { table_id: 't1', seated: 4 },
+      { table_id: 't2', seated: 0 },
+    ])
+
+    act(() => source.emit('delete', { table_id: 't1' }))
+    expect(result.current.tables).toEqual([{ table_id: 't2', seated: 0 }])
+
+    stop()
+    expect(source.close).toHaveBeenCalled()
+    expect(global.fetch).not.toHaveBeenCalled()
+    vi.unstubAllGlobals()
+  })
 })
@@ -1,48 +1,110 @@
 """
 Player action handlers.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from .models import TableState, PlayerRole
 from .player_utils import active_pids
 from .betting import process_call, process_raise, is_betting_complete
 from .game_flow import advance_turn, advance_street, run_showdown, start_new_hand, check_turn_timeout
-from poker.constants import VALID_ACTIONS
+from .messages import ClientMessage, Action, PreAction, Start, JoinWaitlist, LeaveWaitlist, from_dict
 from .waitlist import join_waitlist, leave_waitlist
+from .hand_history import record_action
 
 
-async def handle_message(table: TableState, pid: str, msg: Dict[str, Any]) -> Optional[str]:
+async def handle_message(table: TableState, pid: str, msg: Union[ClientMessage, Dict[str, Any]]) -> Optional[str]:
     """
     Handle incoming player messages.
     Returns optional info message to broadcast.
     """
-    mtype = msg.get("type")
-    player = table.players.get(pid)
-
-    if mtype == "join_waitlist":
-        if join_waitlist(table, pid):
-            return f"{player.name} joined the waitlist"
-        return None
-
-    if mtype == "leave_waitlist":
-        if leave_waitlist(table, pid):
-            return f"{player.name} left the waitlist"
+    if isinstance(msg, dict):
+        msg = from_dict(msg)  # Frames that did not come through a websocket route (tests, HTTP)
+    handler = _HANDLERS.get(type(msg))
+    if handler is None:
         return None
 
     # Only seated players can start hands or take actions
-    if player and player.role != PlayerRole.SEATED:
+    player = table.players.get(pid)
+    if player and player.role != PlayerRole.SEATED and type(msg) not in _ANY_ROLE:
         return None
 
-    if mtype == "start":
-        start_new_hand(table)
-        return "New hand started"
+    return await handler(table, pid, msg)
+
+
+async def _handle_join_waitlist(table: TableState, pid: str, msg: JoinWaitlist) -> Optional[str]:
+    player = table.players.get(pid)
+    if join_waitlist(table, pid, any_table=msg.any_table):
+        if msg.any_table:
+            return f"{player.name} joined the waitlist for any {table.small_blind}/{table.big_blind} table"
+        return f"{player.name} joined the waitlist"
+    return None
+
+
+async def _handle_leave_waitlist(table: TableState, pid: str, msg: LeaveWaitlist) -> Optional[str]:
+    if leave_waitlist(table, pid):
+        return f"{table.players[pid].name} left the waitlist"
+    return None
+
 
-    if mtype == "action":
-        return await _handle_action(table, pid, msg)
+async def _handle_start(table: TableState, pid: str, msg: Start) -> Optional[str]:
+    start_new_hand(table)
+    return "New hand started"
 
+
+async def _handle_pre_action(table: TableState, pid: str, msg: PreAction) -> Optional[str]:
+    set_pre_action(table, pid, msg)
     return None
 
 
-async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Optional[str]:
+def set_pre_action(table: TableState, pid: str, msg: PreAction) -> bool:
+    """
+    Queue a pre-action for the player's next turn on this street, or clear it with action=None.
+    Returns True if the queue changed.
+    """
+    if msg.action is None:
+        return table.pre_actions.pop(pid, None) is not None
+    if not table.hand_in_progress or table.runout_in_progress:
+        return False
+    if pid not in table.hole_cards or pid in table.folded_pids:
+        return False
+
+    pre_action = {"action": msg.action}
+    if msg.action == "call_up_to":
+        pre_action["amount"] = msg.amount
+    table.pre_actions[pid] = pre_action
+    return True
+
+
+def _resolve_pre_action(table: TableState, pid: str, pre_action: Dict[str, Any]) -> Optional[str]:
+    """The action a pre-action stands for now, or None if it no longer applies."""
+    player = table.players[pid]
+    to_call = min(table.current_bet - table.player_bets.get(pid, 0), player.stack)
+    if to_call <= 0:
+        return "check"
+    if pre_action["action"] == "check_fold":
+        return "fold"
+    if pre_action["action"] == "call_any" or to_call <= pre_action.get("amount", 0):
+        return "call"
+    return None  # Raised past their limit: the player decides for themselves
+
+
+async def apply_pre_actions(table: TableState) -> List[str]:
+    """
+    Play queued pre-actions for as long as the turn lands on a player who has one.
+    Returns the info messages for the actions taken.
+    """
+    messages = []
+    while table.hand_in_progress and table.current_turn_pid in table.pre_actions:
+        pid = table.current_turn_pid
+        action = _resolve_pre_action(table, pid, table.pre_actions.pop(pid))
+        if action is None:
+            break
+        message = await _handle_action(table, pid, Action(action))
+        if message:
+            messages.append(message)
+    return messages
+
+
+async def _handle_action(table: TableState, pid: str, msg: Action) -> Optional[str]:
     """Handle player action (fold, check, call, raise)."""
     # Check for timeout first
     timed_out, auto_action = check_turn_timeout(table)
@@ -50,6 +112,7 @@ async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Op
         # Player timed out before their action, process timeout
         current_pid = table.current_turn_pid
         player_name = table.players[current_pid].name if current_pid else "Player"
+        record_action(table, current_pid, auto_action)
 
         # Continue game flow after timeout
         active = active_pids(table)
@@ -65,11 +128,8 @@ async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Op
 
         return f"{player_name} timed out - auto {auto_action}"
 
-    action = msg.get("action")
-    amount = msg.get("amount", 0)
-
-    if action not in VALID_ACTIONS:
-        return None
+    action = msg.action
+    amount = msg.amount
 
     # Must be your turn
     if table.current_turn_pid != pid:
@@ -85,17 +145,13 @@ async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Op
         if table.current_bet > player_current_bet:
             return None  # Invalid action
 
-    # Handle raise
-    elif action == "raise":
-        # Validate amount is positive
-        if amount is None or amount <= 0:
-            return None  # Invalid raise amount
-
     # Mark player as having acted (only after validation passes)
     table.players_acted.add(pid)
 
     # Record last action for UI animations
     table.last_action = {"pid": pid, "action": action, "amount": amount}
+    contributed = table.total_contributions.get(pid, 0)
+    history_entry = record_action(table, pid, action)
 
     # Build action message for logging
     action_msg = None
@@ -147,6 +203,10 @@ async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Op
         total_contrib = table.total_contributions.get(pid, 0)
         print(f"[ALL-IN] {player.name} all-in for ${all_in_amount}, total contribution: ${total_contrib}, pot: ${table.pot}")
 
+    # Hand history stores the chips this action put in
+    if history_entry is not None:
+        history_entry["amount"] = table.total_contributions.get(pid, 0) - contributed
+
     # Check if betting round is complete
     active = active_pids(table)
     if is_betting_complete(table, active):
@@ -187,6 +247,16 @@ async def _handle_action(table: TableState, pid: str, msg: Dict[str, Any]) -> Op
     return action_msg
 
 
+_HANDLERS = {
+    Start: _handle_start,
+    Action: _handle_action,
+    PreAction: _handle_pre_action,
+    JoinWaitlist: _handle_join_waitlist,
+    LeaveWaitlist: _handle_leave_waitlist,
+}
+_ANY_ROLE = {JoinWaitlist, LeaveWaitlist}  # Spectators and waiting players may send these
+
+
 def handle_disconnect(table: TableState, pid: str) -> Optional[str]:
     """
     Handles a player disconnect. Auto-folds them if hand is in progress.
@@ -198,6 +268,7 @@ def handle_disconnect(table: TableState, pid: str) -> Optional[str]:
     # Fold the disconnected player
     if pid not in table.folded_pids:
         table.folded_pids.add(pid)
+        record_action(table, pid, "fold")
 
         # Check if only one player remains
         active = active_pids(table)
@@ -222,3 +293,55 @@ def handle_disconnect(table: TableState, pid: str) -> Optional[str]:
         return "Hand ended - not enough players"
 
     return None
+
+
+def handle_timeout(table: TableState) -> Optional[str]:
+    """
+    Applies the auto fold/check for an expired turn and continues the hand.
+    Returns info message if the turn had timed out.
+    """
+    timed_out, auto_action = check_turn_timeout(table)
+    if not timed_out:
+        return None
+
+    current_pid = table.current_turn_pid
+    player_name = table.players[current_pid].name if current_pid else "Player"
+
+    # Set last_action for UI animation
+    table.last_action = {"pid": current_pid, "action": "fold" if auto_action == "fold" else "check", "amount": 0}
+    record_action(table, current_pid, auto_action)
+
+    active = active_pids(table)
+    if len(active) == 1:
+        return run_showdown(table)
+
+    if is_betting_complete(table, active):
+        can_continue = advance_street(table)
+        if not can_continue:
+            return run_showdown(table)
+    else:
+        advance_turn(table)
+
+    return f"{player_name} timed out - auto {auto_action}"
+
+
+def advance_runout(table: TableState) -> Optional[str]:
+    """
+    Deals the next street of an all-in runout, or runs the showdown after the river.
+    Returns info message describing what was dealt.
+    """
+    if not table.hand_in_progress or not table.runout_in_progress:
+        return None
+
+    if table.street == "river":
+        # Runout complete, go to showdown
+        table.runout_in_progress = False
+        return run_showdown(table)
+
+    advance_street(table)
+    # Clear turn state during runout (no one to act)
+    table.current_turn_pid = None
+    table.turn_deadline = None
+    street_names = {"flop": "Flop", "turn": "Turn", "river": "River"}
+    street_name = street_names.get(table.street, table.street)
+    return f"📋 Dealing {street_name}: {' '.join(table.board)}"
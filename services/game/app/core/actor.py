@@ -0,0 +1,522 @@
+"""
+Per-table actor.
+
+Each table is driven by a single task that consumes an ordered command queue
+(joins, player messages, disconnects, timer fires). The actor is the only code
+that mutates its TableState and the only code that broadcasts it, so there is
+no lock and ordering is simply queue order. Everything already queued when the
+actor wakes up is applied as one batch, followed by one state broadcast.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from .models import TableState, PlayerRole
+from .messages import ClientMessage
+from .tables import get_table, delete_table, evict_table, LOBBY_URL
+from .protocol import broadcast_state, broadcast_info, state_frame, state_prefix, is_plain_spectator
+from .relay import SpectatorRelay
+from .actions import handle_message, handle_disconnect, handle_timeout, advance_runout, apply_pre_actions
+from .game_flow import start_new_hand
+from .player_utils import eligible_players
+from .timers import timers
+from .loop_monitor import track, set_activity
+from .occupancy import publisher as occupancy
+from .waitlist import global_waitlist
+from .hibernation import store as hibernated, drop_stale_players, TABLE_IDLE_SECONDS, TABLE_HIBERNATE_TTL
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 64
+RUNOUT_STREET_DELAY = 2.0  # Seconds between streets during an all-in runout
+
+
+@dataclass
+class Join:
+    """Seat (or rail) a player and attach their websocket."""
+    ws: Any
+    pid: str
+    name: str
+    stack: int
+    user_id: Optional[int] = None
+    spectator: bool = False  # Watch from the rail even if a seat is free
+    ticket: Optional[str] = None  # Resume ticket to hand out in the welcome
+    kind = "join"
+
+
+@dataclass
+class PlayerMessage:
+    """A decoded client frame (start, action, waitlist...). Plain dicts are validated when applied."""
+    pid: str
+    msg: Union[ClientMessage, Dict[str, Any]]
+    kind = "message"
+
+
+@dataclass
+class Disconnect:
+    """The player's websocket closed. With ``grace``, they keep their seat that long in case they resume."""
+    pid: str
+    ws: Any
+    grace: float = 0
+    kind = "disconnect"
+
+
+@dataclass
+class Resume:
+    """Reattach a player whose socket dropped less than the grace window ago."""
+    ws: Any
+    pid: str
+    last_seq: int
+    ticket: Optional[str] = None
+    kind = "resume"
+
+
+@dataclass
+class GraceExpired:
+    """A dropped player did not resume in time: disconnect them for real."""
+    pid: str
+    kind = "grace_expired"
+
+
+@dataclass
+class TimerFired:
+    """A central-timer deadline for this table elapsed ("turn", "runout", "deal" or "idle")."""
+    timer: str
+    kind = "timer"
+
+
+@dataclass
+class SeatOffer:
+    """Tell a global-waitlist player watching this table about a seat elsewhere."""
+    pid: str
+    table_id: str
+    kind = "seat_offer"
+
+
+@dataclass
+class Call:
+    """Run ``fn(table)`` inside the actor (for HTTP handlers and tests)."""
+    fn: Callable[[TableState], Any]
+    kind = "call"
+
+
+@dataclass
+class _Outbox:
+    """Frames produced by one batch, sent once the whole batch is applied."""
+    direct: List[Tuple[Any, str]] = field(default_factory=list)
+    relayed: List[Tuple[Any, int]] = field(default_factory=list)  # (socket, stack) owed the state by the relay
+    info: List[str] = field(default_factory=list)
+    dirty: bool = False
+
+
+class TableActor:
+    """Owns one TableState; applies commands in order, in batches."""
+
+    def __init__(self, table: TableState):
+        self.table = table
+        self.table_id = table.table_id
+        self.closed = False
+        self.batches = 0
+        self.commands = 0
+        self.relay = SpectatorRelay(self.table_id)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, cmd) -> None:
+        """Queue a command without waiting for it to be applied."""
+        if self.closed:
+            get_actor(self.table_id).submit(cmd)
+            return
+        self._ensure_task()
+        self._queue.put_nowait((cmd, None))
+
+    async def request(self, cmd) -> Any:
+        """Queue a command and wait until it is applied and its frames are sent."""
+        if self.closed:
+            return await get_actor(self.table_id).request(cmd)
+        self._ensure_task()
+        future = self._loop.create_future()
+        self._queue.put_nowait((cmd, future))
+        return await future
+
+    async def call(self, fn: Callable[[TableState], Any]) -> Any:
+        return await self.request(Call(fn))
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the previous loop went away (tests run one loop per test)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name=f"table-actor-{self.table_id}")
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            out = _Outbox()
+            results = []
+            for cmd, _ in batch:
+                with track(self.table_id, _label(cmd)):
+                    try:
+                        results.append(await self._apply(cmd, out))
+                    except Exception as e:
+                        logger.exception(f"[ACTOR] Table {self.table_id} failed to apply {_label(cmd)}")
+                        results.append(e)
+
+            closing, failure = False, None
+            try:
+                closing = await self._finish_batch(batch, out)
+            except Exception as e:
+                # The commands are applied, but their callers must not wait forever for the rest
+                logger.exception(f"[ACTOR] Table {self.table_id} failed to finish a batch")
+                failure = e
+            finally:
+                for (_, future), result in zip(batch, results):
+                    if future is None or future.done():
+                        continue
+                    result = failure or result
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+            if closing:
+                return
+
+    async def _finish_batch(self, batch: List[Tuple[Any, Optional[asyncio.Future]]], out: _Outbox) -> bool:
+        """Broadcast, re-arm timers and close or hibernate if due. True once the actor is done."""
+        if drop_stale_players(self.table):
+            out.dirty = True
+
+        set_activity(self.table_id, "broadcast")
+        await self._flush(out)
+        self._schedule_timers()
+        occupancy.mark(self.table)
+        self.batches += 1
+        self.commands += len(batch)
+
+        # Checked when someone leaves or a timer fires, never after a bare Call on an empty table
+        if not (any(isinstance(cmd, (Disconnect, GraceExpired, TimerFired)) for cmd, _ in batch)
+                and self._is_abandoned()):
+            return False
+        if TABLE_IDLE_SECONDS <= 0 or any(_label(cmd) == "timer:expire" for cmd, _ in batch):
+            self._close()
+            await self._delete_from_lobby()
+            return True
+        return await self._hibernate()
+
+    async def _apply(self, cmd, out: _Outbox) -> Any:
+        table = self.table
+
+        if isinstance(cmd, Join):
+            old_ws = table.connections.get(cmd.pid)
+            if old_ws is not None and old_ws is not cmd.ws:
+                logger.warning(f"[WS] Player {cmd.pid} ({cmd.name}) reconnecting - closing old connection")
+                try:
+                    await old_ws.close()
+                except Exception as e:
+                    logger.error(f"[WS] Error closing old connection: {e}")
+
+            player = table.upsert_player(pid=cmd.pid, name=cmd.name, stack=cmd.stack, force_spectator=cmd.spectator)
+            table.connections[cmd.pid] = cmd.ws
+            timers.cancel(self._grace_key(cmd.pid))
+            if global_waitlist.take_offer(cmd.pid, self.table_id) and player.role != PlayerRole.SEATED:
+                # Offered a seat but a hand is running: first in line for the next one
+                table.waitlist.appendleft(cmd.pid)
+                player.role = PlayerRole.WAITLIST
+                table.spectator_pids.discard(cmd.pid)
+
+            # Store user_id in player metadata for later stack updates
+            if cmd.user_id:
+                if not hasattr(table, 'user_ids'):
+                    table.user_ids = {}
+                table.user_ids[cmd.pid] = cmd.user_id
+
+            logger.info(f"[WS] Player {cmd.pid} ({cmd.name}) connected to table {self.table_id} with {cmd.stack} chips")
+            welcome = {"type": "welcome", "pid": cmd.pid}
+            if cmd.ticket:
+                welcome["resume"] = cmd.ticket
+            out.direct.append((cmd.ws, json.dumps(welcome)))
+            out.dirty = True
+            return cmd.pid
+
+        if isinstance(cmd, Resume):
+            player = table.players.get(cmd.pid)
+            if player is None or not player.connected or cmd.pid in table.connections:
+                return False  # Grace ran out, or the player is already back on another socket
+            table.connections[cmd.pid] = cmd.ws
+            timers.cancel(self._grace_key(cmd.pid))
+            # Only the resuming player hears about it: what they missed, then the table as it is now.
+            # A spectator gets no replay of live frames, just the current table through the relay's delay.
+            spectator = is_plain_spectator(table, cmd.pid)
+            missed = None if spectator else table.frame_log.since(cmd.last_seq)
+            welcome = {"type": "welcome", "pid": cmd.pid, "resumed": True, "complete": missed is not None}
+            if cmd.ticket:
+                welcome["resume"] = cmd.ticket
+            out.direct.append((cmd.ws, json.dumps(welcome)))
+            if spectator:
+                out.relayed.append((cmd.ws, player.stack))
+            else:
+                out.direct.extend((cmd.ws, text) for text in missed or ())
+                out.direct.append((cmd.ws, state_frame(table, cmd.pid)))
+            logger.info(f"[WS] Player {cmd.pid} resumed at table {self.table_id} ({len(missed or ())} frames replayed)")
+            return True
+
+        if isinstance(cmd, PlayerMessage):
+            if cmd.pid not in table.connections:
+                return None  # Frame from a socket that has since been replaced or closed
+            self._add_info(out, await handle_message(table, cmd.pid, cmd.msg))
+            await self._play_pre_actions(out)
+            out.dirty = True
+            return None
+
+        if isinstance(cmd, Disconnect):
+            if table.connections.get(cmd.pid) is not cmd.ws:
+                return None  # An older socket for a player who already reconnected
+            table.connections.pop(cmd.pid, None)
+
+            if cmd.grace > 0 and cmd.pid in table.players:
+                # Seat and hand stay as they are; nobody else needs to hear about it yet
+                timers.schedule(self._grace_key(cmd.pid), cmd.grace, self.submit, GraceExpired(cmd.pid))
+                return None
+            await self._disconnect(cmd.pid, out)
+            return None
+
+        if isinstance(cmd, GraceExpired):
+            if cmd.pid in table.connections or cmd.pid not in table.players:
+                return None  # Resumed or joined again in the meantime
+            await self._disconnect(cmd.pid, out)
+            return None
+
+        if isinstance(cmd, TimerFired):
+            if cmd.timer in ("idle", "expire"):
+                return None  # Stale players are dropped after every batch; hibernation or deletion follows it
+            if cmd.timer == "deal":
+                if not table.hand_in_progress:
+                    start_new_hand(table)
+                    if table.hand_in_progress:
+                        self._add_info(out, "New hand started")
+                        out.dirty = True
+                return None
+            if cmd.timer == "runout":
+                info_msg = advance_runout(table)
+            else:
+                info_msg = handle_timeout(table)
+            if info_msg:
+                self._add_info(out, info_msg)
+                await self._play_pre_actions(out)
+                out.dirty = True
+            return None
+
+        if isinstance(cmd, SeatOffer):
+            player = table.players.get(cmd.pid)
+            ws = table.connections.get(cmd.pid)
+            if player is None or ws is None:
+                return None
+            if player.role == PlayerRole.WAITLIST and cmd.pid not in table.waitlist:
+                player.role = PlayerRole.SPECTATOR
+                table.spectator_pids.add(cmd.pid)
+            out.direct.append((ws, json.dumps({"type": "seat_offer", "table_id": cmd.table_id})))
+            out.dirty = True
+            return None
+
+        if isinstance(cmd, Call):
+            return cmd.fn(table)
+
+        raise TypeError(f"Unknown table command: {cmd!r}")
+
+    async def _disconnect(self, pid: str, out: _Outbox) -> None:
+        table = self.table
+        # Handle in-game disconnect (fold player out if needed)
+        info_msg = handle_disconnect(table, pid)
+        if info_msg:
+            logger.info(f"[WS] Disconnect handled: {info_msg}")
+
+        # Mark player as disconnected (preserves their stack and data)
+        table.mark_disconnected(pid)
+        global_waitlist.leave(pid, self.table_id)
+        self._add_info(out, info_msg)
+        await self._play_pre_actions(out)
+        out.dirty = True
+
+    async def _play_pre_actions(self, out: _Outbox) -> None:
+        """Resolve every turn that a queued pre-action decides, all within this batch's broadcast."""
+        for message in await apply_pre_actions(self.table):
+            self._add_info(out, message)
+
+    def _grace_key(self, pid: str) -> Tuple[str, str]:
+        return (self.table_id, f"grace:{pid}")
+
+    @staticmethod
+    def _add_info(out: _Outbox, message: Optional[str]) -> None:
+        if message:
+            out.info.append(message)
+
+    async def _flush(self, out: _Outbox) -> None:
+        for ws, text in out.direct:
+            try:
+                await ws.send_text(text)
+            except Exception:
+                pass
+        for message in out.info:
+            await broadcast_info(self.table, message, self.relay)
+        if out.dirty:
+            await broadcast_state(self.table, self.relay)
+        elif out.relayed:
+            self.relay.publish_state(state_prefix(self.table, self.table.frame_log.seq), out.relayed)
+
+    def _schedule_timers(self) -> None:
+        """Keep this table's central-timer entries in sync with its state."""
+        table = self.table
+        turn_key = (self.table_id, "turn")
+        runout_key = (self.table_id, "runout")
+        idle_key = (self.table_id, "idle")
+        deal_key = (self.table_id, "deal")
+
+        # Restarted by every batch, so it only fires after TABLE_IDLE_SECONDS without commands
+        if table.hand_in_progress or TABLE_IDLE_SECONDS <= 0:
+            timers.cancel(idle_key)
+        else:
+            timers.schedule(idle_key, TABLE_IDLE_SECONDS, self.submit, TimerFired("idle"))
+
+        # Deal the next hand once the last one has been on show for deal_delay_seconds
+        if table.hand_in_progress or table.deal_delay_seconds is None or not self._can_deal():
+            timers.cancel(deal_key)
+        elif not timers.pending(deal_key):
+            timers.schedule(deal_key, table.deal_delay_seconds, self.submit, TimerFired("deal"))
+
+        if table.hand_in_progress and table.runout_in_progress:
+            timers.cancel(turn_key)
+            if not timers.pending(runout_key):
+                timers.schedule(runout_key, RUNOUT_STREET_DELAY, self.submit, TimerFired("runout"))
+            return
+
+        timers.cancel(runout_key)
+        if table.hand_in_progress and table.turn_deadline:
+            if timers.due(turn_key) != table.turn_deadline:
+                timers.schedule_at(turn_key, table.turn_deadline, self.submit, TimerFired("turn"))
+        else:
+            timers.cancel(turn_key)
+
+    def _can_deal(self) -> bool:
+        # Waiting players are seated by start_new_hand, so they count towards the two
+        return len(eligible_players(self.table)) + len(self.table.waitlist) >= 2
+
+    def _is_abandoned(self) -> bool:
+        """Nobody connected and no hand to finish (turn timers fold out a hand everyone left)."""
+        table = self.table
+        # A player inside their resume grace has no connection but still counts as connected
+        return (not table.hand_in_progress and not table.connections
+                and table.has_no_connected_players() and self._queue.empty())
+
+    def _close(self) -> None:
+        """Drop the table from the game service. Later commands go to a fresh actor."""
+        logger.info(f"[CLEANUP] Table {self.table_id} has no connected players, deleting...")
+        self._detach()
+        delete_table(self.table_id)
+
+    async def _hibernate(self) -> bool:
+        """
+        Move the abandoned table to disk. get_table() loads it back for the next
+        command; if none comes within TABLE_HIBERNATE_TTL it is deleted for good.
+        False if a command arrived while the file was written and the table stays.
+        """
+        logger.info(f"[HIBERNATE] Table {self.table_id} has nobody connected, writing to disk")
+        try:
+            await asyncio.to_thread(hibernated.save, self.table)
+        except OSError as e:
+            logger.error(f"[HIBERNATE] Could not write table {self.table_id} to disk ({e}), deleting it instead")
+            self._close()
+            await self._delete_from_lobby()
+            return True
+        if not self._queue.empty():
+            hibernated.delete(self.table_id)  # Somebody is back already
+            return False
+        self._detach()
+        evict_table(self.table_id)
+        if TABLE_HIBERNATE_TTL > 0:
+            timers.schedule((self.table_id, "expire"), TABLE_HIBERNATE_TTL, _expire, self.table_id)
+        return True
+
+    def _detach(self) -> None:
+        self.closed = True
+        timers.cancel_owner(self.table_id)
+        self.relay.close()
+        occupancy.remove(self.table_id)
+        if _actors.get(self.table_id) is self:
+            del _actors[self.table_id]
+
+    async def _delete_from_lobby(self) -> None:
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.delete(f"{LOBBY_URL}/api/tables/{self.table_id}", timeout=5.0)
+                if response.status_code == 204:
+                    logger.info(f"[CLEANUP] Table {self.table_id} deleted from lobby")
+                else:
+                    logger.warning(f"[CLEANUP] Failed to delete table {self.table_id} from lobby: {response.status_code}")
+        except Exception as e:
+            logger.error(f"[CLEANUP] Error deleting table {self.table_id} from lobby: {e}")
+
+
+def _label(cmd) -> str:
+    if isinstance(cmd, PlayerMessage):
+        if isinstance(cmd.msg, ClientMessage):
+            return cmd.msg.type
+        return str(cmd.msg.get("type")) if isinstance(cmd.msg, dict) else "invalid"
+    if isinstance(cmd, TimerFired):
+        return f"timer:{cmd.timer}"
+    return cmd.kind
+
+
+_actors: Dict[str, TableActor] = {}
+
+
+def _send_seat_offer(origin_table_id: str, pid: str, table_id: str) -> None:
+    actor = _actors.get(origin_table_id)
+    if actor is not None and not actor.closed:
+        actor.submit(SeatOffer(pid=pid, table_id=table_id))
+
+
+global_waitlist.notify = _send_seat_offer
+
+
+def _expire(table_id: str) -> None:
+    """A hibernated table's TTL ran out: load it so its actor can delete it, unless it is gone already."""
+    if table_id in hibernated or table_id in _actors:
+        get_actor(table_id).submit(TimerFired("expire"))
+
+
+def rearm_hibernated() -> int:
+    """At startup: restart the expiry timers of tables hibernated before the restart. Returns how many."""
+    if TABLE_HIBERNATE_TTL <= 0:
+        return 0
+    now = time.time()
+    count = 0
+    for table_id, hibernated_at in hibernated.entries():
+        timers.schedule((table_id, "expire"), hibernated_at + TABLE_HIBERNATE_TTL - now, _expire, table_id)
+        count += 1
+    return count
+
+
+def get_actor(table_id: str) -> TableActor:
+    """Get the actor for a table, creating the table and actor if needed."""
+    table = get_table(table_id)
+    actor = _actors.get(table_id)
+    if actor is None or actor.table is not table:
+        actor = TableActor(table)
+        _actors[table_id] = actor
+    return actor
@@ -56,8 +56,14 @@ def validate_token_and_load_user(token: str) -> Optional[Tuple[User, int]]:
                 db.commit()
                 db.refresh(player_stack)
 
-            logger.info(f"[AUTH] Authenticated user {user.username} (ID: {user.id}) with stack: {player_stack.stack}")
-            return (user, player_stack.stack)
+            # A stack still waiting for the background writer is newer than the row
+            from .stack_writer import stack_writer
+            stack = stack_writer.pending(user.id)
+            if stack is None:
+                stack = player_stack.stack
+
+            logger.info(f"[AUTH] Authenticated user {user.username} (ID: {user.id}) with stack: {stack}")
+            return (user, stack)
         finally:
             db.close()
     except Exception as e:
@@ -90,3 +96,30 @@ def update_user_stack(user_id: int, new_stack: int) -> bool:
         return False
     finally:
         db.close()
+
+
+def load_admin_user(token: str) -> Optional[User]:
+    """
+    Validate JWT token and return the user if they are an admin.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        User if the token is valid and belongs to an admin, None otherwise
+    """
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    db = next(get_db())
+    try:
+        user = db.query(User).filter(User.username == payload["sub"]).first()
+        if user is None or not user.is_admin:
+            return None
+        return user
+    except Exception as e:
+        logger.error(f"[AUTH] Exception in load_admin_user: {e}", exc_info=True)
+        return None
+    finally:
+        db.close()
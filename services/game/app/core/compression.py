@@ -0,0 +1,126 @@
+"""
+Optional frame compression for game websockets.
+
+A client asks for it when it connects, with ``?compress=deflate`` (raw
+DEFLATE, which the browser's ``DecompressionStream("deflate-raw")`` can
+inflate) or ``?compress=deflate-dict`` (the same, primed with
+``STATE_DICTIONARY``, served at ``/api/compression-dictionary``). Frames
+shorter than ``WS_COMPRESSION_MIN_BYTES`` are still sent as text; longer ones
+go out as binary messages. ``WS_COMPRESSION_LEVEL`` is the zlib level: 1 spends
+the least CPU, 9 saves the most bandwidth.
+
+Every frame is compressed on its own (no context carried between messages, as
+permessage-deflate would), so the result depends only on the text. A broadcast
+hands the same string to every viewer with the same view, and each compressor
+keeps its recent results, so a frame going to a hundred spectators is
+compressed once. The transport-level permessage-deflate that uvicorn
+negotiates cannot do either of those things.
+"""
+import os
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+from . import metrics
+
+WS_COMPRESSION = os.getenv("WS_COMPRESSION", "on") == "on"
+WS_COMPRESSION_MIN_BYTES = int(os.getenv("WS_COMPRESSION_MIN_BYTES", "512"))
+WS_COMPRESSION_LEVEL = int(os.getenv("WS_COMPRESSION_LEVEL", "6"))
+
+# Keys and values that show up in nearly every state frame. DEFLATE finds the
+# cheapest matches near the end of the dictionary, so the most common come last.
+STATE_DICTIONARY = (
+    b'"showdown": {"players": {"hole_cards": "winner_pids": "runout": true'
+    b'"current_side_pots": [{"type": "Main Pot", "amount": "eligible_players": '
+    b'"last_action": {"pid": "action": "fold""check""call""raise""all_in"'
+    b'"street": "preflop""flop""turn""river", "board": [], '
+    b'{"type": "info", "seq": "message": "New hand started"'
+    b'"spectators": [], "waitlist": [], "hole_cards": "pre_action": null, '
+    b'"my_role": "seated""spectator""waitlist", "my_stack": "waitlist_position": 0}}'
+    b'"hand_in_progress": true, "runout_in_progress": false, "dealer_seat": '
+    b'"sb_pid": "bb_pid": "current_turn_pid": "turn_deadline": '
+    b'"turn_timeout_seconds": 30, "pot": "current_bet": "player_bets": {'
+    b'{"type": "state", "seq": "state": {"table_id": "players": [{"pid": "'
+    b'"name": "stack": "seat": "connected": true, "folded": false}, {"pid": "'
+)
+
+_input_bytes = metrics.counter("pokerlite_ws_compression_input_bytes_total", "Frame bytes before compression")
+_output_bytes = metrics.counter("pokerlite_ws_compression_output_bytes_total", "Frame bytes after compression")
+_reused = metrics.counter("pokerlite_ws_compression_reused_total", "Sends that reused an already compressed frame")
+_ratio = metrics.histogram(
+    "pokerlite_ws_compression_ratio",
+    "Compressed size over original size, per distinct frame",
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0),
+)
+
+
+class FrameCompressor:
+    """Compresses frames at or above ``min_bytes``, remembering the last ``cache_size`` results."""
+
+    def __init__(self, mode: str, level: int = WS_COMPRESSION_LEVEL, min_bytes: int = WS_COMPRESSION_MIN_BYTES,
+                 zdict: Optional[bytes] = None, cache_size: int = 32):
+        self.mode = mode
+        self.level = level
+        self.min_bytes = min_bytes
+        self.zdict = zdict
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def encode(self, text: str) -> Union[str, bytes]:
+        """``text`` itself if it is too short to bother, else its compressed bytes."""
+        if len(text) < self.min_bytes:
+            return text
+        raw_size = len(text.encode())
+        data = self._cache.get(text)  # A str caches its hash, so a repeat of the same object is cheap
+        if data is not None:
+            self._cache.move_to_end(text)
+            _reused.inc(mode=self.mode)
+        else:
+            data = self._compress(text.encode())
+            self._cache[text] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            _ratio.observe(len(data) / raw_size)
+        _input_bytes.inc(raw_size, mode=self.mode)
+        _output_bytes.inc(len(data), mode=self.mode)
+        return data
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.zdict:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=self.zdict)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        return compressor.compress(raw) + compressor.flush()
+
+
+class CompressedSocket:
+    """Stands in for a websocket in ``table.connections``; sends long frames compressed."""
+
+    def __init__(self, ws: Any, compressor: FrameCompressor):
+        self.ws = ws
+        self.compressor = compressor
+
+    async def send_text(self, text: str) -> None:
+        data = self.compressor.encode(text)
+        if isinstance(data, bytes):
+            await self.ws.send_bytes(data)
+        else:
+            await self.ws.send_text(data)
+
+    async def close(self) -> None:
+        await self.ws.close()
+
+
+compressors = {
+    "deflate": FrameCompressor("deflate"),
+    "deflate-dict": FrameCompressor("deflate-dict", zdict=STATE_DICTIONARY),
+}
+
+
+def negotiate(ws: Any) -> Any:
+    """The socket to send on: ``ws`` wrapped in a CompressedSocket if the client asked for compression."""
+    if not WS_COMPRESSION:
+        return ws
+    params = getattr(ws, "query_params", None)
+    compressor = compressors.get(params.get("compress")) if params is not None else None
+    return CompressedSocket(ws, compressor) if compressor is not None else ws
@@ -0,0 +1,444 @@
+"""
+Fast-fold ("zoom") player pools.
+
+A pool is one stake level played as a stream of short-lived hands instead of
+a fixed table. Players waiting for a hand sit in the pool's ready queue; as
+soon as ``FAST_FOLD_TABLE_SIZE`` of them are ready a hand is dealt to them,
+and a player who folds goes straight back into the queue instead of watching
+the rest of the hand. When the queue cannot fill a table, whoever is ready
+(two or more) is dealt a short-handed hand after ``FAST_FOLD_FILL_SECONDS``.
+
+Like a table actor, each pool is driven by a single task consuming an ordered
+command queue, so it is the only code touching its hands and new hands are
+formed at the end of the batch that freed their players. Hands are played on
+ordinary TableStates with ``start_new_hand`` and ``handle_message``; when a
+hand ends its TableState goes on a free list and is reset in place for a
+later hand rather than allocated again.
+
+A player's websocket sits in the ``connections`` of whichever hand they are
+playing, so the usual broadcasts reach them there, and the pool routes their
+frames to that hand. The player who has gone longest without posting the big
+blind gets it, then the small blind and the button.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, fields, MISSING
+from typing import Any, Dict, List, Optional, Tuple
+
+from poker.constants import TURN_TIMEOUT_SECONDS
+from . import metrics
+from .models import TableState, Player, PlayerRole
+from .actor import Join, PlayerMessage, Disconnect, MAX_BATCH, RUNOUT_STREET_DELAY
+from .actions import handle_message, handle_disconnect, handle_timeout, advance_runout
+from .messages import Action, from_dict
+from .game_flow import start_new_hand
+from .protocol import broadcast_state, broadcast_info
+from .stack_writer import stack_writer
+from .timers import timers
+from .wait_queue import WaitQueue
+
+logger = logging.getLogger(__name__)
+
+FAST_FOLD_TABLE_SIZE = int(os.getenv("FAST_FOLD_TABLE_SIZE", "6"))
+FAST_FOLD_FILL_SECONDS = float(os.getenv("FAST_FOLD_FILL_SECONDS", "0.5"))
+FAST_FOLD_STAKES = tuple(int(bb) for bb in os.getenv("FAST_FOLD_STAKES", "10,20,50,100").split(","))
+
+_hands_dealt = metrics.counter("pokerlite_fast_fold_hands_total", "Hands dealt in fast-fold pools")
+_ready_wait = metrics.histogram(
+    "pokerlite_fast_fold_ready_wait_seconds",
+    "Time from a player joining the ready queue to being dealt a hand",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+@dataclass
+class PoolPlayer:
+    """A player in a pool, between hands or playing one."""
+    pid: str
+    name: str
+    stack: int
+    ws: Any
+    user_id: Optional[int] = None
+    hand_id: Optional[str] = None  # TableState they are playing, None while waiting (or busted)
+    since_big_blind: int = 0  # Hands dealt to them since they last posted the big blind
+    ready_at: float = 0.0
+
+
+@dataclass
+class _HandTimer:
+    """A central-timer deadline for one of the pool's hands ("turn" or "runout")."""
+    hand_id: str
+    timer: str
+    kind = "timer"
+
+
+@dataclass
+class _Fill:
+    """Deal whoever is ready, even if they cannot fill a table."""
+    kind = "fill"
+
+
+@dataclass
+class _Outbox:
+    direct: List[Tuple[Any, str]] = field(default_factory=list)
+    info: Dict[str, List[str]] = field(default_factory=dict)
+    touched: Dict[str, TableState] = field(default_factory=dict)
+
+
+def _blind_seats(players: int) -> List[int]:
+    """Seats in the order big blind, small blind, button, then the rest.
+
+    Hands start with ``dealer_seat = 0``, so the button goes to seat 1.
+    """
+    if players == 2:
+        return [2, 1]  # Heads-up: the button posts the small blind
+    return [3, 2, 1] + list(range(4, players + 1))
+
+
+class FastFoldPool:
+    """Ready queue, running hands and recycled tables for one stake level."""
+
+    def __init__(self, big_blind: int, table_size: int = FAST_FOLD_TABLE_SIZE,
+                 fill_seconds: float = FAST_FOLD_FILL_SECONDS,
+                 turn_timeout_seconds: int = TURN_TIMEOUT_SECONDS, clock=timers):
+        if table_size < 2:
+            raise ValueError("table_size must be at least 2")
+        self.pool_id = f"ff-{big_blind}"
+        self.big_blind = big_blind
+        self.small_blind = big_blind // 2
+        self.table_size = table_size
+        self.fill_seconds = fill_seconds
+        self.turn_timeout_seconds = turn_timeout_seconds
+        self.clock = clock
+        self.players: Dict[str, PoolPlayer] = {}
+        self.ready = WaitQueue()
+        self.hands: Dict[str, TableState] = {}  # Hands in progress by table_id
+        self.hands_dealt = 0
+        self.batches = 0
+        self._free: List[TableState] = []
+        self._table_ids = itertools.count(1)
+        self._fill_due = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def fill_key(self) -> Tuple[str, str]:
+        return (self.pool_id, "fill")
+
+    @property
+    def tables_allocated(self) -> int:
+        """TableStates ever created by this pool (running hands plus the free list)."""
+        return len(self.hands) + len(self._free)
+
+    # -- command queue (same contract as TableActor) ----------------------
+
+    def submit(self, cmd) -> None:
+        self._ensure_task()
+        self._queue.put_nowait((cmd, None))
+
+    async def request(self, cmd) -> Any:
+        self._ensure_task()
+        future = self._loop.create_future()
+        self._queue.put_nowait((cmd, future))
+        return await future
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name=f"fast-fold-{self.pool_id}")
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            out = _Outbox()
+            results = []
+            for cmd, _ in batch:
+                try:
+                    results.append(await self._apply(cmd, out))
+                except Exception as e:
+                    logger.exception(f"[FAST-FOLD] Pool {self.pool_id} failed to apply {cmd.kind}")
+                    results.append(e)
+
+            # Finished hands show their result before their players move on
+            await self._flush(out)
+            finished = [t for t in out.touched.values() if not t.hand_in_progress and t.table_id in self.hands]
+            out = _Outbox()
+            for table in finished:
+                self._release(table, out)
+            self._deal(out)
+            await self._flush(out)
+            self._schedule_fill()
+            self.batches += 1
+
+            for (_, future), result in zip(batch, results):
+                if future is None or future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    # -- commands ---------------------------------------------------------
+
+    async def _apply(self, cmd, out: _Outbox) -> Any:
+        if isinstance(cmd, Join):
+            return await self._join(cmd, out)
+
+        if isinstance(cmd, PlayerMessage):
+            player = self.players.get(cmd.pid)
+            if player is None or player.hand_id is None:
+                return None
+            msg = from_dict(cmd.msg) if isinstance(cmd.msg, dict) else cmd.msg
+            # Only betting actions make sense here, and only for the hand they were meant for
+            if not isinstance(msg, Action):
+                return None
+            if msg.table_id is not None and msg.table_id != player.hand_id:
+                return None
+            table = self.hands[player.hand_id]
+            self._touch(out, table, await handle_message(table, cmd.pid, msg))
+            self._detach_folded(table)
+            return None
+
+        if isinstance(cmd, Disconnect):
+            player = self.players.get(cmd.pid)
+            if player is None or player.ws is not cmd.ws:
+                return None  # An older socket for a player who already reconnected
+            self._leave(cmd.pid, out)
+            return None
+
+        if isinstance(cmd, _HandTimer):
+            table = self.hands.get(cmd.hand_id)
+            if table is None:
+                return None
+            if cmd.timer == "runout":
+                info_msg = advance_runout(table)
+            else:
+                info_msg = handle_timeout(table)
+            if info_msg:
+                self._touch(out, table, info_msg)
+                self._detach_folded(table)
+            return None
+
+        if isinstance(cmd, _Fill):
+            self._fill_due = True
+            return None
+
+        raise TypeError(f"Unknown pool command: {cmd!r}")
+
+    async def _join(self, cmd: Join, out: _Outbox) -> str:
+        player = self.players.get(cmd.pid)
+        if player is not None:
+            # Reconnecting: keep their pool stack and whatever hand they are in
+            if player.ws is not cmd.ws:
+                try:
+                    await player.ws.close()
+                except Exception as e:
+                    logger.error(f"[WS] Error closing old connection: {e}")
+            player.ws = cmd.ws
+            player.name = cmd.name
+            if player.hand_id is not None:
+                table = self.hands[player.hand_id]
+                table.connections[cmd.pid] = cmd.ws
+                out.touched[table.table_id] = table
+        else:
+            player = PoolPlayer(pid=cmd.pid, name=cmd.name, stack=cmd.stack, ws=cmd.ws, user_id=cmd.user_id)
+            self.players[cmd.pid] = player
+            self._ready_up(player, out)
+
+        logger.info(f"[FAST-FOLD] Player {cmd.pid} ({cmd.name}) joined pool {self.pool_id} with {player.stack} chips")
+        out.direct.append((cmd.ws, json.dumps({"type": "welcome", "pid": cmd.pid, "pool_id": self.pool_id})))
+        return cmd.pid
+
+    def _leave(self, pid: str, out: _Outbox) -> Optional[PoolPlayer]:
+        """Take a player out of the pool, folding them out of their hand if they are in one."""
+        player = self.players.pop(pid, None)
+        if player is None:
+            return None
+        self.ready.discard(pid)
+        if player.hand_id is not None:
+            table = self.hands[player.hand_id]
+            table.connections.pop(pid, None)
+            info_msg = handle_disconnect(table, pid)
+            table.mark_disconnected(pid)
+            player.stack = table.players[pid].stack
+            if table.hand_in_progress:
+                table.user_ids.pop(pid, None)
+                _save_stack(player)
+            player.hand_id = None
+            self._touch(out, table, info_msg)
+        logger.info(f"[FAST-FOLD] Player {pid} left pool {self.pool_id} with {player.stack} chips")
+        return player
+
+    # -- moving players between the queue and hands -------------------------
+
+    def _ready_up(self, player: PoolPlayer, out: _Outbox) -> None:
+        if player.stack > 0:
+            player.ready_at = time.monotonic()
+            self.ready.append(player.pid)
+        else:
+            out.direct.append((player.ws, json.dumps({"type": "info", "message": "You are out of chips"})))
+
+    def _detach_folded(self, table: TableState) -> None:
+        """Send players who folded out of ``table`` back to the ready queue."""
+        for pid in table.folded_pids:
+            player = self.players.get(pid)
+            if player is None or player.hand_id != table.table_id:
+                continue
+            table.connections.pop(pid, None)
+            player.stack = table.players[pid].stack
+            player.hand_id = None
+            if table.hand_in_progress:
+                # Folded chips are final; the hand's own stack update would come too late
+                table.user_ids.pop(pid, None)
+                _save_stack(player)
+            player.ready_at = time.monotonic()
+            if player.stack > 0:
+                self.ready.append(pid)
+
+    def _release(self, table: TableState, out: _Outbox) -> None:
+        """The hand is over: its players go back to the queue and the table to the free list."""
+        del self.hands[table.table_id]
+        for pid, seat in table.players.items():
+            player = self.players.get(pid)
+            if player is None or player.hand_id != table.table_id:
+                continue
+            player.stack = seat.stack
+            player.hand_id = None
+            self._ready_up(player, out)
+        self.clock.cancel_owner(table.table_id)
+        _reset(table)
+        self._free.append(table)
+
+    def _deal(self, out: _Outbox) -> None:
+        """Deal hands to the ready queue: full tables always, short ones when a fill is due."""
+        while len(self.ready) >= self.table_size or (self._fill_due and len(self.ready) >= 2):
+            count = min(len(self.ready), self.table_size)
+            players = [self.players[self.ready.popleft()] for _ in range(count)]
+            table = self._deal_hand(players)
+            out.touched[table.table_id] = table
+        self._fill_due = False
+
+    def _deal_hand(self, players: List[PoolPlayer]) -> TableState:
+        table = self._free.pop() if self._free else self._new_table()
+        table.small_blind = self.small_blind
+        table.big_blind = self.big_blind
+        # Exactly this many seats, so start_new_hand never seats anyone from a waitlist
+        table.max_players = len(players)
+        table.turn_timeout_seconds = self.turn_timeout_seconds
+        table.deal_delay_seconds = None
+
+        now = time.monotonic()
+        players = sorted(players, key=lambda p: p.since_big_blind, reverse=True)
+        for player, seat in zip(players, _blind_seats(len(players))):
+            table.players[player.pid] = Player(
+                pid=player.pid, name=player.name, stack=player.stack, seat=seat,
+                role=PlayerRole.SEATED, connected=True,
+            )
+            table.connections[player.pid] = player.ws
+            if player.user_id:
+                table.user_ids[player.pid] = player.user_id
+            player.hand_id = table.table_id
+            player.since_big_blind += 1
+            _ready_wait.observe(now - player.ready_at)
+        players[0].since_big_blind = 0
+
+        start_new_hand(table)
+        self.hands[table.table_id] = table
+        self.hands_dealt += 1
+        _hands_dealt.inc()
+        return table
+
+    def _new_table(self) -> TableState:
+        table = TableState(table_id=f"{self.pool_id}-{next(self._table_ids)}")
+        table.user_ids = {}
+        return table
+
+    # -- output and timers ------------------------------------------------
+
+    @staticmethod
+    def _touch(out: _Outbox, table: TableState, message: Optional[str]) -> None:
+        out.touched[table.table_id] = table
+        if message:
+            out.info.setdefault(table.table_id, []).append(message)
+
+    async def _flush(self, out: _Outbox) -> None:
+        for ws, text in out.direct:
+            try:
+                await ws.send_text(text)
+            except Exception:
+                pass
+        for table_id, table in out.touched.items():
+            for message in out.info.get(table_id, ()):
+                await broadcast_info(table, message)
+            await broadcast_state(table)
+            if table.hand_in_progress:
+                self._schedule_timers(table)
+
+    def _schedule_timers(self, table: TableState) -> None:
+        turn_key = (table.table_id, "turn")
+        runout_key = (table.table_id, "runout")
+        if table.runout_in_progress:
+            self.clock.cancel(turn_key)
+            if not self.clock.pending(runout_key):
+                self.clock.schedule(runout_key, RUNOUT_STREET_DELAY, self.submit, _HandTimer(table.table_id, "runout"))
+            return
+
+        self.clock.cancel(runout_key)
+        if table.turn_deadline:
+            if self.clock.due(turn_key) != table.turn_deadline:
+                self.clock.schedule_at(turn_key, table.turn_deadline, self.submit, _HandTimer(table.table_id, "turn"))
+        else:
+            self.clock.cancel(turn_key)
+
+    def _schedule_fill(self) -> None:
+        if len(self.ready) < 2:
+            self.clock.cancel(self.fill_key)
+        elif not self.clock.pending(self.fill_key):
+            self.clock.schedule(self.fill_key, self.fill_seconds, self.submit, _Fill())
+
+
+def _reset(table: TableState) -> None:
+    """Return a finished hand's TableState to its defaults, reusing its containers."""
+    for f in fields(TableState):
+        if f.name == "table_id":
+            continue
+        if f.default_factory is not MISSING:
+            value = getattr(table, f.name)
+            if isinstance(value, (dict, list, set)):
+                value.clear()
+            elif value:  # e.g. a non-empty WaitQueue
+                setattr(table, f.name, f.default_factory())
+        else:
+            setattr(table, f.name, f.default)
+    table.user_ids.clear()
+
+
+def _save_stack(player: PoolPlayer) -> None:
+    if player.user_id:
+        stack_writer.save(player.user_id, player.stack)
+
+
+_pools: Dict[int, FastFoldPool] = {}
+
+
+def get_pool(big_blind: int) -> FastFoldPool:
+    """The pool for a stake level, created on first use."""
+    pool = _pools.get(big_blind)
+    if pool is None:
+        pool = _pools[big_blind] = FastFoldPool(big_blind)
+    return pool
@@ -14,12 +14,14 @@ from poker.poker_logic import (
 )
 from .betting import *
 from .game_flow import *
-from .actions import handle_message, handle_disconnect
+from .actions import handle_message, handle_disconnect, handle_timeout, advance_runout
 
 # Expose with private naming for test compatibility
 __all__ = [
     'handle_message',
     'handle_disconnect',
+    'handle_timeout',
+    'advance_runout',
     '_evaluate_hand',
     '_compare_hands',
     '_hand_name',
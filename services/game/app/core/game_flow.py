@@ -6,6 +6,7 @@ from .models import TableState
 from .player_utils import connected_players, active_pids, eligible_players
 from poker.card_utils import shuffle_deck
 from .betting import post_blinds
+from .hand_history import begin_hand, record_blinds, finish_hand
 from poker.poker_logic import evaluate_hand, evaluate_hand_with_cards, compare_hands, hand_name, get_key_cards
 
 def _set_turn_deadline(table: TableState) -> None:
@@ -86,6 +87,7 @@ def start_new_hand(table: TableState) -> None:
     table.board = []
     table.folded_pids = set()
     table.players_acted = set()
+    table.pre_actions = {}
     table.street = "preflop"
     table.current_bet = 0
     table.player_bets = {}
@@ -100,9 +102,11 @@ def start_new_hand(table: TableState) -> None:
 
     # Deal hole cards
     _deal_hole_cards(table, players)
+    begin_hand(table, players)
 
     # Post blinds
     post_blinds(table)
+    record_blinds(table)
 
     # Set first to act (after big blind)
     _set_first_to_act(table, players)
@@ -175,6 +179,7 @@ def advance_street(table: TableState) -> bool:
     # Advance to next street
     table.street = next_street
     table.players_acted = set()
+    table.pre_actions = {}
     table.last_action = None  # Clear last action when advancing streets
 
     # Reset betting for new street
@@ -308,7 +313,9 @@ def calculate_side_pots(table: TableState, player_ids: list[str]) -> list[dict]:
         # Complex case: different bet amounts, need side pots
         player_bets_list.sort(key=lambda x: x[1])
 
-        # Build side pots
+        # Build side pots. Chips from folded players count towards every
+        # level they reached even though they can't win any of them.
+        contributions = list(table.total_contributions.values())
         side_pots = []
         remaining_players = set(player_ids)
         prev_bet_level = 0
@@ -316,7 +323,9 @@ def calculate_side_pots(table: TableState, player_ids: list[str]) -> list[dict]:
         for i, (pid, bet_amount) in enumerate(player_bets_list):
             if bet_amount > prev_bet_level and remaining_players:
                 # Create a pot for this bet level
-                pot_amount = (bet_amount - prev_bet_level) * len(remaining_players)
+                pot_amount = sum(
+                    min(c, bet_amount) - min(c, prev_bet_level) for c in contributions
+                )
                 side_pots.append({
                     'amount': pot_amount,
                     'eligible_players': remaining_players.copy()
@@ -326,6 +335,10 @@ def calculate_side_pots(table: TableState, player_ids: list[str]) -> list[dict]:
             # Remove this player from remaining (they're all-in at this level)
             remaining_players.discard(pid)
 
+        # A folded player may have put in more than any remaining player
+        if side_pots:
+            side_pots[-1]['amount'] += sum(max(0, c - prev_bet_level) for c in contributions)
+
         return side_pots
 
 
@@ -534,18 +547,15 @@ def _end_hand(table: TableState) -> None:
     # calculation in the result message after this function returns
     table.folded_pids = set()
     table.players_acted = set()
+    table.pre_actions = {}
+    finish_hand(table)
 
     # Persist stack changes to database for authenticated players
     if hasattr(table, 'user_ids'):
-        from .auth import update_user_stack
+        from .stack_writer import stack_writer
         for pid, user_id in table.user_ids.items():
             if pid in table.players:
-                player = table.players[pid]
-                success = update_user_stack(user_id, player.stack)
-                if success:
-                    print(f"[DB] Updated stack for user {user_id} ({player.name}): {player.stack} chips")
-                else:
-                    print(f"[DB] Failed to update stack for user {user_id}")
+                stack_writer.save(user_id, table.players[pid].stack)
 
     # Note: Busted player conversion moved to start_new_hand
     # This allows showdown data to be displayed properly before cleanup
@@ -0,0 +1,332 @@
+"""
+Hand history recording and persistence.
+
+While a hand is played the table keeps a ``HandRecord`` (players, starting
+stacks, every action in order). When the hand ends the finished record is
+handed to ``hand_writer``, a background thread that buffers records and
+bulk-inserts them in batches, so the event loop never waits on the database:
+
+- ``hands`` rows go in as one multi-row INSERT ... RETURNING id
+- ``hand_players`` / ``hand_actions`` rows are streamed with COPY on
+  PostgreSQL (CSV through ``copy_expert`` with psycopg2, the declared
+  driver, or ``write_row`` with psycopg 3) and multi-row inserts elsewhere
+
+The writer only accepts records once started (the app lifespan does this), so
+tests and benchmarks that play hands don't touch the database.
+
+Other consumers (e.g. player stats) subscribe to finished hands with
+``add_hand_listener``.
+"""
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from db import get_db, Hand, HandPlayer, HandAction
+from . import metrics
+from .models import TableState
+
+logger = logging.getLogger(__name__)
+
+HAND_HISTORY_BATCH_SIZE = int(os.getenv("HAND_HISTORY_BATCH_SIZE", "500"))
+HAND_HISTORY_FLUSH_INTERVAL = float(os.getenv("HAND_HISTORY_FLUSH_INTERVAL", "1.0"))
+HAND_HISTORY_QUEUE_SIZE = int(os.getenv("HAND_HISTORY_QUEUE_SIZE", "20000"))
+
+_written = metrics.counter("pokerlite_hand_history_written_total", "Hands persisted to the hand history tables")
+_dropped = metrics.counter("pokerlite_hand_history_dropped_total", "Hands dropped because the write queue was full")
+_failed = metrics.counter("pokerlite_hand_history_failed_total", "Hands lost to failed batch inserts")
+_queue_depth = metrics.gauge("pokerlite_hand_history_queue_depth", "Finished hands waiting to be written")
+_flush_seconds = metrics.histogram("pokerlite_hand_history_flush_seconds", "Time spent writing one batch of hands")
+
+
+@dataclass
+class HandPlayerRecord:
+    pid: str
+    name: str
+    seat: int
+    starting_stack: int
+    user_id: Optional[int] = None
+    hole_cards: Optional[str] = None
+    ending_stack: int = 0
+    won: bool = False
+
+
+@dataclass
+class HandRecord:
+    """Everything needed to persist one hand."""
+    table_id: str
+    started_at: datetime
+    small_blind: int
+    big_blind: int
+    dealer_seat: int
+    players: Dict[str, HandPlayerRecord] = field(default_factory=dict)
+    actions: List[dict] = field(default_factory=list)  # {seq, pid, street, action, amount}
+    ended_at: Optional[datetime] = None
+    board: str = ""
+    pot: int = 0
+    went_to_showdown: bool = False
+
+
+_hand_listeners: List[Callable[[HandRecord], None]] = []
+
+
+def add_hand_listener(listener: Callable[[HandRecord], None]) -> None:
+    """Call ``listener(record)`` for every finished hand (on the event loop; keep it cheap)."""
+    if listener not in _hand_listeners:
+        _hand_listeners.append(listener)
+
+
+def remove_hand_listener(listener: Callable[[HandRecord], None]) -> None:
+    if listener in _hand_listeners:
+        _hand_listeners.remove(listener)
+
+
+def begin_hand(table: TableState, players: list) -> None:
+    """Start recording a hand. Call after hole cards are dealt, before blinds."""
+    user_ids = getattr(table, "user_ids", {})
+    table.hand_record = HandRecord(
+        table_id=table.table_id,
+        started_at=datetime.utcnow(),
+        small_blind=table.small_blind,
+        big_blind=table.big_blind,
+        dealer_seat=table.dealer_seat,
+        players={
+            p.pid: HandPlayerRecord(
+                pid=p.pid,
+                name=p.name,
+                seat=p.seat,
+                starting_stack=p.stack,
+                user_id=user_ids.get(p.pid),
+                hole_cards=" ".join(table.hole_cards.get(p.pid, [])) or None,
+            )
+            for p in players
+        },
+    )
+
+
+def record_action(table: TableState, pid: str, action: str, amount: int = 0) -> Optional[dict]:
+    """Append an action to the current hand. Returns the entry so the amount can be filled in later."""
+    record = table.hand_record
+    if record is None or pid not in record.players:
+        return None
+    entry = {"seq": len(record.actions), "pid": pid, "street": table.street, "action": action, "amount": amount}
+    record.actions.append(entry)
+    return entry
+
+
+def record_blinds(table: TableState) -> None:
+    """Record the blinds posted by post_blinds (small blind is posted first)."""
+    for name, (pid, amount) in zip(("small_blind", "big_blind"), table.player_bets.items()):
+        record_action(table, pid, name, amount)
+
+
+def finish_hand(table: TableState) -> Optional[HandRecord]:
+    """Close the current record with results and queue it for writing."""
+    record = table.hand_record
+    if record is None:
+        return None
+    table.hand_record = None
+
+    showdown = table.showdown_data or {}
+    winners = set(showdown.get("winner_pids") or [])
+    record.ended_at = datetime.utcnow()
+    record.board = " ".join(table.board)
+    record.pot = sum(table.total_contributions.values())
+    record.went_to_showdown = bool(showdown.get("players")) and not showdown.get("fold_win")
+    for pid, hp in record.players.items():
+        player = table.players.get(pid)
+        hp.ending_stack = player.stack if player else 0
+        hp.won = pid in winners
+
+    for listener in list(_hand_listeners):
+        try:
+            listener(record)
+        except Exception:
+            logger.exception(f"[HISTORY] Hand listener {listener!r} failed")
+    hand_writer.submit(record)
+    return record
+
+
+class HandHistoryWriter:
+    """Background thread that batches finished hands into bulk inserts."""
+
+    def __init__(self, batch_size: int = HAND_HISTORY_BATCH_SIZE,
+                 flush_interval: float = HAND_HISTORY_FLUSH_INTERVAL,
+                 max_queue: int = HAND_HISTORY_QUEUE_SIZE):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[HandRecord]]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hand-history-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"[HISTORY] Writer started (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush whatever is queued and stop the thread, waiting at most ``timeout`` seconds."""
+        if not self.running:
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)  # Wakes the thread now rather than after flush_interval
+        except queue.Full:
+            pass  # It sees the flag once the queue drains; never block shutdown on a stuck database
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, record: HandRecord) -> bool:
+        """Queue a finished hand. Never blocks; drops (and counts) when the queue is full."""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            _dropped.inc()
+            logger.warning(f"[HISTORY] Write queue full, dropping hand from table {record.table_id}")
+            return False
+        _queue_depth.set(self._queue.qsize())
+        return True
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[HandRecord] = []
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+                continue
+            if first is None:
+                break
+            batch.append(first)
+
+            # Keep collecting until the batch is full or the interval has passed
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            _queue_depth.set(self._queue.qsize())
+            self.flush(batch)
+
+    def flush(self, batch: List[HandRecord]) -> int:
+        """Write one batch in a single transaction. Returns the number of hands written."""
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        db = next(get_db())
+        try:
+            hand_ids = db.execute(
+                insert(Hand.__table__).returning(Hand.__table__.c.id, sort_by_parameter_order=True),
+                [_hand_row(record) for record in batch],
+            ).scalars().all()
+
+            player_rows = []
+            action_rows = []
+            for hand_id, record in zip(hand_ids, batch):
+                player_rows.extend(_player_row(hand_id, hp) for hp in record.players.values())
+                action_rows.extend(dict(a, hand_id=hand_id) for a in record.actions)
+
+            _bulk_insert(db, HandPlayer.__table__, player_rows)
+            _bulk_insert(db, HandAction.__table__, action_rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            _failed.inc(len(batch))
+            logger.error(f"[HISTORY] Failed to write {len(batch)} hands: {e}", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+        _written.inc(len(batch))
+        _flush_seconds.observe(time.perf_counter() - started)
+        return len(batch)
+
+
+def _hand_row(record: HandRecord) -> dict:
+    return {
+        "table_id": record.table_id,
+        "started_at": record.started_at,
+        "ended_at": record.ended_at or record.started_at,
+        "small_blind": record.small_blind,
+        "big_blind": record.big_blind,
+        "dealer_seat": record.dealer_seat,
+        "board": record.board,
+        "pot": record.pot,
+        "went_to_showdown": record.went_to_showdown,
+    }
+
+
+def _player_row(hand_id: int, hp: HandPlayerRecord) -> dict:
+    return {
+        "hand_id": hand_id,
+        "user_id": hp.user_id,
+        "pid": hp.pid,
+        "name": hp.name,
+        "seat": hp.seat,
+        "hole_cards": hp.hole_cards,
+        "starting_stack": hp.starting_stack,
+        "ending_stack": hp.ending_stack,
+        "net": hp.ending_stack - hp.starting_stack,
+        "won": hp.won,
+    }
+
+
+def _csv_field(value) -> str:
+    """One COPY CSV field: NULL is the bare empty field, everything else is quoted."""
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _bulk_insert(db, table, rows: List[dict]) -> None:
+    """COPY on PostgreSQL (psycopg2 or psycopg 3), executemany (multi-row VALUES) otherwise."""
+    if not rows:
+        return
+    connection = db.connection()
+    driver = connection.dialect.driver if connection.dialect.name == "postgresql" else None
+    if driver in ("psycopg2", "psycopg"):
+        columns = list(rows[0])
+        command = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        cursor = connection.connection.driver_connection.cursor()
+        if driver == "psycopg2":
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write(",".join(_csv_field(row[c]) for c in columns) + "\n")
+            buffer.seek(0)
+            cursor.copy_expert(command + " WITH (FORMAT csv)", buffer)
+        else:
+            with cursor.copy(command) as copy:
+                for row in rows:
+                    copy.write_row([row[c] for c in columns])
+        return
+    db.execute(insert(table), rows)
+
+
+hand_writer = HandHistoryWriter()
@@ -0,0 +1,173 @@
+"""
+Idle table hibernation.
+
+When the last player leaves a table (or its resume grace runs out) and no
+hand is running, its state is written to a local store (one JSON file per
+table under ``TABLE_HIBERNATE_DIR``) and dropped from memory; a hand everyone
+left is played out by the turn timers first, and a table that sees no
+commands for ``TABLE_IDLE_SECONDS`` is checked again on the central timer.
+``tables.get_table`` reads it back the next time the table is needed, before
+asking the lobby for a config, so the lobby keeps listing it. A table still
+on disk ``TABLE_HIBERNATE_TTL`` seconds later is deleted, lobby entry and all.
+Each file records when it was written, so after a restart the expiry timers
+are re-armed from the store (and tables already past their TTL go at once).
+If the file cannot be written the table is deleted instead.
+With ``TABLE_IDLE_SECONDS`` at 0 nothing is hibernated and the last player
+leaving deletes the table straight away.
+
+Players who disconnected more than ``DISCONNECTED_PLAYER_TTL`` seconds ago are
+removed between hands, so a long-running table does not keep everyone who
+ever sat at it. Authenticated players' stacks are already in the database;
+a returning guest starts over with a fresh stack.
+
+Only what survives between hands is stored: config, seats, stacks, the dealer
+button, the waitlist and spectators.
+"""
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from . import metrics
+from .models import TableState, Player, PlayerRole
+from .wait_queue import WaitQueue
+
+TABLE_IDLE_SECONDS = float(os.getenv("TABLE_IDLE_SECONDS", "600"))
+DISCONNECTED_PLAYER_TTL = float(os.getenv("DISCONNECTED_PLAYER_TTL", "900"))
+TABLE_HIBERNATE_TTL = float(os.getenv("TABLE_HIBERNATE_TTL", "3600"))
+TABLE_HIBERNATE_DIR = os.getenv(
+    "TABLE_HIBERNATE_DIR", os.path.join(tempfile.gettempdir(), "pokerlite-tables")
+)
+
+_hibernated = metrics.counter("pokerlite_tables_hibernated_total", "Idle tables written to disk and dropped from memory")
+_rehydrated = metrics.counter("pokerlite_tables_rehydrated_total", "Hibernated tables loaded back into memory")
+_compacted = metrics.counter("pokerlite_players_compacted_total", "Long-disconnected players removed from tables")
+
+
+def dump_table(table: TableState) -> Dict[str, Any]:
+    """Between-hands state of a table as plain JSON-able data."""
+    return {
+        "table_id": table.table_id,
+        "small_blind": table.small_blind,
+        "big_blind": table.big_blind,
+        "max_players": table.max_players,
+        "turn_timeout_seconds": table.turn_timeout_seconds,
+        "deal_delay_seconds": table.deal_delay_seconds,
+        "dealer_seat": table.dealer_seat,
+        "deck_seed": table.deck_seed,
+        "use_deterministic_deck": table.use_deterministic_deck,
+        "players": [
+            {
+                "pid": p.pid,
+                "name": p.name,
+                "stack": p.stack,
+                "seat": p.seat,
+                "connected": False,  # Nobody has a socket to a hibernated table
+                "role": p.role.value,
+            }
+            for p in table.players.values()
+        ],
+        "waitlist": list(table.waitlist),
+        "spectator_pids": sorted(table.spectator_pids),
+        "disconnected_at": dict(table.disconnected_at),
+        "user_ids": dict(getattr(table, "user_ids", {})),
+        "hibernated_at": time.time(),
+    }
+
+
+def load_table(data: Dict[str, Any]) -> TableState:
+    table = TableState(
+        table_id=data["table_id"],
+        small_blind=data["small_blind"],
+        big_blind=data["big_blind"],
+        max_players=data["max_players"],
+        turn_timeout_seconds=data["turn_timeout_seconds"],
+        deal_delay_seconds=data.get("deal_delay_seconds", 5),
+        dealer_seat=data["dealer_seat"],
+        deck_seed=data.get("deck_seed"),
+        use_deterministic_deck=data.get("use_deterministic_deck", False),
+    )
+    for p in data["players"]:
+        table.players[p["pid"]] = Player(
+            pid=p["pid"], name=p["name"], stack=p["stack"], seat=p["seat"],
+            connected=p["connected"], role=PlayerRole(p["role"]),
+        )
+    table.waitlist = WaitQueue(data.get("waitlist", ()))
+    table.spectator_pids = set(data.get("spectator_pids", ()))
+    table.disconnected_at = dict(data.get("disconnected_at", {}))
+    if data.get("user_ids"):
+        table.user_ids = dict(data["user_ids"])
+    return table
+
+
+class TableStore:
+    """Hibernated tables, one JSON file per table."""
+
+    def __init__(self, directory: str = TABLE_HIBERNATE_DIR):
+        self.directory = directory
+
+    def _path(self, table_id: str) -> str:
+        return os.path.join(self.directory, quote(table_id, safe="") + ".json")
+
+    def save(self, table: TableState) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(table.table_id)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(dump_table(table), f, separators=(",", ":"))
+        os.replace(tmp, path)  # Readers never see a half-written file
+        _hibernated.inc()
+
+    def load(self, table_id: str) -> Optional[TableState]:
+        """Take a hibernated table out of the store, or None if it is not there."""
+        path = self._path(table_id)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        _rehydrated.inc()
+        return load_table(data)
+
+    def delete(self, table_id: str) -> bool:
+        try:
+            os.remove(self._path(table_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def entries(self) -> Iterator[Tuple[str, float]]:
+        """``(table_id, hibernated_at)`` for every table in the store; unreadable files are skipped."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                yield data["table_id"], data.get("hibernated_at") or os.path.getmtime(path)
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def __contains__(self, table_id: str) -> bool:
+        return os.path.exists(self._path(table_id))
+
+
+store = TableStore()
+
+
+def drop_stale_players(table: TableState, ttl: float = DISCONNECTED_PLAYER_TTL) -> int:
+    """Remove players disconnected for longer than ``ttl``. Only between hands."""
+    if table.hand_in_progress or not table.disconnected_at:
+        return 0
+    dropped = table.drop_disconnected(time.time() - ttl)
+    if dropped:
+        _compacted.inc(len(dropped))
+    return len(dropped)
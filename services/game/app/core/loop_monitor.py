@@ -0,0 +1,269 @@
+"""
+Event-loop lag and slow-callback monitor.
+
+A heartbeat callback is scheduled on the loop every ``interval`` seconds and
+measures how late it actually ran (scheduling lag). A watchdog thread polls the
+heartbeat; when the loop has not ticked for longer than ``threshold`` it grabs
+the loop thread's current stack with ``sys._current_frames()`` together with
+the table/message being handled, so a stall can be pinned on the code that
+caused it even though the loop itself is blocked.
+
+Handlers opt into attribution with ``set_activity(table_id, message_type)``
+for a whole task, or scoped with::
+
+    with track(table_id, "action"):
+        ...
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Deque, Dict, List, Optional, Tuple
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.25"))
+LOOP_SLOW_CALLBACK_MS = float(os.getenv("LOOP_SLOW_CALLBACK_MS", "100"))
+MAX_SLOW_EVENTS = 200
+MAX_STACK_DEPTH = 30
+LAG_WINDOW = 1200
+
+_lag_histogram = metrics.histogram(
+    "pokerlite_event_loop_lag_seconds",
+    "Event loop scheduling lag measured by the heartbeat",
+)
+_lag_max_gauge = metrics.gauge(
+    "pokerlite_event_loop_lag_max_seconds",
+    "Largest event loop lag seen in the current window",
+)
+_slow_counter = metrics.counter(
+    "pokerlite_event_loop_slow_callbacks_total",
+    "Callbacks that blocked the event loop for longer than the threshold",
+)
+
+# Task -> (table_id, message_type) for the work the task is currently doing.
+_activity: "weakref.WeakKeyDictionary[asyncio.Task, Tuple[str, str]]" = weakref.WeakKeyDictionary()
+
+
+@contextmanager
+def track(table_id: Optional[str], message_type: Optional[str]):
+    """Attribute work done by the current task to a table and message type."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        yield
+        return
+
+    previous = _activity.get(task)
+    _activity[task] = (table_id or "", message_type or "")
+    try:
+        yield
+    finally:
+        if previous is None:
+            _activity.pop(task, None)
+        else:
+            _activity[task] = previous
+
+
+def set_activity(table_id: Optional[str], message_type: Optional[str]) -> None:
+    """Attribute everything the current task does from now on (for long-lived per-table tasks)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return
+    if task is not None:
+        _activity[task] = (table_id or "", message_type or "")
+
+
+def current_activity(loop: asyncio.AbstractEventLoop) -> Tuple[str, str]:
+    """Return (table_id, message_type) for the task currently running on ``loop``."""
+    task = asyncio.current_task(loop)
+    if task is None:
+        return "", ""
+    return _activity.get(task, ("", ""))
+
+
+@dataclass
+class SlowCallback:
+    """A stall of the event loop longer than the configured threshold."""
+    started_at: float  # Unix timestamp
+    duration_ms: float
+    table_id: str = ""
+    message_type: str = ""
+    task: str = ""
+    stack: List[str] = field(default_factory=list)
+
+
+class LoopMonitor:
+    """Measures event-loop lag continuously and records slow callbacks."""
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold_ms: float = LOOP_SLOW_CALLBACK_MS,
+        max_events: int = MAX_SLOW_EVENTS,
+    ):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.slow_callbacks: Deque[SlowCallback] = deque(maxlen=max_events)
+        self.lag_samples: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self.by_table: Dict[str, Dict[str, float]] = {}
+        self.max_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Shared between the heartbeat (loop thread) and the watchdog thread
+        self._expected = 0.0
+        self._pending_sample: Optional[Tuple[float, SlowCallback]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._expected = time.perf_counter() + self.interval
+        self._handle = self._loop.call_later(self.interval, self._heartbeat)
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"[LOOP] Monitor started (interval={self.interval}s, threshold={self.threshold * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        if not self.running:
+            return
+        self._stop.set()
+        if self._handle:
+            self._handle.cancel()
+        if self._watchdog and self._watchdog is not threading.current_thread():
+            self._watchdog.join(timeout=1.0)
+        self._loop = None
+        self._handle = None
+        self._watchdog = None
+
+    def _heartbeat(self) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, now - self._expected)
+        self._record_lag(lag)
+
+        if lag > self.threshold:
+            sample = self._pending_sample
+            if sample and sample[0] == self._expected:
+                event = sample[1]
+            else:
+                # Stall was shorter than a watchdog poll; we know it happened but not who did it
+                event = SlowCallback(started_at=time.time() - lag)
+            event.duration_ms = round(lag * 1000, 2)
+            self._record_slow(event)
+        self._pending_sample = None
+
+        self._expected = now + self.interval
+        if self._loop and not self._stop.is_set():
+            self._handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    def _watch(self) -> None:
+        poll = max(self.threshold / 2, 0.005)
+        while not self._stop.wait(poll):
+            expected = self._expected
+            overdue = time.perf_counter() - expected
+            if overdue <= self.threshold:
+                continue
+            if self._pending_sample and self._pending_sample[0] == expected:
+                continue  # Already sampled this stall
+            self._pending_sample = (expected, self._sample(overdue))
+
+    def _sample(self, overdue: float) -> SlowCallback:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=MAX_STACK_DEPTH) if frame else []
+        table_id, message_type = ("", "")
+        task_name = ""
+        if self._loop:
+            table_id, message_type = current_activity(self._loop)
+            task = asyncio.current_task(self._loop)
+            task_name = task.get_name() if task else ""
+        return SlowCallback(
+            started_at=time.time() - overdue,
+            duration_ms=0.0,
+            table_id=table_id,
+            message_type=message_type,
+            task=task_name,
+            stack=[line.rstrip() for line in stack],
+        )
+
+    def _record_lag(self, lag: float) -> None:
+        self.lag_samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        _lag_histogram.observe(lag)
+        _lag_max_gauge.set(self.max_lag)
+
+    def _record_slow(self, event: SlowCallback) -> None:
+        self.slow_callbacks.append(event)
+        _slow_counter.inc(message_type=event.message_type or "unknown")
+
+        stats = self.by_table.setdefault(event.table_id or "unknown", {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += event.duration_ms
+        stats["max_ms"] = max(stats["max_ms"], event.duration_ms)
+
+        logger.warning(
+            f"[LOOP] Event loop blocked for {event.duration_ms:.0f}ms "
+            f"(table={event.table_id or '-'}, message={event.message_type or '-'})"
+        )
+
+    def snapshot(self, limit: int = 50) -> dict:
+        """Summarize recent lag and slow callbacks."""
+        samples = sorted(self.lag_samples)
+
+        def pct(p: float) -> float:
+            if not samples:
+                return 0.0
+            idx = min(len(samples) - 1, int(p * len(samples)))
+            return round(samples[idx] * 1000, 3)
+
+        events = list(self.slow_callbacks)[-limit:]
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": {
+                "current": round(self.lag_samples[-1] * 1000, 3) if self.lag_samples else 0.0,
+                "p50": pct(0.50),
+                "p99": pct(0.99),
+                "max": round(self.max_lag * 1000, 3),
+                "samples": len(samples),
+            },
+            "slow_callbacks_total": sum(int(s["count"]) for s in self.by_table.values()),
+            "by_table": self.by_table,
+            "slow_callbacks": [asdict(e) for e in reversed(events)],
+        }
+
+    def reset(self) -> None:
+        """Clear collected samples (keeps running)."""
+        self.slow_callbacks.clear()
+        self.lag_samples.clear()
+        self.by_table = {}
+        self.max_lag = 0.0
+        _lag_max_gauge.set(0.0)
+
+
+monitor = LoopMonitor()
@@ -0,0 +1,137 @@
+"""
+Typed client messages.
+
+Inbound frames are decoded and validated here, once, into small dataclasses,
+so table code never sees a raw dict. A frame that is not valid JSON, has an
+unknown ``type`` or has a badly typed field decodes to None and is dropped by
+the websocket route before it is queued on a table. Checks that depend on the
+table (is it your turn, can you check) stay with the table logic.
+
+Every message may carry a ``table_id``: the multiplexed connection routes on
+it and fast-fold pools use it to drop actions meant for an earlier hand.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Optional
+
+from poker.constants import VALID_ACTIONS, PRE_ACTIONS
+
+
+@dataclass
+class ClientMessage:
+    type: ClassVar[str] = ""
+    table_id: Optional[str] = field(default=None, kw_only=True)
+
+
+@dataclass
+class Start(ClientMessage):
+    """Deal a new hand."""
+    type: ClassVar[str] = "start"
+
+
+@dataclass
+class Action(ClientMessage):
+    """A betting action on the player's turn. ``amount`` is the raise-to total."""
+    type: ClassVar[str] = "action"
+    action: str
+    amount: int = 0
+
+
+@dataclass
+class PreAction(ClientMessage):
+    """Queue (or with ``action`` None, clear) a decision for the player's next turn."""
+    type: ClassVar[str] = "pre_action"
+    action: Optional[str]
+    amount: int = 0
+
+
+@dataclass
+class JoinWaitlist(ClientMessage):
+    type: ClassVar[str] = "join_waitlist"
+    any_table: bool = False
+
+
+@dataclass
+class LeaveWaitlist(ClientMessage):
+    type: ClassVar[str] = "leave_waitlist"
+
+
+@dataclass
+class Subscribe(ClientMessage):
+    """Multiplexed connections only: start playing or watching ``table_id``."""
+    type: ClassVar[str] = "subscribe"
+    spectate: bool = False
+
+
+@dataclass
+class Unsubscribe(ClientMessage):
+    """Multiplexed connections only: leave ``table_id``."""
+    type: ClassVar[str] = "unsubscribe"
+
+
+def _amount(value: Any) -> Optional[int]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
+
+
+def _action(data: Dict[str, Any], table_id: Optional[str]) -> Optional[Action]:
+    action = data.get("action")
+    if not isinstance(action, str) or action not in VALID_ACTIONS:
+        return None
+    amount = _amount(data.get("amount", 0))
+    if amount is None:
+        return None
+    if action == "raise" and amount <= 0:
+        return None
+    return Action(action, amount, table_id=table_id)
+
+
+def _pre_action(data: Dict[str, Any], table_id: Optional[str]) -> Optional[PreAction]:
+    action = data.get("action")
+    if action is None:
+        return PreAction(None, table_id=table_id)
+    if not isinstance(action, str) or action not in PRE_ACTIONS:
+        return None
+    amount = _amount(data.get("amount", 0))
+    if amount is None:
+        return None
+    if action == "call_up_to" and amount <= 0:
+        return None
+    return PreAction(action, amount, table_id=table_id)
+
+
+_PARSERS: Dict[str, Callable[[Dict[str, Any], Optional[str]], Optional[ClientMessage]]] = {
+    Start.type: lambda data, table_id: Start(table_id=table_id),
+    Action.type: _action,
+    PreAction.type: _pre_action,
+    JoinWaitlist.type: lambda data, table_id: JoinWaitlist(bool(data.get("any_table")), table_id=table_id),
+    LeaveWaitlist.type: lambda data, table_id: LeaveWaitlist(table_id=table_id),
+    Subscribe.type: lambda data, table_id: Subscribe(bool(data.get("spectate")), table_id=table_id),
+    Unsubscribe.type: lambda data, table_id: Unsubscribe(table_id=table_id),
+}
+
+
+def from_dict(data: Any) -> Optional[ClientMessage]:
+    """Validate an already-decoded frame. None if it is not a message we accept."""
+    if not isinstance(data, dict):
+        return None
+    mtype = data.get("type")
+    parse = _PARSERS.get(mtype) if isinstance(mtype, str) else None
+    if parse is None:
+        return None
+    table_id = data.get("table_id")
+    if table_id is not None and (not isinstance(table_id, str) or not table_id):
+        return None
+    return parse(data, table_id)
+
+
+def decode(raw: str) -> Optional[ClientMessage]:
+    """Decode and validate one websocket frame in a single pass. Never raises."""
+    try:
+        data = json.loads(raw)
+    except (ValueError, RecursionError):  # RecursionError: absurdly deep nesting
+        return None
+    return from_dict(data)
@@ -1,17 +1,18 @@
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-import asyncio
+from typing import Any, Dict, List, Optional
 from fastapi import WebSocket
 
 # Import from shared module
 from models.player import Player, PlayerRole
+from .wait_queue import WaitQueue
+from .sessions import FrameLog
 
 @dataclass
 class TableState:
     table_id: str
     players: Dict[str, Player] = field(default_factory=dict)
     connections: Dict[str, WebSocket] = field(default_factory=dict)
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
     # Minimal game fields (placeholder engine)
     hand_in_progress: bool = False
@@ -26,6 +27,7 @@ class TableState:
     hole_cards: dict[str, list[str]] = field(default_factory=dict)
     folded_pids: set[str] = field(default_factory=set)
     players_acted: set[str] = field(default_factory=set)  # Track who has acted this round
+    pre_actions: dict[str, dict] = field(default_factory=dict)  # PID -> {action, amount} queued for this street
     street: str = "preflop"  # preflop, flop, turn, river
 
     # Betting state
@@ -38,6 +40,7 @@ class TableState:
     # Table configuration
     max_players: int = 8
     turn_timeout_seconds: int = 30
+    deal_delay_seconds: Optional[float] = 5  # Pause before dealing the next hand automatically; None = manual
 
     # Showdown data (populated after showdown, cleared on new hand)
     showdown_data: Optional[dict] = None
@@ -53,8 +56,15 @@ class TableState:
     use_deterministic_deck: bool = False  # Enable for testing
 
     # Player management
-    waitlist: list[str] = field(default_factory=list)  # PIDs in FIFO order
+    waitlist: WaitQueue = field(default_factory=WaitQueue)  # PIDs in FIFO order
     spectator_pids: set[str] = field(default_factory=set)  # PIDs of spectators
+    disconnected_at: Dict[str, float] = field(default_factory=dict)  # PID -> Unix timestamp
+
+    # Hand history for the hand in progress (hand_history.HandRecord)
+    hand_record: Optional[Any] = None
+
+    # Broadcast sequence numbers and recent frames, replayed to resuming players
+    frame_log: FrameLog = field(default_factory=FrameLog)
 
 
     def upsert_player(self, pid: str, name: str, force_spectator: bool = False, stack: int = None) -> Player:
@@ -65,6 +75,7 @@ class TableState:
             p = self.players[pid]
             p.connected = True
             p.name = name
+            self.disconnected_at.pop(pid, None)
             # Update stack if provided (for authenticated players who bought more chips)
             if stack is not None:
                 p.stack = stack
@@ -104,9 +115,9 @@ class TableState:
     def mark_disconnected(self, pid: str) -> None:
         if pid in self.players:
             self.players[pid].connected = False
+            self.disconnected_at[pid] = time.time()
             # Remove from waitlist if they were waiting
-            if pid in self.waitlist:
-                self.waitlist.remove(pid)
+            self.waitlist.discard(pid)
 
     def remove_player(self, pid: str) -> None:
         """Completely remove a player from the table."""
@@ -114,8 +125,17 @@ class TableState:
             # Remove from all tracking structures
             self.players.pop(pid, None)
             self.spectator_pids.discard(pid)
-            if pid in self.waitlist:
-                self.waitlist.remove(pid)
+            self.waitlist.discard(pid)
+            self.disconnected_at.pop(pid, None)
+
+    def drop_disconnected(self, before: float) -> List[str]:
+        """Remove players who disconnected before ``before`` (Unix timestamp). Call between hands."""
+        stale = [pid for pid, at in self.disconnected_at.items() if at <= before]
+        for pid in stale:
+            self.remove_player(pid)
+            if hasattr(self, 'user_ids'):
+                self.user_ids.pop(pid, None)
+        return stale
 
     def is_empty(self) -> bool:
         """Check if table has no players at all."""
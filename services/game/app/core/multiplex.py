@@ -0,0 +1,126 @@
+"""
+Multiplexed websocket connections.
+
+One socket on ``/ws`` can subscribe to several tables. Each subscription gets
+a ``TableChannel`` that the table actor treats as the player's websocket: it
+goes in ``table.connections`` and the actor sends to it as usual. A channel
+does not write to the socket itself; it tags the frame with its table_id and
+queues it on the connection, and the connection's writer task sends
+everything queued since its last send as one ``batch`` frame. A player at
+four busy tables therefore gets one socket write per round of broadcasts, not
+four, and a slow socket never holds up a table actor.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MUX_MAX_TABLES = int(os.getenv("MUX_MAX_TABLES", "16"))
+MUX_MAX_PENDING_FRAMES = int(os.getenv("MUX_MAX_PENDING_FRAMES", "1000"))
+
+
+def tag(table_id: str, text: str) -> str:
+    """Add ``"table_id"`` to a JSON object frame without decoding it."""
+    body = text.strip()[1:]
+    prefix = '{"table_id": ' + json.dumps(table_id)
+    return prefix + ("" if body.lstrip().startswith("}") else ", ") + body
+
+
+class TableChannel:
+    """Stands in for a websocket in one table's ``connections``."""
+
+    def __init__(self, connection: "MuxConnection", table_id: str):
+        self.connection = connection
+        self.table_id = table_id
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        if not self.closed:
+            self.connection.queue(tag(self.table_id, text))
+
+    async def close(self) -> None:
+        """The table replaced this channel (the player joined it from somewhere else)."""
+        if self.connection.channels.get(self.table_id) is self:
+            del self.connection.channels[self.table_id]
+            self.connection.queue(json.dumps({"type": "unsubscribed", "table_id": self.table_id}))
+        self.closed = True
+
+
+class MuxConnection:
+    """A client socket, its table subscriptions and the writer that batches its frames."""
+
+    def __init__(self, ws: Any, max_tables: int = MUX_MAX_TABLES,
+                 max_pending: int = MUX_MAX_PENDING_FRAMES):
+        self.ws = ws
+        self.max_tables = max_tables
+        self.max_pending = max_pending
+        self.channels: Dict[str, TableChannel] = {}
+        self.sends = 0
+        self._pending: List[str] = []
+        self._wake = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self) -> None:
+        self._writer = asyncio.get_running_loop().create_task(self._write(), name="mux-writer")
+
+    def subscribe(self, table_id: str) -> Optional[TableChannel]:
+        """A channel for ``table_id``, or None if the connection is at ``max_tables``."""
+        channel = self.channels.get(table_id)
+        if channel is not None:
+            return channel
+        if len(self.channels) >= self.max_tables:
+            return None
+        channel = self.channels[table_id] = TableChannel(self, table_id)
+        return channel
+
+    def unsubscribe(self, table_id: str) -> Optional[TableChannel]:
+        channel = self.channels.pop(table_id, None)
+        if channel is not None:
+            channel.closed = True
+        return channel
+
+    def queue(self, text: str) -> None:
+        """Queue an already-tagged frame for the next batch."""
+        if self._closing:
+            return
+        if len(self._pending) >= self.max_pending:
+            logger.warning(f"[MUX] {len(self._pending)} frames waiting for a slow client, closing the connection")
+            self._closing = True
+            self._pending.clear()
+            asyncio.get_running_loop().create_task(self._close_socket())
+            return
+        self._pending.append(text)
+        self._wake.set()
+
+    async def close(self) -> List[Tuple[str, TableChannel]]:
+        """Stop writing. Returns the subscriptions the caller should detach from their tables."""
+        self._closing = True
+        channels = list(self.channels.items())
+        for table_id, _ in channels:
+            self.unsubscribe(table_id)
+        if self._writer is not None:
+            self._writer.cancel()
+        return channels
+
+    async def _write(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            frames, self._pending = self._pending, []
+            if not frames:
+                continue
+            try:
+                await self.ws.send_text('{"type": "batch", "frames": [' + ", ".join(frames) + "]}")
+            except Exception:
+                return  # The receive loop sees the disconnect and cleans up
+            self.sends += 1
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.ws.close()
+        except Exception:
+            pass
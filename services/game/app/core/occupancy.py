@@ -0,0 +1,167 @@
+"""
+Live table occupancy pushed to the lobby.
+
+Actors call ``publisher.mark(table)`` after every batch they apply. Every
+``OCCUPANCY_PUSH_INTERVAL`` seconds the publisher snapshots the tables marked
+since the last push and sends only the fields that changed, as one frame over a
+long-lived websocket to the lobby's ``/internal/occupancy``::
+
+    {"type": "occupancy", "full": false,
+     "tables": {"abc123": {"seated": 4, "waitlist": 1}}, "removed": ["def456"]}
+
+The first frame after every (re)connect is a full snapshot (``"full": true``),
+so the lobby can drop whatever it held for tables that are gone.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+import websockets
+
+from models.player import PlayerRole
+from .hand_history import HandRecord, add_hand_listener, remove_hand_listener
+from .models import TableState
+from .tables import LOBBY_URL
+
+logger = logging.getLogger(__name__)
+
+OCCUPANCY_PUSH_INTERVAL = float(os.getenv("OCCUPANCY_PUSH_INTERVAL", "0.25"))
+OCCUPANCY_RECONNECT_MAX = 30.0
+HANDS_WINDOW = 3600.0  # hands_per_hour and avg_pot cover the last hour
+
+
+def _feed_url() -> str:
+    base = LOBBY_URL.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+    url = f"{base}/internal/occupancy"
+    token = os.getenv("INTERNAL_API_TOKEN")
+    return f"{url}?token={token}" if token else url
+
+
+class OccupancyPublisher:
+    """Tracks live tables and pushes batched occupancy deltas to the lobby."""
+
+    def __init__(self, interval: float = OCCUPANCY_PUSH_INTERVAL):
+        self.interval = interval
+        self._tables: Dict[str, TableState] = {}
+        self._dirty: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._sent: Dict[str, Dict[str, int]] = {}
+        self._hands: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        add_hand_listener(self.observe)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="occupancy-publisher")
+        logger.info(f"[OCCUPANCY] Publishing to {LOBBY_URL} every {self.interval}s")
+
+    async def stop(self) -> None:
+        remove_hand_listener(self.observe)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def mark(self, table: TableState) -> None:
+        """Note that ``table`` may have changed since the last push."""
+        self._tables[table.table_id] = table
+        self._dirty.add(table.table_id)
+        self._removed.discard(table.table_id)
+
+    def remove(self, table_id: str) -> None:
+        """The table is gone from this service."""
+        self._tables.pop(table_id, None)
+        self._hands.pop(table_id, None)
+        self._dirty.discard(table_id)
+        self._removed.add(table_id)
+
+    def observe(self, record: HandRecord) -> None:
+        """Hand listener: count the hand towards its table's hourly rate."""
+        self._hands.setdefault(record.table_id, deque()).append((time.monotonic(), record.pot))
+        self._dirty.add(record.table_id)
+
+    def snapshot(self, table: TableState) -> Dict[str, int]:
+        connected = [p for p in table.players.values() if p.connected]
+        hands = self._hands.get(table.table_id, ())
+        return {
+            "seated": sum(1 for p in connected if p.role == PlayerRole.SEATED),
+            "spectators": sum(1 for p in connected if p.role == PlayerRole.SPECTATOR),
+            "waitlist": len(table.waitlist),
+            "hands_per_hour": len(hands),
+            "avg_pot": round(sum(pot for _, pot in hands) / len(hands)) if hands else 0,
+        }
+
+    def _expire_hands(self) -> None:
+        """Drop hands older than the window; their tables need a fresh snapshot."""
+        cutoff = time.monotonic() - HANDS_WINDOW
+        for table_id, hands in self._hands.items():
+            if hands and hands[0][0] < cutoff:
+                while hands and hands[0][0] < cutoff:
+                    hands.popleft()
+                self._dirty.add(table_id)
+
+    def build_frame(self, full: bool = False) -> Optional[dict]:
+        """Collect changes since the last frame. Returns None when there is nothing to send."""
+        self._expire_hands()
+        dirty, self._dirty = self._dirty, set()
+        removed, self._removed = self._removed, set()
+        if full:
+            self._sent.clear()
+            dirty = set(self._tables)
+            removed = set()
+
+        changed = {}
+        for table_id in dirty:
+            table = self._tables.get(table_id)
+            if table is None:
+                continue
+            snap = self.snapshot(table)
+            last = self._sent.get(table_id, {})
+            delta = {k: v for k, v in snap.items() if last.get(k) != v}
+            if delta:
+                changed[table_id] = delta
+                self._sent[table_id] = snap
+        for table_id in removed:
+            self._sent.pop(table_id, None)
+
+        if not (full or changed or removed):
+            return None
+        return {"type": "occupancy", "full": full, "tables": changed, "removed": sorted(removed)}
+
+    async def _run(self) -> None:
+        delay = 1.0
+        warned = False
+        while True:
+            try:
+                async with websockets.connect(_feed_url()) as ws:
+                    logger.info("[OCCUPANCY] Connected to lobby")
+                    delay, warned = 1.0, False
+                    frame = self.build_frame(full=True)
+                    while True:
+                        if frame is not None:
+                            await ws.send(json.dumps(frame, separators=(",", ":")))
+                        await asyncio.sleep(self.interval)
+                        frame = self.build_frame()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not warned:
+                    logger.warning(f"[OCCUPANCY] Lobby feed unavailable, retrying: {e}")
+                    warned = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, OCCUPANCY_RECONNECT_MAX)
+
+
+publisher = OccupancyPublisher()
@@ -0,0 +1,180 @@
+"""
+Streaming player statistics.
+
+Subscribes to finished hands, runs the ``poker.stats`` reducers for every
+authenticated player in the hand and accumulates the counter increments per
+user in memory. A background thread flushes the accumulated deltas every
+``STATS_FLUSH_INTERVAL`` seconds as one batch of
+``INSERT ... ON CONFLICT DO UPDATE SET value = value + excluded.value`` rows
+into ``player_stats``, so totals are never recomputed from hand history.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from db import get_db, PlayerStat
+from poker.stats import Counters, PlayerHand, reduce_hand
+from . import metrics
+from .hand_history import HandRecord, add_hand_listener, remove_hand_listener
+
+logger = logging.getLogger(__name__)
+
+STATS_FLUSH_INTERVAL = float(os.getenv("STATS_FLUSH_INTERVAL", "5.0"))
+
+_flushed_users = metrics.counter("pokerlite_player_stats_flushed_users_total", "User stat rows flushed to player_stats")
+_flush_failures = metrics.counter("pokerlite_player_stats_flush_failures_total", "Failed player_stats flushes")
+_pending_users = metrics.gauge("pokerlite_player_stats_pending_users", "Users with stat increments not yet flushed")
+
+
+def player_hands(record: HandRecord) -> Dict[int, PlayerHand]:
+    """Split a finished hand into per-user reducer inputs (guests are skipped)."""
+    by_pid: Dict[str, list] = {}
+    for a in record.actions:
+        by_pid.setdefault(a["pid"], []).append((a["street"], a["action"], a["amount"]))
+
+    board_cards = len(record.board.split())
+    result = {}
+    for pid, hp in record.players.items():
+        if hp.user_id is None:
+            continue
+        result[hp.user_id] = PlayerHand(
+            actions=by_pid.get(pid, []),
+            big_blind=record.big_blind,
+            net=hp.ending_stack - hp.starting_stack,
+            won=hp.won,
+            board_cards=board_cards,
+            went_to_showdown=record.went_to_showdown,
+        )
+    return result
+
+
+class StatsAggregator:
+    """In-memory per-user counter deltas with periodic batched flushes."""
+
+    def __init__(self, flush_interval: float = STATS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, Counters] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        add_hand_listener(self.observe)
+        self._thread = threading.Thread(target=self._run, name="player-stats-flusher", daemon=True)
+        self._thread.start()
+        logger.info(f"[STATS] Aggregator started (flush every {self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop listening and flush what is left."""
+        remove_hand_listener(self.observe)
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def observe(self, record: HandRecord) -> None:
+        """Hand listener: fold one finished hand into the pending counters."""
+        hands = player_hands(record)
+        if not hands:
+            return
+        with self._lock:
+            for user_id, hand in hands.items():
+                reduce_hand(hand, self._pending.setdefault(user_id, {}))
+            _pending_users.set(len(self._pending))
+
+    def pending(self, user_id: int) -> Counters:
+        """Increments for ``user_id`` not yet written to the database."""
+        with self._lock:
+            return dict(self._pending.get(user_id, {}))
+
+    def flush(self) -> int:
+        """Write pending increments in one transaction. Returns the number of users flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            _pending_users.set(0)
+        if not pending:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [
+            {"user_id": user_id, "counter": counter, "value": value, "updated_at": now}
+            for user_id, counters in pending.items()
+            for counter, value in counters.items()
+        ]
+        try:
+            db = next(get_db())
+            try:
+                _upsert_increments(db, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            _flush_failures.inc()
+            logger.error(f"[STATS] Failed to flush stats for {len(pending)} users: {e}", exc_info=True)
+            self._merge_back(pending)
+            return 0
+
+        _flushed_users.inc(len(pending))
+        return len(pending)
+
+    def _merge_back(self, pending: Dict[int, Counters]) -> None:
+        """Return unflushed increments so the next flush retries them."""
+        with self._lock:
+            for user_id, counters in pending.items():
+                target = self._pending.setdefault(user_id, {})
+                for counter, value in counters.items():
+                    target[counter] = target.get(counter, 0) + value
+            _pending_users.set(len(self._pending))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            started = time.perf_counter()
+            flushed = self.flush()
+            if flushed:
+                logger.debug(f"[STATS] Flushed {flushed} users in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+def _upsert_increments(db, rows: List[dict]) -> None:
+    """Add ``value`` to existing (user_id, counter) rows, inserting missing ones."""
+    table = PlayerStat.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for row in rows:
+            updated = db.execute(
+                table.update()
+                .where(table.c.user_id == row["user_id"], table.c.counter == row["counter"])
+                .values(value=table.c.value + row["value"], updated_at=row["updated_at"])
+            )
+            if updated.rowcount == 0:
+                db.execute(insert(table), row)
+        return
+
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.counter],
+        set_={"value": table.c.value + stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt, rows)
+
+
+aggregator = StatsAggregator()
@@ -0,0 +1,144 @@
+"""
+Statistical sampling profiler for the live game service.
+
+A helper thread wakes every ``interval`` seconds, reads the target thread's
+current frame via ``sys._current_frames()`` and counts the stack. Nothing is
+installed in the profiled thread (no settrace/setprofile), so overhead is the
+cost of one stack walk per sample.
+
+Output is in the "collapsed stacks" format consumed by flamegraph.pl and
+speedscope: one line per distinct stack, frames root-first separated by ``;``
+followed by the sample count. The root frame of each stack is the subsystem
+it was attributed to (evaluation, broadcast, serialization, db, auth, other).
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+MAX_PROFILE_SECONDS = 120
+MIN_INTERVAL = 0.001
+MAX_DEPTH = 64
+
+# Checked from the innermost frame outwards, first match wins, so
+# json.dumps called from broadcast_state counts as serialization.
+SUBSYSTEMS: List[Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = [
+    # (tag, path fragments, function names)
+    ("serialization", (os.sep + "json" + os.sep,), ()),
+    ("db", ("sqlalchemy", "psycopg", os.sep + "db" + os.sep), ()),
+    ("auth", ("jose", "passlib", "bcrypt", os.path.join("core", "auth.py")), ()),
+    ("evaluation", ("poker_logic.py",), ("evaluate_hand", "evaluate_hand_with_cards", "compare_hands")),
+    ("compression", ("compression.py",), ()),
+    ("relay", ("relay.py",), ()),
+    ("broadcast", ("protocol.py",), ("broadcast_state", "public_state")),
+]
+
+
+def _frame_label(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def classify(codes: List) -> str:
+    """Return the subsystem tag for a stack given innermost-first code objects."""
+    for code in codes:
+        path = code.co_filename
+        for tag, fragments, functions in SUBSYSTEMS:
+            if code.co_name in functions or any(f in path for f in fragments):
+                return tag
+    return "other"
+
+
+class SamplingProfiler:
+    """Samples one (or every) thread's stack at a fixed interval."""
+
+    def __init__(self, interval: float = 0.005, target_thread_id: Optional[int] = None, all_threads: bool = False):
+        self.interval = max(interval, MIN_INTERVAL)
+        self.target_thread_id = target_thread_id if target_thread_id is not None else threading.get_ident()
+        self.all_threads = all_threads
+        self.stacks: Counter = Counter()
+        self.by_subsystem: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.all_threads:
+                targets = [f for tid, f in frames.items() if tid != own_id]
+            else:
+                frame = frames.get(self.target_thread_id)
+                targets = [frame] if frame is not None else []
+            for frame in targets:
+                self._record(frame)
+
+    def _record(self, frame) -> None:
+        codes = []
+        while frame is not None and len(codes) < MAX_DEPTH:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        if not codes:
+            return
+        # Idle loop time shows up as the selector wait; keep it so "idle %" is visible
+        tag = classify(codes)
+        key = (tag,) + tuple(_frame_label(c) for c in reversed(codes))
+        self.stacks[key] += 1
+        self.by_subsystem[tag] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """Render samples as flamegraph-compatible collapsed stacks."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self) -> Dict:
+        return {
+            "samples": self.samples,
+            "duration_seconds": round(self.elapsed, 3),
+            "interval_ms": self.interval * 1000,
+            "by_subsystem": dict(self.by_subsystem.most_common()),
+            "collapsed": self.collapsed(),
+        }
+
+
+_active_lock = threading.Lock()
+_active: Optional[SamplingProfiler] = None
+
+
+def acquire(profiler: SamplingProfiler) -> bool:
+    """Register ``profiler`` as the single active profile. False if one is already running."""
+    global _active
+    with _active_lock:
+        if _active is not None:
+            return False
+        _active = profiler
+        return True
+
+
+def release(profiler: SamplingProfiler) -> None:
+    global _active
+    with _active_lock:
+        if _active is profiler:
+            _active = None
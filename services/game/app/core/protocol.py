@@ -1,11 +1,19 @@
 import json
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from .models import TableState, PlayerRole
 from .player_utils import eligible_players, active_pids
 from .waitlist import get_waitlist_position
 from .game_flow import calculate_side_pots
 
+if TYPE_CHECKING:
+    from .relay import SpectatorRelay
+
 def public_state(table: TableState, viewer_pid: Optional[str] = None) -> dict:
+    return {**table_view(table), **viewer_view(table, viewer_pid)}
+
+
+def viewer_view(table: TableState, viewer_pid: Optional[str]) -> dict:
+    """The part of the state that differs between viewers."""
     # Get viewer's role
     viewer = table.players.get(viewer_pid) if viewer_pid else None
     viewer_role = viewer.role.value if viewer else None
@@ -16,6 +24,43 @@ def public_state(table: TableState, viewer_pid: Optional[str] = None) -> dict:
         if viewer and viewer.role == PlayerRole.SEATED:
             hole = table.hole_cards.get(viewer_pid)
 
+    # Get waitlist position for viewer
+    waitlist_position = get_waitlist_position(table, viewer_pid) if viewer_pid else 0
+
+    # Get viewer's stack (for spectators who aren't in the players list)
+    viewer_stack = viewer.stack if viewer else 0
+
+    return {
+        # private view
+        "hole_cards": hole,
+        "pre_action": table.pre_actions.get(viewer_pid) if viewer_pid else None,
+
+        # Player role and management info
+        "my_role": viewer_role,
+        "my_stack": viewer_stack,
+        "waitlist_position": waitlist_position,
+    }
+
+
+def is_plain_spectator(table: TableState, pid: str) -> bool:
+    """Spectating and not on a waitlist: served by the table's relay, if it has one."""
+    player = table.players.get(pid)
+    return player is not None and player.role == PlayerRole.SPECTATOR and not get_waitlist_position(table, pid)
+
+
+def spectator_view(stack: int) -> dict:
+    """What viewer_view() gives a spectator who is not on a waitlist: only their stack varies."""
+    return {
+        "hole_cards": None,
+        "pre_action": None,
+        "my_role": PlayerRole.SPECTATOR.value,
+        "my_stack": stack,
+        "waitlist_position": 0,
+    }
+
+
+def table_view(table: TableState) -> dict:
+    """The part of the state every viewer sees the same."""
     # Calculate SB/BB positions
     sb_pid = None
     bb_pid = None
@@ -38,12 +83,6 @@ def public_state(table: TableState, viewer_pid: Optional[str] = None) -> dict:
             sb_pid = next((p.pid for p in players if p.seat == sb_seat), None)
             bb_pid = next((p.pid for p in players if p.seat == bb_seat), None)
 
-    # Get waitlist position for viewer
-    waitlist_position = get_waitlist_position(table, viewer_pid) if viewer_pid else 0
-
-    # Get viewer's stack (for spectators who aren't in the players list)
-    viewer_stack = viewer.stack if viewer else 0
-
     # Build spectator list (names only)
     spectators = [
         {"pid": p.pid, "name": p.name}
@@ -120,9 +159,6 @@ def public_state(table: TableState, viewer_pid: Optional[str] = None) -> dict:
         "current_bet": table.current_bet,
         "player_bets": table.player_bets,
 
-        # private view
-        "hole_cards": hole,
-
         # showdown data (only present after showdown, before next hand)
         "showdown": table.showdown_data,
 
@@ -132,20 +168,75 @@ def public_state(table: TableState, viewer_pid: Optional[str] = None) -> dict:
         # Current side pots (during hand, if applicable)
         "current_side_pots": current_side_pots,
 
-        # Player role and management info
-        "my_role": viewer_role,
-        "my_stack": viewer_stack,
-        "waitlist_position": waitlist_position,
+        # Table management info
         "spectators": spectators,
         "waitlist": waitlist,
     }
 
 
-async def broadcast_state(table: TableState) -> None:
-    # Per-connection view (so later we can customize what each pid sees)
-    for pid, ws in list(table.connections.items()):
+def state_prefix(table: TableState, seq: int) -> str:
+    """A ``state`` frame up to and including the table-wide fields; a viewer's own part completes it."""
+    return '{"type": "state", "seq": ' + str(seq) + ', "state": {' + json.dumps(table_view(table))[1:-1] + ", "
+
+
+def state_frame(table: TableState, pid: str, seq: Optional[int] = None) -> str:
+    """One player's view of the table as a ``state`` frame."""
+    seq = table.frame_log.seq if seq is None else seq
+    return json.dumps({"type": "state", "seq": seq, "state": public_state(table, pid)})
+
+
+async def broadcast_state(table: TableState, relay: Optional["SpectatorRelay"] = None) -> None:
+    """
+    Send every connection its view of the table.
+
+    The shared part is serialized once, and viewers whose own part is the same
+    (most spectators) get the very same frame string, so a compressing socket
+    only compresses it once. With a relay, spectators are left to it.
+    """
+    seq = table.frame_log.next_seq()
+    if not table.connections:
+        return
+    prefix = state_prefix(table, seq)
+    connections, spectators = _split_spectators(table, relay)
+    if spectators:
+        relay.publish_state(prefix, spectators)
+    frames: Dict[str, str] = {}
+    for pid, ws in connections:
+        own = json.dumps(viewer_view(table, pid))
+        text = frames.get(own)
+        if text is None:
+            text = frames[own] = prefix + own[1:] + "}"
         try:
-            await ws.send_text(json.dumps({"type": "state", "state": public_state(table, pid)}))
+            await ws.send_text(text)
         except Exception:
             # Ignore send errors; disconnect handler will clean up
             pass
+
+
+async def broadcast_info(table: TableState, message: str, relay: Optional["SpectatorRelay"] = None) -> None:
+    """Send an info line to every connection at the table."""
+    seq = table.frame_log.next_seq()
+    text = json.dumps({"type": "info", "seq": seq, "message": message})
+    table.frame_log.record(seq, text)
+    connections, spectators = _split_spectators(table, relay)
+    if spectators:
+        relay.publish_info(text, spectators)
+    for pid, ws in connections:
+        try:
+            await ws.send_text(text)
+        except Exception:
+            pass
+
+
+def _split_spectators(table: TableState, relay: Optional["SpectatorRelay"]) -> Tuple[List[Tuple[str, Any]], List[Tuple[Any, int]]]:
+    """(pid, socket) pairs to send to directly, and (socket, stack) pairs for the relay."""
+    if relay is None:
+        return list(table.connections.items()), []
+    direct, spectators = [], []
+    for pid, ws in table.connections.items():
+        if is_plain_spectator(table, pid):
+            spectators.append((ws, table.players[pid].stack))
+        else:
+            relay.bypass(ws)  # Anything the relay still holds for them is older than this
+            direct.append((pid, ws))
+    return direct, spectators
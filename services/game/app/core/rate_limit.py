@@ -0,0 +1,121 @@
+"""
+Token-bucket rate limits for inbound websocket frames.
+
+Every frame a client sends is checked against three buckets before it is
+decoded: one for the connection, one for the player (who may hold several
+sockets) and one for the source IP (which may be many players behind one
+NAT, hence the larger default). A frame that finds any bucket empty is dropped
+there and then: it is never parsed, never reaches the table actor and causes
+no broadcast.
+"""
+import os
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from . import metrics
+
+WS_RATE_PER_SECOND = float(os.getenv("WS_RATE_PER_SECOND", "10"))
+WS_RATE_BURST = float(os.getenv("WS_RATE_BURST", "20"))
+WS_PID_RATE_PER_SECOND = float(os.getenv("WS_PID_RATE_PER_SECOND", "20"))
+WS_PID_RATE_BURST = float(os.getenv("WS_PID_RATE_BURST", "40"))
+WS_IP_RATE_PER_SECOND = float(os.getenv("WS_IP_RATE_PER_SECOND", "100"))
+WS_IP_RATE_BURST = float(os.getenv("WS_IP_RATE_BURST", "200"))
+
+_accepted = metrics.counter("pokerlite_ws_frames_accepted_total", "Inbound websocket frames within rate limits")
+_dropped = metrics.counter("pokerlite_ws_frames_dropped_total", "Inbound websocket frames dropped by a rate limit")
+
+
+class TokenBucket:
+    """Holds up to ``burst`` tokens and refills at ``rate`` tokens per second."""
+    __slots__ = ("rate", "burst", "tokens", "updated", "clock")
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.clock = clock
+        self.updated = clock()
+
+    def allow(self, cost: float = 1) -> bool:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def full_at(self) -> float:
+        """When the bucket will be back to ``burst`` if nothing else is taken."""
+        return self.updated + (self.burst - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class KeyedLimiter:
+    """One bucket per key. Buckets that have refilled are dropped, since a fresh one is the same."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._next_prune = clock() + self._prune_interval()
+
+    def allow(self, key: Hashable) -> bool:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, self.clock)
+        allowed = bucket.allow()
+        if bucket.updated >= self._next_prune:
+            self._prune(bucket.updated)
+        return allowed
+
+    def _prune_interval(self) -> float:
+        return self.burst / self.rate if self.rate > 0 else 60.0
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key, bucket in self._buckets.items() if bucket.full_at() <= now]:
+            del self._buckets[key]
+        self._next_prune = now + self._prune_interval()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class FrameLimiter:
+    """The per-connection, per-player and per-IP limits applied to every inbound frame."""
+
+    def __init__(self, rate: float = WS_RATE_PER_SECOND, burst: float = WS_RATE_BURST,
+                 pid_rate: float = WS_PID_RATE_PER_SECOND, pid_burst: float = WS_PID_RATE_BURST,
+                 ip_rate: float = WS_IP_RATE_PER_SECOND, ip_burst: float = WS_IP_RATE_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.pids = KeyedLimiter(pid_rate, pid_burst, clock)
+        self.ips = KeyedLimiter(ip_rate, ip_burst, clock)
+
+    def connection(self) -> TokenBucket:
+        """A bucket for a new connection, owned (and dropped) by its endpoint."""
+        return TokenBucket(self.rate, self.burst, self.clock)
+
+    def check(self, connection: TokenBucket, pid: str, ip: Optional[str]) -> bool:
+        """Take a token for one frame. False means drop the frame."""
+        if not connection.allow():
+            scope = "connection"
+        elif not self.pids.allow(pid):
+            scope = "pid"
+        elif ip is not None and not self.ips.allow(ip):
+            scope = "ip"
+        else:
+            _accepted.inc()
+            return True
+        _dropped.inc(scope=scope)
+        return False
+
+
+def client_ip(ws) -> Optional[str]:
+    client = getattr(ws, "client", None)
+    return client.host if client else None
+
+
+frame_limiter = FrameLimiter()
@@ -0,0 +1,136 @@
+"""
+Spectator relay.
+
+At a popular table the rail can be far bigger than the eight seats. The table
+actor sends state and info frames itself only to players (seated or waiting);
+for spectators it hands the relay the table-wide part of the state, already
+serialized, and moves on. The relay runs as its own task. It optionally holds
+frames back for ``SPECTATOR_DELAY_SECONDS`` so nobody can relay live hands to
+a player, then renders one frame per distinct spectator view (in practice one
+per stack size) and fans it out.
+
+Everything the relay needs travels in what is published, never read from the
+table, so the same interface could sit in front of a separate process
+subscribed to the table's frames. The one thing the table tells it besides
+frames is ``bypass(ws)``: that socket now gets live frames (its owner took a
+seat or joined a waitlist), so anything still queued for it is stale and
+dropped rather than applied on top of newer state.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import metrics
+from .protocol import spectator_view
+
+logger = logging.getLogger(__name__)
+
+SPECTATOR_DELAY_SECONDS = float(os.getenv("SPECTATOR_DELAY_SECONDS", "0"))
+
+_sent = metrics.counter("pokerlite_spectator_relay_frames_total", "Frames sent to spectators by relays")
+_rendered = metrics.counter("pokerlite_spectator_relay_renders_total", "Distinct spectator state frames rendered")
+_backlog = metrics.gauge("pokerlite_spectator_relay_backlog", "Published frames not yet sent to spectators")
+
+Spectators = List[Tuple[Any, int]]  # (socket, stack)
+
+
+class SpectatorRelay:
+    """Delivers one table's frames to its spectators, in order, after ``delay`` seconds."""
+
+    def __init__(self, table_id: str, delay: float = SPECTATOR_DELAY_SECONDS):
+        self.table_id = table_id
+        self.delay = delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._published = 0
+        self._queued: Dict[int, int] = {}  # id(socket) -> frames waiting for it
+        self._stale: Dict[int, int] = {}  # id(socket) -> frames published before this number are dropped
+
+    def bypass(self, ws: Any) -> None:
+        """``ws`` was just sent a live frame: drop whatever is still queued for it."""
+        if id(ws) in self._queued:
+            self._stale[id(ws)] = self._published
+
+    def publish_state(self, prefix: str, spectators: Spectators) -> None:
+        """``prefix`` is a state frame up to and including the table-wide fields and a trailing ", "."""
+        self._put(("state", prefix, spectators))
+
+    def publish_info(self, text: str, spectators: Spectators) -> None:
+        self._put(("info", text, spectators))
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            _backlog.inc(-self._queue.qsize())
+            self._queued.clear()
+            self._stale.clear()
+
+    def _put(self, item) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the previous loop went away (tests run one loop per test)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+            self._queued.clear()
+            self._stale.clear()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name=f"spectator-relay-{self.table_id}")
+        for ws, _ in item[2]:
+            self._queued[id(ws)] = self._queued.get(id(ws), 0) + 1
+        self._queue.put_nowait((loop.time() + self.delay, self._published, item))
+        self._published += 1
+        _backlog.inc()
+
+    async def _run(self) -> None:
+        while True:
+            due, number, (kind, body, spectators) = await self._queue.get()
+            wait = due - self._loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            _backlog.inc(-1)
+            spectators = self._current(number, spectators)
+            if kind == "state":
+                await self._send_state(body, spectators)
+            else:
+                await self._send(body, spectators)
+
+    def _current(self, number: int, spectators: Spectators) -> Spectators:
+        """The spectators frame ``number`` is still meant for, releasing its hold on each."""
+        current = []
+        for ws, stack in spectators:
+            key = id(ws)
+            if number >= self._stale.get(key, 0):
+                current.append((ws, stack))
+            left = self._queued.get(key, 1) - 1
+            if left > 0:
+                self._queued[key] = left
+            else:
+                self._queued.pop(key, None)
+                self._stale.pop(key, None)
+        return current
+
+    async def _send_state(self, prefix: str, spectators: Spectators) -> None:
+        frames = {}
+        for ws, stack in spectators:
+            text = frames.get(stack)
+            if text is None:
+                text = frames[stack] = prefix + json.dumps(spectator_view(stack))[1:] + "}"
+                _rendered.inc()
+            await self._deliver(ws, text)
+
+    async def _send(self, text: str, spectators: Spectators) -> None:
+        for ws, _ in spectators:
+            await self._deliver(ws, text)
+
+    @staticmethod
+    async def _deliver(ws: Any, text: str) -> None:
+        try:
+            await ws.send_text(text)
+        except Exception:
+            return  # Gone since the frame was published; the table handles the disconnect
+        _sent.inc()
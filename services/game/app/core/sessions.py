@@ -0,0 +1,117 @@
+"""
+Resumable table sessions.
+
+Every ``welcome`` carries a resume ticket. When a socket drops, the ticket
+stays valid for ``RESUME_GRACE_SECONDS`` and the player keeps their seat and
+their place in the hand for that long (their turn clock still runs). A client
+that reconnects in time opens with ``{"type": "resume", "ticket", "last_seq"}``
+instead of ``join``: no token check, no broadcast to the rest of the table,
+just the frames it missed and a fresh state for itself.
+
+Table-wide frames are numbered with a per-table ``seq``. The last
+``RESUME_BUFFER_FRAMES`` info frames are kept in the table's ``FrameLog``;
+state frames are not, since each one is a full snapshot that supersedes the
+ones before it.
+"""
+import os
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+RESUME_GRACE_SECONDS = float(os.getenv("RESUME_GRACE_SECONDS", "30"))
+RESUME_BUFFER_FRAMES = int(os.getenv("RESUME_BUFFER_FRAMES", "64"))
+
+
+class FrameLog:
+    """Sequence numbers for a table's broadcasts and a ring buffer of recent info frames."""
+
+    def __init__(self, size: int = RESUME_BUFFER_FRAMES):
+        self.seq = 0
+        self._frames: Deque[Tuple[int, str]] = deque(maxlen=size)
+        self._dropped_through = 0  # Highest seq pushed out of the buffer
+
+    def next_seq(self) -> int:
+        self.seq += 1
+        return self.seq
+
+    def record(self, seq: int, text: str) -> None:
+        if self._frames.maxlen == 0:
+            self._dropped_through = seq
+            return
+        if len(self._frames) == self._frames.maxlen:
+            self._dropped_through = self._frames[0][0]
+        self._frames.append((seq, text))
+
+    def since(self, seq: int) -> Optional[List[str]]:
+        """Buffered frames after ``seq``, or None if some of them are gone (or ``seq`` is from elsewhere)."""
+        if seq > self.seq or seq < self._dropped_through:
+            return None
+        return [text for s, text in self._frames if s > seq]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+@dataclass
+class ResumeTicket:
+    pid: str
+    name: str
+    table_id: str
+    expires_at: Optional[float] = None  # Set when the socket drops; None while connected
+
+
+class TicketStore:
+    """Outstanding resume tickets. A ticket is discarded once its resume is accepted."""
+
+    def __init__(self, grace_seconds: float = RESUME_GRACE_SECONDS):
+        self.grace_seconds = grace_seconds
+        self._tickets: Dict[str, ResumeTicket] = {}
+        self._expiring: Deque[Tuple[float, str]] = deque()  # Grace is fixed, so already in expiry order
+
+    def issue(self, pid: str, name: str, table_id: str) -> str:
+        self._prune()
+        token = secrets.token_urlsafe(16)
+        self._tickets[token] = ResumeTicket(pid=pid, name=name, table_id=table_id)
+        return token
+
+    def release(self, token: str) -> None:
+        """The socket holding ``token`` closed: start its grace window."""
+        ticket = self._tickets.get(token)
+        if ticket is None:
+            return
+        if self.grace_seconds <= 0:
+            del self._tickets[token]
+            return
+        ticket.expires_at = time.monotonic() + self.grace_seconds
+        self._expiring.append((ticket.expires_at, token))
+
+    def peek(self, token: object, table_id: str) -> Optional[ResumeTicket]:
+        """The live ticket for ``token`` at ``table_id``, left in place until the resume is accepted."""
+        if not isinstance(token, str):
+            return None
+        ticket = self._tickets.get(token)
+        if ticket is None or ticket.table_id != table_id:
+            return None
+        if ticket.expires_at is not None and ticket.expires_at <= time.monotonic():
+            del self._tickets[token]
+            return None
+        return ticket
+
+    def discard(self, token: str) -> None:
+        self._tickets.pop(token, None)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        while self._expiring and self._expiring[0][0] <= now:
+            _, token = self._expiring.popleft()
+            ticket = self._tickets.get(token)
+            if ticket is not None and ticket.expires_at is not None and ticket.expires_at <= now:
+                del self._tickets[token]
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+
+tickets = TicketStore()
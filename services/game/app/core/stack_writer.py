@@ -0,0 +1,119 @@
+"""
+Background persistence of player stacks.
+
+Stack updates are recorded in memory, latest value per user, and a background
+thread writes them to ``player_stacks`` every ``STACK_FLUSH_INTERVAL`` seconds
+in one transaction, so folds and hand ends never commit on the event loop.
+Because only the newest stack per user is kept, an older update can never land
+after a newer one. Until the writer is started, updates are written straight
+away.
+"""
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from db import get_db, PlayerStack
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+STACK_FLUSH_INTERVAL = float(os.getenv("STACK_FLUSH_INTERVAL", "0.5"))
+
+_flushed_stacks = metrics.counter("pokerlite_stack_writes_total", "Player stacks written to player_stacks")
+_flush_failures = metrics.counter("pokerlite_stack_write_failures_total", "Failed player stack flushes")
+_pending_stacks = metrics.gauge("pokerlite_stack_writes_pending", "Player stacks not yet written")
+
+
+class StackWriter:
+    """Latest stack per user, flushed in batches by a background thread."""
+
+    def __init__(self, flush_interval: float = STACK_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"[STACKS] Writer started (flush every {self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread and write what is left."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def save(self, user_id: int, stack: int) -> None:
+        """Record ``stack`` as the user's current stack."""
+        if not self.running:
+            from .auth import update_user_stack
+            if not update_user_stack(user_id, stack):
+                logger.warning(f"[DB] Failed to update stack for user {user_id}")
+            return
+        with self._lock:
+            self._pending[user_id] = stack
+            _pending_stacks.set(len(self._pending))
+
+    def pending(self, user_id: int) -> Optional[int]:
+        """The user's stack if it has not been written yet."""
+        with self._lock:
+            return self._pending.get(user_id)
+
+    def flush(self) -> int:
+        """Write pending stacks in one transaction. Returns the number written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            _pending_stacks.set(0)
+        if not pending:
+            return 0
+
+        try:
+            db = next(get_db())
+            try:
+                written = set()
+                for row in db.query(PlayerStack).filter(PlayerStack.user_id.in_(pending)):
+                    row.stack = pending[row.user_id]
+                    written.add(row.user_id)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            _flush_failures.inc()
+            logger.error(f"[STACKS] Failed to write stacks for {len(pending)} users: {e}", exc_info=True)
+            self._merge_back(pending)
+            return 0
+
+        missing = pending.keys() - written
+        if missing:
+            logger.warning(f"[DB] No stack row for users {sorted(missing)}")
+        _flushed_stacks.inc(len(written))
+        return len(written)
+
+    def _merge_back(self, pending: Dict[int, int]) -> None:
+        """Return unwritten stacks for the next flush, unless a newer one came in meanwhile."""
+        with self._lock:
+            for user_id, stack in pending.items():
+                self._pending.setdefault(user_id, stack)
+            _pending_stacks.set(len(self._pending))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+stack_writer = StackWriter()
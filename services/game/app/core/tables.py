@@ -2,6 +2,7 @@ from typing import Dict
 import httpx
 import os
 from .models import TableState
+from .hibernation import store as hibernated
 
 _tables: Dict[str, TableState] = {}
 
@@ -9,6 +10,11 @@ LOBBY_URL = os.getenv("LOBBY_URL", "http://localhost:8000")
 
 def get_table(table_id: str) -> TableState:
     if table_id not in _tables:
+        table = hibernated.load(table_id)
+        if table is not None:
+            _tables[table_id] = table
+            return table
+
         # Fetch table config from lobby service
         try:
             response = httpx.get(f"{LOBBY_URL}/api/tables/{table_id}", timeout=5.0)
@@ -20,6 +26,7 @@ def get_table(table_id: str) -> TableState:
                     big_blind=config.get("big_blind", 10),
                     max_players=config.get("max_players", 8),
                     turn_timeout_seconds=config.get("turn_timeout_seconds", 30),
+                    deal_delay_seconds=config.get("deal_delay_seconds", 5),
                 )
             else:
                 # Table not found in lobby, use defaults
@@ -32,8 +39,14 @@ def get_table(table_id: str) -> TableState:
     return _tables[table_id]
 
 
+def evict_table(table_id: str) -> bool:
+    """Drop a table from memory without deleting it (after it was hibernated)."""
+    return _tables.pop(table_id, None) is not None
+
+
 def delete_table(table_id: str) -> bool:
     """Delete a table from memory. Returns True if deleted, False if not found."""
+    hibernated.delete(table_id)
     if table_id in _tables:
         _tables.pop(table_id)
         return True
@@ -0,0 +1,69 @@
+"""
+Central timer service.
+
+All time-based game events (turn deadlines, runout streets, ...) are scheduled
+here instead of in per-table polling loops. Timers are keyed by
+``(owner, name)`` so each owner (usually a table_id) has at most one pending
+timer per purpose; scheduling the same key again replaces the old timer.
+
+Under the hood this is the event loop's own timer heap (``loop.call_later``),
+so idle tables cost nothing and firing is O(log n) in the number of timers.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+TimerKey = Tuple[str, str]
+
+
+class TimerService:
+    """Keyed one-shot timers on the running event loop."""
+
+    def __init__(self):
+        self._handles: Dict[TimerKey, asyncio.TimerHandle] = {}
+        self._due: Dict[TimerKey, float] = {}
+
+    def schedule(self, key: TimerKey, delay: float, callback: Callable, *args) -> None:
+        """Run ``callback(*args)`` after ``delay`` seconds, replacing any timer with the same key."""
+        self.cancel(key)
+        loop = asyncio.get_running_loop()
+        self._handles[key] = loop.call_later(max(0.0, delay), self._fire, key, callback, args)
+        self._due[key] = time.time() + max(0.0, delay)
+
+    def schedule_at(self, key: TimerKey, when: float, callback: Callable, *args) -> None:
+        """Like schedule() but ``when`` is a Unix timestamp (as used by TableState.turn_deadline)."""
+        self.schedule(key, when - time.time(), callback, *args)
+        self._due[key] = when
+
+    def cancel(self, key: TimerKey) -> bool:
+        handle = self._handles.pop(key, None)
+        self._due.pop(key, None)
+        if handle is None:
+            return False
+        handle.cancel()
+        return True
+
+    def cancel_owner(self, owner: str) -> int:
+        """Cancel every timer belonging to ``owner``. Returns how many were cancelled."""
+        keys = [key for key in self._handles if key[0] == owner]
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def pending(self, key: TimerKey) -> bool:
+        return key in self._handles
+
+    def due(self, key: TimerKey) -> Optional[float]:
+        """Unix timestamp the timer will fire at, or None if not scheduled."""
+        return self._due.get(key)
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def _fire(self, key: TimerKey, callback: Callable, args: tuple) -> None:
+        self._handles.pop(key, None)
+        self._due.pop(key, None)
+        callback(*args)
+
+
+timers = TimerService()
@@ -0,0 +1,350 @@
+"""
+Multi-table tournament engine.
+
+A tournament seats its entrants across ``ceil(entrants / table_size)`` tables
+and then only acts between hands: ``deal(table)`` is called before a table
+starts its next hand and ``end_hand(table)`` once the hand is over. Between
+those two calls the table is the engine's to rearrange, so every seat move is
+applied to a table that has no hand in progress. A player moved to a table
+that is mid-hand waits in that table's arrivals and is seated when its hand
+ends.
+
+After each hand the engine:
+
+* eliminates busted players (players busting in the same hand finish in
+  order of the chips they started it with),
+* breaks the table with the fewest players once the rest can seat everyone,
+  sending each of its players to whichever table is currently shortest,
+* balances: while this table has two or more players more than the shortest
+  table, it sends the player due the big blind to the shortest table.
+
+Only tables that are too full ever give players and each move goes to the
+shortest table, so nobody is moved more than balancing needs. Tables are
+bucketed by player count, so finding the shortest table is a scan over at
+most ``table_size`` buckets however many tables are running.
+
+Blind levels run on the central timer (``timers``) keyed by the tournament
+id; a new level applies to each table from its next hand.
+
+Nothing in the app creates a tournament yet: there is no route, its tables
+are not driven by table actors, and turn timers exist only in
+``tournament_sim``. The engine is exercised headless through that simulator
+until the websocket layer is wired to ``on_move``/``on_finish``.
+"""
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from poker.constants import DEFAULT_STARTING_STACK
+from .models import TableState, Player, PlayerRole
+from .game_flow import start_new_hand
+from .player_utils import eligible_players
+from .timers import timers
+
+TOURNAMENT_TABLE_SIZE = int(os.getenv("TOURNAMENT_TABLE_SIZE", "9"))
+TOURNAMENT_LEVEL_SECONDS = float(os.getenv("TOURNAMENT_LEVEL_SECONDS", "600"))
+
+
+@dataclass(frozen=True)
+class BlindLevel:
+    small_blind: int
+    big_blind: int
+
+
+DEFAULT_BLIND_LEVELS: Tuple[BlindLevel, ...] = tuple(
+    BlindLevel(sb, sb * 2) for sb in (
+        5, 10, 15, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750,
+        1000, 1500, 2000, 3000, 4000, 5000, 7500, 10000, 15000, 20000,
+    )
+)
+
+
+@dataclass
+class SeatMove:
+    """A player sent from one table to another between hands."""
+    pid: str
+    from_table: str
+    to_table: str
+
+
+class Tournament:
+    """Tables, clock and seating for one multi-table tournament."""
+
+    def __init__(self, tournament_id: str, entrants: Iterable[Tuple[str, str]],
+                 starting_stack: int = DEFAULT_STARTING_STACK,
+                 table_size: int = TOURNAMENT_TABLE_SIZE,
+                 levels: Sequence[BlindLevel] = DEFAULT_BLIND_LEVELS,
+                 level_seconds: float = TOURNAMENT_LEVEL_SECONDS,
+                 clock=timers, seed: Optional[int] = None):
+        self.tournament_id = tournament_id
+        self.entrants: Dict[str, str] = dict(entrants)  # pid -> name
+        if len(self.entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+        if table_size < 2:
+            raise ValueError("table_size must be at least 2")
+        self.starting_stack = starting_stack
+        self.table_size = table_size
+        self.levels = list(levels)
+        self.level_seconds = level_seconds
+        self.clock = clock
+        self.level = 0
+        self.remaining = len(self.entrants)
+        self.finished = False
+        self.places: Dict[str, int] = {}  # pid -> finishing place (1 = winner)
+        self.broken: List[str] = []  # table ids in the order they were broken
+        self.moves = 0
+        # Called as on_move(pid, from_table_id, to_table_id) for every seat move
+        self.on_move: Optional[Callable[[str, str, str], None]] = None
+        # Called as on_finish(tournament) once a winner is known
+        self.on_finish: Optional[Callable[["Tournament"], None]] = None
+
+        self.tables: Dict[str, TableState] = {}
+        self._location: Dict[str, str] = {}  # pid -> table_id (seated or arriving)
+        self._arrivals: Dict[str, List[Player]] = {}
+        self._breaking: Dict[str, None] = {}
+        self._start_stacks: Dict[str, Dict[str, int]] = {}
+        self._sizes: Dict[str, int] = {}
+        # Player count -> table ids; breaking tables are not filed
+        self._by_size: List[Dict[str, None]] = [{} for _ in range(table_size + 1)]
+
+        self._seat_entrants(random.Random(seed))
+
+    @property
+    def blinds(self) -> BlindLevel:
+        return self.levels[self.level]
+
+    @property
+    def level_key(self) -> Tuple[str, str]:
+        return (self.tournament_id, "level")
+
+    def _seat_entrants(self, rng: random.Random) -> None:
+        pids = list(self.entrants)
+        rng.shuffle(pids)
+        count = math.ceil(len(pids) / self.table_size)
+        for n in range(count):
+            table = TableState(
+                table_id=f"{self.tournament_id}-{n + 1}",
+                small_blind=self.blinds.small_blind,
+                big_blind=self.blinds.big_blind,
+                max_players=self.table_size,
+            )
+            self.tables[table.table_id] = table
+            self._file(table.table_id, 0)
+
+        # Deal entrants round the tables so sizes differ by at most one
+        table_ids = list(self.tables)
+        for i, pid in enumerate(pids):
+            table_id = table_ids[i % count]
+            player = Player(pid=pid, name=self.entrants[pid], stack=self.starting_stack)
+            self._seat(self.tables[table_id], player)
+            self._location[pid] = table_id
+            self._file(table_id, self._sizes[table_id] + 1)
+
+    # -- clock -----------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the blind clock."""
+        self._schedule_level()
+
+    def stop(self) -> None:
+        self.clock.cancel(self.level_key)
+
+    def level_ends_at(self) -> Optional[float]:
+        return self.clock.due(self.level_key)
+
+    def _schedule_level(self) -> None:
+        if not self.finished and self.level + 1 < len(self.levels):
+            self.clock.schedule(self.level_key, self.level_seconds, self.advance_level)
+
+    def advance_level(self) -> None:
+        """Move to the next blind level; each table picks it up on its next hand."""
+        if self.finished or self.level + 1 >= len(self.levels):
+            return
+        self.level += 1
+        self._schedule_level()
+
+    # -- hands -----------------------------------------------------------
+
+    def deal(self, table: TableState) -> bool:
+        """Start the table's next hand. Returns False if it cannot deal right now."""
+        table_id = table.table_id
+        if self.finished or table.hand_in_progress or self.tables.get(table_id) is not table:
+            return False
+        if table_id in self._breaking:
+            self._break(table)
+            return False
+
+        self._seat_arrivals(table)
+        table.small_blind = self.blinds.small_blind
+        table.big_blind = self.blinds.big_blind
+        if len(eligible_players(table)) < 2:
+            return False
+
+        self._start_stacks[table_id] = {
+            p.pid: p.stack for p in table.players.values() if p.role == PlayerRole.SEATED
+        }
+        start_new_hand(table)
+        return table.hand_in_progress
+
+    def end_hand(self, table: TableState) -> List[SeatMove]:
+        """Settle the table after a hand: eliminations, breaking and balancing."""
+        table_id = table.table_id
+        if self.finished or table.hand_in_progress or self.tables.get(table_id) is not table:
+            return []
+
+        moves: List[SeatMove] = []
+        self._seat_arrivals(table)
+        self._eliminate(table)
+        if self.finished:
+            return moves
+
+        self._plan_breaks()
+        for breaking_id in list(self._breaking):
+            breaking = self.tables[breaking_id]
+            if not breaking.hand_in_progress:
+                moves.extend(self._break(breaking))
+
+        if table_id in self.tables and table_id not in self._breaking:
+            moves.extend(self._balance(table))
+        return moves
+
+    def _eliminate(self, table: TableState) -> None:
+        start_stacks = self._start_stacks.pop(table.table_id, {})
+        busted = [
+            p for p in table.players.values()
+            if p.role == PlayerRole.SEATED and p.stack == 0
+        ]
+        if not busted:
+            return
+
+        # Smallest starting stack finishes lowest
+        busted.sort(key=lambda p: start_stacks.get(p.pid, 0))
+        for player in busted:
+            self.places[player.pid] = self.remaining
+            self.remaining -= 1
+            table.remove_player(player.pid)
+            table.connections.pop(player.pid, None)
+            del self._location[player.pid]
+        self._file(table.table_id, self._sizes[table.table_id] - len(busted))
+
+        if self.remaining == 1:
+            winner = next(iter(self._location))
+            self.places[winner] = 1
+            self.finished = True
+            self.stop()
+            if self.on_finish is not None:
+                self.on_finish(self)
+
+    # -- seating ---------------------------------------------------------
+
+    def _plan_breaks(self) -> None:
+        """Mark the shortest tables for breaking while the others can seat everyone."""
+        while True:
+            running = len(self.tables) - len(self._breaking)
+            if running <= 1 or self.remaining > (running - 1) * self.table_size:
+                return
+            table_id = self._shortest()
+            self._unfile(table_id)
+            self._breaking[table_id] = None
+
+    def _break(self, table: TableState) -> List[SeatMove]:
+        table_id = table.table_id
+        self._seat_arrivals(table)
+        moves = [
+            self._move(table, player.pid, self._shortest())
+            for player in sorted(self._seated(table), key=lambda p: p.seat)
+        ]
+        del self._breaking[table_id]
+        del self.tables[table_id]
+        self._sizes.pop(table_id, None)
+        self._start_stacks.pop(table_id, None)
+        self.broken.append(table_id)
+        return moves
+
+    def _balance(self, table: TableState) -> List[SeatMove]:
+        moves = []
+        while True:
+            shortest = self._shortest(exclude=table.table_id)
+            if shortest is None or self._sizes[table.table_id] - self._sizes[shortest] <= 1:
+                return moves
+            moves.append(self._move(table, self._due_big_blind(table), shortest))
+
+    def _move(self, source: TableState, pid: str, to_table: str) -> SeatMove:
+        player = source.players.pop(pid)
+        source.connections.pop(pid, None)
+        if source.table_id in self._sizes:
+            self._file(source.table_id, self._sizes[source.table_id] - 1)
+
+        dest = self.tables[to_table]
+        if dest.hand_in_progress:
+            self._arrivals.setdefault(to_table, []).append(player)
+        else:
+            self._seat(dest, player)
+        self._location[pid] = to_table
+        self._file(to_table, self._sizes[to_table] + 1)
+
+        self.moves += 1
+        if self.on_move is not None:
+            self.on_move(pid, source.table_id, to_table)
+        return SeatMove(pid=pid, from_table=source.table_id, to_table=to_table)
+
+    def _seat_arrivals(self, table: TableState) -> None:
+        for player in self._arrivals.pop(table.table_id, ()):
+            self._seat(table, player)
+
+    @staticmethod
+    def _seat(table: TableState, player: Player) -> None:
+        used = {p.seat for p in table.players.values() if p.role == PlayerRole.SEATED}
+        seat = 1
+        while seat in used:
+            seat += 1
+        player.seat = seat
+        player.role = PlayerRole.SEATED
+        table.players[player.pid] = player
+
+    @staticmethod
+    def _seated(table: TableState) -> List[Player]:
+        return [p for p in table.players.values() if p.role == PlayerRole.SEATED]
+
+    def _due_big_blind(self, table: TableState) -> str:
+        """The player who would post the big blind next hand (the fairest one to move)."""
+        players = sorted(self._seated(table), key=lambda p: p.seat)
+        after = [p for p in players if p.seat > table.dealer_seat]
+        order = after + players[:len(players) - len(after)]
+        # order[0] gets the button next, then the small and big blinds
+        return order[min(2, len(order) - 1)].pid
+
+    def _shortest(self, exclude: Optional[str] = None) -> Optional[str]:
+        for bucket in self._by_size:
+            for table_id in bucket:
+                if table_id != exclude:
+                    return table_id
+        return None
+
+    def _file(self, table_id: str, size: int) -> None:
+        self._unfile(table_id)
+        self._sizes[table_id] = size
+        if table_id not in self._breaking:
+            self._by_size[size][table_id] = None
+
+    def _unfile(self, table_id: str) -> None:
+        size = self._sizes.get(table_id)
+        if size is not None:
+            self._by_size[size].pop(table_id, None)
+
+    # -- results ---------------------------------------------------------
+
+    def table_of(self, pid: str) -> Optional[str]:
+        """Table the player is seated at (or on their way to), None once eliminated."""
+        return self._location.get(pid)
+
+    def standings(self) -> List[Tuple[int, str, str]]:
+        """(place, pid, name) for every eliminated player and the winner, best first."""
+        return sorted((place, pid, self.entrants[pid]) for pid, place in self.places.items())
+
+    def chips_in_play(self) -> int:
+        seated = sum(p.stack for t in self.tables.values() for p in self._seated(t))
+        arriving = sum(p.stack for players in self._arrivals.values() for p in players)
+        return seated + arriving + sum(t.pot for t in self.tables.values())
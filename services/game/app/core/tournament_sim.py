@@ -0,0 +1,225 @@
+"""
+Headless tournament simulation.
+
+Plays a whole tournament with random bots and no websockets, on a virtual
+clock: every round each table plays one hand, then the clock moves forward by
+``--hand-seconds`` so blind levels go up on schedule without waiting for them.
+
+    python -m app.core.tournament_sim --entrants 5000 --seed 1
+"""
+import argparse
+import asyncio
+import contextlib
+import heapq
+import itertools
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from poker.constants import DEFAULT_STARTING_STACK
+from .actions import handle_message, advance_runout
+from .models import TableState
+from .tournament import Tournament, TOURNAMENT_TABLE_SIZE, TOURNAMENT_LEVEL_SECONDS
+
+MAX_ACTIONS_PER_HAND = 1000
+MAX_ROUNDS = 1_000_000
+
+TimerKey = Tuple[str, str]
+
+
+class ManualClock:
+    """Stand-in for the central timer service where time only moves on advance()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._timers: Dict[TimerKey, Tuple[float, int, Callable, tuple]] = {}
+        self._heap: List[Tuple[float, int, TimerKey]] = []
+        self._order = itertools.count()
+
+    def schedule(self, key: TimerKey, delay: float, callback: Callable, *args) -> None:
+        entry = (self.now + max(0.0, delay), next(self._order), callback, args)
+        self._timers[key] = entry
+        heapq.heappush(self._heap, (entry[0], entry[1], key))
+
+    def cancel(self, key: TimerKey) -> bool:
+        return self._timers.pop(key, None) is not None
+
+    def cancel_owner(self, owner: str) -> int:
+        keys = [key for key in self._timers if key[0] == owner]
+        for key in keys:
+            del self._timers[key]
+        return len(keys)
+
+    def pending(self, key: TimerKey) -> bool:
+        return key in self._timers
+
+    def due(self, key: TimerKey) -> Optional[float]:
+        entry = self._timers.get(key)
+        return entry[0] if entry else None
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward, firing due timers in order."""
+        until = self.now + seconds
+        while self._heap and self._heap[0][0] <= until:
+            when, order, key = heapq.heappop(self._heap)
+            entry = self._timers.get(key)
+            if entry is None or entry[1] != order:
+                continue  # Cancelled or rescheduled
+            del self._timers[key]
+            self.now = when
+            entry[2](*entry[3])
+        self.now = until
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+
+@dataclass
+class SimulationResult:
+    entrants: int
+    hands: int
+    rounds: int
+    moves: int
+    tables: int
+    tables_broken: int
+    final_level: int
+    clock_seconds: float
+    wall_seconds: float
+    standings: List[Tuple[int, str, str]] = field(default_factory=list)
+
+
+def _bot_action(table: TableState, pid: str, rng: random.Random) -> dict:
+    """Loose-aggressive random play so the field shrinks quickly."""
+    player = table.players[pid]
+    to_call = table.current_bet - table.player_bets.get(pid, 0)
+    if player.stack == 0:
+        return {"type": "action", "action": "call" if to_call > 0 else "check"}
+
+    roll = rng.random()
+    if to_call > 0:
+        action = "fold" if roll < 0.45 else "all_in" if roll > 0.9 else "call"
+        return {"type": "action", "action": action}
+    if roll < 0.75:
+        return {"type": "action", "action": "check"}
+    if roll > 0.95:
+        return {"type": "action", "action": "all_in"}
+    return {"type": "action", "action": "raise", "amount": table.current_bet + table.big_blind * 3}
+
+
+async def play_hand(table: TableState, rng: random.Random) -> int:
+    """Play the hand in progress to the end with bots. Returns the number of actions."""
+    actions = 0
+    while table.hand_in_progress:
+        if actions >= MAX_ACTIONS_PER_HAND:
+            raise RuntimeError(f"Hand at {table.table_id} did not finish after {actions} actions")
+        actions += 1
+        if table.runout_in_progress:
+            advance_runout(table)
+            continue
+        pid = table.current_turn_pid
+        if pid is None:
+            raise RuntimeError(f"Hand at {table.table_id} has nobody to act")
+        await handle_message(table, pid, _bot_action(table, pid, rng))
+    return actions
+
+
+async def run(tournament: Tournament, clock: ManualClock, rng: random.Random,
+              hand_seconds: float = 60.0) -> Tuple[int, int]:
+    """Drive the tournament until it has a winner. Returns (hands, rounds)."""
+    hands = rounds = 0
+    tournament.start()
+    while not tournament.finished:
+        if rounds >= MAX_ROUNDS:
+            raise RuntimeError(f"Tournament did not finish after {rounds} rounds")
+        rounds += 1
+        for table in list(tournament.tables.values()):
+            if table.table_id not in tournament.tables:
+                continue  # Broken earlier in this round
+            table.use_deterministic_deck = True
+            table.deck_seed = rng.getrandbits(32)
+            if tournament.deal(table):
+                await play_hand(table, rng)
+                hands += 1
+            tournament.end_hand(table)
+            if tournament.finished:
+                break
+        clock.advance(hand_seconds)
+    return hands, rounds
+
+
+def simulate(entrants: int = 1000, table_size: int = TOURNAMENT_TABLE_SIZE,
+             starting_stack: int = DEFAULT_STARTING_STACK,
+             level_seconds: float = TOURNAMENT_LEVEL_SECONDS,
+             hand_seconds: float = 60.0, seed: int = 0, quiet: bool = True) -> SimulationResult:
+    """Run one tournament of ``entrants`` bots to completion."""
+    rng = random.Random(seed)
+    clock = ManualClock()
+    tournament = Tournament(
+        "sim",
+        ((f"p{i}", f"Bot {i}") for i in range(1, entrants + 1)),
+        starting_stack=starting_stack,
+        table_size=table_size,
+        level_seconds=level_seconds,
+        clock=clock,
+        seed=seed,
+    )
+    tables = len(tournament.tables)
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        # The engine logs every showdown; thousands of hands would drown the summary
+        with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+            hands, rounds = asyncio.run(run(tournament, clock, rng, hand_seconds))
+
+    return SimulationResult(
+        entrants=entrants,
+        hands=hands,
+        rounds=rounds,
+        moves=tournament.moves,
+        tables=tables,
+        tables_broken=len(tournament.broken),
+        final_level=tournament.level + 1,
+        clock_seconds=clock.now,
+        wall_seconds=time.perf_counter() - started,
+        standings=tournament.standings(),
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.core.tournament_sim",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entrants", type=int, default=5000)
+    parser.add_argument("--table-size", type=int, default=TOURNAMENT_TABLE_SIZE)
+    parser.add_argument("--starting-stack", type=int, default=DEFAULT_STARTING_STACK)
+    parser.add_argument("--level-seconds", type=float, default=TOURNAMENT_LEVEL_SECONDS)
+    parser.add_argument("--hand-seconds", type=float, default=60.0,
+                        help="Virtual seconds one round of hands takes")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    result = simulate(
+        entrants=args.entrants,
+        table_size=args.table_size,
+        starting_stack=args.starting_stack,
+        level_seconds=args.level_seconds,
+        hand_seconds=args.hand_seconds,
+        seed=args.seed,
+    )
+    print(f"{result.entrants} entrants at {result.tables} tables")
+    print(f"{result.hands} hands over {result.rounds} rounds, {result.moves} seat moves, "
+          f"{result.tables_broken} tables broken")
+    print(f"Finished at level {result.final_level} after {result.clock_seconds / 3600:.1f}h of tournament time")
+    print(f"Simulated in {result.wall_seconds:.1f}s")
+    for place, pid, name in result.standings[:10]:
+        print(f"  {place:>5}. {name} ({pid})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+FIFO queue of unique player ids with O(1) join, leave and promote.
+
+A deque keeps arrival order and a dict maps each waiting pid to its ticket.
+Leaving only drops the dict entry; the stale deque entry is skipped when it
+reaches the front, and the deque is compacted once stale entries outnumber
+live ones, so every operation stays amortized O(1).
+
+Tickets come from one process-wide counter, so the heads of two queues can be
+compared to find who has waited longest.
+"""
+import itertools
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+_tickets = itertools.count(1)
+
+
+class WaitQueue:
+    """Ordered set of pids: append, discard, popleft and ``in`` are O(1)."""
+
+    def __init__(self, pids: Iterable[str] = ()):
+        self._queue: Deque[Tuple[str, int]] = deque()
+        self._tickets: Dict[str, int] = {}
+        for pid in pids:
+            self.append(pid)
+
+    def append(self, pid: str) -> bool:
+        """Join at the back. Returns False if already waiting."""
+        if pid in self._tickets:
+            return False
+        ticket = next(_tickets)
+        self._tickets[pid] = ticket
+        self._queue.append((pid, ticket))
+        return True
+
+    def appendleft(self, pid: str) -> bool:
+        """Join at the front (e.g. a promoted player who could not be seated yet)."""
+        if pid in self._tickets:
+            return False
+        ticket = self.head_ticket() - 1 if self._tickets else next(_tickets)
+        self._tickets[pid] = ticket
+        self._queue.appendleft((pid, ticket))
+        return True
+
+    def discard(self, pid: str) -> bool:
+        """Leave the queue. Returns False if not waiting."""
+        if self._tickets.pop(pid, None) is None:
+            return False
+        if len(self._queue) > 2 * len(self._tickets) + 16:
+            self._queue = deque(e for e in self._queue if self._tickets.get(e[0]) == e[1])
+        return True
+
+    def remove(self, pid: str) -> None:
+        if not self.discard(pid):
+            raise ValueError(f"{pid} is not waiting")
+
+    def _drop_stale_head(self) -> None:
+        while self._queue and self._tickets.get(self._queue[0][0]) != self._queue[0][1]:
+            self._queue.popleft()
+
+    def popleft(self) -> str:
+        """Remove and return the longest-waiting pid."""
+        self._drop_stale_head()
+        if not self._queue:
+            raise IndexError("pop from an empty WaitQueue")
+        pid, _ = self._queue.popleft()
+        del self._tickets[pid]
+        return pid
+
+    def peek(self) -> Optional[str]:
+        self._drop_stale_head()
+        return self._queue[0][0] if self._queue else None
+
+    def head_ticket(self) -> Optional[int]:
+        """Ticket of the longest-waiting pid (lower = waited longer)."""
+        self._drop_stale_head()
+        return self._queue[0][1] if self._queue else None
+
+    def position(self, pid: str) -> int:
+        """1-indexed position, 0 if not waiting. O(n); for display only."""
+        if pid not in self._tickets:
+            return 0
+        for i, waiting in enumerate(self, start=1):
+            if waiting == pid:
+                return i
+        return 0
+
+    def __contains__(self, pid: object) -> bool:
+        return pid in self._tickets
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __iter__(self) -> Iterator[str]:
+        for pid, ticket in list(self._queue):
+            if self._tickets.get(pid) == ticket:
+                yield pid
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WaitQueue):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"WaitQueue({list(self)!r})"
@@ -1,16 +1,124 @@
 """
 Waitlist management for poker tables.
-"""
-from .models import TableState, Player, PlayerRole
-from poker.constants import MAX_PLAYERS, DEFAULT_STARTING_STACK
 
+Each table has its own FIFO (``TableState.waitlist``). A player can instead
+join the global waitlist for a stake level (big blind), which gets them into
+whichever table at those stakes frees a seat first. When a table has a free
+seat it takes whoever has waited longest across its own waitlist and the
+global one for its stakes. A global waiter watching from another table is
+sent a ``seat_offer`` for this one and the seat is held for
+``WAITLIST_OFFER_TTL`` seconds.
+"""
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
 
-def join_waitlist(table: TableState, pid: str) -> bool:
+from .models import TableState, Player, PlayerRole
+from .wait_queue import WaitQueue
+
+WAITLIST_OFFER_TTL = float(os.getenv("WAITLIST_OFFER_TTL", "30"))
+
+
+@dataclass
+class _Waiting:
+    big_blind: int
+    table_id: str  # Table the player is watching from
+
+
+class GlobalWaitlist:
+    """Stake-level FIFO waitlists shared by every table in the process."""
+
+    def __init__(self, offer_ttl: float = WAITLIST_OFFER_TTL):
+        self.offer_ttl = offer_ttl
+        self._queues: Dict[int, WaitQueue] = {}
+        self._waiting: Dict[str, _Waiting] = {}
+        self._offers: Dict[str, Dict[str, float]] = {}  # table_id -> pid -> expiry
+        # Called as notify(origin_table_id, pid, table_id) when a seat is offered
+        self.notify: Optional[Callable[[str, str, str], None]] = None
+
+    def join(self, pid: str, big_blind: int, table_id: str) -> bool:
+        if pid in self._waiting:
+            return False
+        self._waiting[pid] = _Waiting(big_blind, table_id)
+        self._queues.setdefault(big_blind, WaitQueue()).append(pid)
+        return True
+
+    def leave(self, pid: str, table_id: Optional[str] = None) -> bool:
+        """Leave the global waitlist (only if joined from ``table_id``, when given)."""
+        waiting = self._waiting.get(pid)
+        if waiting is None or (table_id is not None and waiting.table_id != table_id):
+            return False
+        del self._waiting[pid]
+        self._queues[waiting.big_blind].discard(pid)
+        return True
+
+    def is_waiting(self, pid: str) -> bool:
+        return pid in self._waiting
+
+    def position(self, pid: str) -> int:
+        waiting = self._waiting.get(pid)
+        return self._queues[waiting.big_blind].position(pid) if waiting else 0
+
+    def size(self, big_blind: int) -> int:
+        queue = self._queues.get(big_blind)
+        return len(queue) if queue else 0
+
+    def head_ticket(self, big_blind: int) -> Optional[int]:
+        queue = self._queues.get(big_blind)
+        return queue.head_ticket() if queue else None
+
+    def pop(self, big_blind: int) -> Optional[Tuple[str, str]]:
+        """Remove the longest-waiting player at these stakes: (pid, origin table_id)."""
+        queue = self._queues.get(big_blind)
+        if not queue:
+            return None
+        pid = queue.popleft()
+        return pid, self._waiting.pop(pid).table_id
+
+    def offer(self, pid: str, origin_table_id: str, table_id: str) -> None:
+        """Hold a seat at ``table_id`` for ``pid`` and tell them about it."""
+        self._offers.setdefault(table_id, {})[pid] = time.monotonic() + self.offer_ttl
+        if self.notify is not None:
+            self.notify(origin_table_id, pid, table_id)
+
+    def pending_offers(self, table_id: str) -> int:
+        """Seats at the table held for players who have not arrived yet."""
+        offers = self._offers.get(table_id)
+        if not offers:
+            return 0
+        now = time.monotonic()
+        for pid in [pid for pid, expiry in offers.items() if expiry <= now]:
+            del offers[pid]
+        if not offers:
+            del self._offers[table_id]
+        return len(offers)
+
+    def take_offer(self, pid: str, table_id: str) -> bool:
+        """The player arrived at ``table_id``. Returns True if a seat was held for them."""
+        offers = self._offers.get(table_id)
+        if not offers or offers.pop(pid, None) is None:
+            return False
+        if not offers:
+            del self._offers[table_id]
+        return True
+
+    def clear(self) -> None:
+        self._queues.clear()
+        self._waiting.clear()
+        self._offers.clear()
+
+
+global_waitlist = GlobalWaitlist()
+
+
+def join_waitlist(table: TableState, pid: str, any_table: bool = False) -> bool:
     """
-    Add a spectator to the waitlist.
-    Returns True if added, False if already on waitlist, seated, or has no chips.
+    Add a spectator to the waitlist, or to the global waitlist for the
+    table's stakes when ``any_table`` is set.
+    Returns True if added, False if already waiting, seated, or has no chips.
     """
-    if pid in table.waitlist:
+    if pid in table.waitlist or global_waitlist.is_waiting(pid):
         return False
 
     player = table.players.get(pid)
@@ -24,7 +132,10 @@ def join_waitlist(table: TableState, pid: str) -> bool:
     if player.stack == 0:
         return False
 
-    table.waitlist.append(pid)
+    if any_table:
+        global_waitlist.join(pid, table.big_blind, table.table_id)
+    else:
+        table.waitlist.append(pid)
     player.role = PlayerRole.WAITLIST
     table.spectator_pids.discard(pid)
     return True
@@ -35,10 +146,9 @@ def leave_waitlist(table: TableState, pid: str) -> bool:
     Remove a player from the waitlist, return them to spectator.
     Returns True if removed, False if not on waitlist.
     """
-    if pid not in table.waitlist:
+    if not (table.waitlist.discard(pid) or global_waitlist.leave(pid, table.table_id)):
         return False
 
-    table.waitlist.remove(pid)
     player = table.players.get(pid)
     if player:
         player.role = PlayerRole.SPECTATOR
@@ -46,11 +156,28 @@ def leave_waitlist(table: TableState, pid: str) -> bool:
     return True
 
 
+def _can_seat(player: Optional[Player]) -> bool:
+    # Skip players with 0 chips (shouldn't be on waitlist, but just in case)
+    return player is not None and player.connected and player.stack > 0
+
+
+def _seat(table: TableState, player: Player) -> None:
+    used_seats = {p.seat for p in table.players.values() if p.role == PlayerRole.SEATED}
+    seat = 1
+    while seat in used_seats:
+        seat += 1
+
+    player.seat = seat
+    player.role = PlayerRole.SEATED
+    # Don't override stack - player keeps their existing chips
+
+
 def promote_from_waitlist(table: TableState) -> str | None:
     """
-    Promote the first waitlisted player to a seat.
+    Fill one free seat with whoever has waited longest, from the table's own
+    waitlist or the global waitlist for its stakes.
     Only call between hands when seats are available.
-    Returns the promoted player's PID or None.
+    Returns the PID that was seated (or offered the seat), or None.
     """
     if table.hand_in_progress:
         return None
@@ -60,40 +187,34 @@ def promote_from_waitlist(table: TableState) -> str | None:
         if p.role == PlayerRole.SEATED and p.connected
     )
 
-    if seated_count >= MAX_PLAYERS:
+    if seated_count + global_waitlist.pending_offers(table.table_id) >= table.max_players:
         return None
 
-    while table.waitlist:
-        pid = table.waitlist.pop(0)
-        player = table.players.get(pid)
+    while True:
+        local = table.waitlist.head_ticket()
+        remote = global_waitlist.head_ticket(table.big_blind)
+        if local is None and remote is None:
+            return None
 
-        if not player or not player.connected:
-            continue
+        if remote is None or (local is not None and local < remote):
+            pid = table.waitlist.popleft()
+        else:
+            pid, origin = global_waitlist.pop(table.big_blind)
+            if origin != table.table_id:
+                global_waitlist.offer(pid, origin, table.table_id)
+                return pid
 
-        # Skip players with 0 chips (shouldn't be on waitlist, but just in case)
-        if player.stack == 0:
+        player = table.players.get(pid)
+        if not _can_seat(player):
             continue
-
-        # Assign seat
-        used_seats = {p.seat for p in table.players.values() if p.role == PlayerRole.SEATED}
-        seat = 1
-        while seat in used_seats:
-            seat += 1
-
-        player.seat = seat
-        player.role = PlayerRole.SEATED
-        # Don't override stack - player keeps their existing chips
+        _seat(table, player)
         return pid
 
-    return None
-
 
 def get_waitlist_position(table: TableState, pid: str) -> int:
     """
-    Get a player's position in the waitlist (1-indexed).
+    Get a player's position in the waitlist (1-indexed), or in the global
+    waitlist for the stakes if they joined that one.
     Returns 0 if not on waitlist.
     """
-    try:
-        return table.waitlist.index(pid) + 1
-    except ValueError:
-        return 0
+    return table.waitlist.position(pid) or global_waitlist.position(pid)
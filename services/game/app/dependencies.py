@@ -0,0 +1,25 @@
+"""FastAPI dependencies for the game service."""
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+
+from db import User
+from .core.auth import load_admin_user
+
+# Tokens are issued by the lobby service; the game service only validates them
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+
+
+def get_current_admin(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Dependency to require admin privileges.
+
+    Declared sync so FastAPI runs the DB lookup in its threadpool
+    instead of on the event loop.
+
+    Raises:
+        HTTPException: 403 if the token is invalid or the user is not an admin
+    """
+    user = load_admin_user(token)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -8,6 +10,13 @@ from pathlib import Path
 
 from .routes.http import router as http_router
 from .routes.ws import router as ws_router
+from .routes.admin import router as admin_router
+from .core.loop_monitor import monitor as loop_monitor
+from .core.hand_history import hand_writer
+from .core.player_stats import aggregator as stats_aggregator
+from .core.stack_writer import stack_writer
+from .core.occupancy import publisher as occupancy_publisher
+from .core.actor import rearm_hibernated
 
 # Configure logging
 logging.basicConfig(
@@ -15,8 +24,28 @@ logging.basicConfig(
     format='%(levelname)s:     %(message)s'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true":
+        loop_monitor.start()
+    if os.getenv("HAND_HISTORY_ENABLED", "true").lower() == "true":
+        hand_writer.start()
+    if os.getenv("STATS_ENABLED", "true").lower() == "true":
+        stats_aggregator.start()
+    if os.getenv("OCCUPANCY_PUSH_ENABLED", "true").lower() == "true":
+        occupancy_publisher.start()
+    stack_writer.start()
+    rearm_hibernated()
+    yield
+    loop_monitor.stop()
+    await occupancy_publisher.stop()
+    await asyncio.to_thread(stats_aggregator.stop)
+    await asyncio.to_thread(hand_writer.stop)
+    await asyncio.to_thread(stack_writer.stop)
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="PokerLite", version="1.0.0")
+    app = FastAPI(title="PokerLite", version="1.0.0", lifespan=lifespan)
 
     # CORS configuration for development
     # In production, these should be set via environment variables
@@ -33,6 +62,7 @@ def create_app() -> FastAPI:
     # Include API routes
     app.include_router(http_router)
     app.include_router(ws_router)
+    app.include_router(admin_router)
 
     # Serve static files (built React app) if they exist
     static_dir = Path(__file__).parent.parent / "static"
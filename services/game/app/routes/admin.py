@@ -0,0 +1,64 @@
+"""Admin-only diagnostics for the game service."""
+import asyncio
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from db import User
+from ..core import profiler
+from ..core.loop_monitor import monitor
+from ..dependencies import get_current_admin
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/loop")
+def loop_stats(
+    limit: int = Query(50, ge=1, le=200),
+    admin: User = Depends(get_current_admin),
+):
+    """Event-loop lag and recent slow callbacks with table attribution."""
+    return monitor.snapshot(limit=limit)
+
+
+@router.post("/loop/reset")
+def reset_loop_stats(admin: User = Depends(get_current_admin)):
+    """Clear collected lag samples and slow callbacks."""
+    monitor.reset()
+    return {"ok": True}
+
+
+@router.post("/profile")
+async def profile(
+    seconds: float = Query(10, gt=0, le=profiler.MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    threads: str = Query("loop", pattern="^(loop|all)$"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Sample the live process for ``seconds`` and return collapsed stacks.
+
+    ``threads=loop`` samples only the event-loop thread; ``threads=all`` also
+    includes threadpool workers (sync routes, DB calls). The collapsed output
+    can be fed straight into flamegraph.pl or speedscope.
+    """
+    sampler = profiler.SamplingProfiler(
+        interval=interval_ms / 1000,
+        target_thread_id=threading.get_ident(),  # async route runs on the loop thread
+        all_threads=threads == "all",
+    )
+    if not profiler.acquire(sampler):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+        profiler.release(sampler)
+
+    if format == "json":
+        return sampler.summary()
+    return PlainTextResponse(sampler.collapsed())
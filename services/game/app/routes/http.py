@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel
 from typing import Optional
 import os
 
 from ..core.tables import get_table
+from ..core.actor import get_actor
+from ..core.metrics import render_prometheus
+from ..core.compression import STATE_DICTIONARY
 
 router = APIRouter()
 
@@ -19,6 +23,18 @@ def health():
     return {"ok": True, "service": "pokerlite"}
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus-format metrics for this process."""
+    return render_prometheus()
+
+
+@router.get("/api/compression-dictionary")
+def compression_dictionary():
+    """Preset DEFLATE dictionary for websockets opened with ?compress=deflate-dict."""
+    return Response(content=STATE_DICTIONARY, media_type="application/octet-stream")
+
+
 @router.post("/api/test/tables/{table_id}/config")
 async def set_test_config(table_id: str, config: TestConfig):
     """Set test configuration for a table (test mode only).
@@ -30,11 +46,12 @@ async def set_test_config(table_id: str, config: TestConfig):
     if env == "production":
         raise HTTPException(status_code=403, detail="Not available in production")
 
-    table = get_table(table_id)
-    async with table.lock:
+    def apply(table):
         table.deck_seed = config.deck_seed
         table.use_deterministic_deck = config.use_deterministic_deck
 
+    await get_actor(table_id).call(apply)
+
     return {
         "ok": True,
         "table_id": table_id,
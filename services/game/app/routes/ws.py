@@ -1,173 +1,55 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import json
 import secrets
-import asyncio
-import httpx
-import os
 import logging
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-from ..core.tables import get_table, delete_table
-from ..core.protocol import broadcast_state
-from ..core.game import handle_message, handle_disconnect
-from ..core.game_flow import check_turn_timeout
-from ..core.player_utils import active_pids
-from ..core.betting import is_betting_complete
-from ..core.game_flow import advance_turn, advance_street, run_showdown
+from ..core.actor import get_actor, Join, PlayerMessage, Disconnect, Resume
+from ..core.fast_fold import get_pool, FAST_FOLD_STAKES
+from ..core.multiplex import MuxConnection
+from ..core.sessions import tickets
+from ..core.rate_limit import frame_limiter, client_ip
+from ..core.messages import Action, Subscribe, Unsubscribe, decode
+from ..core.compression import negotiate
 from ..core.auth import validate_token_and_load_user
+from ..core.loop_monitor import set_activity
 
 router = APIRouter()
 
-# Track active timeout checkers per table
-_timeout_tasks: dict[str, asyncio.Task] = {}
 
-LOBBY_URL = os.getenv("LOBBY_URL", "http://localhost:8000")
-
-
-async def cleanup_empty_table(table_id: str) -> None:
-    """Delete table from both game and lobby services if all players disconnected."""
-    table = get_table(table_id)
-
-    # Debug: show all players and their connection status
-    all_players = [(p.name, p.connected, p.role.value) for p in table.players.values()]
-    connected_players = [p.name for p in table.players.values() if p.connected]
-    logger.info(f"[CLEANUP] Table {table_id} - Total players: {len(table.players)}, Connected: {len(connected_players)}")
-    logger.info(f"[CLEANUP] All players: {all_players}")
-
-    if table.has_no_connected_players():
-        logger.info(f"[CLEANUP] Table {table_id} has no connected players, deleting...")
-
-        # Delete from game service
-        delete_table(table_id)
-
-        # Delete from lobby service
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(f"{LOBBY_URL}/api/tables/{table_id}", timeout=5.0)
-                if response.status_code == 204:
-                    logger.info(f"[CLEANUP] Table {table_id} deleted from lobby")
-                else:
-                    logger.warning(f"[CLEANUP] Failed to delete table {table_id} from lobby: {response.status_code}")
-        except Exception as e:
-            logger.error(f"[CLEANUP] Error deleting table {table_id} from lobby: {e}")
-
-        # Stop timeout checker task
-        task = _timeout_tasks.pop(table_id, None)
-        if task and not task.done():
-            task.cancel()
-
-
-async def _timeout_checker(table_id: str):
-    """Background task that checks for turn timeouts and handles runouts."""
-    table = get_table(table_id)
-
-    while True:
-        await asyncio.sleep(1)  # Check every second
-
-        # Stop if no connections
-        if not table.connections:
-            break
-
-        info_msg = None
-
-        async with table.lock:
-            if not table.hand_in_progress:
-                continue
-
-            # Handle runout mode (all players all-in)
-            if table.runout_in_progress:
-                logger.debug(f"[RUNOUT] Processing runout on {table.street}")
-                if table.street == "river":
-                    # Runout complete, go to showdown
-                    table.runout_in_progress = False
-                    info_msg = run_showdown(table)
-                    logger.debug(f"[RUNOUT] Showdown complete: {info_msg}")
-                else:
-                    # Deal next street
-                    advance_street(table)
-                    # Clear turn state during runout (no one to act)
-                    table.current_turn_pid = None
-                    table.turn_deadline = None
-                    street_names = {"flop": "Flop", "turn": "Turn", "river": "River"}
-                    street_name = street_names.get(table.street, table.street)
-                    info_msg = f"📋 Dealing {street_name}: {' '.join(table.board)}"
-                    logger.debug(f"[RUNOUT] Advanced to {table.street}: {' '.join(table.board)}")
-
-                # Broadcast info message
-                if info_msg:
-                    for conn_pid, conn_ws in list(table.connections.items()):
-                        try:
-                            await conn_ws.send_text(json.dumps({"type": "info", "message": info_msg}))
-                        except Exception:
-                            pass
-
-                # Broadcast state for this street
-                await broadcast_state(table)
-
-                if table.runout_in_progress:
-                    # Wait 2 seconds before next street for animation
-                    await asyncio.sleep(2)
-                continue
-
-            timed_out, auto_action = check_turn_timeout(table)
-            if not timed_out:
-                continue
-
-            # Process the timeout
-            current_pid = table.current_turn_pid
-            player_name = table.players[current_pid].name if current_pid else "Player"
-
-            # Set last_action for UI animation
-            table.last_action = {"pid": current_pid, "action": "fold" if auto_action == "fold" else "check", "amount": 0}
-
-            # Continue game flow after timeout
-            active = active_pids(table)
-            if len(active) == 1:
-                info_msg = run_showdown(table)
-            elif is_betting_complete(table, active):
-                can_continue = advance_street(table)
-                if not can_continue:
-                    info_msg = run_showdown(table)
-                else:
-                    info_msg = f"{player_name} timed out - auto {auto_action}"
-            else:
-                advance_turn(table)
-                info_msg = f"{player_name} timed out - auto {auto_action}"
-
-        # Broadcast info message
-        if info_msg:
-            for conn_pid, conn_ws in list(table.connections.items()):
-                try:
-                    await conn_ws.send_text(json.dumps({"type": "info", "message": info_msg}))
-                except Exception:
-                    pass
-
-        await broadcast_state(table)
-
-    # Clean up task reference
-    _timeout_tasks.pop(table_id, None)
-
-@router.websocket("/ws/{table_id}")
-async def ws_endpoint(ws: WebSocket, table_id: str):
-    logger.info(f"[WS] WebSocket endpoint called for table {table_id}")
-    await ws.accept()
-    logger.info(f"[WS] WebSocket accepted")
-    table = get_table(table_id)
-
-    # First message must be join
+async def _read_hello(ws: WebSocket) -> Optional[Dict[str, Any]]:
+    """The client's opening frame, or None (and the socket closed) if it is not a JSON object."""
     try:
         first = await ws.receive_text()
         hello = json.loads(first)
     except Exception as e:
         logger.error(f"[WS] Error receiving/parsing join message: {e}")
         await ws.close()
-        return
+        return None
+    if not isinstance(hello, dict):
+        await ws.close()
+        return None
+    return hello
+
 
+async def _handshake(ws: WebSocket, where: str,
+                     hello: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, str, int, Optional[int]]]:
+    """Accept the socket and read the join frame: (pid, name, stack, user_id), or None once closed."""
+    if hello is None:
+        await ws.accept()
+        logger.info(f"[WS] WebSocket accepted")
+        set_activity(where, "join")
+        hello = await _read_hello(ws)
+        if hello is None:
+            return None
+
+    # First message must be join
     if hello.get("type") != "join":
         await ws.send_text(json.dumps({"type": "info", "message": "first message must be type=join"}))
         await ws.close()
-        return
+        return None
 
     # Check for authentication token
     token = hello.get("token")
@@ -188,81 +70,172 @@ async def ws_endpoint(ws: WebSocket, table_id: str):
             logger.warning(f"[AUTH] Token validation failed, closing connection")
             await ws.send_text(json.dumps({"type": "error", "message": "Invalid authentication token"}))
             await ws.close()
-            return
+            return None
     else:
         # Guest player (no auth)
         name = (hello.get("name") or "guest")[:24]
         pid = hello.get("pid") or secrets.token_hex(8)
         logger.info(f"[WS] Guest player {name} connecting (no auth)")
 
-    async with table.lock:
-        # Check if player is already connected
-        if pid in table.connections:
-            logger.warning(f"[WS] Player {pid} ({name}) reconnecting - closing old connection")
-            try:
-                old_ws = table.connections[pid]
-                await old_ws.close()
-            except Exception as e:
-                logger.error(f"[WS] Error closing old connection: {e}")
+    return pid, name, initial_stack, user_id
 
-        table.upsert_player(pid=pid, name=name, stack=initial_stack)
-        table.connections[pid] = ws
 
-        # Store user_id in player metadata for later stack updates
-        if user_id:
-            if not hasattr(table, 'user_ids'):
-                table.user_ids = {}
-            table.user_ids[pid] = user_id
-
-        logger.info(f"[WS] Player {pid} ({name}) connected to table {table_id} with {initial_stack} chips")
+@router.websocket("/ws/{table_id}")
+async def ws_endpoint(ws: WebSocket, table_id: str):
+    logger.info(f"[WS] WebSocket endpoint called for table {table_id}")
+    await ws.accept()
+    set_activity(table_id, "join")
+    hello = await _read_hello(ws)
+    if hello is None:
+        return
 
-    # Start timeout checker if not running
-    if table_id not in _timeout_tasks or _timeout_tasks[table_id].done():
-        _timeout_tasks[table_id] = asyncio.create_task(_timeout_checker(table_id))
+    sock = negotiate(ws)  # What the table sends on: compressing, if the client asked
+    resumed = await _resume(sock, table_id, hello) if hello.get("type") == "resume" else None
+    if resumed is not None:
+        pid, name, token = resumed
+    else:
+        if hello.get("type") == "resume":
+            # Too late (or a bad ticket): the client starts over with a normal join
+            await ws.send_text(json.dumps({"type": "resume_failed"}))
+            hello = await _read_hello(ws)
+            if hello is None:
+                return
+        joined = await _handshake(ws, table_id, hello)
+        if joined is None:
+            return
+        pid, name, initial_stack, user_id = joined
+        token = tickets.issue(pid, name, table_id)
 
-    await ws.send_text(json.dumps({"type": "welcome", "pid": pid}))
-    await broadcast_state(table)
+        # The table actor seats the player, sends welcome and broadcasts state
+        await get_actor(table_id).request(Join(
+            ws=sock, pid=pid, name=name, stack=initial_stack, user_id=user_id, ticket=token,
+        ))
 
+    bucket, ip = frame_limiter.connection(), client_ip(ws)
     try:
         while True:
             raw = await ws.receive_text()
-            msg = json.loads(raw)
+            if not frame_limiter.check(bucket, pid, ip):
+                continue  # Over a rate limit: dropped before it is even decoded
+            msg = decode(raw)
+            if msg is None:
+                continue  # Malformed or unknown: never queued on the table
+            set_activity(table_id, msg.type)
+            get_actor(table_id).submit(PlayerMessage(pid=pid, msg=msg))
 
-            async with table.lock:
-                info_msg = await handle_message(table, pid, msg)
+    except WebSocketDisconnect:
+        logger.info(f"[WS] Player {pid} ({name}) disconnected from table {table_id}")
+    finally:
+        set_activity(table_id, "disconnect")
+        # After the grace window the actor folds the player out if needed and deletes the table once nobody is left
+        tickets.release(token)
+        await get_actor(table_id).request(Disconnect(pid=pid, ws=sock, grace=tickets.grace_seconds))
+
+
+async def _resume(ws: Any, table_id: str, hello: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+    """Reattach a dropped player from their resume ticket: (pid, name, new ticket), or None."""
+    # Only used up once the table takes the resume: a resume attempt while the
+    # original socket is still attached must leave that session its ticket
+    ticket = tickets.peek(hello.get("ticket"), table_id)
+    if ticket is None:
+        return None
+    last_seq = hello.get("last_seq")
+    if not isinstance(last_seq, int) or isinstance(last_seq, bool):
+        last_seq = -1  # Nothing to replay from: the client just gets the current state
+    token = tickets.issue(ticket.pid, ticket.name, table_id)
+    if not await get_actor(table_id).request(Resume(ws=ws, pid=ticket.pid, last_seq=last_seq, ticket=token)):
+        tickets.discard(token)
+        return None
+    tickets.discard(hello["ticket"])
+    logger.info(f"[WS] Player {ticket.pid} ({ticket.name}) resumed at table {table_id}")
+    return ticket.pid, ticket.name, token
+
+
+@router.websocket("/ws/fast-fold/{big_blind}")
+async def fast_fold_endpoint(ws: WebSocket, big_blind: int):
+    """Join the fast-fold pool for a stake level; frames go to whichever hand the player is in."""
+    pool_id = f"ff-{big_blind}"
+    if big_blind not in FAST_FOLD_STAKES:
+        await ws.accept()
+        await ws.send_text(json.dumps({"type": "error", "message": f"No fast-fold pool for big blind {big_blind}"}))
+        await ws.close()
+        return
+    joined = await _handshake(ws, pool_id)
+    if joined is None:
+        return
+    pid, name, initial_stack, user_id = joined
 
-            # Broadcast info message if there is one
-            if info_msg:
-                for conn_pid, conn_ws in table.connections.items():
-                    try:
-                        await conn_ws.send_text(json.dumps({"type": "info", "message": info_msg}))
-                    except Exception:
-                        pass
+    pool = get_pool(big_blind)
+    sock = negotiate(ws)
+    await pool.request(Join(ws=sock, pid=pid, name=name, stack=initial_stack, user_id=user_id))
 
-            await broadcast_state(table)
+    bucket, ip = frame_limiter.connection(), client_ip(ws)
+    try:
+        while True:
+            raw = await ws.receive_text()
+            if not frame_limiter.check(bucket, pid, ip):
+                continue
+            msg = decode(raw)
+            if not isinstance(msg, Action):
+                continue  # Only betting actions make sense in a pool
+            set_activity(pool_id, msg.type)
+            pool.submit(PlayerMessage(pid=pid, msg=msg))
 
     except WebSocketDisconnect:
-        logger.info(f"[WS] Player {pid} ({name}) disconnected from table {table_id}")
-        async with table.lock:
-            table.connections.pop(pid, None)
+        logger.info(f"[WS] Player {pid} ({name}) left fast-fold pool {pool_id}")
+    finally:
+        set_activity(pool_id, "disconnect")
+        await pool.request(Disconnect(pid=pid, ws=sock))
 
-            # Handle in-game disconnect (fold player out if needed)
-            info_msg = handle_disconnect(table, pid)
-            if info_msg:
-                logger.info(f"[WS] Disconnect handled: {info_msg}")
 
-            # Mark player as disconnected (preserves their stack and data)
-            table.mark_disconnected(pid)
+@router.websocket("/ws")
+async def mux_endpoint(ws: WebSocket):
+    """One connection for several tables: frames carry table_id and go out in batches."""
+    joined = await _handshake(ws, "mux")
+    if joined is None:
+        return
+    pid, name, initial_stack, user_id = joined
 
-        # Broadcast disconnect info if applicable
-        if info_msg:
-            for conn_pid, conn_ws in table.connections.items():
-                try:
-                    await conn_ws.send_text(json.dumps({"type": "info", "message": info_msg}))
-                except Exception:
-                    pass
+    conn = MuxConnection(negotiate(ws))
+    conn.start()
+    conn.queue(json.dumps({"type": "welcome", "pid": pid}))
 
-        await broadcast_state(table)
+    bucket, ip = frame_limiter.connection(), client_ip(ws)
+    try:
+        while True:
+            raw = await ws.receive_text()
+            if not frame_limiter.check(bucket, pid, ip):
+                continue
+            msg = decode(raw)
+            if msg is None:
+                continue
+            table_id = msg.table_id
+            if table_id is None:
+                conn.queue(json.dumps({"type": "error", "message": "table_id is required"}))
+                continue
+            set_activity(table_id, msg.type)
+
+            if isinstance(msg, Subscribe):
+                channel = conn.subscribe(table_id)
+                if channel is None:
+                    conn.queue(json.dumps({"type": "error", "table_id": table_id,
+                                           "message": f"At most {conn.max_tables} tables per connection"}))
+                    continue
+                await get_actor(table_id).request(Join(
+                    ws=channel, pid=pid, name=name, stack=initial_stack, user_id=user_id,
+                    spectator=msg.spectate,
+                ))
+            elif isinstance(msg, Unsubscribe):
+                channel = conn.unsubscribe(table_id)
+                if channel is not None:
+                    await get_actor(table_id).request(Disconnect(pid=pid, ws=channel))
+            elif table_id in conn.channels:
+                get_actor(table_id).submit(PlayerMessage(pid=pid, msg=msg))
 
-        # Check if all players are disconnected and clean up if so
-        await cleanup_empty_table(table_id)
+    except WebSocketDisconnect:
+        logger.info(f"[WS] Player {pid} ({name}) disconnected from {len(conn.channels)} tables")
+    finally:
+        # Fold the player out of every table they were subscribed to
+        for table_id, channel in await conn.close():
+            set_activity(table_id, "disconnect")
+            await get_actor(table_id).request(Disconnect(pid=pid, ws=channel))
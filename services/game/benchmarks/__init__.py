@@ -0,0 +1 @@
+"""Micro-benchmarks for game-service hot paths. Run with ``python -m benchmarks``."""
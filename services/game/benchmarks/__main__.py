@@ -0,0 +1,72 @@
+"""
+Run the micro-benchmark suite and compare against a stored baseline.
+
+    python -m benchmarks                    # run, write results.json, compare to baseline.json
+    python -m benchmarks --save-baseline    # run and store the results as the new baseline
+    python -m benchmarks --filter protocol  # only cases whose name contains "protocol"
+
+Exits with status 1 when any case is slower than the baseline by more than
+``--threshold`` (default 20%).
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .cases import all_benchmarks
+from .harness import compare, print_results, run_benchmark, to_document
+
+HERE = Path(__file__).parent
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds per timed repeat")
+    parser.add_argument("--quick", action="store_true", help="Fewer, shorter repeats (smoke test)")
+    parser.add_argument("--output", type=Path, default=HERE / "results.json")
+    parser.add_argument("--baseline", type=Path, default=HERE / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed slowdown before failing (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.quick:
+        args.repeats, args.min_time = 3, 0.01
+
+    benches = [b for b in all_benchmarks(args.seed) if args.filter in b.name]
+    results = []
+    for bench in benches:
+        print(f"running {bench.name} ...", file=sys.stderr)
+        results.append(run_benchmark(bench, min_time=args.min_time, repeats=args.repeats))
+
+    document = to_document(results, args.seed)
+    args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    comparisons = []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    elif args.baseline.exists():
+        comparisons = compare(document, json.loads(args.baseline.read_text()), args.threshold)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+
+    print_results(results, comparisons)
+    print(f"\nResults written to {args.output}")
+
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for c in regressions:
+            print(f"  {c.name}: {c.baseline_ns:.0f} ns -> {c.current_ns:.0f} ns ({c.ratio:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
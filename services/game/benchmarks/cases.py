@@ -0,0 +1,140 @@
+"""
+Benchmark cases for poker_logic, game_flow and protocol hot paths.
+
+Every input is generated from a fixed seed so runs are comparable across
+machines and commits.
+"""
+import itertools
+import random
+from typing import List
+
+from poker.card_utils import new_deck
+from poker.poker_logic import evaluate_hand, evaluate_hand_with_cards
+from app.core.models import TableState
+from app.core.game_flow import start_new_hand, calculate_side_pots
+from app.core.protocol import public_state, broadcast_state
+from app.core.actions import handle_message
+
+from .harness import Benchmark
+
+PLAYER_COUNTS = (2, 6, 8)
+SPECTATOR_COUNTS = (0, 10, 100)
+HAND_POOL_SIZE = 1000
+
+
+class NullWebSocket:
+    """Stands in for a client connection; counts bytes instead of sending them."""
+
+    def __init__(self):
+        self.bytes_sent = 0
+
+    async def send_text(self, text: str) -> None:
+        self.bytes_sent += len(text)
+
+
+def _hand_pool(seed: int, size: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    deck = new_deck()
+    return [rng.sample(deck, size) for _ in range(HAND_POOL_SIZE)]
+
+
+def build_table(players: int, spectators: int = 0, seed: int = 0, connect: bool = False) -> TableState:
+    """A table with ``players`` seated, ``spectators`` on the rail and a hand dealt."""
+    table = TableState(table_id=f"bench-{players}-{spectators}", deck_seed=seed, use_deterministic_deck=True)
+    for i in range(players):
+        table.upsert_player(f"p{i}", f"Player{i}")
+    for i in range(spectators):
+        table.upsert_player(f"s{i}", f"Rail{i}", force_spectator=True)
+    if connect:
+        table.connections = {pid: NullWebSocket() for pid in table.players}
+    start_new_hand(table)
+    return table
+
+
+def _evaluate(seed: int, size: int):
+    def setup():
+        hands = itertools.cycle(_hand_pool(seed, size))
+        return lambda: evaluate_hand(next(hands))
+    return setup
+
+
+def _evaluate_with_cards(seed: int):
+    def setup():
+        hands = itertools.cycle(_hand_pool(seed, 7))
+        return lambda: evaluate_hand_with_cards(next(hands))
+    return setup
+
+
+def _side_pots(seed: int, players: int):
+    def setup():
+        rng = random.Random(seed)
+        table = build_table(players, seed=seed)
+        pids = list(table.players)
+        # Staggered all-in amounts so every level creates a side pot
+        table.total_contributions = {pid: rng.randrange(10, 1000, 10) for pid in pids}
+        table.pot = sum(table.total_contributions.values())
+        return lambda: calculate_side_pots(table, pids)
+    return setup
+
+
+def _public_state(seed: int, players: int, spectators: int):
+    def setup():
+        table = build_table(players, spectators, seed=seed)
+        viewer = "p0"
+        return lambda: public_state(table, viewer)
+    return setup
+
+
+def _broadcast(seed: int, players: int, spectators: int):
+    def setup():
+        table = build_table(players, spectators, seed=seed, connect=True)
+        return lambda: broadcast_state(table)
+    return setup
+
+
+def _start_hand(seed: int, players: int):
+    def setup():
+        table = build_table(players, seed=seed)
+
+        def run():
+            table.hand_in_progress = False
+            start_new_hand(table)
+        return run
+    return setup
+
+
+def _full_hand(seed: int, players: int):
+    """Deal and play a check/call hand through showdown via handle_message."""
+    def setup():
+        table = build_table(players, seed=seed)
+        call = {"type": "action", "action": "call"}
+        check = {"type": "action", "action": "check"}
+
+        async def run():
+            for p in table.players.values():
+                p.stack = 1000
+            table.hand_in_progress = False
+            start_new_hand(table)
+            while table.hand_in_progress and not table.runout_in_progress:
+                pid = table.current_turn_pid
+                to_call = table.current_bet - table.player_bets.get(pid, 0)
+                await handle_message(table, pid, call if to_call > 0 else check)
+        return run
+    return setup
+
+
+def all_benchmarks(seed: int = 42) -> List[Benchmark]:
+    benches = [
+        Benchmark("poker_logic.evaluate_hand[5]", "poker_logic", _evaluate(seed, 5), {"cards": 5}),
+        Benchmark("poker_logic.evaluate_hand[7]", "poker_logic", _evaluate(seed, 7), {"cards": 7}),
+        Benchmark("poker_logic.evaluate_hand_with_cards[7]", "poker_logic", _evaluate_with_cards(seed), {"cards": 7}),
+    ]
+    for n in PLAYER_COUNTS:
+        benches.append(Benchmark(f"game_flow.calculate_side_pots[p{n}]", "game_flow", _side_pots(seed, n), {"players": n}))
+        benches.append(Benchmark(f"game_flow.start_new_hand[p{n}]", "game_flow", _start_hand(seed, n), {"players": n}))
+        benches.append(Benchmark(f"game_flow.full_hand[p{n}]", "game_flow", _full_hand(seed, n), {"players": n}, is_async=True))
+    for n, s in itertools.product(PLAYER_COUNTS, SPECTATOR_COUNTS):
+        params = {"players": n, "spectators": s}
+        benches.append(Benchmark(f"protocol.public_state[p{n},s{s}]", "protocol", _public_state(seed, n, s), params))
+        benches.append(Benchmark(f"protocol.broadcast_state[p{n},s{s}]", "protocol", _broadcast(seed, n, s), params, is_async=True))
+    return benches
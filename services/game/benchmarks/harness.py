@@ -0,0 +1,156 @@
+"""
+Timing harness: calibrates iteration counts, collects repeat timings and
+compares results against a stored baseline.
+"""
+import asyncio
+import contextlib
+import io
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Benchmark:
+    """A named hot-path call. ``setup`` returns the zero-arg callable to time."""
+    name: str
+    group: str
+    setup: Callable[[], Callable]
+    params: Dict[str, object] = field(default_factory=dict)
+    is_async: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    params: Dict[str, object]
+    iterations: int
+    repeats: int
+    median_ns: float
+    min_ns: float
+    stdev_ns: float
+    ops_per_second: float
+
+
+def _time_sync(fn: Callable, iterations: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter_ns() - start
+
+
+def _time_async(fn: Callable, iterations: int, loop: asyncio.AbstractEventLoop) -> int:
+    async def body():
+        for _ in range(iterations):
+            await fn()
+
+    start = time.perf_counter_ns()
+    loop.run_until_complete(body())
+    return time.perf_counter_ns() - start
+
+
+def run_benchmark(bench: Benchmark, min_time: float = 0.05, repeats: int = 5) -> Result:
+    """Time ``bench``: grow iterations until one repeat takes ``min_time``, then repeat."""
+    fn = bench.setup()
+    loop = asyncio.new_event_loop() if bench.is_async else None
+
+    def timed(n: int) -> int:
+        # Game code prints debug lines on some paths; keep them out of the timings' output
+        with contextlib.redirect_stdout(io.StringIO()):
+            return _time_async(fn, n, loop) if loop else _time_sync(fn, n)
+
+    try:
+        timed(1)  # Warm up caches and lazy imports
+        iterations = 1
+        while True:
+            elapsed = timed(iterations)
+            if elapsed >= min_time * 1e9 or iterations >= 1_000_000:
+                break
+            iterations *= 2 if elapsed == 0 else max(2, min(10, int(min_time * 1e9 / elapsed) + 1))
+
+        per_call = [timed(iterations) / iterations for _ in range(repeats)]
+    finally:
+        if loop:
+            loop.close()
+
+    median = statistics.median(per_call)
+    return Result(
+        name=bench.name,
+        group=bench.group,
+        params=bench.params,
+        iterations=iterations,
+        repeats=repeats,
+        median_ns=round(median, 1),
+        min_ns=round(min(per_call), 1),
+        stdev_ns=round(statistics.stdev(per_call), 1) if repeats > 1 else 0.0,
+        ops_per_second=round(1e9 / median, 1) if median else 0.0,
+    )
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def to_document(results: List[Result], seed: int) -> dict:
+    return {
+        "environment": environment(),
+        "seed": seed,
+        "results": {r.name: asdict(r) for r in results},
+    }
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_ns: float
+    current_ns: float
+    ratio: float
+    regressed: bool
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[Comparison]:
+    """Compare median timings; a case regresses when it is more than ``threshold`` slower."""
+    comparisons = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("median_ns"):
+            continue
+        ratio = result["median_ns"] / base["median_ns"]
+        comparisons.append(Comparison(
+            name=name,
+            baseline_ns=base["median_ns"],
+            current_ns=result["median_ns"],
+            ratio=round(ratio, 3),
+            regressed=ratio > 1 + threshold,
+        ))
+    return comparisons
+
+
+def format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def print_results(results: List[Result], comparisons: Optional[List[Comparison]] = None) -> None:
+    by_name = {c.name: c for c in comparisons or []}
+    width = max((len(r.name) for r in results), default=10)
+    print(f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'ops/s':>12}  {'vs baseline':>12}")
+    for r in results:
+        cmp = by_name.get(r.name)
+        delta = ""
+        if cmp:
+            delta = f"{(cmp.ratio - 1) * 100:+.1f}%" + (" !!" if cmp.regressed else "")
+        print(f"{r.name:<{width}}  {format_ns(r.median_ns):>10}  {format_ns(r.min_ns):>10}  {r.ops_per_second:>12,.0f}  {delta:>12}")
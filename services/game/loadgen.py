@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Websocket load generator for the game service.
+
+Creates tables through the lobby API, then opens one websocket per simulated
+player/spectator to /ws/{table_id}, performs the join handshake and plays
+legal actions from received state frames. Reports action-to-broadcast latency
+percentiles (time from sending an action to the next state frame) and
+throughput.
+
+Example (lobby on :8000, game on :8001):
+    python loadgen.py --tables 50 --players 6 --spectators 10 --duration 60
+
+Thousands of sockets need a raised fd limit (``ulimit -n 65536``).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import httpx
+import websockets
+
+
+@dataclass
+class Stats:
+    """Aggregated results shared by all simulated clients."""
+    latencies: List[float] = field(default_factory=list)
+    actions_sent: int = 0
+    starts_sent: int = 0
+    frames_received: int = 0
+    bytes_received: int = 0
+    connected: int = 0
+    connect_errors: int = 0
+    disconnects: int = 0
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        data = sorted(self.latencies)
+        idx = min(len(data) - 1, int(p / 100 * len(data)))
+        return data[idx] * 1000
+
+    def report(self, elapsed: float) -> dict:
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "connected": self.connected,
+            "connect_errors": self.connect_errors,
+            "disconnects": self.disconnects,
+            "actions_sent": self.actions_sent,
+            "starts_sent": self.starts_sent,
+            "frames_received": self.frames_received,
+            "bytes_received": self.bytes_received,
+            "actions_per_second": round(self.actions_sent / elapsed, 2) if elapsed else 0,
+            "frames_per_second": round(self.frames_received / elapsed, 2) if elapsed else 0,
+            "latency_ms": {
+                "samples": len(self.latencies),
+                "p50": round(self.percentile(50), 2),
+                "p90": round(self.percentile(90), 2),
+                "p99": round(self.percentile(99), 2),
+                "max": round(max(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            },
+        }
+
+
+class SimClient:
+    """One websocket connection: a seated player or a spectator."""
+
+    def __init__(self, args, stats: Stats, table_id: str, name: str, is_dealer: bool, rng: random.Random):
+        self.args = args
+        self.stats = stats
+        self.table_id = table_id
+        self.name = name
+        self.is_dealer = is_dealer  # The one client per table that sends "start"
+        self.rng = rng
+        self.pid: Optional[str] = None
+        self.pending_since: Optional[float] = None
+        self._acting = False
+        self._start_scheduled = False
+
+    async def run(self, deadline: float) -> None:
+        uri = f"{self.args.game_ws_url}/ws/{self.table_id}"
+        try:
+            ws = await websockets.connect(uri, max_size=None, ping_interval=None, open_timeout=30)
+        except Exception:
+            self.stats.connect_errors += 1
+            return
+
+        self.stats.connected += 1
+        try:
+            await ws.send(json.dumps({"type": "join", "name": self.name}))
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                await self._on_frame(ws, raw)
+        except websockets.ConnectionClosed:
+            self.stats.disconnects += 1
+        finally:
+            await ws.close()
+
+    async def _on_frame(self, ws, raw: str) -> None:
+        self.stats.frames_received += 1
+        self.stats.bytes_received += len(raw)
+        msg = json.loads(raw)
+        mtype = msg.get("type")
+
+        if mtype == "welcome":
+            self.pid = msg.get("pid")
+            return
+        if mtype != "state":
+            return
+
+        # The first state after our action is the broadcast it triggered
+        if self.pending_since is not None:
+            self.stats.latencies.append(time.perf_counter() - self.pending_since)
+            self.pending_since = None
+
+        state = msg["state"]
+        if not state.get("hand_in_progress"):
+            if self.is_dealer and not self._start_scheduled and len(state.get("players", [])) >= 2:
+                self._start_scheduled = True
+                asyncio.create_task(self._start_hand_later(ws))
+            return
+
+        if state.get("current_turn_pid") == self.pid and state.get("my_role") == "seated" and not self._acting:
+            self._acting = True
+            asyncio.create_task(self._act(ws, state))
+
+    async def _start_hand_later(self, ws) -> None:
+        await asyncio.sleep(self.args.hand_delay)
+        self._start_scheduled = False
+        try:
+            await ws.send(json.dumps({"type": "start"}))
+            self.stats.starts_sent += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _act(self, ws, state: dict) -> None:
+        await asyncio.sleep(self.rng.uniform(self.args.think_min, self.args.think_max) / 1000)
+        action = self._choose_action(state)
+        self.pending_since = time.perf_counter()
+        try:
+            await ws.send(json.dumps(action))
+            self.stats.actions_sent += 1
+        except websockets.ConnectionClosed:
+            self.pending_since = None
+        finally:
+            self._acting = False
+
+    def _choose_action(self, state: dict) -> dict:
+        to_call = state.get("current_bet", 0) - state.get("player_bets", {}).get(self.pid, 0)
+        roll = self.rng.random()
+        if to_call <= 0:
+            if roll < self.args.raise_rate:
+                return {"type": "action", "action": "raise", "amount": max(state.get("current_bet", 0) * 2, 20)}
+            return {"type": "action", "action": "check"}
+        if roll < self.args.fold_rate:
+            return {"type": "action", "action": "fold"}
+        return {"type": "action", "action": "call"}
+
+
+async def create_tables(args) -> List[str]:
+    """Create tables through the lobby API. Seats = players so extra joiners become spectators."""
+    table_ids = []
+    async with httpx.AsyncClient(base_url=args.lobby_url, timeout=10.0) as client:
+        for i in range(args.tables):
+            response = await client.post("/api/tables", json={
+                "name": f"load-{i}",
+                "small_blind": 5,
+                "big_blind": 10,
+                "max_players": max(2, min(args.players, 8)),
+                "turn_timeout_seconds": 120,
+            })
+            response.raise_for_status()
+            table_ids.append(response.json()["table_id"])
+    return table_ids
+
+
+async def main(args) -> dict:
+    rng = random.Random(args.seed)
+    stats = Stats()
+
+    table_ids = await create_tables(args)
+    print(f"Created {len(table_ids)} tables via {args.lobby_url}")
+
+    players = [
+        SimClient(args, stats, table_id, f"bot{i}", is_dealer=(i == 0), rng=random.Random(rng.random()))
+        for table_id in table_ids
+        for i in range(args.players)
+    ]
+    spectators = [
+        SimClient(args, stats, table_id, f"rail{i}", is_dealer=False, rng=random.Random(rng.random()))
+        for table_id in table_ids
+        for i in range(args.spectators)
+    ]
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    tasks = await _launch(players, deadline, args.ramp)
+    if spectators:
+        # Give players time to take the seats so later joiners land on the rail
+        await asyncio.sleep(args.spectator_delay)
+        tasks += await _launch(spectators, deadline, args.ramp)
+
+    await asyncio.gather(*tasks)
+    report = stats.report(time.perf_counter() - started)
+    report["tables"] = len(table_ids)
+    report["clients"] = len(players) + len(spectators)
+    return report
+
+
+async def _launch(clients: List[SimClient], deadline: float, ramp: int) -> List[asyncio.Task]:
+    """Start clients, opening at most ``ramp`` connections per second."""
+    tasks = []
+    for i, client in enumerate(clients):
+        tasks.append(asyncio.create_task(client.run(deadline)))
+        if ramp and (i + 1) % ramp == 0:
+            await asyncio.sleep(1)
+    return tasks
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Websocket load generator for the game service")
+    parser.add_argument("--lobby-url", default="http://localhost:8000")
+    parser.add_argument("--game-ws-url", default="ws://localhost:8001")
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--players", type=int, default=6, help="Seated players per table")
+    parser.add_argument("--spectators", type=int, default=0, help="Spectators per table")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--think-min", type=float, default=200, help="Minimum think time (ms)")
+    parser.add_argument("--think-max", type=float, default=1500, help="Maximum think time (ms)")
+    parser.add_argument("--hand-delay", type=float, default=1.0, help="Seconds between hands")
+    parser.add_argument("--fold-rate", type=float, default=0.2)
+    parser.add_argument("--raise-rate", type=float, default=0.1)
+    parser.add_argument("--spectator-delay", type=float, default=2.0, help="Seconds to wait before spectators connect")
+    parser.add_argument("--ramp", type=int, default=200, help="Connections opened per second (0 = all at once)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
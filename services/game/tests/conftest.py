@@ -2,9 +2,16 @@
 Shared test fixtures for pokerlite tests.
 """
 import pytest
+from app.core import hibernation
 from app.core.models import TableState, Player
 
 
+@pytest.fixture(autouse=True)
+def hibernate_dir(tmp_path, monkeypatch):
+    """Tables hibernated by a test go to its own directory, never to a shared one."""
+    monkeypatch.setattr(hibernation.store, "directory", str(tmp_path / "hibernated"))
+
+
 @pytest.fixture
 def empty_table():
     """Create an empty table state."""
@@ -1,6 +1,6 @@
 """Tests for action handling."""
 import pytest
-from app.core.actions import handle_message
+from app.core.actions import handle_message, apply_pre_actions
 from app.core.game_flow import start_new_hand
 from app.core.models import TableState, Player, PlayerRole
 
@@ -261,3 +261,77 @@ class TestActionHandling:
         # Should now be in runout mode with turn cleared
         assert table.runout_in_progress is True
         assert table.current_turn_pid is None
+
+
+class TestPreActions:
+    """Tests for pre-actions queued before the player's turn."""
+
+    @pytest.mark.asyncio
+    async def test_queued_turns_resolve_in_one_pass(self, table_with_three_players):
+        """call_any and check_fold play out as soon as the turn reaches them."""
+        table = table_with_three_players
+        start_new_hand(table)
+        first, second, third = "p1", "p2", "p3"  # UTG, small blind, big blind
+        assert table.current_turn_pid == first
+
+        await handle_message(table, second, {"type": "pre_action", "action": "call_any"})
+        await handle_message(table, third, {"type": "pre_action", "action": "check_fold"})
+        await handle_message(table, first, {"type": "action", "action": "call"})
+        messages = await apply_pre_actions(table)
+
+        assert messages[0] == "Bob calls $5"
+        assert "Dealing Flop" in messages[1]
+        assert table.street == "flop"
+        assert table.pre_actions == {}
+
+    @pytest.mark.asyncio
+    async def test_call_up_to_is_dropped_after_a_bigger_raise(self, table_with_three_players):
+        table = table_with_three_players
+        start_new_hand(table)
+
+        await handle_message(table, "p2", {"type": "pre_action", "action": "call_up_to", "amount": 20})
+        await handle_message(table, "p1", {"type": "action", "action": "raise", "amount": 100})
+
+        assert await apply_pre_actions(table) == []
+        assert table.current_turn_pid == "p2"
+        assert "p2" not in table.pre_actions
+
+    @pytest.mark.asyncio
+    async def test_check_fold_folds_facing_a_bet(self, table_with_three_players):
+        table = table_with_three_players
+        start_new_hand(table)
+
+        await handle_message(table, "p2", {"type": "pre_action", "action": "check_fold"})
+        await handle_message(table, "p1", {"type": "action", "action": "call"})
+        await apply_pre_actions(table)
+
+        assert "p2" in table.folded_pids
+        assert table.current_turn_pid == "p3"
+
+    @pytest.mark.asyncio
+    async def test_invalid_pre_actions_are_ignored(self, table_with_three_players):
+        table = table_with_three_players
+        await handle_message(table, "p2", {"type": "pre_action", "action": "call_any"})
+        assert table.pre_actions == {}  # No hand running
+
+        start_new_hand(table)
+        for msg in ({"action": "raise"}, {"action": "call_up_to"}, {"action": "call_up_to", "amount": -5}):
+            await handle_message(table, "p2", {"type": "pre_action", **msg})
+        assert table.pre_actions == {}
+
+        await handle_message(table, "p2", {"type": "pre_action", "action": "call_any"})
+        await handle_message(table, "p2", {"type": "pre_action", "action": None})
+        assert table.pre_actions == {}
+
+    @pytest.mark.asyncio
+    async def test_pre_actions_last_one_street(self, table_with_three_players):
+        table = table_with_three_players
+        start_new_hand(table)
+        for pid in ("p1", "p2"):
+            await handle_message(table, pid, {"type": "action", "action": "call"})
+        await handle_message(table, "p1", {"type": "pre_action", "action": "call_any"})
+
+        await handle_message(table, "p3", {"type": "action", "action": "check"})
+
+        assert table.street == "flop"
+        assert table.pre_actions == {}
@@ -0,0 +1,214 @@
+"""
+Tests for the per-table actor and the central timer service.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core import tables
+from app.core.actor import TableActor, Join, PlayerMessage, Disconnect, Call, get_actor, _actors
+from app.core.models import TableState
+from app.core.timers import TimerService, timers
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def frames(self, mtype: str):
+        return [f for f in self.sent if f["type"] == mtype]
+
+
+@pytest.fixture
+def actor(monkeypatch):
+    """An actor for a table registered in the table store (no lobby round trip)."""
+    table = TableState(table_id="actor-test")
+    tables._tables[table.table_id] = table
+
+    async def no_lobby(self):
+        pass
+
+    monkeypatch.setattr(TableActor, "_delete_from_lobby", no_lobby)
+    yield get_actor(table.table_id)
+    timers.cancel_owner(table.table_id)
+    tables._tables.pop(table.table_id, None)
+    _actors.pop(table.table_id, None)
+
+
+async def _join(actor, pid):
+    ws = FakeWebSocket()
+    await actor.request(Join(ws=ws, pid=pid, name=pid.upper(), stack=1000))
+    return ws
+
+
+class TestTableActor:
+    @pytest.mark.asyncio
+    async def test_join_sends_welcome_then_state(self, actor):
+        ws = await _join(actor, "p1")
+
+        assert [f["type"] for f in ws.sent] == ["welcome", "state"]
+        assert ws.sent[0]["pid"] == "p1"
+        assert "p1" in actor.table.players
+
+    @pytest.mark.asyncio
+    async def test_queued_commands_are_applied_as_one_batch(self, actor):
+        ws1 = await _join(actor, "p1")
+        ws2 = await _join(actor, "p2")
+        ws1.sent.clear()
+        batches = actor.batches
+
+        actor.submit(PlayerMessage(pid="p1", msg={"type": "start"}))
+        # Queued behind "start", so it sees the dealt hand
+        pid = await actor.call(lambda table: table.current_turn_pid)
+
+        assert pid in ("p1", "p2")
+        assert actor.batches == batches + 1
+        assert len(ws1.frames("state")) == 1  # One broadcast for the whole batch
+
+    @pytest.mark.asyncio
+    async def test_commands_apply_in_submission_order(self, actor):
+        await _join(actor, "p1")
+        await _join(actor, "p2")
+        seen = []
+
+        for i in range(5):
+            actor.submit(Call(lambda t, i=i: seen.append(i)))
+        await actor.call(lambda t: None)
+
+        assert seen == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_stale_disconnect_is_ignored(self, actor):
+        old = await _join(actor, "p1")
+        await _join(actor, "p2")
+        new = await _join(actor, "p1")
+
+        assert old.closed
+        await actor.request(Disconnect(pid="p1", ws=old))
+
+        assert actor.table.connections["p1"] is new
+        assert actor.table.players["p1"].connected
+
+    @pytest.mark.asyncio
+    async def test_pre_action_resolves_in_the_same_broadcast(self, actor):
+        await _join(actor, "p1")
+        ws = await _join(actor, "p2")
+        await actor.request(PlayerMessage(pid="p1", msg={"type": "start"}))
+        first = actor.table.current_turn_pid
+        other = "p2" if first == "p1" else "p1"
+        await actor.request(PlayerMessage(pid=other, msg={"type": "pre_action", "action": "check_fold"}))
+        ws.sent.clear()
+
+        await actor.request(PlayerMessage(pid=first, msg={"type": "action", "action": "call"}))
+
+        assert actor.table.street == "flop"  # The big blind's check was played without a round trip
+        assert len(ws.frames("state")) == 1
+
+    @pytest.mark.asyncio
+    async def test_broadcast_failure_resolves_callers_and_keeps_the_actor(self, actor, monkeypatch):
+        real_flush = actor._flush
+
+        async def broken_flush(out):
+            raise ValueError("cannot serialize")
+
+        monkeypatch.setattr(actor, "_flush", broken_flush)
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(actor.request(Join(ws=FakeWebSocket(), pid="p1", name="P1", stack=1000)), 1)
+
+        monkeypatch.setattr(actor, "_flush", real_flush)
+        ws = await _join(actor, "p2")
+        assert ws.frames("state")
+        assert not actor._task.done()
+
+    @pytest.mark.asyncio
+    async def test_last_disconnect_closes_table(self, actor):
+        ws = await _join(actor, "p1")
+        await actor.request(Disconnect(pid="p1", ws=ws))
+
+        assert actor.closed
+        assert "actor-test" not in tables._tables
+        assert "actor-test" not in _actors
+
+    @pytest.mark.asyncio
+    async def test_turn_timeout_fires_from_central_timer(self, actor):
+        await _join(actor, "p1")
+        ws = await _join(actor, "p2")
+
+        def start_with_short_clock(table):
+            table.turn_timeout_seconds = 0.05
+
+        await actor.call(start_with_short_clock)
+        await actor.request(PlayerMessage(pid="p1", msg={"type": "start"}))
+        first = actor.table.current_turn_pid
+        assert timers.pending(("actor-test", "turn"))
+
+        await asyncio.sleep(0.2)
+
+        # Heads-up preflop: the small blind is auto-folded and the hand ends
+        assert actor.table.last_action == {"pid": first, "action": "fold", "amount": 0}
+        assert not actor.table.hand_in_progress
+        assert ws.frames("state")[-1]["state"]["showdown"]["fold_win"]
+
+    @pytest.mark.asyncio
+    async def test_next_hand_is_dealt_after_the_delay(self, actor):
+        actor.table.deal_delay_seconds = 0.05
+        await _join(actor, "p1")
+        assert not timers.pending(("actor-test", "deal"))  # One player: nothing to deal
+
+        ws = await _join(actor, "p2")
+        assert timers.pending(("actor-test", "deal"))
+        assert not actor.table.hand_in_progress
+
+        await asyncio.sleep(0.2)
+
+        assert actor.table.hand_in_progress
+        assert not timers.pending(("actor-test", "deal"))
+        assert "New hand started" in [f["message"] for f in ws.frames("info")]
+
+    @pytest.mark.asyncio
+    async def test_manual_dealing_when_delay_is_none(self, actor):
+        actor.table.deal_delay_seconds = None
+        await _join(actor, "p1")
+        await _join(actor, "p2")
+
+        assert not timers.pending(("actor-test", "deal"))
+        await actor.request(PlayerMessage(pid="p1", msg={"type": "start"}))
+        assert actor.table.hand_in_progress
+
+
+class TestTimerService:
+    @pytest.mark.asyncio
+    async def test_schedule_replaces_existing_key(self):
+        service = TimerService()
+        fired = []
+        service.schedule(("t", "turn"), 0.01, fired.append, "first")
+        service.schedule(("t", "turn"), 0.01, fired.append, "second")
+
+        await asyncio.sleep(0.05)
+
+        assert fired == ["second"]
+        assert len(service) == 0
+
+    @pytest.mark.asyncio
+    async def test_schedule_at_and_cancel_owner(self):
+        service = TimerService()
+        fired = []
+        when = time.time() + 0.01
+        service.schedule_at(("t", "turn"), when, fired.append, "turn")
+        service.schedule(("t", "runout"), 0.01, fired.append, "runout")
+        service.schedule(("u", "turn"), 0.01, fired.append, "other")
+
+        assert service.due(("t", "turn")) == when
+        assert service.cancel_owner("t") == 2
+        await asyncio.sleep(0.05)
+
+        assert fired == ["other"]
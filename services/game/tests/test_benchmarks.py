@@ -0,0 +1,41 @@
+"""
+Tests for the micro-benchmark harness (not the timings themselves).
+"""
+from benchmarks.cases import all_benchmarks, build_table
+from benchmarks.harness import Benchmark, compare, run_benchmark, to_document
+
+
+def _doc(**medians):
+    return {"results": {name: {"median_ns": ns} for name, ns in medians.items()}}
+
+
+class TestCompare:
+    def test_flags_regression_beyond_threshold(self):
+        result = compare(_doc(a=130.0, b=105.0), _doc(a=100.0, b=100.0), threshold=0.2)
+        by_name = {c.name: c for c in result}
+        assert by_name["a"].regressed
+        assert not by_name["b"].regressed
+
+    def test_ignores_cases_missing_from_baseline(self):
+        assert compare(_doc(new=50.0), _doc(old=50.0), threshold=0.2) == []
+
+
+class TestHarness:
+    def test_run_sync_benchmark(self):
+        result = run_benchmark(Benchmark("noop", "test", lambda: (lambda: None)), min_time=0.001, repeats=2)
+        assert result.iterations >= 1
+        assert result.median_ns >= 0
+        assert to_document([result], seed=1)["results"]["noop"]["repeats"] == 2
+
+    def test_every_case_runs(self):
+        for bench in all_benchmarks(seed=1):
+            if "s100" in bench.name:
+                continue  # Same code path as s10, just slower
+            result = run_benchmark(bench, min_time=0.0, repeats=1)
+            assert result.iterations >= 1, bench.name
+
+    def test_fixed_seed_is_reproducible(self):
+        first = build_table(6, seed=7)
+        second = build_table(6, seed=7)
+        assert first.hole_cards == second.hole_cards
+        assert first.deck == second.deck
@@ -93,3 +93,22 @@ class TestCalculateSidePots:
         assert len(pots) == 1
         assert pots[0]['amount'] == 0
         assert pots[0]['eligible_players'] == {"p1", "p2"}
+
+    def test_folded_contributions_stay_in_the_pots(self):
+        """Chips from a folded player are won by someone, not lost."""
+        table = TableState(table_id="test")
+        table.pot = 1090
+        table.total_contributions = {
+            "p1": 300,      # All-in for 300
+            "p2": 500,
+            "folder": 290,  # Folded after putting in 290
+        }
+
+        pots = calculate_side_pots(table, ["p1", "p2"])
+
+        assert len(pots) == 2
+        assert pots[0]['amount'] == 890
+        assert pots[0]['eligible_players'] == {"p1", "p2"}
+        assert pots[1]['amount'] == 200
+        assert pots[1]['eligible_players'] == {"p2"}
+        assert sum(p['amount'] for p in pots) == table.pot
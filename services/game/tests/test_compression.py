@@ -0,0 +1,110 @@
+"""
+Tests for optional websocket frame compression.
+"""
+import json
+import zlib
+
+import pytest
+
+from app.core.compression import FrameCompressor, CompressedSocket, STATE_DICTIONARY, negotiate, compressors
+from app.core.game_flow import start_new_hand
+from app.core.models import TableState
+from app.core.protocol import broadcast_state
+
+
+class FakeWebSocket:
+    def __init__(self, query_params=None):
+        self.query_params = query_params or {}
+        self.sent = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def close(self) -> None:
+        pass
+
+
+def _inflate(data: bytes, zdict: bytes = b"") -> str:
+    inflater = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+    return (inflater.decompress(data) + inflater.flush()).decode()
+
+
+LONG = json.dumps({"type": "state", "state": {"players": [{"pid": f"p{i}", "stack": 1000} for i in range(20)]}})
+
+
+class TestFrameCompressor:
+    def test_short_frames_stay_text(self):
+        compressor = FrameCompressor("test", min_bytes=100)
+        assert compressor.encode('{"type": "info"}') == '{"type": "info"}'
+
+    def test_long_frames_round_trip(self):
+        plain = FrameCompressor("test", min_bytes=100).encode(LONG)
+        primed = FrameCompressor("test", min_bytes=100, zdict=STATE_DICTIONARY).encode(LONG)
+
+        assert _inflate(plain) == LONG
+        assert _inflate(primed, STATE_DICTIONARY) == LONG
+        assert len(primed) < len(plain) < len(LONG)
+
+    def test_repeated_frame_is_compressed_once(self, monkeypatch):
+        compressor = FrameCompressor("test", min_bytes=100, cache_size=2)
+        calls = []
+        real = compressor._compress
+        monkeypatch.setattr(compressor, "_compress", lambda raw: calls.append(raw) or real(raw))
+
+        first = compressor.encode(LONG)
+        assert compressor.encode(LONG) is first
+        assert len(calls) == 1
+
+        for n in range(2):
+            compressor.encode(LONG + " " * (n + 1))  # Pushes LONG out of the cache
+        compressor.encode(LONG)
+        assert len(calls) == 4
+
+
+class TestNegotiation:
+    def test_query_parameter_picks_the_compressor(self):
+        sock = negotiate(FakeWebSocket({"compress": "deflate-dict"}))
+        assert isinstance(sock, CompressedSocket)
+        assert sock.compressor is compressors["deflate-dict"]
+
+    def test_plain_socket_without_or_with_unknown_compression(self):
+        for params in ({}, {"compress": "brotli"}):
+            ws = FakeWebSocket(params)
+            assert negotiate(ws) is ws
+
+    @pytest.mark.asyncio
+    async def test_compressed_socket_sends_binary_only_when_worth_it(self):
+        ws = FakeWebSocket()
+        sock = CompressedSocket(ws, FrameCompressor("test", min_bytes=100))
+        await sock.send_text('{"type": "info"}')
+        await sock.send_text(LONG)
+        assert isinstance(ws.sent[0], str) and isinstance(ws.sent[1], bytes)
+
+
+class TestSharedBroadcast:
+    @pytest.mark.asyncio
+    async def test_spectators_share_one_frame_and_one_compression(self, monkeypatch):
+        table = TableState(table_id="compress-test")
+        compressor = FrameCompressor("test", min_bytes=100)
+        calls = []
+        real = compressor._compress
+        monkeypatch.setattr(compressor, "_compress", lambda raw: calls.append(raw) or real(raw))
+        sockets = {}
+        for i in range(2):
+            table.upsert_player(pid=f"p{i}", name=f"P{i}")
+        for i in range(2, 12):
+            table.upsert_player(pid=f"p{i}", name=f"P{i}", force_spectator=True)
+        start_new_hand(table)
+        for pid in table.players:
+            sockets[pid] = FakeWebSocket()
+            table.connections[pid] = CompressedSocket(sockets[pid], compressor)
+
+        await broadcast_state(table)
+
+        assert len(calls) == 3  # Two players with their own cards, one view for all ten spectators
+        views = [json.loads(_inflate(sockets[pid].sent[0]))["state"] for pid in ("p0", "p5")]
+        assert views[0]["my_role"] == "seated" and views[1]["my_role"] == "spectator"
+        assert views[0]["players"] == views[1]["players"]
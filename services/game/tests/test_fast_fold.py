@@ -0,0 +1,264 @@
+"""
+Tests for fast-fold player pools.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core import fast_fold
+from app.core.actor import Join, PlayerMessage, Disconnect
+from app.core.fast_fold import FastFoldPool, PoolPlayer, _blind_seats
+from app.core.timers import timers
+
+FOLD = {"type": "action", "action": "fold"}
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def states(self):
+        return [f["state"] for f in self.sent if f["type"] == "state"]
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(table_size=3, fill_seconds=60.0):
+        pool = FastFoldPool(10, table_size=table_size, fill_seconds=fill_seconds)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        timers.cancel(pool.fill_key)
+        for n in range(1, pool.tables_allocated + 1):
+            timers.cancel_owner(f"{pool.pool_id}-{n}")
+
+
+async def _join(pool, *pids):
+    sockets = {}
+    for pid in pids:
+        sockets[pid] = FakeWebSocket()
+        await pool.request(Join(ws=sockets[pid], pid=pid, name=pid.upper(), stack=1000))
+    return sockets
+
+
+def _hand_of(pool, pid):
+    return pool.hands[pool.players[pid].hand_id]
+
+
+def _chips(pool):
+    return sum(p.stack for p in pool.players.values() if p.hand_id is None) + sum(
+        sum(p.stack for pid, p in t.players.items() if pool.players[pid].hand_id == t.table_id) + t.pot
+        for t in pool.hands.values()
+    )
+
+
+class TestDealing:
+    @pytest.mark.asyncio
+    async def test_full_table_is_dealt_as_soon_as_it_is_ready(self, make_pool):
+        pool = make_pool(table_size=3)
+        sockets = await _join(pool, "p1", "p2")
+        assert pool.hands == {}
+
+        sockets.update(await _join(pool, "p3"))
+
+        assert len(pool.hands) == 1
+        table = next(iter(pool.hands.values()))
+        assert table.hand_in_progress
+        assert set(table.players) == {"p1", "p2", "p3"}
+        assert len(pool.ready) == 0
+        for pid, ws in sockets.items():
+            assert ws.sent[0] == {"type": "welcome", "pid": pid, "pool_id": "ff-10"}
+            assert ws.states()[-1]["table_id"] == table.table_id
+            assert ws.states()[-1]["hole_cards"]
+
+    @pytest.mark.asyncio
+    async def test_short_handed_hand_after_fill_delay(self, make_pool):
+        pool = make_pool(table_size=6, fill_seconds=0.01)
+        await _join(pool, "p1", "p2")
+        assert pool.hands == {}
+
+        await asyncio.sleep(0.05)
+
+        table = _hand_of(pool, "p1")
+        assert set(table.players) == {"p1", "p2"}
+        assert table.max_players == 2  # Nobody is seated from a waitlist mid-pool
+
+    @pytest.mark.asyncio
+    async def test_big_blind_goes_to_whoever_went_longest_without_it(self, make_pool):
+        pool = make_pool(table_size=3)
+        players = [
+            PoolPlayer(pid="a", name="A", stack=1000, ws=FakeWebSocket(), since_big_blind=0),
+            PoolPlayer(pid="b", name="B", stack=1000, ws=FakeWebSocket(), since_big_blind=5),
+            PoolPlayer(pid="c", name="C", stack=1000, ws=FakeWebSocket(), since_big_blind=2),
+        ]
+
+        table = pool._deal_hand(players)
+
+        assert table.player_bets == {"c": 5, "b": 10}
+        assert [p.since_big_blind for p in players] == [1, 0, 3]
+
+    def test_blind_seats(self):
+        assert _blind_seats(2) == [2, 1]
+        assert _blind_seats(6) == [3, 2, 1, 4, 5, 6]
+
+
+class TestFolding:
+    @pytest.mark.asyncio
+    async def test_folder_moves_to_a_new_hand_while_the_old_one_plays_on(self, make_pool):
+        pool = make_pool(table_size=3)
+        sockets = await _join(pool, "p1", "p2", "p3", "p4", "p5", "p6", "p7")
+        first, second = list(pool.hands.values())
+
+        folders = []
+        for table in (first, second):
+            pid = table.current_turn_pid
+            folders.append(pid)
+            await pool.request(PlayerMessage(pid=pid, msg=FOLD))
+
+        third = _hand_of(pool, "p7")
+        assert set(third.players) == {"p7", *folders}
+        assert first.hand_in_progress and second.hand_in_progress
+        assert folders[0] not in first.connections
+        assert sockets[folders[0]].states()[-1]["table_id"] == third.table_id
+        assert _chips(pool) == 7000
+
+    @pytest.mark.asyncio
+    async def test_frames_go_to_the_players_current_hand(self, make_pool):
+        pool = make_pool(table_size=2)
+        await _join(pool, "p1", "p2", "p3", "p4")
+        table = _hand_of(pool, "p1")
+        other = "p2" if table.current_turn_pid == "p1" else "p1"
+
+        # Not their turn, and a frame for another hand is dropped
+        await pool.request(PlayerMessage(pid=other, msg=FOLD))
+        await pool.request(PlayerMessage(pid=table.current_turn_pid, msg={**FOLD, "table_id": "ff-10-99"}))
+        assert table.hand_in_progress
+
+        await pool.request(PlayerMessage(pid=table.current_turn_pid, msg=FOLD))
+        assert pool.players[other].hand_id is not None
+        assert pool.hands_dealt == 3
+
+    @pytest.mark.asyncio
+    async def test_finished_tables_are_recycled(self, make_pool):
+        pool = make_pool(table_size=2)
+        await _join(pool, "p1", "p2", "p3", "p4")
+        tables = {id(t) for t in pool.hands.values()}
+
+        for _ in range(20):
+            for table in list(pool.hands.values()):
+                await pool.request(PlayerMessage(pid=table.current_turn_pid, msg=FOLD))
+
+        assert pool.hands_dealt == 42
+        assert pool.tables_allocated == 2
+        assert {id(t) for t in pool.hands.values()} == tables
+        assert _chips(pool) == 4000
+
+    @pytest.mark.asyncio
+    async def test_busted_player_is_not_dealt_in(self, make_pool):
+        pool = make_pool(table_size=2)
+        sockets = await _join(pool, "p1", "p2")
+        table = _hand_of(pool, "p1")
+        loser = table.current_turn_pid
+        await pool.request(PlayerMessage(pid=loser, msg={"type": "action", "action": "all_in"}))
+        caller = table.current_turn_pid
+        table.players[caller].stack += 10_000  # Make sure the caller covers
+        table.hole_cards[caller], table.hole_cards[loser] = ["As", "Ah"], ["2c", "7d"]
+        table.deck = ["3s", "8h", "9d", "Jc", "4h", "Kd", "5c", "Qs"]  # Dealt from the end
+        await pool.request(PlayerMessage(pid=caller, msg={"type": "action", "action": "call"}))
+        while table.hand_in_progress:
+            await pool.request(fast_fold._HandTimer(table.table_id, "runout"))
+
+        assert pool.players[loser].stack == 0
+        assert pool.players[loser].hand_id is None
+        assert loser not in pool.ready
+        assert sockets[loser].sent[-1] == {"type": "info", "message": "You are out of chips"}
+
+
+    @pytest.mark.asyncio
+    async def test_folded_stack_is_handed_to_the_stack_writer(self, make_pool, monkeypatch):
+        from app.core import auth
+        from app.core.stack_writer import StackWriter
+
+        def on_the_loop(user_id, stack):
+            raise AssertionError("stack written on the event loop")
+
+        monkeypatch.setattr(auth, "update_user_stack", on_the_loop)
+        writer = StackWriter(flush_interval=60)
+        monkeypatch.setattr(fast_fold, "stack_writer", writer)
+        writer.start()
+        try:
+            pool = make_pool(table_size=3)
+            for n in (1, 2, 3):
+                await pool.request(Join(ws=FakeWebSocket(), pid=f"p{n}", name=f"P{n}", stack=1000, user_id=n))
+            table = _hand_of(pool, "p1")
+            pid = table.current_turn_pid
+
+            await pool.request(PlayerMessage(pid=pid, msg=FOLD))
+
+            assert table.hand_in_progress and pid not in table.user_ids
+            assert writer.pending(pool.players[pid].user_id) == pool.players[pid].stack
+        finally:
+            writer._pending.clear()
+            writer.stop()
+
+
+class TestLeaving:
+    @pytest.mark.asyncio
+    async def test_disconnect_folds_the_player_out_of_the_pool(self, make_pool):
+        pool = make_pool(table_size=3)
+        sockets = await _join(pool, "p1", "p2", "p3")
+        table = _hand_of(pool, "p1")
+
+        await pool.request(Disconnect(pid="p1", ws=sockets["p1"]))
+
+        assert "p1" not in pool.players
+        assert "p1" in table.folded_pids and "p1" not in table.connections
+        assert table.hand_in_progress
+
+    @pytest.mark.asyncio
+    async def test_reconnect_keeps_the_hand(self, make_pool):
+        pool = make_pool(table_size=2)
+        sockets = await _join(pool, "p1", "p2")
+        table = _hand_of(pool, "p1")
+        fresh = FakeWebSocket()
+
+        await pool.request(Join(ws=fresh, pid="p1", name="P1", stack=5000))
+        await pool.request(Disconnect(pid="p1", ws=sockets["p1"]))  # The old socket closing
+
+        assert sockets["p1"].closed
+        assert table.connections["p1"] is fresh
+        assert pool.players["p1"].stack == 1000  # The pool's stack, not the one sent on rejoin
+        assert fresh.states()[-1]["table_id"] == table.table_id
+
+
+class TestScale:
+    @pytest.mark.asyncio
+    async def test_thousands_of_players_fold_through_many_hands(self, make_pool):
+        pool = make_pool(table_size=6)
+        sockets = {f"p{i}": FakeWebSocket() for i in range(3000)}
+        for pid, ws in sockets.items():
+            pool.submit(Join(ws=ws, pid=pid, name=pid, stack=1000))
+        await pool.request(PlayerMessage(pid="p0", msg={"type": "noop"}))
+        assert len(pool.hands) == 500
+
+        for _ in range(8):
+            for table in list(pool.hands.values()):
+                pool.submit(PlayerMessage(pid=table.current_turn_pid, msg=FOLD))
+            await pool.request(PlayerMessage(pid="p0", msg={"type": "noop"}))
+
+        # Every player is in at most one hand, and finished hands' tables were reused
+        assert sum(len(t.connections) for t in pool.hands.values()) + len(pool.ready) == 3000
+        assert pool.tables_allocated < pool.hands_dealt
+        assert _chips(pool) == 3_000_000
@@ -0,0 +1,200 @@
+"""Tests for hand history recording and the batched writer."""
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import hand_history
+from app.core.actions import handle_message, handle_disconnect
+from app.core.game_flow import start_new_hand
+from app.core.hand_history import HandHistoryWriter
+from app.core.models import TableState
+from db import Base, User, Hand, HandPlayer, HandAction
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_hand_history.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def finished(monkeypatch):
+    """Collect records passed to the writer instead of writing them."""
+    records = []
+    monkeypatch.setattr(hand_history.hand_writer, "submit", records.append)
+    return records
+
+
+@pytest.fixture
+def database(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(hand_history, "get_db", override_get_db)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def _table():
+    table = TableState(table_id="history", deck_seed=7, use_deterministic_deck=True)
+    table.upsert_player("p1", "Alice")
+    table.upsert_player("p2", "Bob")
+    table.user_ids = {"p1": 1}
+    return table
+
+
+async def _play_fold_hand(table):
+    start_new_hand(table)
+    first = table.current_turn_pid
+    await handle_message(table, first, {"type": "action", "action": "raise", "amount": 30})
+    await handle_message(table, table.current_turn_pid, {"type": "action", "action": "fold"})
+    return first
+
+
+class TestRecording:
+    @pytest.mark.asyncio
+    async def test_records_blinds_actions_and_results(self, finished):
+        table = _table()
+        raiser = await _play_fold_hand(table)
+
+        assert len(finished) == 1
+        record = finished[0]
+        assert table.hand_record is None
+        assert [a["action"] for a in record.actions] == ["small_blind", "big_blind", "raise", "fold"]
+        assert [a["seq"] for a in record.actions] == [0, 1, 2, 3]
+        # Amounts are chips put in: raiser had 5 in (SB) and raised to 30
+        assert record.actions[2]["amount"] == 25
+        assert record.pot == 40
+        assert not record.went_to_showdown
+
+        winner = record.players[raiser]
+        assert winner.won
+        assert winner.ending_stack - winner.starting_stack == 10
+        assert record.players["p1"].user_id == 1
+        assert record.players["p2"].user_id is None
+        assert len(winner.hole_cards.split()) == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_fold_is_recorded(self, finished):
+        table = _table()
+        start_new_hand(table)
+        table.mark_disconnected("p2")
+        handle_disconnect(table, "p2")
+
+        assert finished[0].actions[-1]["pid"] == "p2"
+        assert finished[0].actions[-1]["action"] == "fold"
+
+    @pytest.mark.asyncio
+    async def test_spectators_are_not_recorded(self, finished):
+        table = _table()
+        table.upsert_player("s1", "Rail", force_spectator=True)
+        await _play_fold_hand(table)
+
+        assert set(finished[0].players) == {"p1", "p2"}
+
+
+class TestWriter:
+    @pytest.mark.asyncio
+    async def test_flush_bulk_inserts_hands_players_and_actions(self, finished, database):
+        db = TestingSessionLocal()
+        db.add(User(id=1, username="alice", password_hash="x"))
+        db.commit()
+        db.close()
+
+        table = _table()
+        for _ in range(3):
+            await _play_fold_hand(table)
+
+        assert HandHistoryWriter().flush(finished) == 3
+
+        db = TestingSessionLocal()
+        try:
+            hands = db.query(Hand).order_by(Hand.id).all()
+            assert len(hands) == 3
+            assert hands[0].id < hands[1].id < hands[2].id
+            assert all(h.table_id == "history" and h.pot == 40 for h in hands)
+            assert db.query(HandPlayer).filter(HandPlayer.user_id == 1).count() == 3
+            actions = db.query(HandAction).filter(HandAction.hand_id == hands[1].id).order_by(HandAction.seq).all()
+            assert [a.action for a in actions] == ["small_blind", "big_blind", "raise", "fold"]
+            assert sum(p.net for p in hands[2].players) == 0
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_background_thread_drains_queue_on_stop(self, finished, database):
+        table = _table()
+        for _ in range(5):
+            await _play_fold_hand(table)
+
+        writer = HandHistoryWriter(batch_size=2, flush_interval=0.05)
+        assert not writer.submit(finished[0])  # Not started yet
+        writer.start()
+        for record in finished:
+            assert writer.submit(record)
+        writer.stop()
+
+        db = TestingSessionLocal()
+        try:
+            assert db.query(Hand).count() == 5
+        finally:
+            db.close()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = HandHistoryWriter(max_queue=1, flush_interval=60)
+        writer._thread = threading.current_thread()  # Pretend running, but nothing drains the queue
+        record = hand_history.HandRecord(
+            table_id="t", started_at=None, small_blind=5, big_blind=10, dealer_seat=1
+        )
+
+        assert writer.submit(record)
+        assert not writer.submit(record)
+
+    def test_stop_does_not_hang_on_a_full_queue(self, monkeypatch):
+        writer = HandHistoryWriter(max_queue=1, flush_interval=0.05)
+        database_down = threading.Event()
+        monkeypatch.setattr(writer, "flush", lambda batch: database_down.wait(5))
+        record = hand_history.HandRecord(
+            table_id="t", started_at=None, small_blind=5, big_blind=10, dealer_seat=1
+        )
+        writer.start()
+        writer.submit(record)
+        time.sleep(0.1)  # The thread is now stuck writing it
+        assert writer.submit(record)  # Fills the queue
+
+        started = time.monotonic()
+        writer.stop(timeout=0.2)
+        assert time.monotonic() - started < 1
+        database_down.set()
+
+    def test_postgres_psycopg2_rows_go_through_copy(self):
+        from types import SimpleNamespace
+
+        class FakeCursor:
+            def copy_expert(self, sql, file):
+                self.sql, self.data = sql, file.read()
+
+        cursor = FakeCursor()
+        connection = SimpleNamespace(
+            dialect=SimpleNamespace(name="postgresql", driver="psycopg2"),
+            connection=SimpleNamespace(driver_connection=SimpleNamespace(cursor=lambda: cursor)),
+        )
+        db = SimpleNamespace(connection=lambda: connection, execute=lambda *a: pytest.fail("used executemany"))
+        rows = [
+            {"hand_id": 1, "pid": "p1", "name": 'Al "Ace", Jr', "hole_cards": "Ah Kd", "won": True},
+            {"hand_id": 1, "pid": "p2", "name": "", "hole_cards": None, "won": False},
+        ]
+
+        hand_history._bulk_insert(db, HandPlayer.__table__, rows)
+
+        assert cursor.sql == "COPY hand_players (hand_id, pid, name, hole_cards, won) FROM STDIN WITH (FORMAT csv)"
+        assert cursor.data.splitlines() == [
+            '"1","p1","Al ""Ace"", Jr","Ah Kd","True"',
+            '"1","p2","",,"False"',  # Empty string stays a string, None is NULL
+        ]
@@ -0,0 +1,256 @@
+"""
+Tests for idle table hibernation and stale player compaction.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core import actor as actor_module, hibernation, tables
+from app.core.actor import TableActor, Call, Join, Disconnect, get_actor, _actors
+from app.core.hibernation import TableStore, dump_table, load_table, drop_stale_players
+from app.core.models import TableState, Player
+from app.core.timers import timers
+from app.core.wait_queue import WaitQueue
+from models.player import PlayerRole
+
+
+def _table(table_id="hib-test"):
+    table = TableState(table_id=table_id, small_blind=10, big_blind=20, max_players=6, dealer_seat=2,
+                       deal_delay_seconds=None)
+    table.players = {
+        "p1": Player(pid="p1", name="Alice", stack=750, seat=1, connected=False),
+        "p2": Player(pid="p2", name="Bob", stack=1250, seat=2, connected=False),
+        "s1": Player(pid="s1", name="Rail", role=PlayerRole.WAITLIST, connected=False),
+    }
+    table.waitlist = WaitQueue(["s1"])
+    table.user_ids = {"p2": 42}
+    return table
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = TableStore(str(tmp_path))
+    monkeypatch.setattr(tables, "hibernated", store)
+    monkeypatch.setattr(actor_module, "hibernated", store)
+    return store
+
+
+class TestSerialization:
+    def test_round_trip(self):
+        table = load_table(dump_table(_table()))
+
+        assert (table.small_blind, table.big_blind, table.max_players) == (10, 20, 6)
+        assert table.dealer_seat == 2
+        assert table.deal_delay_seconds is None
+        assert table.players["p2"].stack == 1250
+        assert table.players["p2"].seat == 2
+        assert table.players["s1"].role == PlayerRole.WAITLIST
+        assert list(table.waitlist) == ["s1"]
+        assert table.user_ids == {"p2": 42}
+
+    def test_players_come_back_disconnected(self):
+        table = _table()
+        table.players["p1"].connected = True
+        assert not load_table(dump_table(table)).players["p1"].connected
+
+
+class TestTableStore:
+    def test_load_takes_the_table_out(self, store):
+        store.save(_table())
+        assert "hib-test" in store
+
+        table = store.load("hib-test")
+
+        assert table.players["p1"].name == "Alice"
+        assert "hib-test" not in store
+        assert store.load("hib-test") is None
+
+    def test_odd_table_ids_are_safe_file_names(self, store):
+        store.save(_table("../../etc/x"))
+        assert store.load("../../etc/x").table_id == "../../etc/x"
+
+    def test_get_table_rehydrates_before_asking_the_lobby(self, store):
+        store.save(_table())
+        try:
+            table = tables.get_table("hib-test")
+            assert table.players["p2"].stack == 1250
+            assert tables.get_table("hib-test") is table
+        finally:
+            tables._tables.pop("hib-test", None)
+
+    def test_delete_table_removes_the_hibernated_copy(self, store):
+        store.save(_table())
+        tables.delete_table("hib-test")
+        assert "hib-test" not in store
+
+
+class TestStalePlayers:
+    def test_drops_only_players_gone_longer_than_ttl(self):
+        table = _table()
+        table.players["p1"].connected = True
+        table.mark_disconnected("p1")
+        table.disconnected_at["p2"] = time.time() - 120
+
+        assert drop_stale_players(table, ttl=60) == 1
+
+        assert "p2" not in table.players
+        assert "p1" in table.players
+        assert table.user_ids == {}
+
+    def test_reconnecting_clears_the_timestamp(self):
+        table = _table()
+        table.mark_disconnected("p1")
+        table.upsert_player("p1", "Alice")
+        assert "p1" not in table.disconnected_at
+
+    def test_nothing_is_dropped_during_a_hand(self):
+        table = _table()
+        table.disconnected_at["p2"] = 0
+        table.hand_in_progress = True
+        assert drop_stale_players(table, ttl=60) == 0
+        assert "p2" in table.players
+
+
+class TestActorHibernation:
+    @pytest.fixture
+    def idle_table(self, store, monkeypatch):
+        monkeypatch.setattr(actor_module, "TABLE_IDLE_SECONDS", 0.01)
+        table = _table()
+        tables._tables[table.table_id] = table
+        yield table
+        timers.cancel_owner(table.table_id)
+        tables._tables.pop(table.table_id, None)
+        _actors.pop(table.table_id, None)
+
+    @pytest.mark.asyncio
+    async def test_idle_table_without_sockets_is_hibernated(self, store, idle_table):
+        actor = get_actor(idle_table.table_id)
+        await actor.call(lambda t: None)
+        await asyncio.sleep(0.05)
+
+        assert actor.closed
+        assert idle_table.table_id not in tables._tables
+        assert idle_table.table_id in store
+
+        rehydrated = await get_actor(idle_table.table_id).call(lambda t: t)
+        assert rehydrated is not idle_table
+        assert rehydrated.players["p2"].stack == 1250
+
+    @pytest.mark.asyncio
+    async def test_table_with_open_socket_stays_in_memory(self, store, idle_table):
+        idle_table.connections["p1"] = object()
+        actor = get_actor(idle_table.table_id)
+        await actor.call(lambda t: None)
+        await asyncio.sleep(0.05)
+
+        assert not actor.closed
+        assert tables._tables[idle_table.table_id] is idle_table
+        assert idle_table.table_id not in store
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def close(self) -> None:
+        pass
+
+
+class TestLastPlayerLeaving:
+    @pytest.fixture
+    def lobby_deletes(self, store, monkeypatch):
+        deleted = []
+
+        async def record(self):
+            deleted.append(self.table_id)
+
+        monkeypatch.setattr(TableActor, "_delete_from_lobby", record)
+        table = TableState(table_id="leave-test", deal_delay_seconds=None)
+        tables._tables[table.table_id] = table
+        yield deleted
+        timers.cancel_owner(table.table_id)
+        tables._tables.pop(table.table_id, None)
+        _actors.pop(table.table_id, None)
+
+    async def _join_and_leave(self, pids=("p1", "p2")):
+        actor = get_actor("leave-test")
+        sockets = {}
+        for pid in pids:
+            sockets[pid] = FakeWebSocket()
+            await actor.request(Join(ws=sockets[pid], pid=pid, name=pid.upper(), stack=1000))
+        for pid in pids:
+            await actor.request(Disconnect(pid=pid, ws=sockets[pid]))
+        return actor
+
+    @pytest.mark.asyncio
+    async def test_table_is_hibernated_not_deleted(self, store, lobby_deletes):
+        actor = await self._join_and_leave()
+
+        assert actor.closed
+        assert "leave-test" not in tables._tables
+        assert "leave-test" in store
+        assert lobby_deletes == []
+
+        rejoined = get_actor("leave-test")
+        await rejoined.request(Join(ws=FakeWebSocket(), pid="p2", name="P2", stack=1000))
+        assert rejoined.table is not actor.table
+        assert rejoined.table.players["p1"].seat == actor.table.players["p1"].seat  # Still holding their seat
+        assert "leave-test" not in store
+
+    @pytest.mark.asyncio
+    async def test_table_nobody_rejoins_is_deleted_after_ttl(self, store, lobby_deletes, monkeypatch):
+        monkeypatch.setattr(actor_module, "TABLE_HIBERNATE_TTL", 0.02)
+        await self._join_and_leave()
+        await asyncio.sleep(0.1)
+
+        assert "leave-test" not in store
+        assert "leave-test" not in tables._tables
+        assert lobby_deletes == ["leave-test"]
+
+    @pytest.mark.asyncio
+    async def test_without_hibernation_the_table_is_deleted(self, store, lobby_deletes, monkeypatch):
+        monkeypatch.setattr(actor_module, "TABLE_IDLE_SECONDS", 0)
+        await self._join_and_leave()
+
+        assert "leave-test" not in store
+        assert lobby_deletes == ["leave-test"]
+
+    @pytest.mark.asyncio
+    async def test_unwritable_store_deletes_the_table_instead(self, store, lobby_deletes, monkeypatch):
+        def full_disk(table):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(store, "save", full_disk)
+        actor = await asyncio.wait_for(self._join_and_leave(), 1)
+
+        assert actor.closed
+        assert "leave-test" not in tables._tables
+        assert lobby_deletes == ["leave-test"]
+
+    @pytest.mark.asyncio
+    async def test_restart_rearms_expiry_from_the_store(self, store, lobby_deletes, monkeypatch):
+        monkeypatch.setattr(actor_module, "TABLE_HIBERNATE_TTL", 60)
+        stale = _table("leave-test")
+        store.save(stale)
+        fresh = _table("fresh-test")
+        store.save(fresh)
+        path = store._path("leave-test")
+        with open(path) as f:
+            data = json.load(f)
+        data["hibernated_at"] -= 120  # Written two minutes before the "restart"
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+        assert actor_module.rearm_hibernated() == 2
+        await asyncio.sleep(0.05)
+
+        assert "leave-test" not in store
+        assert lobby_deletes == ["leave-test"]
+        assert "fresh-test" in store
+        assert timers.pending(("fresh-test", "expire"))
+        timers.cancel_owner("fresh-test")
@@ -0,0 +1,131 @@
+"""
+Tests for the event-loop monitor, metrics registry and admin endpoint.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.loop_monitor import LoopMonitor, track, set_activity, current_activity
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_records_lag_samples(self):
+        monitor = LoopMonitor(interval=0.01, threshold_ms=500)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            monitor.stop()
+
+        snap = monitor.snapshot()
+        assert snap["lag_ms"]["samples"] > 0
+        assert snap["slow_callbacks"] == []
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_recorded_with_attribution(self):
+        monitor = LoopMonitor(interval=0.01, threshold_ms=50)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            with track("table-1", "action"):
+                time.sleep(0.2)  # Block the loop
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.stop()
+
+        snap = monitor.snapshot()
+        assert snap["slow_callbacks_total"] >= 1
+        event = snap["slow_callbacks"][0]
+        assert event["duration_ms"] >= 100
+        assert event["table_id"] == "table-1"
+        assert event["message_type"] == "action"
+        assert any("time.sleep" in line for line in event["stack"])
+        assert snap["by_table"]["table-1"]["count"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_events(self):
+        monitor = LoopMonitor(interval=0.01, threshold_ms=20)
+        monitor.start()
+        try:
+            time.sleep(0.05)
+            await asyncio.sleep(0.03)
+        finally:
+            monitor.stop()
+
+        assert monitor.slow_callbacks
+        monitor.reset()
+        assert monitor.snapshot()["slow_callbacks"] == []
+        assert monitor.max_lag == 0.0
+
+
+class TestActivity:
+    @pytest.mark.asyncio
+    async def test_track_restores_previous_activity(self):
+        loop = asyncio.get_running_loop()
+        set_activity("t1", "join")
+        with track("t1", "action"):
+            assert current_activity(loop) == ("t1", "action")
+        assert current_activity(loop) == ("t1", "join")
+
+    def test_track_outside_loop_is_noop(self):
+        with track("t1", "action"):
+            pass
+
+
+class TestMetrics:
+    def test_counter_and_histogram_render(self):
+        c = metrics.counter("test_requests_total", "Test counter")
+        c.inc(kind="a")
+        c.inc(2, kind="a")
+        h = metrics.histogram("test_latency_seconds", "Test histogram", buckets=(0.1, 1.0))
+        h.observe(0.05)
+        h.observe(0.5)
+
+        text = metrics.render_prometheus()
+        assert 'test_requests_total{kind="a"} 3' in text
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 2' in text
+        assert "test_latency_seconds_count 2" in text
+
+    def test_same_name_returns_same_metric(self):
+        assert metrics.gauge("test_gauge", "x") is metrics.gauge("test_gauge", "x")
+
+    def test_kind_mismatch_raises(self):
+        metrics.counter("test_kind_clash", "x")
+        with pytest.raises(ValueError):
+            metrics.gauge("test_kind_clash", "x")
+
+
+class TestAdminEndpoint:
+    @pytest.fixture
+    def client(self):
+        from app.main import app
+        from app.dependencies import get_current_admin
+
+        app.dependency_overrides[get_current_admin] = lambda: object()
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_current_admin, None)
+
+    def test_loop_stats(self, client):
+        response = client.get("/api/admin/loop")
+        assert response.status_code == 200
+        body = response.json()
+        assert "lag_ms" in body
+        assert "slow_callbacks" in body
+
+    def test_requires_admin(self):
+        from app.main import app
+
+        response = TestClient(app).get("/api/admin/loop", headers={"Authorization": "Bearer bogus"})
+        assert response.status_code == 403
+
+    def test_metrics_endpoint(self):
+        from app.main import app
+
+        response = TestClient(app).get("/metrics")
+        assert response.status_code == 200
+        assert "pokerlite_event_loop_lag_seconds" in response.text
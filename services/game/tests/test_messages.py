@@ -0,0 +1,58 @@
+"""
+Tests for typed client message decoding.
+"""
+import pytest
+
+from app.core.messages import (
+    Action, PreAction, Start, JoinWaitlist, LeaveWaitlist, Subscribe, Unsubscribe, decode, from_dict,
+)
+
+
+class TestDecode:
+    @pytest.mark.parametrize("raw, expected", [
+        ('{"type": "start"}', Start()),
+        ('{"type": "action", "action": "fold"}', Action("fold")),
+        ('{"type": "action", "action": "raise", "amount": 60}', Action("raise", 60)),
+        ('{"type": "action", "action": "raise", "amount": 60.0}', Action("raise", 60)),
+        ('{"type": "pre_action", "action": "call_up_to", "amount": 40}', PreAction("call_up_to", 40)),
+        ('{"type": "pre_action", "action": null}', PreAction(None)),
+        ('{"type": "join_waitlist", "any_table": true}', JoinWaitlist(True)),
+        ('{"type": "leave_waitlist"}', LeaveWaitlist()),
+        ('{"type": "subscribe", "table_id": "t1", "spectate": true}', Subscribe(True, table_id="t1")),
+        ('{"type": "unsubscribe", "table_id": "t1"}', Unsubscribe(table_id="t1")),
+    ])
+    def test_valid_frames(self, raw, expected):
+        assert decode(raw) == expected
+
+    @pytest.mark.parametrize("raw", [
+        "not json {",
+        "[1, 2]",
+        '{"action": "fold"}',
+        '{"type": ["action"]}',
+        '{"type": "shutdown"}',
+        '{"type": "action", "action": "steal"}',
+        '{"type": "action", "action": "raise"}',
+        '{"type": "action", "action": "raise", "amount": -10}',
+        '{"type": "action", "action": "raise", "amount": "50"}',
+        '{"type": "action", "action": "raise", "amount": true}',
+        '{"type": "action", "action": "raise", "amount": 10.5}',
+        '{"type": "pre_action", "action": "fold"}',
+        '{"type": "pre_action", "action": "call_up_to"}',
+        '{"type": "start", "table_id": 7}',
+        '{"type": "start", "table_id": ""}',
+        '{"type": "action", "action": [1]}',
+        '{"type": "action", "action": {}}',
+        '{"type": "pre_action", "action": ["fold"]}',
+        '{"type": "pre_action", "action": {}}',
+        '{"type": {}}',
+        '[' * 100000,
+    ])
+    def test_invalid_frames_decode_to_none(self, raw):
+        assert decode(raw) is None
+
+    def test_table_id_is_kept(self):
+        assert decode('{"type": "action", "action": "call", "table_id": "ff-10-3"}').table_id == "ff-10-3"
+
+    def test_from_dict_matches_decode(self):
+        assert from_dict({"type": "action", "action": "check"}) == decode('{"type": "action", "action": "check"}')
+        assert from_dict("start") is None
@@ -0,0 +1,165 @@
+"""
+Tests for multiplexed websocket connections (one socket, many tables).
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.core import tables
+from app.core.actor import TableActor, _actors
+from app.core.models import TableState, PlayerRole
+from app.core.multiplex import MuxConnection, tag
+from app.core.timers import timers
+from app.routes.ws import mux_endpoint
+
+
+class FakeWebSocket:
+    def __init__(self, incoming=()):
+        self.sent = []
+        self.closed = False
+        self.incoming = asyncio.Queue()
+        for msg in incoming:
+            self.send_from_client(msg)
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def send_from_client(self, msg) -> None:
+        self.incoming.put_nowait(msg)
+
+    async def receive_text(self) -> str:
+        msg = await self.incoming.get()
+        if msg is None:
+            raise WebSocketDisconnect()
+        return json.dumps(msg)
+
+    def frames(self):
+        return [f for batch in self.sent for f in batch["frames"]]
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestTag:
+    def test_adds_table_id(self):
+        assert json.loads(tag("t1", '{"type": "info", "message": "hi"}')) == {
+            "table_id": "t1", "type": "info", "message": "hi",
+        }
+
+    def test_empty_object(self):
+        assert json.loads(tag("t1", "{}")) == {"table_id": "t1"}
+
+
+class TestMuxConnection:
+    @pytest.mark.asyncio
+    async def test_frames_from_several_tables_go_out_in_one_send(self):
+        ws = FakeWebSocket()
+        conn = MuxConnection(ws)
+        conn.start()
+        a, b = conn.subscribe("a"), conn.subscribe("b")
+
+        await a.send_text(json.dumps({"type": "state", "state": {"pot": 1}}))
+        await b.send_text(json.dumps({"type": "state", "state": {"pot": 2}}))
+        await a.send_text(json.dumps({"type": "info", "message": "x"}))
+        await _drain()
+
+        assert conn.sends == 1
+        assert [(f["table_id"], f["type"]) for f in ws.frames()] == [("a", "state"), ("b", "state"), ("a", "info")]
+
+    @pytest.mark.asyncio
+    async def test_subscription_limit(self):
+        conn = MuxConnection(FakeWebSocket(), max_tables=2)
+        assert conn.subscribe("a") and conn.subscribe("b")
+        assert conn.subscribe("a") is conn.channels["a"]
+        assert conn.subscribe("c") is None
+
+    @pytest.mark.asyncio
+    async def test_replaced_channel_is_unsubscribed(self):
+        ws = FakeWebSocket()
+        conn = MuxConnection(ws)
+        conn.start()
+        channel = conn.subscribe("a")
+
+        await channel.close()
+        await channel.send_text(json.dumps({"type": "info", "message": "late"}))
+        await _drain()
+
+        assert "a" not in conn.channels
+        assert ws.frames() == [{"type": "unsubscribed", "table_id": "a"}]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_is_disconnected(self):
+        ws = FakeWebSocket()
+        conn = MuxConnection(ws, max_pending=3)  # Writer not started: nothing drains
+        for _ in range(4):
+            conn.queue('{"type": "info"}')
+        await _drain()
+        assert ws.closed
+
+
+@pytest.fixture
+def two_tables(monkeypatch):
+    async def no_lobby(self):
+        pass
+
+    monkeypatch.setattr(TableActor, "_delete_from_lobby", no_lobby)
+    pair = [TableState(table_id="mux-a"), TableState(table_id="mux-b")]
+    for table in pair:
+        tables._tables[table.table_id] = table
+    yield pair
+    for table in pair:
+        timers.cancel_owner(table.table_id)
+        tables._tables.pop(table.table_id, None)
+        _actors.pop(table.table_id, None)
+
+
+class TestMuxEndpoint:
+    @pytest.mark.asyncio
+    async def test_play_one_table_and_watch_another(self, two_tables):
+        first, second = two_tables
+        ws = FakeWebSocket([
+            {"type": "join", "name": "Alice", "pid": "p1"},
+            {"type": "subscribe", "table_id": "mux-a"},
+            {"type": "subscribe", "table_id": "mux-b", "spectate": True},
+        ])
+        task = asyncio.create_task(mux_endpoint(ws))
+        await _drain()
+        await asyncio.sleep(0.01)
+
+        assert first.players["p1"].role == PlayerRole.SEATED
+        assert second.players["p1"].role == PlayerRole.SPECTATOR
+        assert first.connections["p1"] is not second.connections["p1"]
+        states = [f for f in ws.frames() if f["type"] == "state"]
+        assert {f["table_id"] for f in states} == {"mux-a", "mux-b"}
+        assert ws.frames()[0] == {"type": "welcome", "pid": "p1"}
+
+        ws.send_from_client({"type": "join_waitlist", "table_id": "mux-b"})
+        ws.send_from_client({"type": "unsubscribe", "table_id": "mux-a"})
+        await asyncio.sleep(0.01)
+
+        assert second.players["p1"].role == PlayerRole.WAITLIST
+        assert "p1" not in first.connections
+
+        ws.send_from_client(None)
+        await asyncio.wait_for(task, 1)
+        assert second.connections == {}
+
+    @pytest.mark.asyncio
+    async def test_frames_need_a_table_id(self, two_tables):
+        ws = FakeWebSocket([{"type": "join", "name": "Alice"}, {"type": "action", "action": "fold"}])
+        task = asyncio.create_task(mux_endpoint(ws))
+        await asyncio.sleep(0.01)
+        assert {"type": "error", "message": "table_id is required"} in ws.frames()
+
+        ws.send_from_client(None)
+        await asyncio.wait_for(task, 1)
@@ -0,0 +1,73 @@
+"""Tests for the occupancy publisher's snapshots and delta frames."""
+from datetime import datetime
+
+from app.core.hand_history import HandRecord
+from app.core.models import TableState, Player
+from app.core.occupancy import OccupancyPublisher
+from app.core.wait_queue import WaitQueue
+from models.player import PlayerRole
+
+
+def _table():
+    table = TableState(table_id="t1")
+    table.players = {
+        "p1": Player(pid="p1", name="Alice", seat=1),
+        "p2": Player(pid="p2", name="Bob", seat=2),
+        "p3": Player(pid="p3", name="Gone", seat=3, connected=False),
+        "s1": Player(pid="s1", name="Rail", role=PlayerRole.SPECTATOR),
+    }
+    table.waitlist = WaitQueue(["s1"])
+    return table
+
+
+def _hand(pot):
+    return HandRecord(table_id="t1", started_at=datetime.utcnow(), small_blind=5,
+                      big_blind=10, dealer_seat=1, pot=pot)
+
+
+def test_snapshot_counts_connected_players():
+    publisher = OccupancyPublisher()
+    publisher.observe(_hand(100))
+    publisher.observe(_hand(50))
+
+    assert publisher.snapshot(_table()) == {
+        "seated": 2, "spectators": 1, "waitlist": 1, "hands_per_hour": 2, "avg_pot": 75,
+    }
+
+
+def test_frames_carry_only_changed_fields():
+    publisher = OccupancyPublisher()
+    table = _table()
+    publisher.mark(table)
+
+    first = publisher.build_frame()
+    assert first["tables"]["t1"]["seated"] == 2
+    assert publisher.build_frame() is None
+
+    table.waitlist = WaitQueue()
+    publisher.mark(table)
+    assert publisher.build_frame()["tables"] == {"t1": {"waitlist": 0}}
+
+    # Marked but unchanged: nothing to send
+    publisher.mark(table)
+    assert publisher.build_frame() is None
+
+
+def test_full_frame_resends_everything():
+    publisher = OccupancyPublisher()
+    publisher.mark(_table())
+    publisher.build_frame()
+
+    full = publisher.build_frame(full=True)
+    assert full["full"] is True
+    assert set(full["tables"]["t1"]) == {"seated", "spectators", "waitlist", "hands_per_hour", "avg_pot"}
+
+
+def test_removed_tables_are_reported_once():
+    publisher = OccupancyPublisher()
+    publisher.mark(_table())
+    publisher.build_frame()
+
+    publisher.remove("t1")
+    assert publisher.build_frame()["removed"] == ["t1"]
+    assert publisher.build_frame() is None
@@ -0,0 +1,156 @@
+"""Tests for stat reducers and the streaming stats aggregator."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import player_stats
+from app.core.hand_history import HandRecord, HandPlayerRecord
+from app.core.player_stats import StatsAggregator, player_hands
+from db import Base, User, PlayerStat
+from poker.stats import PlayerHand, reduce_hand, compute_stats
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_player_stats.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(player_stats, "get_db", override_get_db)
+    db = TestingSessionLocal()
+    db.add_all([User(id=1, username="alice", password_hash="x"), User(id=2, username="bob", password_hash="x")])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def hand(actions, net=0, won=False, board_cards=0, showdown=False, big_blind=10):
+    return PlayerHand(actions=actions, big_blind=big_blind, net=net, won=won,
+                      board_cards=board_cards, went_to_showdown=showdown)
+
+
+def _record():
+    """Alice raises preflop, Bob calls; Alice bets the flop, Bob calls; showdown on the river, Alice wins."""
+    actions = [
+        ("p1", "preflop", "small_blind", 5), ("p2", "preflop", "big_blind", 10),
+        ("p1", "preflop", "raise", 25), ("p2", "preflop", "call", 20),
+        ("p1", "flop", "raise", 30), ("p2", "flop", "call", 30),
+        ("p1", "turn", "check", 0), ("p2", "turn", "check", 0),
+        ("p1", "river", "check", 0), ("p2", "river", "check", 0),
+    ]
+    return HandRecord(
+        table_id="t", started_at=datetime.utcnow(), small_blind=5, big_blind=10, dealer_seat=1,
+        players={
+            "p1": HandPlayerRecord(pid="p1", name="Alice", seat=1, starting_stack=1000, user_id=1, ending_stack=1060, won=True),
+            "p2": HandPlayerRecord(pid="p2", name="Bob", seat=2, starting_stack=1000, user_id=2, ending_stack=940),
+            "g1": HandPlayerRecord(pid="g1", name="Guest", seat=3, starting_stack=1000, ending_stack=1000),
+        },
+        actions=[{"seq": i, "pid": p, "street": s, "action": a, "amount": n} for i, (p, s, a, n) in enumerate(actions)],
+        board="Ah Kd 7c 2s 2h", pot=120, went_to_showdown=True,
+    )
+
+
+class TestReducers:
+    def test_blinds_are_not_vpip(self):
+        counters = reduce_hand(hand([("preflop", "big_blind", 10), ("preflop", "check", 0)]))
+        assert counters.get("vpip", 0) == 0
+        assert counters["hands"] == 1
+
+    def test_preflop_raise_counts_vpip_and_pfr(self):
+        counters = reduce_hand(hand([("preflop", "raise", 30)]))
+        assert counters["vpip"] == 1
+        assert counters["pfr"] == 1
+
+    def test_counters_accumulate_into_existing_dict(self):
+        counters = {}
+        reduce_hand(hand([("preflop", "call", 10)], net=-10), counters)
+        reduce_hand(hand([("preflop", "fold", 0)], net=20), counters)
+
+        stats = compute_stats(counters)
+        assert stats["hands"] == 2
+        assert stats["vpip"] == 50.0
+        assert stats["pfr"] == 0.0
+        assert stats["bb_per_100"] == 50.0  # +1 bb over 2 hands
+
+    def test_af_and_wtsd(self):
+        counters = reduce_hand(hand(
+            [("preflop", "call", 10), ("flop", "raise", 20), ("turn", "raise", 40), ("river", "call", 50)],
+            board_cards=5, showdown=True, won=True,
+        ))
+        reduce_hand(hand([("preflop", "call", 10), ("flop", "fold", 0)], board_cards=3), counters)
+
+        stats = compute_stats(counters)
+        assert stats["af"] == 2.0
+        assert stats["wtsd"] == 50.0
+        assert stats["wsd"] == 100.0
+
+    def test_stats_are_none_without_data(self):
+        stats = compute_stats({})
+        assert stats["vpip"] is None
+        assert stats["af"] is None
+
+
+class TestAggregator:
+    def test_player_hands_skips_guests(self):
+        hands = player_hands(_record())
+        assert set(hands) == {1, 2}
+        assert hands[1].net == 60
+        assert len(hands[2].actions) == 5
+
+    def test_observe_accumulates_pending_counters(self):
+        aggregator = StatsAggregator()
+        aggregator.observe(_record())
+        aggregator.observe(_record())
+
+        alice = aggregator.pending(1)
+        assert alice["hands"] == 2
+        assert alice["pfr"] == 2
+        assert alice["showdowns_won"] == 2
+        assert aggregator.pending(2)["postflop_calls"] == 2
+
+    def test_flush_upserts_increments(self, database):
+        aggregator = StatsAggregator()
+        aggregator.observe(_record())
+        assert aggregator.flush() == 2
+        aggregator.observe(_record())
+        assert aggregator.flush() == 2
+        assert aggregator.flush() == 0
+        assert aggregator.pending(1) == {}
+
+        db = TestingSessionLocal()
+        try:
+            counters = dict(db.query(PlayerStat.counter, PlayerStat.value).filter(PlayerStat.user_id == 1).all())
+        finally:
+            db.close()
+        assert counters["hands"] == 2
+        assert counters["net_chips"] == 120
+        stats = compute_stats(counters)
+        assert stats["vpip"] == 100.0
+        assert stats["wtsd"] == 100.0
+        assert stats["bb_per_100"] == 600.0
+
+    def test_failed_flush_keeps_increments(self, monkeypatch):
+        def broken_db():
+            raise RuntimeError("database down")
+            yield
+
+        monkeypatch.setattr(player_stats, "get_db", broken_db)
+        aggregator = StatsAggregator()
+        aggregator.observe(_record())
+
+        assert aggregator.flush() == 0
+        assert aggregator.pending(1)["hands"] == 1
+        aggregator.observe(_record())
+        assert aggregator.pending(1)["hands"] == 2
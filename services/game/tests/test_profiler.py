@@ -0,0 +1,118 @@
+"""
+Tests for the sampling profiler and its admin endpoint.
+"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import profiler
+from app.core.profiler import SamplingProfiler, classify
+from poker.poker_logic import evaluate_hand_with_cards
+
+
+def _busy_evaluate(stop: threading.Event):
+    cards = ["As", "Kd", "Qh", "Js", "9c", "4d", "2h"]
+    while not stop.is_set():
+        evaluate_hand_with_cards(cards)
+
+
+class TestSamplingProfiler:
+    def test_samples_target_thread_and_tags_evaluation(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_evaluate, args=(stop,))
+        worker.start()
+        try:
+            sampler = SamplingProfiler(interval=0.002, target_thread_id=worker.ident)
+            sampler.start()
+            time.sleep(0.2)
+            sampler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert sampler.samples > 0
+        assert sampler.by_subsystem["evaluation"] > 0
+        lines = sampler.collapsed().strip().splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[0] in {"evaluation", "other"}
+        assert any("poker_logic:evaluate_hand" in line for line in lines)
+
+    def test_summary_shape(self):
+        sampler = SamplingProfiler(interval=0.002)
+        sampler.start()
+        time.sleep(0.02)
+        sampler.stop()
+
+        summary = sampler.summary()
+        assert summary["samples"] == sum(summary["by_subsystem"].values())
+        assert "collapsed" in summary
+
+    def test_only_one_active_profile(self):
+        first = SamplingProfiler()
+        second = SamplingProfiler()
+        assert profiler.acquire(first)
+        try:
+            assert not profiler.acquire(second)
+        finally:
+            profiler.release(first)
+        assert profiler.acquire(second)
+        profiler.release(second)
+
+
+class TestClassify:
+    def test_innermost_match_wins(self):
+        import json
+        from app.core import protocol
+
+        codes = [json.encoder.JSONEncoder.encode.__code__, protocol.broadcast_state.__code__]
+        assert classify(codes) == "serialization"
+
+    def test_broadcast(self):
+        from app.core import protocol
+
+        assert classify([protocol.public_state.__code__]) == "broadcast"
+
+    def test_unknown_is_other(self):
+        def helper():
+            pass
+
+        assert classify([helper.__code__]) == "other"
+
+
+class TestProfileEndpoint:
+    @pytest.fixture
+    def client(self):
+        from app.main import app
+        from app.dependencies import get_current_admin
+
+        app.dependency_overrides[get_current_admin] = lambda: object()
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_current_admin, None)
+
+    def test_returns_collapsed_stacks(self, client):
+        response = client.post("/api/admin/profile?seconds=0.05&interval_ms=1")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_json_format(self, client):
+        response = client.post("/api/admin/profile?seconds=0.05&interval_ms=1&format=json")
+        assert response.status_code == 200
+        assert "by_subsystem" in response.json()
+
+    def test_conflict_when_running(self, client):
+        busy = SamplingProfiler()
+        profiler.acquire(busy)
+        try:
+            response = client.post("/api/admin/profile?seconds=0.05")
+        finally:
+            profiler.release(busy)
+        assert response.status_code == 409
+
+    def test_requires_admin(self):
+        from app.main import app
+
+        response = TestClient(app).post("/api/admin/profile?seconds=0.05")
+        assert response.status_code == 401
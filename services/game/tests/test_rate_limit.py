@@ -0,0 +1,118 @@
+"""
+Tests for websocket frame rate limiting.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.core import tables
+from app.core.actor import TableActor, _actors
+from app.core.models import TableState
+from app.core.rate_limit import TokenBucket, KeyedLimiter, FrameLimiter
+from app.core.timers import timers
+from app.routes import ws as ws_routes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+        assert [bucket.allow() for _ in range(4)] == [True, True, True, False]
+        clock.now += 0.5
+        assert bucket.allow()
+        assert not bucket.allow()
+
+    def test_refill_is_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        clock.now += 60
+        assert [bucket.allow() for _ in range(3)] == [True, True, False]
+
+
+class TestKeyedLimiter:
+    def test_keys_have_separate_buckets(self):
+        limiter = KeyedLimiter(rate=1, burst=1, clock=FakeClock())
+        assert limiter.allow("a") and limiter.allow("b")
+        assert not limiter.allow("a")
+
+    def test_refilled_buckets_are_pruned(self):
+        clock = FakeClock()
+        limiter = KeyedLimiter(rate=1, burst=2, clock=clock)
+        for key in range(100):
+            limiter.allow(key)
+
+        clock.now += 5
+        limiter.allow("fresh")
+        assert len(limiter) == 1
+
+
+class TestFrameLimiter:
+    def test_each_scope_limits_on_its_own(self):
+        limiter = FrameLimiter(rate=100, burst=2, pid_rate=100, pid_burst=3, ip_rate=100, ip_burst=4, clock=FakeClock())
+        first, second, third = limiter.connection(), limiter.connection(), limiter.connection()
+
+        assert [limiter.check(first, "p1", "1.2.3.4") for _ in range(3)] == [True, True, False]  # Connection
+        assert [limiter.check(second, "p1", "1.2.3.4") for _ in range(2)] == [True, False]  # Player
+        assert [limiter.check(third, "p2", "1.2.3.4") for _ in range(2)] == [True, False]  # IP
+        assert limiter.check(limiter.connection(), "p3", None)  # No address: no IP limit
+
+
+class FakeWebSocket:
+    def __init__(self, incoming=()):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        for msg in incoming:
+            self.incoming.put_nowait(msg)
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self) -> None:
+        pass
+
+    async def receive_text(self) -> str:
+        msg = await self.incoming.get()
+        if msg is None:
+            raise WebSocketDisconnect()
+        return msg if isinstance(msg, str) else json.dumps(msg)
+
+
+@pytest.fixture
+def table(monkeypatch):
+    async def no_lobby(self):
+        pass
+
+    monkeypatch.setattr(TableActor, "_delete_from_lobby", no_lobby)
+    monkeypatch.setattr(ws_routes, "frame_limiter", FrameLimiter(rate=0, burst=5))
+    table = TableState(table_id="rate-test")
+    tables._tables[table.table_id] = table
+    yield table
+    timers.cancel_owner(table.table_id)
+    tables._tables.pop(table.table_id, None)
+    _actors.pop(table.table_id, None)
+
+
+class TestEndpoint:
+    @pytest.mark.asyncio
+    async def test_flood_never_reaches_the_table(self, table, monkeypatch):
+        submitted = []
+        monkeypatch.setattr(TableActor, "submit", lambda self, cmd: submitted.append(cmd))
+        ws = FakeWebSocket([{"type": "join", "name": "Spammer", "pid": "p1"}] + [{"type": "start"}] * 50 + [None])
+
+        await ws_routes.ws_endpoint(ws, table.table_id)
+
+        assert len(submitted) == 5  # The burst; nothing refills at rate 0
@@ -0,0 +1,148 @@
+"""
+Tests for the spectator relay.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core import tables
+from app.core.actor import TableActor, Join, Disconnect, Resume, get_actor, _actors
+from app.core.game_flow import start_new_hand
+from app.core.models import TableState
+from app.core.protocol import broadcast_info, broadcast_state, public_state
+from app.core.relay import SpectatorRelay
+from app.core.timers import timers
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+def _table():
+    table = TableState(table_id="relay-test")
+    for i in range(2):
+        table.upsert_player(pid=f"p{i}", name=f"P{i}")
+    for i in range(2, 6):
+        table.upsert_player(pid=f"p{i}", name=f"P{i}", force_spectator=True, stack=500 if i < 5 else 0)
+    start_new_hand(table)
+    sockets = {pid: FakeWebSocket() for pid in table.players}
+    table.connections.update(sockets)
+    return table, sockets
+
+
+async def _drain(relay: SpectatorRelay) -> None:
+    while relay._queue is not None and not relay._queue.empty():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+class TestSpectatorRelay:
+    @pytest.mark.asyncio
+    async def test_spectators_get_the_same_state_as_before(self):
+        table, sockets = _table()
+        relay = SpectatorRelay(table.table_id, delay=0)
+
+        await broadcast_state(table, relay)
+        assert all(sockets[pid].sent for pid in ("p0", "p1"))
+        assert not any(sockets[pid].sent for pid in ("p2", "p3", "p4", "p5"))
+
+        await _drain(relay)
+        for pid, ws in sockets.items():
+            assert json.loads(ws.sent[0])["state"] == public_state(table, pid)
+        relay.close()
+
+    @pytest.mark.asyncio
+    async def test_one_frame_per_distinct_stack(self):
+        table, sockets = _table()
+        relay = SpectatorRelay(table.table_id, delay=0)
+
+        await broadcast_state(table, relay)
+        await _drain(relay)
+
+        assert sockets["p2"].sent[0] is sockets["p4"].sent[0]
+        assert sockets["p2"].sent[0] != sockets["p5"].sent[0]
+        relay.close()
+
+    @pytest.mark.asyncio
+    async def test_delay_holds_spectator_frames_back_in_order(self):
+        table, sockets = _table()
+        relay = SpectatorRelay(table.table_id, delay=0.05)
+
+        await broadcast_info(table, "P0 raises", relay)
+        await broadcast_state(table, relay)
+        await asyncio.sleep(0.01)
+        assert len(sockets["p0"].sent) == 2 and not sockets["p2"].sent
+
+        await asyncio.sleep(0.1)
+        assert [json.loads(text)["type"] for text in sockets["p2"].sent] == ["info", "state"]
+        assert sockets["p2"].sent[0] == sockets["p0"].sent[0]
+        relay.close()
+
+    @pytest.mark.asyncio
+    async def test_waitlisted_spectators_are_sent_directly(self):
+        from app.core.waitlist import join_waitlist
+
+        table, sockets = _table()
+        join_waitlist(table, "p3")
+        relay = SpectatorRelay(table.table_id, delay=10)
+
+        await broadcast_state(table, relay)
+
+        assert json.loads(sockets["p3"].sent[0])["state"] == public_state(table, "p3")
+        assert not sockets["p2"].sent
+        relay.close()
+
+    @pytest.mark.asyncio
+    async def test_frames_queued_before_joining_a_waitlist_are_dropped(self):
+        from app.core.waitlist import join_waitlist
+
+        table, sockets = _table()
+        relay = SpectatorRelay(table.table_id, delay=0.05)
+        await broadcast_state(table, relay)
+
+        join_waitlist(table, "p2")
+        await broadcast_state(table, relay)
+        await asyncio.sleep(0.1)
+
+        assert len(sockets["p2"].sent) == 1  # Only the live frame; the older delayed one never lands on top
+        assert json.loads(sockets["p2"].sent[0])["state"]["my_role"] == "waitlist"
+        assert len(sockets["p3"].sent) == 2
+        relay.close()
+
+
+class TestSpectatorResume:
+    @pytest.fixture
+    def actor(self, monkeypatch):
+        async def no_lobby(self):
+            pass
+
+        monkeypatch.setattr(TableActor, "_delete_from_lobby", no_lobby)
+        table = TableState(table_id="relay-resume-test")
+        tables._tables[table.table_id] = table
+        actor = get_actor(table.table_id)
+        actor.relay.delay = 0.05
+        yield actor
+        actor.relay.close()
+        timers.cancel_owner(table.table_id)
+        tables._tables.pop(table.table_id, None)
+        _actors.pop(table.table_id, None)
+
+    @pytest.mark.asyncio
+    async def test_resuming_spectator_gets_the_delayed_state(self, actor):
+        await actor.request(Join(ws=FakeWebSocket(), pid="p1", name="P1", stack=1000))
+        first = FakeWebSocket()
+        await actor.request(Join(ws=first, pid="s1", name="S1", stack=1000, spectator=True))
+        await actor.request(Disconnect(pid="s1", ws=first, grace=5))
+
+        again = FakeWebSocket()
+        assert await actor.request(Resume(ws=again, pid="s1", last_seq=0))
+        assert [json.loads(text)["type"] for text in again.sent] == ["welcome"]
+
+        await asyncio.sleep(0.1)
+        frame = json.loads(again.sent[1])
+        assert frame["type"] == "state" and frame["state"] == public_state(actor.table, "s1")
@@ -0,0 +1,239 @@
+"""
+Tests for resumable table sessions (frame log, resume tickets, disconnect grace).
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.core import tables
+from app.core.actor import TableActor, Join, PlayerMessage, Disconnect, Resume, get_actor, _actors
+from app.core.models import TableState
+from app.core.sessions import FrameLog, TicketStore, tickets
+from app.core.timers import timers
+from app.routes.ws import ws_endpoint
+
+
+class FakeWebSocket:
+    def __init__(self, incoming=()):
+        self.sent = []
+        self.closed = False
+        self.incoming = asyncio.Queue()
+        for msg in incoming:
+            self.incoming.put_nowait(msg)
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def receive_text(self) -> str:
+        msg = await self.incoming.get()
+        if msg is None:
+            raise WebSocketDisconnect()
+        if isinstance(msg, Exception):
+            raise msg
+        return json.dumps(msg)
+
+    def frames(self, mtype: str):
+        return [f for f in self.sent if f["type"] == mtype]
+
+
+@pytest.fixture
+def actor(monkeypatch):
+    table = TableState(table_id="resume-test")
+    tables._tables[table.table_id] = table
+
+    async def no_lobby(self):
+        pass
+
+    monkeypatch.setattr(TableActor, "_delete_from_lobby", no_lobby)
+    yield get_actor(table.table_id)
+    timers.cancel_owner(table.table_id)
+    tables._tables.pop(table.table_id, None)
+    _actors.pop(table.table_id, None)
+
+
+async def _join(actor, pid):
+    ws = FakeWebSocket()
+    await actor.request(Join(ws=ws, pid=pid, name=pid.upper(), stack=1000))
+    return ws
+
+
+class TestFrameLog:
+    def test_frames_after_a_seq(self):
+        log = FrameLog(size=4)
+        for _ in range(3):
+            seq = log.next_seq()
+            log.record(seq, f"f{seq}")
+
+        assert log.since(1) == ["f2", "f3"]
+        assert log.since(3) == []
+
+    def test_gap_when_frames_were_pushed_out(self):
+        log = FrameLog(size=2)
+        for _ in range(5):
+            seq = log.next_seq()
+            log.record(seq, f"f{seq}")
+
+        assert log.since(3) == ["f4", "f5"]
+        assert log.since(2) is None
+        assert log.since(9) is None  # Not a seq this table ever sent
+
+    def test_unrecorded_seqs_still_count(self):
+        log = FrameLog(size=2)
+        log.next_seq()  # A state broadcast: numbered but not kept
+        log.record(log.next_seq(), "info")
+        assert log.since(0) == ["info"]
+
+
+class TestTicketStore:
+    def test_ticket_is_per_table_and_gone_once_discarded(self):
+        store = TicketStore(grace_seconds=30)
+        token = store.issue("p1", "Alice", "t1")
+
+        assert store.peek(token, "t2") is None
+        ticket = store.peek(token, "t1")
+        assert (ticket.pid, ticket.name) == ("p1", "Alice")
+        assert store.peek(token, "t1") is ticket  # Peeking leaves it in place
+        store.discard(token)
+        assert store.peek(token, "t1") is None
+
+    def test_ticket_expires_after_grace(self, monkeypatch):
+        store = TicketStore(grace_seconds=30)
+        now = [1000.0]
+        monkeypatch.setattr("app.core.sessions.time.monotonic", lambda: now[0])
+        kept, expired = store.issue("p1", "A", "t1"), store.issue("p2", "B", "t1")
+        store.release(expired)
+
+        now[0] += 31
+        assert store.peek(expired, "t1") is None
+        assert store.peek(kept, "t1") is not None  # Still connected: no clock running
+
+    def test_released_tickets_are_pruned(self, monkeypatch):
+        store = TicketStore(grace_seconds=30)
+        now = [1000.0]
+        monkeypatch.setattr("app.core.sessions.time.monotonic", lambda: now[0])
+        store.release(store.issue("p1", "A", "t1"))
+
+        now[0] += 31
+        store.issue("p2", "B", "t1")
+        assert len(store) == 1
+
+
+class TestGrace:
+    @pytest.mark.asyncio
+    async def test_dropped_player_keeps_their_seat_until_grace_ends(self, actor):
+        ws1, ws2 = await _join(actor, "p1"), await _join(actor, "p2")
+        await actor.request(PlayerMessage(pid="p1", msg={"type": "start"}))
+        ws2.sent.clear()
+
+        await actor.request(Disconnect(pid="p1", ws=ws1, grace=0.02))
+
+        table = actor.table
+        assert table.players["p1"].connected and "p1" not in table.folded_pids
+        assert ws2.sent == []  # Nobody hears about a drop that may not last
+
+        await asyncio.sleep(0.05)
+        assert not table.players["p1"].connected
+        assert ws2.frames("info")
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_frames_to_the_resumer_only(self, actor):
+        ws1, ws2 = await _join(actor, "p1"), await _join(actor, "p2")
+        last_seq = ws1.sent[-1]["seq"]
+        await actor.request(Disconnect(pid="p1", ws=ws1, grace=30))
+        await actor.request(PlayerMessage(pid="p2", msg={"type": "start"}))
+        ws2.sent.clear()
+
+        fresh = FakeWebSocket()
+        assert await actor.request(Resume(ws=fresh, pid="p1", last_seq=last_seq, ticket="next"))
+
+        assert fresh.sent[0] == {"type": "welcome", "pid": "p1", "resumed": True, "complete": True, "resume": "next"}
+        assert [f["message"] for f in fresh.frames("info")] == ["New hand started"]
+        assert fresh.sent[-1]["type"] == "state" and fresh.sent[-1]["state"]["hole_cards"]
+        assert ws2.sent == []
+        assert not timers.pending((actor.table_id, "grace:p1"))
+
+    @pytest.mark.asyncio
+    async def test_resume_after_grace_fails(self, actor):
+        ws1 = await _join(actor, "p1")
+        await _join(actor, "p2")
+        await actor.request(Disconnect(pid="p1", ws=ws1))
+
+        assert await actor.request(Resume(ws=FakeWebSocket(), pid="p1", last_seq=0)) is False
+
+
+class TestResumeRoute:
+    @pytest.mark.asyncio
+    async def test_reconnect_with_ticket(self, actor):
+        other = await _join(actor, "p2")
+        first = FakeWebSocket([{"type": "join", "name": "Alice", "pid": "p1"}, None])
+        await ws_endpoint(first, actor.table_id)
+        token = first.sent[0]["resume"]
+        assert actor.table.players["p1"].connected
+        other.sent.clear()
+
+        again = FakeWebSocket([{"type": "resume", "ticket": token, "last_seq": first.sent[-1]["seq"]}])
+        task = asyncio.create_task(ws_endpoint(again, actor.table_id))
+        await asyncio.sleep(0.01)
+
+        assert again.sent[0]["resumed"] and again.sent[0]["resume"] != token
+        assert actor.table.connections["p1"] is again
+        assert other.sent == []
+        assert tickets.peek(token, actor.table_id) is None  # Used up once the resume was accepted
+
+        again.incoming.put_nowait(None)
+        await asyncio.wait_for(task, 1)
+        tickets.discard(again.sent[0]["resume"])
+
+    @pytest.mark.asyncio
+    async def test_bad_ticket_falls_back_to_join(self, actor):
+        ws = FakeWebSocket([{"type": "resume", "ticket": "nope", "last_seq": 3},
+                            {"type": "join", "name": "Alice", "pid": "p1"}])
+        task = asyncio.create_task(ws_endpoint(ws, actor.table_id))
+        await asyncio.sleep(0.01)
+
+        assert [f["type"] for f in ws.sent[:3]] == ["resume_failed", "welcome", "state"]
+        assert actor.table.connections["p1"] is ws
+
+        ws.incoming.put_nowait(None)
+        await asyncio.wait_for(task, 1)
+        tickets.discard(ws.sent[1]["resume"])
+
+    @pytest.mark.asyncio
+    async def test_rejected_resume_leaves_the_ticket_to_the_live_session(self, actor):
+        first = FakeWebSocket([{"type": "join", "name": "Alice", "pid": "p1"}])
+        task = asyncio.create_task(ws_endpoint(first, actor.table_id))
+        await asyncio.sleep(0.01)
+        token = first.sent[0]["resume"]
+
+        intruder = FakeWebSocket([{"type": "resume", "ticket": token, "last_seq": 0}])
+        probe = asyncio.create_task(ws_endpoint(intruder, actor.table_id))
+        await asyncio.sleep(0.01)
+        assert intruder.sent[0]["type"] == "resume_failed"
+        assert actor.table.connections["p1"] is first
+
+        first.incoming.put_nowait(None)
+        await asyncio.wait_for(task, 1)
+        assert tickets.peek(token, actor.table_id) is not None  # The real drop can still be resumed
+        intruder.incoming.put_nowait(None)
+        await asyncio.wait_for(probe, 1)
+        tickets.discard(token)
+
+    @pytest.mark.asyncio
+    async def test_handler_error_still_disconnects(self, actor):
+        ws = FakeWebSocket([{"type": "join", "name": "Alice", "pid": "p1"}, RuntimeError("socket broke")])
+
+        with pytest.raises(RuntimeError):
+            await ws_endpoint(ws, actor.table_id)
+
+        assert "p1" not in actor.table.connections
+        token = ws.sent[0]["resume"]
+        assert tickets._tickets[token].expires_at is not None  # Released: its grace window has started
+        tickets.discard(token)
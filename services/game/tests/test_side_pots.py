@@ -173,8 +173,9 @@ class TestAllInBehavior:
 
         # p4 has only 790, tries to go all-in (which is less than 1590)
         from app.core.actions import _handle_action
+        from app.core.messages import Action
 
-        msg = {"type": "action", "action": "all_in"}
+        msg = Action("all_in")
         table.current_turn_pid = "p4"
 
         # Before fix: would call process_raise and reset players_acted to {"p4"}
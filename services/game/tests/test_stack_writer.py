@@ -0,0 +1,91 @@
+"""Tests for background stack persistence."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import stack_writer as stack_writer_module
+from app.core.stack_writer import StackWriter
+from db import Base, User, PlayerStack
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_stack_writer.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(stack_writer_module, "get_db", override_get_db)
+    db = TestingSessionLocal()
+    db.add_all([User(id=1, username="alice", password_hash="x"), User(id=2, username="bob", password_hash="x")])
+    db.add_all([PlayerStack(user_id=1, stack=1000), PlayerStack(user_id=2, stack=1000)])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def _stacks():
+    db = TestingSessionLocal()
+    try:
+        return {row.user_id: row.stack for row in db.query(PlayerStack).all()}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def writer():
+    writer = StackWriter(flush_interval=60)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+class TestStackWriter:
+    def test_latest_stack_per_user_is_written_in_one_flush(self, database, writer):
+        writer.save(1, 900)
+        writer.save(2, 1100)
+        writer.save(1, 850)
+        assert _stacks() == {1: 1000, 2: 1000}
+        assert writer.pending(1) == 850
+
+        assert writer.flush() == 2
+        assert _stacks() == {1: 850, 2: 1100}
+        assert writer.pending(1) is None
+
+    def test_failed_flush_keeps_newer_stacks(self, database, writer, monkeypatch):
+        def broken_db():
+            raise RuntimeError("database is down")
+            yield
+
+        writer.save(1, 900)
+        monkeypatch.setattr(stack_writer_module, "get_db", broken_db)
+        assert writer.flush() == 0
+        assert writer.pending(1) == 900
+
+        writer.save(1, 800)
+        writer._merge_back({1: 900})
+        monkeypatch.setattr(stack_writer_module, "get_db", override_get_db)
+        writer.flush()
+        assert _stacks()[1] == 800
+
+    def test_stop_writes_what_is_left(self, database, writer):
+        writer.save(2, 400)
+        writer.stop()
+        assert _stacks()[2] == 400
+
+    def test_saves_go_straight_to_the_database_until_started(self, monkeypatch):
+        from app.core import auth
+
+        written = []
+        monkeypatch.setattr(auth, "update_user_stack", lambda user_id, stack: written.append((user_id, stack)) or True)
+        StackWriter().save(1, 700)
+        assert written == [(1, 700)]
@@ -0,0 +1,279 @@
+"""Tests for the multi-table tournament engine and the headless simulator."""
+import pytest
+
+from app.core.tournament import Tournament, BlindLevel
+from app.core.tournament_sim import ManualClock, simulate
+from models.player import PlayerRole
+
+LEVELS = [BlindLevel(5, 10), BlindLevel(10, 20), BlindLevel(25, 50)]
+
+
+def _entrants(n):
+    return [(f"p{i}", f"Player {i}") for i in range(1, n + 1)]
+
+
+def _tournament(n, table_size=9, clock=None, **kwargs):
+    return Tournament("t", _entrants(n), table_size=table_size, levels=LEVELS,
+                      level_seconds=600, clock=clock if clock is not None else ManualClock(), seed=1, **kwargs)
+
+
+def _sizes(tournament):
+    return sorted(len(t.players) for t in tournament.tables.values())
+
+
+def _bust(table, *pids):
+    for pid in pids:
+        table.players[pid].stack = 0
+
+
+class TestSeating:
+    def test_field_is_spread_evenly(self):
+        tournament = _tournament(20)
+        assert len(tournament.tables) == 3
+        assert _sizes(tournament) == [6, 7, 7]
+
+    def test_every_entrant_has_a_unique_seat(self):
+        tournament = _tournament(50)
+        seen = set()
+        for table_id, table in tournament.tables.items():
+            seats = [p.seat for p in table.players.values()]
+            assert len(seats) == len(set(seats))
+            assert all(1 <= s <= 9 for s in seats)
+            for pid in table.players:
+                assert tournament.table_of(pid) == table_id
+                seen.add(pid)
+        assert len(seen) == 50
+
+    def test_needs_two_entrants(self):
+        with pytest.raises(ValueError):
+            _tournament(1)
+
+
+class TestBlindClock:
+    def test_levels_advance_on_the_clock(self):
+        clock = ManualClock()
+        tournament = _tournament(18, clock=clock)
+        tournament.start()
+        assert tournament.level_ends_at() == 600
+
+        clock.advance(599)
+        assert tournament.blinds == LEVELS[0]
+        clock.advance(1)
+        assert tournament.blinds == LEVELS[1]
+        clock.advance(600)
+        assert tournament.blinds == LEVELS[2]
+        # Last level: nothing left to schedule
+        assert tournament.level_ends_at() is None
+
+    def test_new_level_applies_from_the_next_hand(self):
+        clock = ManualClock()
+        tournament = _tournament(18, clock=clock)
+        tournament.start()
+        table = next(iter(tournament.tables.values()))
+        assert tournament.deal(table)
+        clock.advance(600)
+        assert table.big_blind == 10
+
+        table.hand_in_progress = False
+        tournament.end_hand(table)
+        assert tournament.deal(table)
+        assert (table.small_blind, table.big_blind) == (10, 20)
+
+    def test_stop_cancels_the_clock(self):
+        clock = ManualClock()
+        tournament = _tournament(18, clock=clock)
+        tournament.start()
+        tournament.stop()
+        clock.advance(3600)
+        assert tournament.level == 0
+
+
+class TestEliminations:
+    def test_same_hand_busts_place_by_starting_stack(self):
+        tournament = _tournament(4, table_size=4)
+        table = tournament.tables["t-1"]
+        table.players["p1"].stack = 500
+        table.players["p2"].stack = 1500
+        assert tournament.deal(table)
+        table.hand_in_progress = False
+        _bust(table, "p1", "p2")
+
+        tournament.end_hand(table)
+
+        assert tournament.places == {"p1": 4, "p2": 3}
+        assert tournament.remaining == 2
+        assert "p1" not in table.players and tournament.table_of("p1") is None
+
+    def test_last_player_standing_wins(self):
+        finished = []
+        tournament = _tournament(2)
+        tournament.on_finish = finished.append
+        table = tournament.tables["t-1"]
+        _bust(table, "p1")
+
+        tournament.end_hand(table)
+
+        assert tournament.finished
+        assert [place for place, _, _ in tournament.standings()] == [1, 2]
+        assert tournament.standings()[0][1] == "p2"
+        assert finished == [tournament]
+        assert not tournament.deal(table)
+
+
+class TestBalancing:
+    def test_moves_from_long_table_to_shortest(self):
+        moved = []
+        tournament = _tournament(18)
+        tournament.on_move = lambda pid, src, dst: moved.append((pid, src, dst))
+        short, long = tournament.tables["t-1"], tournament.tables["t-2"]
+        _bust(short, *list(short.players)[:3])
+        tournament.end_hand(short)
+        assert _sizes(tournament) == [6, 9]
+
+        moves = tournament.end_hand(long)
+
+        assert len(moves) == 1
+        assert _sizes(tournament) == [7, 8]
+        assert moved == [(moves[0].pid, "t-2", "t-1")]
+        player = short.players[moves[0].pid]
+        assert player.role == PlayerRole.SEATED
+        assert player.seat not in {p.seat for p in short.players.values() if p is not player}
+
+    def test_one_player_difference_is_balanced(self):
+        tournament = _tournament(18)
+        short = tournament.tables["t-1"]
+        _bust(short, next(iter(short.players)))
+        assert tournament.end_hand(short) == []
+        assert tournament.end_hand(tournament.tables["t-2"]) == []
+
+    def test_moves_the_player_due_the_big_blind(self):
+        tournament = _tournament(18)
+        short, long = tournament.tables["t-1"], tournament.tables["t-2"]
+        _bust(short, *list(short.players)[:2])
+        tournament.end_hand(short)
+        # Button moves to seat 5, blinds are seats 6 and 7
+        long.dealer_seat = 4
+        due = next(p.pid for p in long.players.values() if p.seat == 7)
+
+        moves = tournament.end_hand(long)
+
+        assert [m.pid for m in moves] == [due]
+
+    def test_player_moved_to_a_table_mid_hand_waits_for_it_to_end(self):
+        tournament = _tournament(18)
+        short, long = tournament.tables["t-1"], tournament.tables["t-2"]
+        _bust(short, *list(short.players)[:3])
+        tournament.end_hand(short)
+        assert tournament.deal(short)
+
+        moves = tournament.end_hand(long)
+
+        assert len(moves) == 1
+        pid = moves[0].pid
+        assert pid not in short.players and pid not in long.players
+        assert tournament.table_of(pid) == "t-1"
+
+        short.hand_in_progress = False
+        tournament.end_hand(short)
+        assert short.players[pid].role == PlayerRole.SEATED
+
+
+class TestBreaking:
+    def test_breaks_shortest_table_when_the_rest_can_seat_everyone(self):
+        tournament = _tournament(27)
+        _bust(tournament.tables["t-3"], *list(tournament.tables["t-3"].players)[:5])
+        tournament.end_hand(tournament.tables["t-3"])
+        assert tournament.broken == []  # 22 players still need three tables
+
+        first = tournament.tables["t-1"]
+        _bust(first, *list(first.players)[:4])
+        moves = tournament.end_hand(first)
+
+        # 18 players fit at two tables: t-3 (4 players) is the shortest
+        assert tournament.broken == ["t-3"]
+        assert "t-3" not in tournament.tables
+        assert [m.to_table for m in moves] == ["t-1"] * 4
+        assert _sizes(tournament) == [9, 9]
+
+    def test_table_in_a_hand_breaks_when_the_hand_ends(self):
+        tournament = _tournament(27)
+        first, third = tournament.tables["t-1"], tournament.tables["t-3"]
+        _bust(first, *list(first.players)[:5])
+        tournament.end_hand(first)
+        assert tournament.deal(first)
+
+        _bust(third, *list(third.players)[:4])
+        tournament.end_hand(third)
+        assert tournament.broken == []  # t-1 is shortest but still playing its hand
+        assert "t-1" in tournament.tables
+
+        first.hand_in_progress = False
+        moves = tournament.end_hand(first)
+
+        assert tournament.broken == ["t-1"]
+        assert len(moves) == 4
+        assert _sizes(tournament) == [9, 9]
+
+
+class TestManualClock:
+    def test_fires_in_due_order_and_skips_cancelled(self):
+        clock = ManualClock()
+        fired = []
+        clock.schedule(("a", "x"), 10, fired.append, "late")
+        clock.schedule(("b", "x"), 5, fired.append, "early")
+        clock.schedule(("c", "x"), 1, fired.append, "cancelled")
+        clock.cancel(("c", "x"))
+        clock.advance(20)
+        assert fired == ["early", "late"]
+        assert clock.now == 20
+        assert len(clock) == 0
+
+    def test_reschedule_replaces(self):
+        clock = ManualClock()
+        fired = []
+        clock.schedule(("a", "x"), 5, fired.append, 1)
+        clock.schedule(("a", "x"), 10, fired.append, 2)
+        clock.advance(7)
+        assert fired == []
+        assert clock.due(("a", "x")) == 10
+        clock.advance(3)
+        assert fired == [2]
+
+
+class TestSimulation:
+    def test_whole_tournament_completes(self):
+        result = simulate(entrants=60, seed=7)
+        assert result.tables == 7
+        assert [place for place, _, _ in result.standings] == list(range(1, 61))
+        assert result.tables_broken == 6
+        assert result.hands > 0
+
+    def test_chips_are_conserved(self):
+        import asyncio
+        import random
+        from app.core.tournament_sim import play_hand
+
+        clock = ManualClock()
+        tournament = Tournament("t", _entrants(40), clock=clock, seed=3)
+        total = tournament.chips_in_play()
+        rng = random.Random(3)
+
+        async def run_rounds():
+            for _ in range(20):
+                for table in list(tournament.tables.values()):
+                    if table.table_id not in tournament.tables:
+                        continue
+                    if tournament.deal(table):
+                        await play_hand(table, rng)
+                    tournament.end_hand(table)
+                    if tournament.finished:
+                        return
+                    assert tournament.chips_in_play() == total
+                    assert max(len(t.players) for t in tournament.tables.values()) <= 9
+                clock.advance(60)
+
+        asyncio.run(run_rounds())
+
+    def test_same_seed_same_result(self):
+        assert simulate(entrants=30, seed=2).standings == simulate(entrants=30, seed=2).standings
+
@@ -3,15 +3,24 @@ Tests for waitlist management functionality.
 """
 import pytest
 from app.core.models import TableState, Player, PlayerRole
+from app.core.wait_queue import WaitQueue
 from app.core.waitlist import (
     join_waitlist,
     leave_waitlist,
     promote_from_waitlist,
     get_waitlist_position,
+    global_waitlist,
 )
 from poker.constants import MAX_PLAYERS, DEFAULT_STARTING_STACK
 
 
+@pytest.fixture(autouse=True)
+def reset_global_waitlist():
+    global_waitlist.clear()
+    yield
+    global_waitlist.clear()
+
+
 @pytest.fixture
 def table():
     return TableState(table_id="test")
@@ -49,7 +58,7 @@ class TestJoinWaitlist:
         join_waitlist(table_with_spectator, "spectator1")
         result = join_waitlist(table_with_spectator, "spectator1")
         assert result is False
-        assert table_with_spectator.waitlist.count("spectator1") == 1
+        assert list(table_with_spectator.waitlist).count("spectator1") == 1
 
     def test_nonexistent_player_cannot_join(self, table):
         result = join_waitlist(table, "nobody")
@@ -190,3 +199,99 @@ class TestPlayerCap:
         player = table.upsert_player("p1", "Player 1")
         assert player.role == PlayerRole.SEATED
         assert player.connected is True
+
+
+class TestWaitQueue:
+    def test_fifo_with_leave_in_the_middle(self):
+        queue = WaitQueue(["a", "b", "c"])
+        assert queue.discard("b") is True
+        assert "b" not in queue
+        assert len(queue) == 2
+        assert queue.popleft() == "a"
+        assert queue.popleft() == "c"
+        with pytest.raises(IndexError):
+            queue.popleft()
+
+    def test_rejoin_goes_to_the_back(self):
+        queue = WaitQueue(["a", "b"])
+        queue.discard("a")
+        queue.append("a")
+        assert list(queue) == ["b", "a"]
+        assert queue.position("a") == 2
+
+    def test_appendleft_jumps_the_queue(self):
+        queue = WaitQueue(["a"])
+        queue.appendleft("z")
+        assert list(queue) == ["z", "a"]
+        assert queue.head_ticket() < WaitQueue(["later"]).head_ticket()
+
+    def test_stale_entries_are_compacted(self):
+        queue = WaitQueue()
+        for i in range(1000):
+            queue.append(f"p{i}")
+            queue.discard(f"p{i}")
+        assert len(queue._queue) < 50
+
+
+class TestGlobalWaitlist:
+    def _spectator(self, table, pid, stack=1000):
+        table.upsert_player(pid, pid, force_spectator=True, stack=stack)
+
+    def test_join_any_table_and_position(self, table_with_spectator):
+        assert join_waitlist(table_with_spectator, "spectator1", any_table=True) is True
+        assert "spectator1" not in table_with_spectator.waitlist
+        assert table_with_spectator.players["spectator1"].role == PlayerRole.WAITLIST
+        assert get_waitlist_position(table_with_spectator, "spectator1") == 1
+        # Can't be on both
+        assert join_waitlist(table_with_spectator, "spectator1") is False
+
+    def test_leave_any_table(self, table_with_spectator):
+        join_waitlist(table_with_spectator, "spectator1", any_table=True)
+        assert leave_waitlist(table_with_spectator, "spectator1") is True
+        assert not global_waitlist.is_waiting("spectator1")
+        assert table_with_spectator.players["spectator1"].role == PlayerRole.SPECTATOR
+
+    def test_promotes_longest_waiting_across_local_and_global(self, table):
+        table.upsert_player("p1", "Player 1")
+        self._spectator(table, "global")
+        self._spectator(table, "local")
+        join_waitlist(table, "global", any_table=True)
+        join_waitlist(table, "local")
+
+        assert promote_from_waitlist(table) == "global"
+        assert table.players["global"].role == PlayerRole.SEATED
+        assert promote_from_waitlist(table) == "local"
+
+    def test_offers_seat_to_player_watching_another_table(self):
+        offers = []
+        global_waitlist.notify = lambda origin, pid, table_id: offers.append((origin, pid, table_id))
+        try:
+            a = TableState(table_id="a", max_players=2)
+            a.upsert_player("a1", "A1")
+            a.upsert_player("a2", "A2")
+            self._spectator(a, "waiter")
+            join_waitlist(a, "waiter", any_table=True)
+
+            b = TableState(table_id="b", max_players=2)
+            b.upsert_player("b1", "B1")
+
+            assert promote_from_waitlist(b) == "waiter"
+            assert offers == [("a", "waiter", "b")]
+            # The offered seat is held: nobody else is promoted into it
+            self._spectator(b, "other")
+            join_waitlist(b, "other")
+            assert promote_from_waitlist(b) is None
+
+            assert global_waitlist.take_offer("waiter", "b") is True
+            assert global_waitlist.pending_offers("b") == 0
+        finally:
+            global_waitlist.notify = None
+
+    def test_other_stakes_are_not_offered(self):
+        a = TableState(table_id="a", big_blind=20)
+        self._spectator(a, "waiter")
+        join_waitlist(a, "waiter", any_table=True)
+
+        b = TableState(table_id="b", big_blind=10)
+        b.upsert_player("b1", "B1")
+        assert promote_from_waitlist(b) is None
@@ -0,0 +1,355 @@
+"""
+Columnar hand-history export for offline analytics.
+
+Streams the ``hands`` / ``hand_players`` / ``hand_actions`` tables into
+chunked, compressed columnar files:
+
+- ``parquet`` (zstd) or ``arrow`` (Arrow IPC, zstd) when pyarrow is installed
+- ``npz`` (``numpy.savez_compressed``) otherwise
+
+Each chunk covers a contiguous hand id range and holds three tables (hands,
+players, actions). Cards are uint8 (``rank * 4 + suit``, 255 = none) and
+streets/actions are uint8 enums; the mappings are written to
+``manifest.json`` next to the chunks. The manifest also records the last
+exported hand id, so re-running an export only appends chunks for new hands.
+Rows are read in keyset-paginated chunks, so memory is bounded by
+``chunk_size`` regardless of how many hands are exported.
+
+Usage (from services/lobby):
+    python -m app.hand_export --out exports/hands [--format parquet|arrow|npz] [--chunk-size 50000]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass, asdict, field
+from datetime import timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db import SessionLocal, Hand, HandPlayer, HandAction
+from poker.constants import RANKS, SUITS
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+HAND_EXPORT_DIR = os.getenv("HAND_EXPORT_DIR", "exports/hands")
+DEFAULT_CHUNK_SIZE = 50_000
+MANIFEST = "manifest.json"
+FORMATS = ("parquet", "arrow", "npz")
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "npz": "npz"}
+
+NO_CARD = 255
+STREETS = ("preflop", "flop", "turn", "river")
+ACTIONS = ("small_blind", "big_blind", "fold", "check", "call", "raise", "all_in")
+_STREET_CODES = {name: i for i, name in enumerate(STREETS)}
+_ACTION_CODES = {name: i for i, name in enumerate(ACTIONS)}
+UNKNOWN_CODE = 255
+
+# Column name -> array typecode (and the matching numpy/arrow type)
+HAND_COLUMNS = {
+    "hand_id": "q", "started_at_ms": "q", "ended_at_ms": "q",
+    "small_blind": "i", "big_blind": "i", "dealer_seat": "B",
+    "board_0": "B", "board_1": "B", "board_2": "B", "board_3": "B", "board_4": "B",
+    "pot": "i", "went_to_showdown": "B",
+}
+PLAYER_COLUMNS = {
+    "hand_id": "q", "user_id": "i", "seat": "B", "hole_0": "B", "hole_1": "B",
+    "starting_stack": "i", "ending_stack": "i", "net": "i", "won": "B",
+}
+ACTION_COLUMNS = {
+    "hand_id": "q", "seq": "H", "seat": "B", "street": "B", "action": "B", "amount": "i",
+}
+_NUMPY_TYPES = {"q": "int64", "i": "int32", "H": "uint16", "B": "uint8"}
+_ARROW_TYPES = {"q": "int64", "i": "int32", "H": "uint16", "B": "uint8"}
+
+
+class ExportError(Exception):
+    """Export cannot run (bad format, missing dependency, format mismatch)."""
+
+
+class ExportBusy(ExportError):
+    """Another export is already running in this process."""
+
+
+def encode_card(card: str) -> int:
+    """'Ah' -> uint8 (rank index * 4 + suit index)."""
+    return RANKS.index(card[0]) * 4 + SUITS.index(card[1])
+
+
+def decode_card(code: int) -> Optional[str]:
+    if code == NO_CARD:
+        return None
+    return RANKS[code // 4] + SUITS[code % 4]
+
+
+def _cards(value: Optional[str], count: int) -> List[int]:
+    codes = [encode_card(c) for c in (value or "").split()][:count]
+    return codes + [NO_CARD] * (count - len(codes))
+
+
+def _epoch_ms(dt) -> int:
+    """Naive UTC datetime (as stored) -> Unix milliseconds."""
+    return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000) if dt else 0
+
+
+def default_format() -> str:
+    if pa is not None:
+        return "parquet"
+    if np is not None:
+        return "npz"
+    raise ExportError("Hand export needs pyarrow (parquet/arrow) or numpy (npz)")
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown export format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    if fmt in ("parquet", "arrow") and pa is None:
+        raise ExportError(f"Format '{fmt}' requires pyarrow")
+    if fmt == "npz" and np is None:
+        raise ExportError("Format 'npz' requires numpy")
+
+
+@dataclass
+class ChunkInfo:
+    index: int
+    first_hand_id: int
+    last_hand_id: int
+    hands: int
+    players: int
+    actions: int
+    files: Dict[str, str]
+
+
+@dataclass
+class Manifest:
+    format: str
+    last_hand_id: int = 0
+    chunks: List[ChunkInfo] = field(default_factory=list)
+    encoding: dict = field(default_factory=lambda: {
+        "cards": "rank_index * 4 + suit_index; 255 = no card",
+        "ranks": RANKS,
+        "suits": SUITS,
+        "streets": list(STREETS),
+        "actions": list(ACTIONS),
+        "unknown_enum": UNKNOWN_CODE,
+        "user_id": "-1 for guests",
+    })
+
+    @classmethod
+    def load(cls, out_dir: str) -> Optional["Manifest"]:
+        path = os.path.join(out_dir, MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        data["chunks"] = [ChunkInfo(**c) for c in data.get("chunks", [])]
+        return cls(**data)
+
+    def save(self, out_dir: str) -> None:
+        tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(tmp, os.path.join(out_dir, MANIFEST))
+
+
+@dataclass
+class ExportResult:
+    format: str
+    out_dir: str
+    chunks_written: int
+    hands_exported: int
+    last_hand_id: int
+    seconds: float
+
+
+def _columns(spec: Dict[str, str]) -> Dict[str, array]:
+    return {name: array(code) for name, code in spec.items()}
+
+
+def _read_chunk(db: Session, after_id: int, limit: int):
+    """Column buffers for up to ``limit`` hands with id > ``after_id``."""
+    hands = db.execute(
+        select(Hand.__table__).where(Hand.id > after_id).order_by(Hand.id).limit(limit)
+    ).all()
+    if not hands:
+        return None
+    first_id, last_id = hands[0].id, hands[-1].id
+
+    h = _columns(HAND_COLUMNS)
+    for row in hands:
+        h["hand_id"].append(row.id)
+        h["started_at_ms"].append(_epoch_ms(row.started_at))
+        h["ended_at_ms"].append(_epoch_ms(row.ended_at))
+        h["small_blind"].append(row.small_blind)
+        h["big_blind"].append(row.big_blind)
+        h["dealer_seat"].append(row.dealer_seat)
+        for i, code in enumerate(_cards(row.board, 5)):
+            h[f"board_{i}"].append(code)
+        h["pot"].append(row.pot)
+        h["went_to_showdown"].append(int(row.went_to_showdown))
+    del hands
+
+    id_range = (first_id, last_id)
+    p = _columns(PLAYER_COLUMNS)
+    seats: Dict[tuple, int] = {}
+    players = db.execute(
+        select(HandPlayer.__table__)
+        .where(HandPlayer.hand_id.between(*id_range))
+        .order_by(HandPlayer.hand_id, HandPlayer.seat)
+    )
+    for row in players:
+        seats[(row.hand_id, row.pid)] = row.seat
+        p["hand_id"].append(row.hand_id)
+        p["user_id"].append(row.user_id if row.user_id is not None else -1)
+        p["seat"].append(row.seat)
+        hole = _cards(row.hole_cards, 2)
+        p["hole_0"].append(hole[0])
+        p["hole_1"].append(hole[1])
+        p["starting_stack"].append(row.starting_stack)
+        p["ending_stack"].append(row.ending_stack)
+        p["net"].append(row.net)
+        p["won"].append(int(row.won))
+
+    a = _columns(ACTION_COLUMNS)
+    actions = db.execute(
+        select(HandAction.__table__)
+        .where(HandAction.hand_id.between(*id_range))
+        .order_by(HandAction.hand_id, HandAction.seq)
+    )
+    for row in actions:
+        a["hand_id"].append(row.hand_id)
+        a["seq"].append(row.seq)
+        a["seat"].append(seats.get((row.hand_id, row.pid), 0))
+        a["street"].append(_STREET_CODES.get(row.street, UNKNOWN_CODE))
+        a["action"].append(_ACTION_CODES.get(row.action, UNKNOWN_CODE))
+        a["amount"].append(row.amount)
+
+    return first_id, last_id, {"hands": h, "players": p, "actions": a}
+
+
+def _write_arrow_table(columns: Dict[str, array], path: str, fmt: str) -> None:
+    table = pa.table({
+        name: pa.array(values, type=getattr(pa, _ARROW_TYPES[values.typecode])())
+        for name, values in columns.items()
+    })
+    if fmt == "parquet":
+        pyarrow.parquet.write_table(table, path, compression="zstd")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+
+
+def _write_chunk(out_dir: str, index: int, fmt: str, tables: Dict[str, Dict[str, array]]) -> Dict[str, str]:
+    """Write one chunk; files appear atomically (written to .tmp then renamed)."""
+    files = {}
+    if fmt == "npz":
+        name = f"chunk-{index:06d}.npz"
+        arrays = {
+            f"{table}__{column}": np.frombuffer(values, dtype=_NUMPY_TYPES[values.typecode]) if len(values)
+            else np.zeros(0, dtype=_NUMPY_TYPES[values.typecode])
+            for table, columns in tables.items()
+            for column, values in columns.items()
+        }
+        tmp = os.path.join(out_dir, name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, os.path.join(out_dir, name))
+        return {table: name for table in tables}
+
+    for table, columns in tables.items():
+        name = f"{table}-{index:06d}.{EXTENSIONS[fmt]}"
+        tmp = os.path.join(out_dir, name + ".tmp")
+        _write_arrow_table(columns, tmp, fmt)
+        os.replace(tmp, os.path.join(out_dir, name))
+        files[table] = name
+    return files
+
+
+_export_lock = threading.Lock()
+
+
+def export_hands(out_dir: Optional[str] = None, fmt: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, db: Optional[Session] = None) -> ExportResult:
+    """
+    Append chunks for every hand newer than the manifest's last_hand_id.
+
+    The format of an existing export is kept; asking for a different one raises
+    ExportError (use a new directory instead).
+    """
+    if not _export_lock.acquire(blocking=False):
+        raise ExportBusy("An export is already running")
+    started = time.perf_counter()
+    out_dir = out_dir or HAND_EXPORT_DIR
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = Manifest.load(out_dir)
+        if manifest is None:
+            manifest = Manifest(format=fmt or default_format())
+        elif fmt and fmt != manifest.format:
+            raise ExportError(f"{out_dir} already holds a '{manifest.format}' export")
+        _check_format(manifest.format)
+
+        chunks = hands = 0
+        while True:
+            chunk = _read_chunk(db, manifest.last_hand_id, chunk_size)
+            if chunk is None:
+                break
+            first_id, last_id, tables = chunk
+            index = len(manifest.chunks) + 1
+            files = _write_chunk(out_dir, index, manifest.format, tables)
+            count = len(tables["hands"]["hand_id"])
+            manifest.chunks.append(ChunkInfo(
+                index=index, first_hand_id=first_id, last_hand_id=last_id, hands=count,
+                players=len(tables["players"]["hand_id"]), actions=len(tables["actions"]["hand_id"]),
+                files=files,
+            ))
+            manifest.last_hand_id = last_id
+            manifest.save(out_dir)  # After every chunk, so an interrupted run resumes cleanly
+            chunks += 1
+            hands += count
+            del tables
+
+        return ExportResult(
+            format=manifest.format,
+            out_dir=out_dir,
+            chunks_written=chunks,
+            hands_exported=hands,
+            last_hand_id=manifest.last_hand_id,
+            seconds=round(time.perf_counter() - started, 3),
+        )
+    finally:
+        if own_session:
+            db.close()
+        _export_lock.release()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export hand history to columnar files")
+    parser.add_argument("--out", default=HAND_EXPORT_DIR, help="Export directory (appended to on re-runs)")
+    parser.add_argument("--format", choices=FORMATS, help="Default: parquet if pyarrow is installed, else npz")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Hands per chunk")
+    args = parser.parse_args(argv)
+
+    result = export_hands(args.out, args.format, args.chunk_size)
+    print(json.dumps(asdict(result), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ from pathlib import Path
 from .routes.tables import router as tables_router
 from .routes.auth import router as auth_router
 from .routes.admin import router as admin_router
+from .routes.hands import router as hands_router
+from .routes.stats import router as stats_router
+from .routes.internal import router as internal_router
+from .routes.matchmaking import router as matchmaking_router
 
 
 def create_app() -> FastAPI:
@@ -26,12 +30,17 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
     # Include routers
     app.include_router(auth_router)
     app.include_router(tables_router)
     app.include_router(admin_router)
+    app.include_router(hands_router)
+    app.include_router(stats_router)
+    app.include_router(internal_router)
+    app.include_router(matchmaking_router)
 
     # Mount static files for avatars
     static_dir = Path(__file__).parent.parent / "static"
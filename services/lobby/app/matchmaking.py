@@ -0,0 +1,152 @@
+"""
+In-memory index of open seats for quick-seat matchmaking.
+
+Tables are bucketed by ``(big_blind, max_players)`` and then by how many seats
+are free. Placing a player looks at the buckets for the requested stakes from
+the fewest free seats upwards, so the fullest table that still has room wins
+and tables fill up instead of spreading players thin. With at most eight seats
+per table that is a fixed number of dict lookups, however many tables exist.
+
+Seat counts come from the game service's occupancy feed. A placement reserves
+its seat straight away, so players quick-seating at the same moment are not
+all sent to the last open seat; the reservation lapses after
+``SEAT_RESERVATION_TTL`` seconds or once the table reports the extra player.
+"""
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from models.table_config import TableConfig
+
+SEAT_RESERVATION_TTL = float(os.getenv("SEAT_RESERVATION_TTL", "15"))
+MAX_SEATS = 8
+
+StakeKey = Tuple[int, int]  # (big_blind, max_players)
+
+
+@dataclass
+class _Entry:
+    key: StakeKey
+    max_players: int
+    seated: int = 0
+    reserved: int = 0
+    bucket: int = 0  # free seats it is filed under, 0 = not filed
+
+    @property
+    def free(self) -> int:
+        return max(0, self.max_players - self.seated - self.reserved)
+
+
+class SeatIndex:
+    """Open seats by stake level, for constant-time placement."""
+
+    def __init__(self, reservation_ttl: float = SEAT_RESERVATION_TTL):
+        self.reservation_ttl = reservation_ttl
+        self.loaded = False
+        self._entries: Dict[str, _Entry] = {}
+        # (big_blind, max_players) -> free seats -> table ids in filing order
+        self._open: Dict[StakeKey, Dict[int, Dict[str, None]]] = {}
+        self._sizes: Dict[int, Set[int]] = {}
+        self._reservations: Deque[Tuple[float, str]] = deque()
+
+    def load(self, tables: Iterable[TableConfig], seated: Dict[str, int]) -> None:
+        """Index existing tables (once, before the first placement)."""
+        for config in tables:
+            if config.table_id not in self._entries:
+                self.add(config, seated.get(config.table_id, 0))
+        self.loaded = True
+
+    def add(self, config: TableConfig, seated: int = 0) -> None:
+        self.remove(config.table_id)
+        key = (config.big_blind, config.max_players)
+        entry = _Entry(key=key, max_players=config.max_players, seated=seated)
+        self._entries[config.table_id] = entry
+        self._sizes.setdefault(config.big_blind, set()).add(config.max_players)
+        self._file(config.table_id, entry)
+
+    def remove(self, table_id: str) -> None:
+        entry = self._entries.pop(table_id, None)
+        if entry is not None:
+            self._unfile(table_id, entry)
+
+    def set_seated(self, table_id: str, seated: int) -> None:
+        """Apply a seated count from the occupancy feed."""
+        entry = self._entries.get(table_id)
+        if entry is None:
+            return
+        if seated > entry.seated:
+            # The new arrivals are most likely the players we reserved seats for
+            entry.reserved = max(0, entry.reserved - (seated - entry.seated))
+        entry.seated = seated
+        self._file(table_id, entry)
+
+    def free_seats(self, table_id: str) -> int:
+        entry = self._entries.get(table_id)
+        return entry.free if entry else 0
+
+    def place(self, big_blind: int, max_players: Optional[int] = None,
+              exclude: Iterable[str] = ()) -> Optional[str]:
+        """Reserve a seat at the fullest open table for the stakes; None if there is none."""
+        self._expire_reservations()
+        excluded = set(exclude)
+        sizes = [max_players] if max_players else sorted(self._sizes.get(big_blind, ()))
+        for free in range(1, MAX_SEATS + 1):
+            for size in sizes:
+                bucket = self._open.get((big_blind, size), {}).get(free)
+                if not bucket:
+                    continue
+                for table_id in bucket:
+                    if table_id not in excluded:
+                        self.reserve(table_id)
+                        return table_id
+        return None
+
+    def reserve(self, table_id: str) -> None:
+        """Hold one seat at the table for a player who is on their way."""
+        entry = self._entries.get(table_id)
+        if entry is None:
+            return
+        entry.reserved += 1
+        self._reservations.append((time.monotonic() + self.reservation_ttl, table_id))
+        self._file(table_id, entry)
+
+    def _expire_reservations(self) -> None:
+        # One TTL for every reservation, so the deque is already in expiry order
+        now = time.monotonic()
+        while self._reservations and self._reservations[0][0] <= now:
+            _, table_id = self._reservations.popleft()
+            entry = self._entries.get(table_id)
+            if entry is not None and entry.reserved > 0:
+                entry.reserved -= 1
+                self._file(table_id, entry)
+
+    def _file(self, table_id: str, entry: _Entry) -> None:
+        """Move the table to the bucket for its current free seat count."""
+        free = entry.free
+        if free == entry.bucket:
+            return
+        self._unfile(table_id, entry)
+        if free > 0:
+            self._open.setdefault(entry.key, {}).setdefault(free, {})[table_id] = None
+            entry.bucket = free
+
+    def _unfile(self, table_id: str, entry: _Entry) -> None:
+        if entry.bucket:
+            buckets = self._open[entry.key]
+            bucket = buckets[entry.bucket]
+            bucket.pop(table_id, None)
+            if not bucket:
+                del buckets[entry.bucket]
+            entry.bucket = 0
+
+    def clear(self) -> None:
+        self.loaded = False
+        self._entries.clear()
+        self._open.clear()
+        self._sizes.clear()
+        self._reservations.clear()
+
+
+seat_index = SeatIndex()
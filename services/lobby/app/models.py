@@ -1,4 +1,6 @@
 """Pydantic models for API requests and responses."""
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +11,10 @@ class CreateTableRequest(BaseModel):
     big_blind: int = Field(default=10, ge=2, description="Big blind amount")
     max_players: int = Field(default=8, ge=2, le=8, description="Maximum players")
     turn_timeout_seconds: int = Field(default=30, ge=10, le=120, description="Turn timeout in seconds")
+    deal_delay_seconds: Optional[int] = Field(
+        default=5, ge=0, le=30,
+        description="Seconds after a hand before the next is dealt automatically; null to deal manually",
+    )
 
 
 class TableResponse(BaseModel):
@@ -19,5 +25,13 @@ class TableResponse(BaseModel):
     big_blind: int
     max_players: int
     turn_timeout_seconds: int
+    deal_delay_seconds: Optional[int] = 5
     created_at: str
     game_ws_url: str  # WebSocket URL to connect to game service
+
+    # Live occupancy pushed by the game service (zero until the table is played)
+    seated: int = 0
+    spectators: int = 0
+    waitlist: int = 0
+    hands_per_hour: int = 0
+    avg_pot: int = 0
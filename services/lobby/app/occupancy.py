@@ -0,0 +1,65 @@
+"""Live table occupancy pushed by the game service, held in memory."""
+from dataclasses import dataclass, asdict, fields
+from typing import Dict
+
+
+@dataclass
+class Occupancy:
+    """Live counts for one table (hands_per_hour and avg_pot cover the last hour)."""
+    seated: int = 0
+    spectators: int = 0
+    waitlist: int = 0
+    hands_per_hour: int = 0
+    avg_pot: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_FIELDS = {f.name for f in fields(Occupancy)}
+
+
+class OccupancyStore:
+    """Applies occupancy frames from the game service's ``/internal/occupancy`` feed."""
+
+    def __init__(self):
+        self._tables: Dict[str, Occupancy] = {}
+
+    def get(self, table_id: str) -> Occupancy:
+        return self._tables.get(table_id) or Occupancy()
+
+    def discard(self, table_id: str) -> None:
+        self._tables.pop(table_id, None)
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+    def apply(self, frame: dict) -> Dict[str, Dict[str, int]]:
+        """Apply one frame. Returns the fields that actually changed, per table."""
+        tables = frame.get("tables") or {}
+        removed = frame.get("removed") or ()
+        touched = set(tables) | set(removed)
+        if frame.get("full"):
+            touched |= set(self._tables)
+        before = {table_id: self.get(table_id).to_dict() for table_id in touched}
+        if frame.get("full"):
+            self._tables = {}
+
+        for table_id, delta in tables.items():
+            occ = self._tables.setdefault(table_id, Occupancy())
+            for name, value in delta.items():
+                if name in _FIELDS:
+                    setattr(occ, name, int(value))
+        for table_id in removed:
+            self._tables.pop(table_id, None)
+
+        changes = {}
+        for table_id in touched:
+            after = self.get(table_id).to_dict()
+            changed = {k: v for k, v in after.items() if before[table_id][k] != v}
+            if changed:
+                changes[table_id] = changed
+        return changes
+
+
+occupancy = OccupancyStore()
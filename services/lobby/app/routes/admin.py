@@ -1,14 +1,19 @@
 """Admin routes for managing users and chip balances."""
+import base64
 import math
+import os
+import time
+from dataclasses import asdict
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import or_
+from sqlalchemy import func, or_, text
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from db import get_db, User, PlayerStack
 from ..dependencies import get_current_admin
+from ..hand_export import export_hands, ExportError, ExportBusy, FORMATS
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -26,12 +31,19 @@ class UserAdminResponse(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """Paginated user list response."""
+    """One page of the user list.
+
+    ``total`` is exact up to ``USER_COUNT_EXACT_LIMIT`` matches and cached for
+    ``USER_COUNT_CACHE_TTL`` seconds; beyond that it is an estimate
+    (``total_is_estimate``). Pass ``next_cursor`` back as ``cursor`` for the
+    next page; it is null on the last page.
+    """
     users: List[UserAdminResponse]
     total: int
-    page: int
+    total_is_estimate: bool
     page_size: int
     pages: int
+    next_cursor: Optional[str]
 
 
 class SetStackRequest(BaseModel):
@@ -39,38 +51,115 @@ class SetStackRequest(BaseModel):
     stack: int = Field(..., ge=0, le=10_000_000)
 
 
+# Counting every match is the slowest part of the listing on a large users
+# table, so counts stop at a cap and are cached briefly per search term.
+USER_COUNT_CACHE_TTL = float(os.getenv("USER_COUNT_CACHE_TTL", "30"))
+USER_COUNT_CACHE_MAX = int(os.getenv("USER_COUNT_CACHE_MAX", "256"))
+USER_COUNT_EXACT_LIMIT = int(os.getenv("USER_COUNT_EXACT_LIMIT", "10000"))
+
+# Below this length trigrams cannot help, so search is a prefix match instead
+SEARCH_PREFIX_MAX_LEN = 2
+
+_count_cache: Dict[str, Tuple[float, int, bool]] = {}
+
+
+def clear_count_cache() -> None:
+    """Forget every cached count; called whenever users are created or deleted."""
+    _count_cache.clear()
+
+
+def _encode_cursor(username: str) -> str:
+    return base64.urlsafe_b64encode(username.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _search_filter(search: str):
+    """Case-insensitive match on username or email, shaped to hit the search indexes."""
+    term = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if len(search) <= SEARCH_PREFIX_MAX_LEN:
+        pattern = f"{term}%"
+        return or_(
+            func.lower(User.username).like(pattern, escape="\\"),
+            func.lower(User.email).like(pattern, escape="\\"),
+        )
+    pattern = f"%{term}%"
+    return or_(User.username.ilike(pattern, escape="\\"), User.email.ilike(pattern, escape="\\"))
+
+
+def _count_users(db: Session, search: Optional[str]) -> Tuple[int, bool]:
+    """Return ``(total, is_estimate)`` for the listing, from cache when fresh."""
+    key = (search or "").lower()
+    cached = _count_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    result = None
+    if not search and db.get_bind().dialect.name == "postgresql":
+        # Planner statistics are free to read; -1 means the table was never analyzed
+        estimate = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")).scalar()
+        if estimate is not None and estimate > USER_COUNT_EXACT_LIMIT:
+            result = (int(estimate), True)
+
+    if result is None:
+        matches = db.query(User.id)
+        if search:
+            matches = matches.filter(_search_filter(search))
+        capped = db.query(func.count()).select_from(
+            matches.limit(USER_COUNT_EXACT_LIMIT + 1).subquery()
+        ).scalar()
+        result = (min(capped, USER_COUNT_EXACT_LIMIT), capped > USER_COUNT_EXACT_LIMIT)
+
+    _count_cache.pop(key, None)
+    if len(_count_cache) >= USER_COUNT_CACHE_MAX:
+        # Dicts keep insertion order, so this drops the oldest entry
+        _count_cache.pop(next(iter(_count_cache)))
+    _count_cache[key] = (time.monotonic() + USER_COUNT_CACHE_TTL, *result)
+    return result
+
+
 @router.get("/users", response_model=UserListResponse)
 def list_users(
     search: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     page_size: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ):
-    """List users with optional search and pagination."""
-    query = db.query(User)
+    """List users ordered by username, with optional search and keyset pagination."""
+    query = (
+        db.query(User.id, User.username, User.email, User.is_admin, PlayerStack.stack)
+        .outerjoin(PlayerStack, PlayerStack.user_id == User.id)
+    )
     if search:
-        pattern = f"%{search}%"
-        query = query.filter(or_(
-            User.username.ilike(pattern),
-            User.email.ilike(pattern),
-        ))
-    total = query.count()
-    users_page = query.order_by(User.username).offset((page - 1) * page_size).limit(page_size).all()
-
-    result = []
-    for user in users_page:
-        stack_row = db.query(PlayerStack).filter(PlayerStack.user_id == user.id).first()
-        result.append(UserAdminResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            is_admin=user.is_admin,
-            stack=stack_row.stack if stack_row else None,
-        ))
+        query = query.filter(_search_filter(search))
+    if cursor:
+        query = query.filter(User.username > _decode_cursor(cursor))
+    rows = query.order_by(User.username).limit(page_size + 1).all()
 
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    users = [
+        UserAdminResponse(id=row.id, username=row.username, email=row.email,
+                          is_admin=row.is_admin, stack=row.stack)
+        for row in rows
+    ]
+
+    total, is_estimate = _count_users(db, search)
     pages = math.ceil(total / page_size) if total > 0 else 1
-    return UserListResponse(users=result, total=total, page=page, page_size=page_size, pages=pages)
+    return UserListResponse(
+        users=users,
+        total=total,
+        total_is_estimate=is_estimate,
+        page_size=page_size,
+        pages=pages,
+        next_cursor=_encode_cursor(rows[-1].username) if has_more else None,
+    )
 
 
 @router.patch("/users/{user_id}/stack")
@@ -153,3 +242,20 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    clear_count_cache()
+
+
+@router.post("/exports/hands")
+def run_hand_export(
+    fmt: Optional[str] = Query(None, alias="format", description=f"One of {', '.join(FORMATS)}; default parquet if available"),
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    """Append hands finished since the last export to the columnar export (HAND_EXPORT_DIR)."""
+    try:
+        result = export_hands(fmt=fmt, db=db)
+    except ExportBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ExportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return asdict(result)
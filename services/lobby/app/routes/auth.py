@@ -16,6 +16,7 @@ from db import (
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
+from .admin import clear_count_cache
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -92,6 +93,7 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     initial_stack = PlayerStack(user_id=new_user.id, stack=1000)
     db.add(initial_stack)
     db.commit()
+    clear_count_cache()  # The admin user list's totals now include this user
 
     # Create access token
     access_token = create_access_token(
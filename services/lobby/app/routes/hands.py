@@ -0,0 +1,161 @@
+"""Hand history routes."""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from db import get_db, User, Hand, HandPlayer, HandAction
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/api/hands", tags=["hands"])
+
+
+class HandSummary(BaseModel):
+    """One hand from the requesting user's point of view."""
+    id: int
+    table_id: str
+    ended_at: datetime
+    small_blind: int
+    big_blind: int
+    board: List[str]
+    pot: int
+    went_to_showdown: bool
+    seat: int
+    hole_cards: List[str]
+    net: int
+    won: bool
+
+
+class HandListResponse(BaseModel):
+    """Page of hands, newest first. Pass ``next_before`` as ``before`` for the next page."""
+    hands: List[HandSummary]
+    next_before: Optional[int]
+
+
+class HandPlayerResponse(BaseModel):
+    name: str
+    seat: int
+    hole_cards: Optional[List[str]]  # Only the requester's own cards and cards shown at showdown
+    starting_stack: int
+    ending_stack: int
+    net: int
+    won: bool
+
+
+class HandActionResponse(BaseModel):
+    seq: int
+    name: str
+    street: str
+    action: str
+    amount: int
+
+
+class HandDetailResponse(BaseModel):
+    """A full hand: players, results and every action in order."""
+    id: int
+    table_id: str
+    started_at: datetime
+    ended_at: datetime
+    small_blind: int
+    big_blind: int
+    dealer_seat: int
+    board: List[str]
+    pot: int
+    went_to_showdown: bool
+    players: List[HandPlayerResponse]
+    actions: List[HandActionResponse]
+
+
+def _cards(value: Optional[str]) -> List[str]:
+    return value.split() if value else []
+
+
+@router.get("/me", response_model=HandListResponse)
+def list_my_hands(
+    before: Optional[int] = Query(None, ge=1, description="Return hands with an id lower than this"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    List the current user's most recent hands.
+
+    Keyset-paginated on hand id (ids increase with completion time), so every
+    page is an index range scan on (user_id, hand_id) no matter how deep.
+    """
+    query = (
+        db.query(HandPlayer, Hand)
+        .join(Hand, Hand.id == HandPlayer.hand_id)
+        .filter(HandPlayer.user_id == current_user.id)
+    )
+    if before is not None:
+        query = query.filter(HandPlayer.hand_id < before)
+    rows = query.order_by(HandPlayer.hand_id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    hands = [
+        HandSummary(
+            id=hand.id,
+            table_id=hand.table_id,
+            ended_at=hand.ended_at,
+            small_blind=hand.small_blind,
+            big_blind=hand.big_blind,
+            board=_cards(hand.board),
+            pot=hand.pot,
+            went_to_showdown=hand.went_to_showdown,
+            seat=player.seat,
+            hole_cards=_cards(player.hole_cards),
+            net=player.net,
+            won=player.won,
+        )
+        for player, hand in rows
+    ]
+    return HandListResponse(hands=hands, next_before=hands[-1].id if has_more else None)
+
+
+@router.get("/{hand_id}", response_model=HandDetailResponse)
+def get_hand(
+    hand_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get one hand. Only players dealt into the hand (and admins) can view it."""
+    hand = db.query(Hand).filter(Hand.id == hand_id).first()
+    if not hand or not (current_user.is_admin or any(p.user_id == current_user.id for p in hand.players)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hand not found")
+
+    names = {p.pid: p.name for p in hand.players}
+    folded = {a.pid for a in hand.actions if a.action == "fold"}
+
+    players = []
+    for p in sorted(hand.players, key=lambda p: p.seat):
+        shown = p.user_id == current_user.id or (hand.went_to_showdown and p.pid not in folded)
+        players.append(HandPlayerResponse(
+            name=p.name,
+            seat=p.seat,
+            hole_cards=_cards(p.hole_cards) if shown else None,
+            starting_stack=p.starting_stack,
+            ending_stack=p.ending_stack,
+            net=p.net,
+            won=p.won,
+        ))
+
+    return HandDetailResponse(
+        id=hand.id,
+        table_id=hand.table_id,
+        started_at=hand.started_at,
+        ended_at=hand.ended_at,
+        small_blind=hand.small_blind,
+        big_blind=hand.big_blind,
+        dealer_seat=hand.dealer_seat,
+        board=_cards(hand.board),
+        pot=hand.pot,
+        went_to_showdown=hand.went_to_showdown,
+        players=players,
+        actions=[
+            HandActionResponse(seq=a.seq, name=names.get(a.pid, a.pid), street=a.street, action=a.action, amount=a.amount)
+            for a in hand.actions
+        ],
+    )
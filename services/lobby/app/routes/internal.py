@@ -0,0 +1,50 @@
+"""Internal service-to-service endpoints (not for browsers)."""
+import json
+import logging
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from ..matchmaking import seat_index
+from ..occupancy import occupancy
+from ..table_events import events
+from .tables import get_storage
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def _authorized(token: Optional[str]) -> bool:
+    """When INTERNAL_API_TOKEN is set, callers must present it as ``?token=``."""
+    expected = os.getenv("INTERNAL_API_TOKEN")
+    return not expected or secrets.compare_digest(token or "", expected)
+
+
+@router.websocket("/occupancy")
+async def occupancy_feed(ws: WebSocket, token: Optional[str] = None):
+    """Receive batched occupancy deltas from the game service."""
+    if not _authorized(token):
+        await ws.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await ws.accept()
+    storage = get_storage()
+    try:
+        while True:
+            try:
+                frame = json.loads(await ws.receive_text())
+                changes = occupancy.apply(frame)
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"[OCCUPANCY] Ignoring malformed frame: {e}")
+                continue
+            seated = {table_id: c["seated"] for table_id, c in changes.items() if "seated" in c}
+            if seated:
+                for table_id, count in seated.items():
+                    seat_index.set_seated(table_id, count)
+                await storage.update_seated(seated)
+            for table_id, changed in changes.items():
+                events.publish("update", {"table_id": table_id, **changed})
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,54 @@
+"""Quick-seat matchmaking across tables."""
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from ..matchmaking import seat_index
+from ..models import CreateTableRequest, TableResponse
+from ..occupancy import occupancy
+from ..storage.base import TableStorage
+from .tables import add_table, get_storage, table_response, get_game_ws_base
+
+router = APIRouter(prefix="/api/matchmaking", tags=["matchmaking"])
+
+
+class QuickSeatRequest(BaseModel):
+    """Stakes and preferences for quick-seat."""
+    big_blind: int = Field(default=10, ge=2, description="Big blind of the stake level")
+    max_players: Optional[int] = Field(default=None, ge=2, le=8, description="Table size; any size if omitted")
+    exclude_table_ids: List[str] = Field(default_factory=list, max_length=50,
+                                         description="Tables the player does not want (e.g. just left)")
+
+
+class QuickSeatResponse(BaseModel):
+    """The table to join, and whether it was created for this request."""
+    table: TableResponse
+    created: bool
+
+
+@router.post("/quick-seat", response_model=QuickSeatResponse)
+async def quick_seat(
+    request: QuickSeatRequest,
+    storage: TableStorage = Depends(get_storage),
+):
+    """Reserve a seat at the fullest open table for the stakes, creating one if none has room."""
+    if not seat_index.loaded:
+        tables = await storage.list_tables()
+        seat_index.load(tables, {t.table_id: occupancy.get(t.table_id).seated for t in tables})
+
+    table_id = seat_index.place(request.big_blind, request.max_players, request.exclude_table_ids)
+    if table_id is not None:
+        config = await storage.get_table(table_id)
+        if config is not None:
+            return QuickSeatResponse(table=table_response(config, get_game_ws_base()), created=False)
+        seat_index.remove(table_id)  # Deleted by another lobby process
+
+    big_blind = request.big_blind
+    table = await add_table(CreateTableRequest(
+        name=f"Quick Seat {big_blind // 2}/{big_blind}",
+        small_blind=max(1, big_blind // 2),
+        big_blind=big_blind,
+        max_players=request.max_players or 6,
+    ), storage)
+    seat_index.reserve(table.table_id)
+    return QuickSeatResponse(table=table, created=True)
@@ -0,0 +1,72 @@
+"""Player statistics routes."""
+import os
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+
+from db import get_db, User, PlayerStat
+from poker.stats import compute_stats
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+# Stats only change when the game service flushes (every few seconds), so a
+# short-lived per-user cache absorbs HUD polling from every seat at a table.
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+STATS_CACHE_MAX = int(os.getenv("STATS_CACHE_MAX", "10000"))
+
+_cache: Dict[int, Tuple[float, "PlayerStatsResponse"]] = {}
+
+
+class PlayerStatsResponse(BaseModel):
+    """HUD stats for one user. Percentages except ``af`` (a ratio) and ``bb_per_100``."""
+    user_id: int
+    username: str
+    stats: Dict[str, Optional[float]]
+
+
+def _load_stats(db: Session, user_id: int) -> PlayerStatsResponse:
+    cached = _cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    rows = db.query(PlayerStat.counter, PlayerStat.value).filter(PlayerStat.user_id == user_id).all()
+    result = PlayerStatsResponse(
+        user_id=user.id,
+        username=user.username,
+        stats=compute_stats({counter: value for counter, value in rows}),
+    )
+    _cache.pop(user_id, None)
+    if len(_cache) >= STATS_CACHE_MAX:
+        # Dicts keep insertion order, so this drops the oldest entry
+        _cache.pop(next(iter(_cache)))
+    _cache[user_id] = (time.monotonic() + STATS_CACHE_TTL, result)
+    return result
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+@router.get("/me", response_model=PlayerStatsResponse)
+def get_my_stats(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's stats."""
+    response.headers["Cache-Control"] = f"private, max-age={int(STATS_CACHE_TTL)}"
+    return _load_stats(db, current_user.id)
+
+
+@router.get("/{user_id}", response_model=PlayerStatsResponse)
+def get_user_stats(user_id: int, response: Response, db: Session = Depends(get_db)):
+    """Get any user's stats (shown to opponents at the table)."""
+    response.headers["Cache-Control"] = f"public, max-age={int(STATS_CACHE_TTL)}"
+    return _load_stats(db, user_id)
@@ -1,19 +1,38 @@
 """API routes for table management."""
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Literal, Optional, Tuple
+import base64
 import secrets
+import zlib
 from datetime import datetime, timezone
 import os
 
-from ..storage.base import TableStorage
+from ..storage.base import TableStorage, TableFilter
 from ..storage.memory import InMemoryTableStorage
 from ..models import CreateTableRequest, TableResponse
+from ..matchmaking import seat_index
+from ..occupancy import occupancy
+from ..table_events import events
 from models.table_config import TableConfig
 
 router = APIRouter(prefix="/api/tables", tags=["tables"])
 
-# Global storage instance (in-memory for MVP)
-_storage = InMemoryTableStorage()
+
+def _create_storage() -> TableStorage:
+    """Pick the storage backend from TABLE_STORAGE ("memory" or "sql")."""
+    backend = os.getenv("TABLE_STORAGE", "memory")
+    if backend == "sql":
+        from db import SessionLocal
+        from ..storage.sql import SqlTableStorage
+        return SqlTableStorage(SessionLocal)
+    if backend != "memory":
+        raise ValueError(f"Unknown TABLE_STORAGE backend: {backend}")
+    return InMemoryTableStorage()
+
+
+# Global storage instance
+_storage = _create_storage()
 
 
 def get_storage() -> TableStorage:
@@ -21,17 +40,61 @@ def get_storage() -> TableStorage:
     return _storage
 
 
+# Seconds between keep-alive comments on an idle lobby stream
+STREAM_KEEPALIVE = float(os.getenv("LOBBY_STREAM_KEEPALIVE", "15"))
+
+
+def _list_etag(request: Request) -> str:
+    # Every change to the table list is an event, so the last event id versions it
+    query = zlib.crc32(str(request.query_params).encode())
+    return f'W/"{events.event_id(events.last_seq)}-{query:x}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+# Live sort keys, largest first
+SORT_KEYS = {
+    "seats_free": lambda t, occ: t.max_players - occ.seated,
+    "hands_per_hour": lambda t, occ: occ.hands_per_hour,
+    "avg_pot": lambda t, occ: occ.avg_pot,
+}
+
+
 def get_game_ws_base() -> str:
     """Get the game service WebSocket base URL from env."""
     return os.getenv("GAME_WS_URL", "ws://localhost:8001")
 
 
-@router.post("", response_model=TableResponse, status_code=201)
-async def create_table(
-    request: CreateTableRequest,
-    storage: TableStorage = Depends(get_storage)
-):
-    """Create a new poker table."""
+def _encode_cursor(table: TableConfig) -> str:
+    raw = f"{table.created_at}|{table.table_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, table_id = raw.rsplit("|", 1)
+        datetime.fromisoformat(created_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, table_id
+
+
+def table_response(config: TableConfig, game_ws_base: str) -> TableResponse:
+    return TableResponse(
+        **config.to_dict(),
+        **occupancy.get(config.table_id).to_dict(),
+        game_ws_url=f"{game_ws_base}/ws/{config.table_id}"
+    )
+
+
+async def add_table(request: CreateTableRequest, storage: TableStorage) -> TableResponse:
+    """Store a new table and announce it to lobby viewers and matchmaking."""
     table_id = secrets.token_urlsafe(8)
     config = TableConfig(
         table_id=table_id,
@@ -40,31 +103,114 @@ async def create_table(
         big_blind=request.big_blind,
         max_players=request.max_players,
         turn_timeout_seconds=request.turn_timeout_seconds,
+        deal_delay_seconds=request.deal_delay_seconds,
         created_at=datetime.now(timezone.utc).isoformat(),
     )
 
     await storage.create_table(config)
+    seat_index.add(config)
+    table = table_response(config, get_game_ws_base())
+    events.publish("create", table.model_dump())
+    return table
 
-    game_ws_base = get_game_ws_base()
-    return TableResponse(
-        **config.to_dict(),
-        game_ws_url=f"{game_ws_base}/ws/{table_id}"
-    )
+
+@router.post("", response_model=TableResponse, status_code=201)
+async def create_table(
+    request: CreateTableRequest,
+    storage: TableStorage = Depends(get_storage)
+):
+    """Create a new poker table."""
+    return await add_table(request, storage)
 
 
 @router.get("", response_model=List[TableResponse])
-async def list_tables(storage: TableStorage = Depends(get_storage)):
-    """List all active tables."""
-    tables = await storage.list_tables()
-    game_ws_base = get_game_ws_base()
+async def list_tables(
+    request: Request,
+    response: Response,
+    min_big_blind: Optional[int] = Query(None, ge=0),
+    max_big_blind: Optional[int] = Query(None, ge=0),
+    min_seats_free: Optional[int] = Query(None, ge=1),
+    created_after: Optional[datetime] = Query(None),
+    sort: Literal["created_at", "seats_free", "hands_per_hour", "avg_pot"] = Query("created_at"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    storage: TableStorage = Depends(get_storage)
+):
+    """List active tables with live occupancy, optional filters and pagination.
+
+    The default order is oldest first, paged with the ``X-Next-Cursor``
+    response header. The live sorts (largest first) return the top ``limit``
+    tables and do not page. Responses carry an ETag; a matching
+    ``If-None-Match`` gets an empty 304.
+    """
+    etag = _list_etag(request)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if cursor and sort != "created_at":
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort=created_at")
+
+    if created_after is not None and created_after.tzinfo is None:
+        created_after = created_after.replace(tzinfo=timezone.utc)
+    live_sort = SORT_KEYS.get(sort)
+    filters = TableFilter(
+        min_big_blind=min_big_blind,
+        max_big_blind=max_big_blind,
+        min_seats_free=min_seats_free,
+        created_after=created_after.isoformat() if created_after else None,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=None if live_sort else limit + 1,
+    )
+    tables = await storage.list_tables(filters)
+    if live_sort:
+        # Stable sort keeps (created_at, table_id) order between equal keys
+        tables.sort(key=lambda t: live_sort(t, occupancy.get(t.table_id)), reverse=True)
+        tables = tables[:limit]
+    elif len(tables) > limit:
+        tables = tables[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(tables[-1])
+    response.headers["ETag"] = etag
 
-    return [
-        TableResponse(
-            **t.to_dict(),
-            game_ws_url=f"{game_ws_base}/ws/{t.table_id}"
-        )
-        for t in tables
-    ]
+    game_ws_base = get_game_ws_base()
+    return [table_response(t, game_ws_base) for t in tables]
+
+
+async def _table_stream(storage: TableStorage, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    seq = events.parse_id(last_event_id)
+    frames = events.after(seq) if seq is not None else None
+    while True:
+        if frames is None:
+            # New viewer, or one that fell too far behind: start from a snapshot
+            seq = events.last_seq
+            game_ws_base = get_game_ws_base()
+            tables = [table_response(t, game_ws_base).model_dump() for t in await storage.list_tables()]
+            yield events.encode(seq, "snapshot", tables)
+            # Changes made while listing are replayed; applying them twice is harmless
+            frames = events.after(seq)
+            continue
+        for frame in frames:
+            yield frame
+        seq += len(frames)
+        if not await events.wait(seq, STREAM_KEEPALIVE):
+            yield ": keep-alive\n\n"
+        frames = events.after(seq)
+
+
+@router.get("/stream")
+async def stream_tables(
+    storage: TableStorage = Depends(get_storage),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Server-sent events: a ``snapshot`` of all tables, then ``create``,
+    ``delete`` and ``update`` events.
+
+    Reconnecting with ``Last-Event-ID`` resumes where the viewer left off;
+    a fresh snapshot is sent when the missed events are no longer buffered.
+    """
+    return StreamingResponse(
+        _table_stream(storage, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{table_id}", response_model=TableResponse)
@@ -77,11 +223,7 @@ async def get_table(
     if not table:
         raise HTTPException(status_code=404, detail="Table not found")
 
-    game_ws_base = get_game_ws_base()
-    return TableResponse(
-        **table.to_dict(),
-        game_ws_url=f"{game_ws_base}/ws/{table.table_id}"
-    )
+    return table_response(table, get_game_ws_base())
 
 
 @router.delete("/{table_id}", status_code=204)
@@ -93,3 +235,6 @@ async def delete_table(
     success = await storage.delete_table(table_id)
     if not success:
         raise HTTPException(status_code=404, detail="Table not found")
+    occupancy.discard(table_id)
+    seat_index.remove(table_id)
+    events.publish("delete", {"table_id": table_id})
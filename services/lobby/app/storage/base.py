@@ -1,9 +1,25 @@
 """Abstract storage interface for table management."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from models.table_config import TableConfig
 
 
+@dataclass
+class TableFilter:
+    """Filters and keyset position for listing tables.
+
+    Listings are ordered by ``(created_at, table_id)``; ``after`` is the
+    ``(created_at, table_id)`` of the last table on the previous page.
+    """
+    min_big_blind: Optional[int] = None
+    max_big_blind: Optional[int] = None
+    min_seats_free: Optional[int] = None
+    created_after: Optional[str] = None  # ISO timestamp
+    after: Optional[Tuple[str, str]] = None
+    limit: Optional[int] = None
+
+
 class TableStorage(ABC):
     """Abstract interface for table storage."""
 
@@ -18,11 +34,16 @@ class TableStorage(ABC):
         pass
 
     @abstractmethod
-    async def list_tables(self) -> List[TableConfig]:
-        """List all tables."""
+    async def list_tables(self, filters: Optional[TableFilter] = None) -> List[TableConfig]:
+        """List tables matching ``filters`` ordered by (created_at, table_id)."""
         pass
 
     @abstractmethod
     async def delete_table(self, table_id: str) -> bool:
         """Delete a table. Returns True if deleted, False if not found."""
         pass
+
+    @abstractmethod
+    async def update_seated(self, seated: Dict[str, int]) -> None:
+        """Record live seated counts (table_id -> seated) for the seats-free filter."""
+        pass
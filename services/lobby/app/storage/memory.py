@@ -1,6 +1,6 @@
 """In-memory table storage implementation."""
 from typing import Dict, List, Optional
-from .base import TableStorage
+from .base import TableStorage, TableFilter
 from models.table_config import TableConfig
 
 
@@ -9,6 +9,7 @@ class InMemoryTableStorage(TableStorage):
 
     def __init__(self):
         self._tables: Dict[str, TableConfig] = {}
+        self._seated: Dict[str, int] = {}
 
     async def create_table(self, config: TableConfig) -> TableConfig:
         """Create a new table."""
@@ -19,13 +20,34 @@ class InMemoryTableStorage(TableStorage):
         """Get a table by ID."""
         return self._tables.get(table_id)
 
-    async def list_tables(self) -> List[TableConfig]:
-        """List all tables."""
-        return list(self._tables.values())
+    async def list_tables(self, filters: Optional[TableFilter] = None) -> List[TableConfig]:
+        """List tables matching ``filters`` ordered by (created_at, table_id)."""
+        f = filters or TableFilter()
+        tables = sorted(self._tables.values(), key=lambda t: (t.created_at or "", t.table_id))
+        if f.min_big_blind is not None:
+            tables = [t for t in tables if t.big_blind >= f.min_big_blind]
+        if f.max_big_blind is not None:
+            tables = [t for t in tables if t.big_blind <= f.max_big_blind]
+        if f.min_seats_free is not None:
+            tables = [t for t in tables if t.max_players - self._seated.get(t.table_id, 0) >= f.min_seats_free]
+        if f.created_after is not None:
+            tables = [t for t in tables if (t.created_at or "") > f.created_after]
+        if f.after is not None:
+            tables = [t for t in tables if (t.created_at or "", t.table_id) > f.after]
+        if f.limit is not None:
+            tables = tables[:f.limit]
+        return tables
 
     async def delete_table(self, table_id: str) -> bool:
         """Delete a table."""
         if table_id in self._tables:
             del self._tables[table_id]
+            self._seated.pop(table_id, None)
             return True
         return False
+
+    async def update_seated(self, seated: Dict[str, int]) -> None:
+        """Record live seated counts."""
+        for table_id, count in seated.items():
+            if table_id in self._tables:
+                self._seated[table_id] = count
@@ -0,0 +1,168 @@
+"""Database-backed table storage with a read-through cache."""
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.orm import Session
+
+from db import LobbyTable
+from models.table_config import TableConfig
+from .base import TableStorage, TableFilter
+
+# The game service looks a table up on every join, so single-table reads are
+# served from memory. Writes through this instance invalidate immediately; the
+# TTL bounds staleness when several lobby processes share the database.
+TABLE_CACHE_TTL = float(os.getenv("TABLE_CACHE_TTL", "60"))
+TABLE_CACHE_MAX = int(os.getenv("TABLE_CACHE_MAX", "10000"))
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """ISO timestamp -> naive UTC datetime, as stored in the database."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _to_config(row: LobbyTable) -> TableConfig:
+    return TableConfig(
+        table_id=row.table_id,
+        name=row.name,
+        small_blind=row.small_blind,
+        big_blind=row.big_blind,
+        max_players=row.max_players,
+        turn_timeout_seconds=row.turn_timeout_seconds,
+        deal_delay_seconds=row.deal_delay_seconds,
+        created_at=row.created_at.replace(tzinfo=timezone.utc).isoformat(),
+    )
+
+
+class SqlTableStorage(TableStorage):
+    """Stores tables in the ``lobby_tables`` table.
+
+    Queries run in a worker thread so the event loop is not blocked on the
+    database. ``get_table`` is cached per table; listings always hit the
+    indexes.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+        self._cache: Dict[str, Tuple[float, TableConfig]] = {}
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _remember(self, config: TableConfig) -> None:
+        if len(self._cache) >= TABLE_CACHE_MAX:
+            # Dicts keep insertion order, so this drops the oldest entry
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[config.table_id] = (time.monotonic() + TABLE_CACHE_TTL, config)
+
+    async def create_table(self, config: TableConfig) -> TableConfig:
+        """Create a new table."""
+        self._cache.pop(config.table_id, None)
+        await asyncio.to_thread(self._insert, config)
+        self._remember(config)
+        return config
+
+    def _insert(self, config: TableConfig) -> None:
+        db = self._session_factory()
+        try:
+            db.add(LobbyTable(
+                table_id=config.table_id,
+                name=config.name,
+                small_blind=config.small_blind,
+                big_blind=config.big_blind,
+                max_players=config.max_players,
+                turn_timeout_seconds=config.turn_timeout_seconds,
+                deal_delay_seconds=config.deal_delay_seconds,
+                created_at=_parse_timestamp(config.created_at) if config.created_at else datetime.utcnow(),
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    async def get_table(self, table_id: str) -> Optional[TableConfig]:
+        """Get a table by ID, from cache when fresh."""
+        cached = self._cache.get(table_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        config = await asyncio.to_thread(self._select_one, table_id)
+        if config is None:
+            self._cache.pop(table_id, None)
+        else:
+            self._remember(config)
+        return config
+
+    def _select_one(self, table_id: str) -> Optional[TableConfig]:
+        db = self._session_factory()
+        try:
+            row = db.get(LobbyTable, table_id)
+            return _to_config(row) if row else None
+        finally:
+            db.close()
+
+    async def list_tables(self, filters: Optional[TableFilter] = None) -> List[TableConfig]:
+        """List tables matching ``filters`` ordered by (created_at, table_id)."""
+        return await asyncio.to_thread(self._select_many, filters or TableFilter())
+
+    def _select_many(self, f: TableFilter) -> List[TableConfig]:
+        db = self._session_factory()
+        try:
+            query = db.query(LobbyTable)
+            if f.min_big_blind is not None:
+                query = query.filter(LobbyTable.big_blind >= f.min_big_blind)
+            if f.max_big_blind is not None:
+                query = query.filter(LobbyTable.big_blind <= f.max_big_blind)
+            if f.min_seats_free is not None:
+                query = query.filter(LobbyTable.max_players - LobbyTable.seated >= f.min_seats_free)
+            if f.created_after is not None:
+                query = query.filter(LobbyTable.created_at > _parse_timestamp(f.created_after))
+            if f.after is not None:
+                created_at, table_id = f.after
+                query = query.filter(
+                    tuple_(LobbyTable.created_at, LobbyTable.table_id) > (_parse_timestamp(created_at), table_id)
+                )
+            query = query.order_by(LobbyTable.created_at, LobbyTable.table_id)
+            if f.limit is not None:
+                query = query.limit(f.limit)
+            return [_to_config(row) for row in query.all()]
+        finally:
+            db.close()
+
+    async def delete_table(self, table_id: str) -> bool:
+        """Delete a table."""
+        self._cache.pop(table_id, None)
+        return await asyncio.to_thread(self._delete, table_id)
+
+    def _delete(self, table_id: str) -> bool:
+        db = self._session_factory()
+        try:
+            deleted = db.query(LobbyTable).filter(LobbyTable.table_id == table_id).delete()
+            db.commit()
+            return deleted > 0
+        finally:
+            db.close()
+
+    async def update_seated(self, seated: Dict[str, int]) -> None:
+        """Record live seated counts in one bulk UPDATE."""
+        if seated:
+            await asyncio.to_thread(self._update_seated, seated)
+
+    def _update_seated(self, seated: Dict[str, int]) -> None:
+        db = self._session_factory()
+        try:
+            existing = {
+                table_id for (table_id,) in
+                db.query(LobbyTable.table_id).filter(LobbyTable.table_id.in_(list(seated)))
+            }
+            rows = [{"table_id": t, "seated": n} for t, n in seated.items() if t in existing]
+            if rows:
+                db.execute(update(LobbyTable), rows)
+                db.commit()
+        finally:
+            db.close()
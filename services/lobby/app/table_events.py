@@ -0,0 +1,85 @@
+"""
+Change feed for the lobby table list.
+
+Every create, delete and occupancy update is appended to a bounded in-memory
+log as an already-encoded server-sent-events frame, so each change is
+serialized once no matter how many lobby viewers are connected. Viewers keep
+their position in the log (the event id) and wait for the next change; a
+viewer that reconnects with ``Last-Event-ID`` is replayed what it missed, or
+sent a fresh snapshot when that has already fallen out of the log.
+
+Event ids are ``<boot id>-<seq>`` so ids from a previous lobby process never
+match this one.
+"""
+import asyncio
+import json
+import os
+import secrets
+from collections import deque
+from typing import Any, Deque, List, Optional, Set, Tuple
+
+LOBBY_EVENT_BUFFER = int(os.getenv("LOBBY_EVENT_BUFFER", "1000"))
+
+
+class TableEventLog:
+    """Bounded log of encoded table-list events with broadcast wakeups."""
+
+    def __init__(self, size: int = LOBBY_EVENT_BUFFER):
+        self.boot_id = secrets.token_hex(4)
+        self.last_seq = 0
+        self._events: Deque[Tuple[int, str]] = deque(maxlen=size)
+        self._waiters: Set[asyncio.Future] = set()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.boot_id}-{seq}"
+
+    def encode(self, seq: int, kind: str, data: Any) -> str:
+        payload = json.dumps(data, separators=(",", ":"))
+        return f"id: {self.event_id(seq)}\nevent: {kind}\ndata: {payload}\n\n"
+
+    def publish(self, kind: str, data: Any) -> int:
+        """Append an event ("create", "delete" or "update") and wake every viewer."""
+        self.last_seq += 1
+        self._events.append((self.last_seq, self.encode(self.last_seq, kind, data)))
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+        return self.last_seq
+
+    def parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Sequence number of an id issued by this process, else None."""
+        if not event_id:
+            return None
+        boot_id, _, seq = event_id.rpartition("-")
+        if boot_id != self.boot_id or not seq.isdigit() or int(seq) > self.last_seq:
+            return None
+        return int(seq)
+
+    def after(self, seq: int) -> Optional[List[str]]:
+        """Frames published after ``seq``, or None if some were already dropped."""
+        if seq == self.last_seq:
+            return []
+        if not self._events or self._events[0][0] > seq + 1:
+            return None
+        return [frame for s, frame in self._events if s > seq]
+
+    async def wait(self, seq: int, timeout: float) -> bool:
+        """Wait until something is published after ``seq``. Returns False on timeout."""
+        if self.last_seq > seq:
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(waiter)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+
+events = TableEventLog()
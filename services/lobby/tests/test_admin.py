@@ -7,6 +7,7 @@ from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch
 
 from app.main import app
+from app.routes import admin as admin_routes
 from db import Base, get_db, User, PlayerStack
 
 # Create test database (separate file from test_auth.db to avoid conflicts)
@@ -29,6 +30,7 @@ def setup_database():
     """Create tables before each test and drop after."""
     app.dependency_overrides[get_db] = override_get_db
     Base.metadata.create_all(bind=engine)
+    admin_routes.clear_count_cache()
     yield
     Base.metadata.drop_all(bind=engine)
     app.dependency_overrides.pop(get_db, None)
@@ -179,7 +181,7 @@ class TestListUsers:
         assert "admin" in usernames
 
     def test_list_users_returns_pagination_metadata(self, client):
-        """Response includes total, page, page_size, and pages fields."""
+        """Response includes total, page_size, pages and cursor fields."""
         register_and_login(client, "alice", "password123")
         admin_token = register_and_login(client, "admin", "password123")
         make_admin("admin")
@@ -187,9 +189,10 @@ class TestListUsers:
         response = client.get("/api/admin/users", headers=auth_headers(admin_token))
         data = response.json()
         assert data["total"] == 2
-        assert data["page"] == 1
+        assert data["total_is_estimate"] is False
         assert data["page_size"] == 20
         assert data["pages"] == 1
+        assert data["next_cursor"] is None
 
     def test_list_users_includes_stack(self, client):
         """Each user entry includes their chip stack."""
@@ -252,7 +255,7 @@ class TestListUsersPaginationSearch:
         admin_token = self._setup_users(client, names)
 
         response = client.get(
-            "/api/admin/users?page=1&page_size=3",
+            "/api/admin/users?page_size=3",
             headers=auth_headers(admin_token),
         )
         data = response.json()
@@ -260,18 +263,86 @@ class TestListUsersPaginationSearch:
         assert data["total"] == 6  # 5 users + 1 admin
         assert data["pages"] == 2
 
-    def test_page_2_returns_next_batch(self, client):
-        """page=2 returns the second batch of users."""
+    def test_next_cursor_returns_next_batch(self, client):
+        """Passing next_cursor back returns the following users."""
         names = [f"user{i:02d}" for i in range(5)]
         admin_token = self._setup_users(client, names)
 
-        page1 = client.get("/api/admin/users?page=1&page_size=3", headers=auth_headers(admin_token)).json()
-        page2 = client.get("/api/admin/users?page=2&page_size=3", headers=auth_headers(admin_token)).json()
+        page1 = client.get("/api/admin/users?page_size=3", headers=auth_headers(admin_token)).json()
+        page2 = client.get(
+            f"/api/admin/users?page_size=3&cursor={page1['next_cursor']}",
+            headers=auth_headers(admin_token),
+        ).json()
+
+        assert [u["username"] for u in page1["users"]] == ["user00", "user01", "user02"]
+        assert [u["username"] for u in page2["users"]] == ["user03", "user04", "zzadmin"]
+        assert page2["next_cursor"] is None
+
+    def test_cursor_walk_with_search(self, client):
+        """Cursors keep the search filter applied across pages."""
+        admin_token = self._setup_users(client, ["alice", "bob", "alicia", "malik", "carol"])
+
+        seen, cursor = [], None
+        while True:
+            url = "/api/admin/users?search=ali&page_size=1"
+            if cursor:
+                url += f"&cursor={cursor}"
+            data = client.get(url, headers=auth_headers(admin_token)).json()
+            seen += [u["username"] for u in data["users"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert seen == ["alice", "alicia", "malik"]
+        assert data["total"] == 3
+
+    def test_invalid_cursor_rejected(self, client):
+        """A cursor that does not decode returns 400."""
+        admin_token = self._setup_users(client, [])
+        response = client.get("/api/admin/users?cursor=%FF%FE", headers=auth_headers(admin_token))
+        assert response.status_code == 400
+
+    def test_total_is_capped_estimate(self, client, monkeypatch):
+        """Counts stop at USER_COUNT_EXACT_LIMIT and are flagged as estimates."""
+        monkeypatch.setattr(admin_routes, "USER_COUNT_EXACT_LIMIT", 3)
+        admin_token = self._setup_users(client, [f"user{i:02d}" for i in range(5)])
+
+        data = client.get("/api/admin/users?page_size=2", headers=auth_headers(admin_token)).json()
+        assert data["total"] == 3
+        assert data["total_is_estimate"] is True
+
+    def test_total_is_cached(self, client):
+        """Repeated listings reuse the cached count until it expires."""
+        admin_token = self._setup_users(client, ["alice"])
+        assert client.get("/api/admin/users", headers=auth_headers(admin_token)).json()["total"] == 2
+
+        db = next(override_get_db())
+        db.add(User(username="bob", password_hash="x"))
+        db.commit()
+        db.close()
+        data = client.get("/api/admin/users", headers=auth_headers(admin_token)).json()
+        assert data["total"] == 2
+        assert "bob" in [u["username"] for u in data["users"]]
+
+        admin_routes.clear_count_cache()
+        assert client.get("/api/admin/users", headers=auth_headers(admin_token)).json()["total"] == 3
+
+    def test_registration_invalidates_total(self, client):
+        """A new registration shows up in the total straight away."""
+        admin_token = self._setup_users(client, ["alice"])
+        assert client.get("/api/admin/users", headers=auth_headers(admin_token)).json()["total"] == 2
+
+        register_and_login(client, "bob", "password123")
+        assert client.get("/api/admin/users", headers=auth_headers(admin_token)).json()["total"] == 3
 
-        names_p1 = {u["username"] for u in page1["users"]}
-        names_p2 = {u["username"] for u in page2["users"]}
-        assert len(names_p2) == 3
-        assert names_p1.isdisjoint(names_p2)
+    def test_count_cache_is_bounded(self, client, monkeypatch):
+        """Each search term caches a count, but only the most recent USER_COUNT_CACHE_MAX are kept."""
+        monkeypatch.setattr(admin_routes, "USER_COUNT_CACHE_MAX", 3)
+        admin_token = self._setup_users(client, ["alice"])
+
+        for term in ("a", "b", "c", "d", "e"):
+            client.get(f"/api/admin/users?search={term}", headers=auth_headers(admin_token))
+
+        assert list(admin_routes._count_cache) == ["c", "d", "e"]
 
     def test_search_by_username(self, client):
         """search param filters by username."""
@@ -317,6 +388,22 @@ class TestListUsersPaginationSearch:
         assert data["users"] == []
         assert data["total"] == 0
 
+    def test_short_search_matches_prefix(self, client):
+        """Searches of one or two characters match the start of the username."""
+        admin_token = self._setup_users(client, ["alice", "malik"])
+
+        response = client.get("/api/admin/users?search=al", headers=auth_headers(admin_token))
+        usernames = [u["username"] for u in response.json()["users"]]
+        assert usernames == ["alice"]
+
+    def test_search_wildcards_are_literal(self, client):
+        """% and _ in the search term match themselves."""
+        admin_token = self._setup_users(client, ["a_b_c", "axbxc"])
+
+        response = client.get("/api/admin/users?search=a_b", headers=auth_headers(admin_token))
+        usernames = [u["username"] for u in response.json()["users"]]
+        assert usernames == ["a_b_c"]
+
     def test_search_is_case_insensitive(self, client):
         """Username search is case-insensitive."""
         admin_token = self._setup_users(client, ["Alice"])
@@ -722,3 +809,4 @@ class TestDeleteUser:
         response = client.get("/api/admin/users", headers=auth_headers(admin_token))
         usernames = [u["username"] for u in response.json()["users"]]
         assert "alice" not in usernames
+
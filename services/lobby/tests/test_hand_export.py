@@ -0,0 +1,172 @@
+"""Tests for the columnar hand-history export."""
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import hand_export
+from app.hand_export import export_hands, encode_card, decode_card, ExportError, ACTIONS, STREETS
+from app.main import app
+from db import Base, get_db, User, Hand, HandPlayer, HandAction
+
+# Create test database (separate file to avoid conflicts with other test modules)
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_hand_export.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    """Override database dependency for testing."""
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    """Create tables before each test and drop after."""
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def add_hands(db, count):
+    for i in range(count):
+        now = datetime(2026, 1, 1, 12, 0, i % 60)
+        hand = Hand(table_id="t1", started_at=now, ended_at=now, small_blind=5, big_blind=10,
+                    dealer_seat=1, board="Ah Kd 7c" if i % 2 else "", pot=20, went_to_showdown=bool(i % 2))
+        hand.players = [
+            HandPlayer(user_id=None, pid="g", name="Guest", seat=1, hole_cards="2s 3h",
+                       starting_stack=1000, ending_stack=1010, net=10, won=True),
+            HandPlayer(user_id=None, pid="h", name="Host", seat=4, hole_cards="Tc Td",
+                       starting_stack=1000, ending_stack=990, net=-10, won=False),
+        ]
+        hand.actions = [
+            HandAction(seq=0, pid="g", street="preflop", action="small_blind", amount=5),
+            HandAction(seq=1, pid="h", street="preflop", action="big_blind", amount=10),
+            HandAction(seq=2, pid="g", street="preflop", action="raise", amount=25),
+            HandAction(seq=3, pid="h", street="preflop", action="fold", amount=0),
+        ]
+        db.add(hand)
+    db.commit()
+
+
+class TestEncoding:
+    def test_cards_round_trip(self):
+        codes = {encode_card(r + s) for r in "23456789TJQKA" for s in "shdc"}
+        assert codes == set(range(52))
+        assert decode_card(encode_card("Ah")) == "Ah"
+        assert decode_card(255) is None
+
+
+class TestParquetExport:
+    def test_incremental_chunks(self, db, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        add_hands(db, 5)
+
+        result = export_hands(str(tmp_path), "parquet", chunk_size=2, db=db)
+        assert result.chunks_written == 3
+        assert result.hands_exported == 5
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest["format"] == "parquet"
+        assert [c["hands"] for c in manifest["chunks"]] == [2, 2, 1]
+        assert manifest["encoding"]["actions"] == list(ACTIONS)
+
+        hands = pq.read_table(tmp_path / "hands-000001.parquet")
+        assert hands.schema.field("board_0").type == "uint8"
+        assert hands.column("hand_id").to_pylist() == [1, 2]
+        assert [decode_card(c) for c in hands.column("board_0").to_pylist()] == [None, "Ah"]
+
+        players = pq.read_table(tmp_path / "players-000001.parquet")
+        assert players.column("user_id").to_pylist() == [-1, -1, -1, -1]
+        assert decode_card(players.column("hole_0").to_pylist()[1]) == "Tc"
+
+        actions = pq.read_table(tmp_path / "actions-000003.parquet")
+        assert actions.schema.field("action").type == "uint8"
+        assert [ACTIONS[a] for a in actions.column("action").to_pylist()] == ["small_blind", "big_blind", "raise", "fold"]
+        assert actions.column("seat").to_pylist() == [1, 4, 1, 4]
+        assert set(actions.column("street").to_pylist()) == {STREETS.index("preflop")}
+
+        # Nothing new: no chunks. New hands: appended as chunk 4.
+        assert export_hands(str(tmp_path), chunk_size=2, db=db).chunks_written == 0
+        add_hands(db, 1)
+        again = export_hands(str(tmp_path), chunk_size=2, db=db)
+        assert again.chunks_written == 1
+        assert again.last_hand_id == 6
+        assert (tmp_path / "hands-000004.parquet").exists()
+
+    def test_format_of_existing_export_is_kept(self, db, tmp_path):
+        pytest.importorskip("pyarrow")
+        pytest.importorskip("numpy")
+        add_hands(db, 1)
+        export_hands(str(tmp_path), "parquet", db=db)
+        with pytest.raises(ExportError):
+            export_hands(str(tmp_path), "npz", db=db)
+
+
+class TestArrowExport:
+    def test_arrow_ipc(self, db, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        add_hands(db, 3)
+        export_hands(str(tmp_path), "arrow", db=db)
+
+        with pa.memory_map(str(tmp_path / "players-000001.arrow")) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.num_rows == 6
+        assert table.column("net").to_pylist()[:2] == [10, -10]
+
+
+class TestNpzExport:
+    def test_npz(self, db, tmp_path):
+        np = pytest.importorskip("numpy")
+        add_hands(db, 3)
+        result = export_hands(str(tmp_path), "npz", chunk_size=2, db=db)
+        assert result.chunks_written == 2
+
+        data = np.load(tmp_path / "chunk-000001.npz")
+        assert data["hands__hand_id"].tolist() == [1, 2]
+        assert data["players__hole_0"].dtype == np.uint8
+        assert data["actions__action"].dtype == np.uint8
+        assert len(data["actions__amount"]) == 8
+
+    def test_missing_dependency(self, db, tmp_path, monkeypatch):
+        monkeypatch.setattr(hand_export, "np", None)
+        with pytest.raises(ExportError):
+            export_hands(str(tmp_path), "npz", db=db)
+
+
+class TestExportEndpoint:
+    def test_requires_admin(self, tmp_path):
+        client = TestClient(app)
+        assert client.post("/api/admin/exports/hands").status_code == 401
+
+    def test_admin_runs_export(self, db, tmp_path, monkeypatch):
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(hand_export, "HAND_EXPORT_DIR", str(tmp_path))
+        client = TestClient(app)
+        client.post("/api/auth/register", json={"username": "boss", "password": "password123"})
+        user = db.query(User).filter(User.username == "boss").first()
+        user.is_admin = True
+        db.commit()
+        token = client.post("/api/auth/login", data={"username": "boss", "password": "password123"}).json()["access_token"]
+        add_hands(db, 2)
+
+        response = client.post("/api/admin/exports/hands?format=parquet", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json()["hands_exported"] == 2
+        assert (tmp_path / "manifest.json").exists()
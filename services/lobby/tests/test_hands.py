@@ -0,0 +1,152 @@
+"""Tests for hand history routes."""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from db import Base, get_db, User, Hand, HandPlayer, HandAction
+
+# Create test database (separate file to avoid conflicts with other test modules)
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_hands.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    """Override database dependency for testing."""
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    """Create tables before each test and drop after."""
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client():
+    """Test client fixture."""
+    return TestClient(app)
+
+
+def register_and_login(client, username="testuser", password="password123"):
+    """Helper: register a user and return their token."""
+    client.post("/api/auth/register", json={"username": username, "password": password})
+    response = client.post("/api/auth/login", data={"username": username, "password": password})
+    return response.json()["access_token"]
+
+
+def user_id(username):
+    db = next(override_get_db())
+    return db.query(User).filter(User.username == username).first().id
+
+
+def auth_headers(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def add_hand(user_ids, showdown=False, fold_pid=None):
+    """Insert a heads-up hand between the given users (seat order); returns its id."""
+    db = next(override_get_db())
+    now = datetime.utcnow()
+    hand = Hand(
+        table_id="t1", started_at=now, ended_at=now, small_blind=5, big_blind=10,
+        dealer_seat=1, board="Ah Kd 7c 2s 2h", pot=20, went_to_showdown=showdown,
+    )
+    for seat, uid in enumerate(user_ids, start=1):
+        won = seat == 1
+        hand.players.append(HandPlayer(
+            user_id=uid, pid=f"user_{uid}", name=f"u{uid}", seat=seat, hole_cards=f"A{'sh'[seat - 1]} Q{'sh'[seat - 1]}",
+            starting_stack=1000, ending_stack=1010 if won else 990, net=10 if won else -10, won=won,
+        ))
+    hand.actions.append(HandAction(seq=0, pid=f"user_{user_ids[0]}", street="preflop", action="small_blind", amount=5))
+    if fold_pid:
+        hand.actions.append(HandAction(seq=1, pid=fold_pid, street="preflop", action="fold", amount=0))
+    db.add(hand)
+    db.commit()
+    hand_id = hand.id
+    db.close()
+    return hand_id
+
+
+class TestListMyHands:
+    def test_requires_auth(self, client):
+        response = client.get("/api/hands/me")
+        assert response.status_code == 401
+
+    def test_empty(self, client):
+        token = register_and_login(client)
+        response = client.get("/api/hands/me", headers=auth_headers(token))
+        assert response.status_code == 200
+        assert response.json() == {"hands": [], "next_before": None}
+
+    def test_keyset_pagination_newest_first(self, client):
+        token = register_and_login(client, "alice")
+        register_and_login(client, "bob")
+        alice, bob = user_id("alice"), user_id("bob")
+        ids = [add_hand([alice, bob]) for _ in range(5)]
+        add_hand([bob, alice])
+        other = add_hand([bob])  # Alice not dealt in
+
+        first = client.get("/api/hands/me?limit=4", headers=auth_headers(token)).json()
+        assert len(first["hands"]) == 4
+        assert first["hands"][0]["id"] == other - 1
+        assert first["next_before"] == first["hands"][-1]["id"]
+
+        second = client.get(f"/api/hands/me?limit=4&before={first['next_before']}", headers=auth_headers(token)).json()
+        assert [h["id"] for h in second["hands"]] == ids[:2][::-1]
+        assert second["next_before"] is None
+
+    def test_summary_is_from_my_seat(self, client):
+        token = register_and_login(client, "alice")
+        register_and_login(client, "bob")
+        add_hand([user_id("bob"), user_id("alice")])
+
+        hand = client.get("/api/hands/me", headers=auth_headers(token)).json()["hands"][0]
+        assert hand["seat"] == 2
+        assert hand["net"] == -10
+        assert hand["won"] is False
+        assert hand["hole_cards"] == ["Ah", "Qh"]
+        assert hand["board"] == ["Ah", "Kd", "7c", "2s", "2h"]
+
+
+class TestGetHand:
+    def test_hides_folded_opponent_cards(self, client):
+        token = register_and_login(client, "alice")
+        register_and_login(client, "bob")
+        alice, bob = user_id("alice"), user_id("bob")
+        hand_id = add_hand([alice, bob], fold_pid=f"user_{bob}")
+
+        response = client.get(f"/api/hands/{hand_id}", headers=auth_headers(token))
+        assert response.status_code == 200
+        body = response.json()
+        assert [p["hole_cards"] for p in body["players"]] == [["As", "Qs"], None]
+        assert [a["action"] for a in body["actions"]] == ["small_blind", "fold"]
+        assert body["actions"][1]["name"] == f"u{bob}"
+
+    def test_shows_cards_at_showdown(self, client):
+        token = register_and_login(client, "alice")
+        register_and_login(client, "bob")
+        hand_id = add_hand([user_id("alice"), user_id("bob")], showdown=True)
+
+        body = client.get(f"/api/hands/{hand_id}", headers=auth_headers(token)).json()
+        assert [p["hole_cards"] for p in body["players"]] == [["As", "Qs"], ["Ah", "Qh"]]
+
+    def test_not_visible_to_other_users(self, client):
+        register_and_login(client, "alice")
+        token = register_and_login(client, "mallory")
+        hand_id = add_hand([user_id("alice")])
+
+        response = client.get(f"/api/hands/{hand_id}", headers=auth_headers(token))
+        assert response.status_code == 404
@@ -0,0 +1,97 @@
+"""Tests for the open-seat index and the quick-seat endpoint."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.matchmaking import SeatIndex, seat_index
+from models.table_config import TableConfig
+
+
+def config(table_id, big_blind=10, max_players=6):
+    return TableConfig(table_id=table_id, name=table_id, small_blind=big_blind // 2,
+                       big_blind=big_blind, max_players=max_players)
+
+
+def test_places_at_fullest_open_table_for_the_stakes():
+    index = SeatIndex()
+    index.add(config("empty"))
+    index.add(config("busy"), seated=4)
+    index.add(config("full"), seated=6)
+    index.add(config("other-stakes", big_blind=50), seated=5)
+
+    assert index.place(10) == "busy"
+    assert index.free_seats("busy") == 1  # reserved
+
+
+def test_reservations_stop_two_players_taking_the_last_seat():
+    index = SeatIndex()
+    index.add(config("nearly"), seated=5)
+    index.add(config("empty"))
+
+    assert index.place(10) == "nearly"
+    assert index.place(10) == "empty"
+
+
+def test_reservations_expire_or_are_consumed_by_the_join():
+    index = SeatIndex(reservation_ttl=0)
+    index.add(config("t1"), seated=5)
+    assert index.place(10) == "t1"
+    # TTL of zero: the reservation has lapsed by the next placement
+    assert index.place(10) == "t1"
+
+    index = SeatIndex()
+    index.add(config("t1"), seated=4)
+    index.place(10)
+    index.set_seated("t1", 5)
+    assert index.free_seats("t1") == 1
+
+
+def test_table_size_preference_and_exclusions():
+    index = SeatIndex()
+    index.add(config("six", max_players=6), seated=5)
+    index.add(config("heads-up", max_players=2), seated=1)
+    index.add(config("ring", max_players=8), seated=2)
+
+    assert index.place(10, max_players=8) == "ring"
+    assert index.place(10, exclude=["six"]) == "heads-up"
+    assert index.place(10, max_players=2) is None
+
+
+def test_removed_and_full_tables_are_not_offered():
+    index = SeatIndex()
+    index.add(config("t1"))
+    index.remove("t1")
+    index.add(config("t2"), seated=2)
+    index.set_seated("t2", 6)
+    assert index.place(10) is None
+
+
+@pytest.fixture
+def fresh_index():
+    seat_index.clear()
+    yield
+    seat_index.clear()
+
+
+@pytest.mark.asyncio
+async def test_quick_seat_uses_open_table_then_creates_one(fresh_index):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = (await client.post("/api/tables", json={
+            "name": "Heads Up", "small_blind": 3100, "big_blind": 6200, "max_players": 2,
+        })).json()
+
+        first = await client.post("/api/matchmaking/quick-seat", json={"big_blind": 6200})
+        assert first.status_code == 200
+        assert first.json()["created"] is False
+        assert first.json()["table"]["table_id"] == created["table_id"]
+
+        second = (await client.post("/api/matchmaking/quick-seat", json={"big_blind": 6200})).json()
+        assert second["created"] is False
+        assert second["table"]["table_id"] == created["table_id"]
+
+        # Both seats are now reserved, so the next player gets a new table
+        third = (await client.post("/api/matchmaking/quick-seat", json={"big_blind": 6200})).json()
+        assert third["created"] is True
+        assert third["table"]["big_blind"] == 6200
+        assert third["table"]["small_blind"] == 3100
+        assert third["table"]["table_id"] != created["table_id"]
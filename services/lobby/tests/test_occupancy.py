@@ -0,0 +1,108 @@
+"""Tests for live occupancy pushed by the game service."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.occupancy import OccupancyStore, occupancy
+
+
+@pytest.fixture(autouse=True)
+def reset_occupancy():
+    occupancy.clear()
+    yield
+    occupancy.clear()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def push(client, frame):
+    """Send one frame over the internal feed; it is applied once the socket has closed."""
+    with client.websocket_connect("/internal/occupancy") as ws:
+        ws.send_json(frame)
+
+
+def test_store_applies_deltas_and_reports_changes():
+    store = OccupancyStore()
+    assert store.apply({"tables": {"t1": {"seated": 3, "waitlist": 1}}}) == {"t1": {"seated": 3, "waitlist": 1}}
+    assert store.apply({"tables": {"t1": {"seated": 3, "waitlist": 2}}}) == {"t1": {"waitlist": 2}}
+    assert store.apply({"tables": {"t1": {"waitlist": 2}}}) == {}
+    assert store.get("t1").seated == 3
+
+    assert store.apply({"removed": ["t1"]}) == {"t1": {"seated": 0, "waitlist": 0}}
+    assert store.get("t1").waitlist == 0
+
+
+def test_full_frame_replaces_everything():
+    store = OccupancyStore()
+    store.apply({"tables": {"t1": {"seated": 2}, "t2": {"seated": 4}}})
+
+    assert store.apply({"full": True, "tables": {"t2": {"seated": 4}}}) == {"t1": {"seated": 0}}
+    assert store.get("t1").seated == 0
+    assert store.get("t2").seated == 4
+
+
+def test_list_includes_occupancy_and_filters_open_seats(client):
+    full = client.post("/api/tables", json={"name": "Full", "max_players": 2, "big_blind": 4242}).json()
+    open_ = client.post("/api/tables", json={"name": "Open", "max_players": 6, "big_blind": 4242}).json()
+
+    push(client, {"type": "occupancy", "tables": {
+        full["table_id"]: {"seated": 2, "spectators": 3},
+        open_["table_id"]: {"seated": 1, "hands_per_hour": 80, "avg_pot": 120},
+    }})
+
+    response = client.get("/api/tables", params={"min_big_blind": 4242, "max_big_blind": 4242, "min_seats_free": 1})
+    assert response.status_code == 200
+    tables = response.json()
+    assert [t["table_id"] for t in tables] == [open_["table_id"]]
+    assert tables[0]["seated"] == 1
+    assert tables[0]["hands_per_hour"] == 80
+    assert tables[0]["avg_pot"] == 120
+
+    detail = client.get(f"/api/tables/{full['table_id']}").json()
+    assert detail["seated"] == 2
+    assert detail["spectators"] == 3
+
+
+def test_list_sorted_by_seats_free(client):
+    a = client.post("/api/tables", json={"name": "A", "max_players": 8, "big_blind": 4343}).json()
+    b = client.post("/api/tables", json={"name": "B", "max_players": 8, "big_blind": 4343}).json()
+    push(client, {"tables": {a["table_id"]: {"seated": 6}, b["table_id"]: {"seated": 2}}})
+
+    response = client.get("/api/tables", params={"min_big_blind": 4343, "max_big_blind": 4343, "sort": "seats_free"})
+    assert [t["table_id"] for t in response.json()] == [b["table_id"], a["table_id"]]
+
+
+def test_cursor_requires_default_sort(client):
+    response = client.get("/api/tables", params={"sort": "avg_pot", "cursor": "abc"})
+    assert response.status_code == 400
+
+
+def test_etag_not_modified_until_something_changes(client):
+    table = client.post("/api/tables", json={"name": "Etag"}).json()
+
+    first = client.get("/api/tables")
+    etag = first.headers["ETag"]
+    again = client.get("/api/tables", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # A different query gets a different ETag
+    other = client.get("/api/tables", params={"limit": 5})
+    assert other.headers["ETag"] != etag
+
+    push(client, {"tables": {table["table_id"]: {"seated": 1}}})
+    changed = client.get("/api/tables", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_feed_rejects_wrong_token(client, monkeypatch):
+    from starlette.websockets import WebSocketDisconnect
+
+    monkeypatch.setenv("INTERNAL_API_TOKEN", "s3cret")
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/internal/occupancy?token=nope") as ws:
+            ws.receive_text()
@@ -0,0 +1,117 @@
+"""Tests for player statistics routes."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.routes import stats as stats_routes
+from db import Base, get_db, User, PlayerStat
+
+# Create test database (separate file to avoid conflicts with other test modules)
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_stats.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    """Override database dependency for testing."""
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    """Create tables before each test and drop after."""
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.create_all(bind=engine)
+    stats_routes.clear_cache()
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client():
+    """Test client fixture."""
+    return TestClient(app)
+
+
+def register_and_login(client, username="testuser", password="password123"):
+    """Helper: register a user and return their token."""
+    client.post("/api/auth/register", json={"username": username, "password": password})
+    response = client.post("/api/auth/login", data={"username": username, "password": password})
+    return response.json()["access_token"]
+
+
+def user_id(username):
+    db = next(override_get_db())
+    return db.query(User).filter(User.username == username).first().id
+
+
+def set_counters(uid, **counters):
+    db = next(override_get_db())
+    for counter, value in counters.items():
+        db.merge(PlayerStat(user_id=uid, counter=counter, value=value))
+    db.commit()
+    db.close()
+
+
+class TestStats:
+    def test_user_stats_from_counters(self, client):
+        register_and_login(client, "alice")
+        uid = user_id("alice")
+        set_counters(uid, hands=200, vpip=50, pfr=30, postflop_aggressive=60, postflop_calls=20,
+                     saw_flop=80, showdowns=20, showdowns_won=12, net_big_blinds=10)
+
+        response = client.get(f"/api/stats/{uid}")
+        assert response.status_code == 200
+        assert "max-age" in response.headers["Cache-Control"]
+        body = response.json()
+        assert body["username"] == "alice"
+        assert body["stats"] == {
+            "hands": 200, "vpip": 25.0, "pfr": 15.0, "af": 3.0, "wtsd": 25.0, "wsd": 60.0, "bb_per_100": 5.0,
+        }
+
+    def test_no_hands_yet(self, client):
+        register_and_login(client, "alice")
+        body = client.get(f"/api/stats/{user_id('alice')}").json()
+        assert body["stats"]["hands"] == 0
+        assert body["stats"]["vpip"] is None
+
+    def test_unknown_user(self, client):
+        assert client.get("/api/stats/999").status_code == 404
+
+    def test_me_requires_auth(self, client):
+        assert client.get("/api/stats/me").status_code == 401
+
+    def test_me(self, client):
+        token = register_and_login(client, "alice")
+        set_counters(user_id("alice"), hands=4, vpip=1)
+        response = client.get("/api/stats/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.json()["stats"]["vpip"] == 25.0
+
+    def test_responses_are_cached(self, client):
+        register_and_login(client, "alice")
+        uid = user_id("alice")
+        set_counters(uid, hands=10, vpip=5)
+        assert client.get(f"/api/stats/{uid}").json()["stats"]["vpip"] == 50.0
+
+        set_counters(uid, hands=10, vpip=1)
+        assert client.get(f"/api/stats/{uid}").json()["stats"]["vpip"] == 50.0
+
+        stats_routes.clear_cache()
+        assert client.get(f"/api/stats/{uid}").json()["stats"]["vpip"] == 10.0
+
+    def test_cache_is_bounded(self, client, monkeypatch):
+        monkeypatch.setattr(stats_routes, "STATS_CACHE_MAX", 2)
+        uids = []
+        for name in ("alice", "bob", "carol"):
+            register_and_login(client, name)
+            uids.append(user_id(name))
+            client.get(f"/api/stats/{uids[-1]}")
+
+        assert list(stats_routes._cache) == uids[1:]
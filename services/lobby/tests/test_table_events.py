@@ -0,0 +1,99 @@
+"""Tests for the lobby table change feed and its SSE stream."""
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.routes.tables import _table_stream
+from app.storage.memory import InMemoryTableStorage
+from app.table_events import TableEventLog
+from models.table_config import TableConfig
+
+
+def parse(frame):
+    """Split one SSE frame into (id, event, data)."""
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+def test_publish_encodes_once_and_replays_after_id():
+    log = TableEventLog()
+    log.publish("create", {"table_id": "t1"})
+    log.publish("delete", {"table_id": "t1"})
+
+    frames = log.after(0)
+    assert [parse(f)[1] for f in frames] == ["create", "delete"]
+    assert parse(frames[1])[0] == log.event_id(2)
+    assert log.after(2) == []
+
+
+def test_ids_from_elsewhere_or_dropped_events_need_a_snapshot():
+    log = TableEventLog(size=2)
+    for i in range(3):
+        log.publish("update", {"table_id": "t1", "seated": i})
+
+    assert log.parse_id(log.event_id(1)) == 1
+    assert log.after(0) is None  # event 1 has been dropped from the buffer
+    assert len(log.after(1)) == 2
+    assert log.parse_id("deadbeef-1") is None
+    assert log.parse_id(log.event_id(99)) is None
+    assert log.parse_id("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_on_publish_and_times_out():
+    log = TableEventLog()
+    assert await log.wait(0, timeout=0.01) is False
+
+    waiter = asyncio.create_task(log.wait(0, timeout=5))
+    await asyncio.sleep(0)
+    log.publish("create", {"table_id": "t1"})
+    assert await waiter is True
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_changes(monkeypatch):
+    log = TableEventLog()
+    monkeypatch.setattr("app.routes.tables.events", log)
+    storage = InMemoryTableStorage()
+    await storage.create_table(TableConfig(table_id="t1", name="One", created_at="2026-01-01T00:00:00+00:00"))
+
+    stream = _table_stream(storage, None)
+    event_id, kind, data = parse(await stream.__anext__())
+    assert kind == "snapshot"
+    assert [t["table_id"] for t in data] == ["t1"]
+
+    next_frame = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0)
+    log.publish("update", {"table_id": "t1", "seated": 3})
+    _, kind, data = parse(await next_frame)
+    assert (kind, data) == ("update", {"table_id": "t1", "seated": 3})
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_from_last_event_id(monkeypatch):
+    log = TableEventLog()
+    monkeypatch.setattr("app.routes.tables.events", log)
+    first = log.publish("create", {"table_id": "t1"})
+    log.publish("delete", {"table_id": "t1"})
+
+    stream = _table_stream(InMemoryTableStorage(), log.event_id(first))
+    _, kind, data = parse(await stream.__anext__())
+    assert (kind, data) == ("delete", {"table_id": "t1"})
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_create_and_delete_publish_events(monkeypatch):
+    log = TableEventLog()
+    monkeypatch.setattr("app.routes.tables.events", log)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        table_id = (await client.post("/api/tables", json={"name": "Evented"})).json()["table_id"]
+        await client.delete(f"/api/tables/{table_id}")
+
+    frames = [parse(f) for f in log.after(0)]
+    assert [(kind, data["table_id"]) for _, kind, data in frames] == [("create", table_id), ("delete", table_id)]
+    assert frames[0][2]["name"] == "Evented"
@@ -0,0 +1,126 @@
+"""Tests for the database-backed table storage."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.storage.base import TableFilter
+from app.storage.sql import SqlTableStorage
+from db import Base, LobbyTable
+from models.table_config import TableConfig
+
+# Create test database (separate file to avoid conflicts with other test modules)
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_table_storage.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    """Create tables before each test and drop after."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def storage():
+    return SqlTableStorage(TestingSessionLocal)
+
+
+def make_config(table_id, big_blind=10, max_players=8, minute=0):
+    return TableConfig(
+        table_id=table_id,
+        name=f"Table {table_id}",
+        small_blind=big_blind // 2,
+        big_blind=big_blind,
+        max_players=max_players,
+        created_at=f"2026-01-01T12:{minute:02d}:00+00:00",
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_round_trip(storage):
+    config = make_config("t1", big_blind=20, max_players=6)
+    await storage.create_table(config)
+
+    storage.clear_cache()
+    loaded = await storage.get_table("t1")
+    assert loaded == config
+
+
+@pytest.mark.asyncio
+async def test_manual_dealing_round_trips(storage):
+    config = make_config("t1")
+    config.deal_delay_seconds = None
+    await storage.create_table(config)
+
+    storage.clear_cache()
+    assert (await storage.get_table("t1")).deal_delay_seconds is None
+
+
+@pytest.mark.asyncio
+async def test_tables_survive_a_new_storage_instance(storage):
+    """Tables persist in the database rather than in the instance."""
+    await storage.create_table(make_config("t1"))
+
+    fresh = SqlTableStorage(TestingSessionLocal)
+    assert (await fresh.get_table("t1")).name == "Table t1"
+
+
+@pytest.mark.asyncio
+async def test_get_table_is_served_from_cache(storage):
+    await storage.create_table(make_config("t1"))
+
+    # Change the row behind the storage's back; the cached config is still returned
+    db = TestingSessionLocal()
+    db.query(LobbyTable).filter(LobbyTable.table_id == "t1").update({"name": "Renamed"})
+    db.commit()
+    db.close()
+
+    assert (await storage.get_table("t1")).name == "Table t1"
+    storage.clear_cache()
+    assert (await storage.get_table("t1")).name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cache(storage):
+    await storage.create_table(make_config("t1"))
+    assert await storage.get_table("t1") is not None
+
+    assert await storage.delete_table("t1") is True
+    assert await storage.get_table("t1") is None
+    assert await storage.delete_table("t1") is False
+
+
+@pytest.mark.asyncio
+async def test_list_filters_by_stakes_seats_and_created_at(storage):
+    await storage.create_table(make_config("low", big_blind=2, minute=1))
+    await storage.create_table(make_config("mid", big_blind=10, max_players=2, minute=2))
+    await storage.create_table(make_config("high", big_blind=100, minute=3))
+
+    ids = lambda tables: [t.table_id for t in tables]
+    assert ids(await storage.list_tables()) == ["low", "mid", "high"]
+    assert ids(await storage.list_tables(TableFilter(min_big_blind=10))) == ["mid", "high"]
+    assert ids(await storage.list_tables(TableFilter(max_big_blind=10))) == ["low", "mid"]
+    assert ids(await storage.list_tables(TableFilter(min_seats_free=3))) == ["low", "high"]
+    assert ids(await storage.list_tables(
+        TableFilter(created_after="2026-01-01T12:01:00+00:00")
+    )) == ["mid", "high"]
+
+
+@pytest.mark.asyncio
+async def test_list_pages_by_created_at_then_table_id(storage):
+    # Two tables share a timestamp; the table_id breaks the tie
+    for table_id, minute in [("b", 1), ("a", 1), ("c", 2), ("d", 3)]:
+        await storage.create_table(make_config(table_id, minute=minute))
+
+    seen = []
+    after = None
+    while True:
+        page = await storage.list_tables(TableFilter(after=after, limit=2))
+        if not page:
+            break
+        seen.extend(t.table_id for t in page)
+        after = (page[-1].created_at, page[-1].table_id)
+
+    assert seen == ["a", "b", "c", "d"]
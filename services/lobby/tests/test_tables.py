@@ -46,6 +46,22 @@ async def test_create_table_with_defaults():
         assert data["big_blind"] == 10
         assert data["max_players"] == 8
         assert data["turn_timeout_seconds"] == 30
+        assert data["deal_delay_seconds"] == 5
+
+
+@pytest.mark.asyncio
+async def test_create_table_with_manual_dealing():
+    """A null deal delay means hands are only started by a player."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/tables", json={"name": "Manual", "deal_delay_seconds": None})
+        assert response.status_code == 201
+        assert response.json()["deal_delay_seconds"] is None
+
+        response = await client.get(f"/api/tables/{response.json()['table_id']}")
+        assert response.json()["deal_delay_seconds"] is None
+
+        response = await client.post("/api/tables", json={"name": "Slow", "deal_delay_seconds": 31})
+        assert response.status_code == 422
 
 
 @pytest.mark.asyncio
@@ -129,3 +145,49 @@ async def test_create_table_validation():
         # Too many players should fail
         response = await client.post("/api/tables", json={"name": "Test", "max_players": 10})
         assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_tables_filters_by_stakes():
+    """Test filtering the table list by big blind."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/api/tables", json={"name": "Micro", "small_blind": 1, "big_blind": 2})
+        await client.post("/api/tables", json={"name": "Nosebleed", "small_blind": 500, "big_blind": 1000})
+
+        response = await client.get("/api/tables", params={"min_big_blind": 1000, "limit": 200})
+        assert response.status_code == 200
+        names = [t["name"] for t in response.json()]
+        assert "Nosebleed" in names
+        assert "Micro" not in names
+
+
+@pytest.mark.asyncio
+async def test_list_tables_cursor_pagination():
+    """Test walking the table list with X-Next-Cursor."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = []
+        for i in range(3):
+            resp = await client.post("/api/tables", json={"name": f"Paged {i}", "big_blind": 7000})
+            created.append(resp.json()["table_id"])
+
+        seen = []
+        params = {"min_big_blind": 7000, "max_big_blind": 7000, "limit": 2}
+        while True:
+            response = await client.get("/api/tables", params=params)
+            assert response.status_code == 200
+            seen.extend(t["table_id"] for t in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+
+        assert sorted(seen) == sorted(created)
+        assert len(seen) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_tables_invalid_cursor():
+    """Test that a malformed cursor is rejected."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/tables", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
@@ -8,7 +8,7 @@ from alembic import context
 
 # Import our models for autogenerate support
 from db.base import Base
-from db.models import User, PlayerStack  # noqa: F401 - imported for metadata
+from db.models import User, PlayerStack, LobbyTable, Hand, HandPlayer, HandAction, PlayerStat  # noqa: F401 - imported for metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""Add deal_delay_seconds to lobby_tables
+
+Revision ID: a7c3e9b5d1f4
+Revises: f1b3d5a7c9e2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9b5d1f4'
+down_revision: Union[str, Sequence[str], None] = 'f1b3d5a7c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('lobby_tables', sa.Column('deal_delay_seconds', sa.SmallInteger(), nullable=True, server_default='5'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('lobby_tables', 'deal_delay_seconds')
@@ -0,0 +1,81 @@
+"""Add hand history tables
+
+Revision ID: c7d2e9f1a3b4
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9f1a3b4'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HandId = sa.BigInteger().with_variant(sa.Integer(), 'sqlite')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('hands',
+    sa.Column('id', HandId, nullable=False),
+    sa.Column('table_id', sa.String(length=64), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('ended_at', sa.DateTime(), nullable=False),
+    sa.Column('small_blind', sa.Integer(), nullable=False),
+    sa.Column('big_blind', sa.Integer(), nullable=False),
+    sa.Column('dealer_seat', sa.SmallInteger(), nullable=False),
+    sa.Column('board', sa.String(length=16), nullable=False),
+    sa.Column('pot', sa.Integer(), nullable=False),
+    sa.Column('went_to_showdown', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_hands_table_id_id', 'hands', ['table_id', 'id'], unique=False)
+    op.create_index('ix_hands_ended_at', 'hands', ['ended_at'], unique=False)
+    op.create_table('hand_players',
+    sa.Column('id', HandId, nullable=False),
+    sa.Column('hand_id', HandId, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('pid', sa.String(length=64), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('seat', sa.SmallInteger(), nullable=False),
+    sa.Column('hole_cards', sa.String(length=8), nullable=True),
+    sa.Column('starting_stack', sa.Integer(), nullable=False),
+    sa.Column('ending_stack', sa.Integer(), nullable=False),
+    sa.Column('net', sa.Integer(), nullable=False),
+    sa.Column('won', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_hand_players_user_id_hand_id', 'hand_players', ['user_id', 'hand_id'], unique=False)
+    op.create_index('ix_hand_players_hand_id', 'hand_players', ['hand_id'], unique=False)
+    op.create_table('hand_actions',
+    sa.Column('id', HandId, nullable=False),
+    sa.Column('hand_id', HandId, nullable=False),
+    sa.Column('seq', sa.SmallInteger(), nullable=False),
+    sa.Column('pid', sa.String(length=64), nullable=False),
+    sa.Column('street', sa.String(length=8), nullable=False),
+    sa.Column('action', sa.String(length=16), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_hand_actions_hand_id_seq', 'hand_actions', ['hand_id', 'seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hand_actions_hand_id_seq', table_name='hand_actions')
+    op.drop_table('hand_actions')
+    op.drop_index('ix_hand_players_hand_id', table_name='hand_players')
+    op.drop_index('ix_hand_players_user_id_hand_id', table_name='hand_players')
+    op.drop_table('hand_players')
+    op.drop_index('ix_hands_ended_at', table_name='hands')
+    op.drop_index('ix_hands_table_id_id', table_name='hands')
+    op.drop_table('hands')
@@ -0,0 +1,44 @@
+"""Add user search indexes
+
+Revision ID: e5a9c3f7b2d1
+Revises: d4f8a2b6c1e9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f7b2d1'
+down_revision: Union[str, Sequence[str], None] = 'd4f8a2b6c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Admin user search matches ``lower(col) LIKE 'term%'`` for short terms
+    (btree, text_pattern_ops) and ``col ILIKE '%term%'`` otherwise (pg_trgm GIN).
+    Both are PostgreSQL-only; SQLite scans the (small) users table.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in ('username', 'email'):
+        op.create_index(f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+        op.create_index(f'ix_users_{column}_lower', 'users',
+                        [sa.text(f'lower({column}) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in ('username', 'email'):
+        op.drop_index(f'ix_users_{column}_lower', table_name='users')
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
@@ -0,0 +1,44 @@
+"""Add lobby_tables
+
+Revision ID: f1b3d5a7c9e2
+Revises: e5a9c3f7b2d1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b3d5a7c9e2'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c3f7b2d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('lobby_tables',
+    sa.Column('table_id', sa.String(length=32), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('small_blind', sa.Integer(), nullable=False),
+    sa.Column('big_blind', sa.Integer(), nullable=False),
+    sa.Column('max_players', sa.SmallInteger(), nullable=False),
+    sa.Column('turn_timeout_seconds', sa.SmallInteger(), nullable=False),
+    sa.Column('seated', sa.SmallInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_id')
+    )
+    op.create_index('ix_lobby_tables_created_at_table_id', 'lobby_tables', ['created_at', 'table_id'], unique=False)
+    op.create_index('ix_lobby_tables_big_blind_created_at', 'lobby_tables', ['big_blind', 'created_at', 'table_id'], unique=False)
+    op.create_index('ix_lobby_tables_seats_free', 'lobby_tables', [sa.text('(max_players - seated)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_lobby_tables_seats_free', table_name='lobby_tables')
+    op.drop_index('ix_lobby_tables_big_blind_created_at', table_name='lobby_tables')
+    op.drop_index('ix_lobby_tables_created_at_table_id', table_name='lobby_tables')
+    op.drop_table('lobby_tables')
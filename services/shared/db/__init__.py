@@ -1,6 +1,6 @@
 """Database models and connection management."""
 from .base import Base
-from .models import User, PlayerStack
+from .models import User, PlayerStack, LobbyTable, Hand, HandPlayer, HandAction, PlayerStat
 from .session import get_db, engine, SessionLocal
 from .auth import hash_password, verify_password, create_access_token, verify_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
@@ -8,6 +8,11 @@ __all__ = [
     "Base",
     "User",
     "PlayerStack",
+    "LobbyTable",
+    "Hand",
+    "HandPlayer",
+    "HandAction",
+    "PlayerStat",
     "get_db",
     "engine",
     "SessionLocal",
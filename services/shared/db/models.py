@@ -1,9 +1,13 @@
-"""Database models for users and player stacks."""
+"""Database models for users, player stacks, lobby tables, hand history and player stats."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Boolean
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, DateTime, ForeignKey, Index, Boolean, Float
 from sqlalchemy.orm import relationship
 from .base import Base
 
+# BIGINT primary keys for the high-volume history tables (SQLite only
+# autoincrements INTEGER PRIMARY KEY, so fall back to that there)
+HandId = BigInteger().with_variant(Integer, "sqlite")
+
 
 class User(Base):
     """User account model."""
@@ -46,3 +50,128 @@ class PlayerStack(Base):
 
     def __repr__(self):
         return f"<PlayerStack(user_id={self.user_id}, stack={self.stack})>"
+
+
+class Hand(Base):
+    """One completed hand. Ids increase with completion time."""
+
+    __tablename__ = "hands"
+
+    id = Column(HandId, primary_key=True)
+    table_id = Column(String(64), nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    ended_at = Column(DateTime, nullable=False)
+    small_blind = Column(Integer, nullable=False)
+    big_blind = Column(Integer, nullable=False)
+    dealer_seat = Column(SmallInteger, nullable=False)
+    board = Column(String(16), nullable=False, default="")  # Space-separated, e.g. "Ah Kd 7c 2s 2h"
+    pot = Column(Integer, nullable=False)
+    went_to_showdown = Column(Boolean, default=False, nullable=False)
+
+    players = relationship("HandPlayer", back_populates="hand", cascade="all, delete-orphan")
+    actions = relationship(
+        "HandAction", back_populates="hand", cascade="all, delete-orphan", order_by="HandAction.seq"
+    )
+
+    __table_args__ = (
+        Index("ix_hands_table_id_id", "table_id", "id"),
+        Index("ix_hands_ended_at", "ended_at"),
+    )
+
+    def __repr__(self):
+        return f"<Hand(id={self.id}, table_id='{self.table_id}', pot={self.pot})>"
+
+
+class HandPlayer(Base):
+    """A player dealt into a hand, with their result."""
+
+    __tablename__ = "hand_players"
+
+    id = Column(HandId, primary_key=True)
+    hand_id = Column(HandId, ForeignKey("hands.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # NULL for guests
+    pid = Column(String(64), nullable=False)
+    name = Column(String(50), nullable=False)
+    seat = Column(SmallInteger, nullable=False)
+    hole_cards = Column(String(8), nullable=True)  # e.g. "Ah Kd"
+    starting_stack = Column(Integer, nullable=False)
+    ending_stack = Column(Integer, nullable=False)
+    net = Column(Integer, nullable=False)  # Chips won minus chips put in
+    won = Column(Boolean, default=False, nullable=False)
+
+    hand = relationship("Hand", back_populates="players")
+
+    # A user's recent hands: WHERE user_id = ? AND hand_id < ? ORDER BY hand_id DESC
+    __table_args__ = (
+        Index("ix_hand_players_user_id_hand_id", "user_id", "hand_id"),
+        Index("ix_hand_players_hand_id", "hand_id"),
+    )
+
+    def __repr__(self):
+        return f"<HandPlayer(hand_id={self.hand_id}, pid='{self.pid}', net={self.net})>"
+
+
+class HandAction(Base):
+    """One action in a hand, in the order it was taken (blinds included)."""
+
+    __tablename__ = "hand_actions"
+
+    id = Column(HandId, primary_key=True)
+    hand_id = Column(HandId, ForeignKey("hands.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(SmallInteger, nullable=False)
+    pid = Column(String(64), nullable=False)
+    street = Column(String(8), nullable=False)  # preflop, flop, turn, river
+    action = Column(String(16), nullable=False)  # small_blind, big_blind, fold, check, call, raise, all_in
+    amount = Column(Integer, default=0, nullable=False)
+
+    hand = relationship("Hand", back_populates="actions")
+
+    __table_args__ = (
+        Index("ix_hand_actions_hand_id_seq", "hand_id", "seq"),
+    )
+
+    def __repr__(self):
+        return f"<HandAction(hand_id={self.hand_id}, seq={self.seq}, action='{self.action}')>"
+
+
+class PlayerStat(Base):
+    """One running counter behind a user's HUD stats (see poker.stats)."""
+
+    __tablename__ = "player_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    counter = Column(String(32), primary_key=True)  # e.g. "hands", "vpip", "net_big_blinds"
+    value = Column(Float, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PlayerStat(user_id={self.user_id}, counter='{self.counter}', value={self.value})>"
+
+
+class LobbyTable(Base):
+    """A table listed in the lobby: its TableConfig plus the current seat count."""
+
+    __tablename__ = "lobby_tables"
+
+    table_id = Column(String(32), primary_key=True)
+    name = Column(String(50), nullable=False)
+    small_blind = Column(Integer, nullable=False)
+    big_blind = Column(Integer, nullable=False)
+    max_players = Column(SmallInteger, nullable=False)
+    turn_timeout_seconds = Column(SmallInteger, nullable=False)
+    deal_delay_seconds = Column(SmallInteger, nullable=True)  # NULL = manual dealing
+    seated = Column(SmallInteger, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Listings page on (created_at, table_id), optionally within a big blind range
+    __table_args__ = (
+        Index("ix_lobby_tables_created_at_table_id", "created_at", "table_id"),
+        Index("ix_lobby_tables_big_blind_created_at", "big_blind", "created_at", "table_id"),
+    )
+
+    def __repr__(self):
+        return f"<LobbyTable(table_id='{self.table_id}', name='{self.name}', seated={self.seated})>"
+
+
+# "Seats free" filter: WHERE max_players - seated >= ?
+Index("ix_lobby_tables_seats_free", LobbyTable.max_players - LobbyTable.seated)
@@ -12,6 +12,7 @@ class TableConfig:
     big_blind: int = 10
     max_players: int = 8
     turn_timeout_seconds: int = 30
+    deal_delay_seconds: Optional[int] = 5  # Pause after a hand before dealing the next; None = deal manually
     created_at: Optional[str] = None  # ISO timestamp
 
     def to_dict(self) -> dict:
@@ -23,5 +24,6 @@ class TableConfig:
             "big_blind": self.big_blind,
             "max_players": self.max_players,
             "turn_timeout_seconds": self.turn_timeout_seconds,
+            "deal_delay_seconds": self.deal_delay_seconds,
             "created_at": self.created_at,
         }
@@ -8,6 +8,7 @@ SUITS = "shdc"  # spades, hearts, diamonds, clubs
 
 # Valid actions
 VALID_ACTIONS = {"fold", "check", "call", "raise", "all_in"}
+PRE_ACTIONS = {"check_fold", "call_any", "call_up_to"}  # Queued before the player's turn
 
 # Hand rankings (lower number = better hand)
 HAND_RANKS = {
@@ -0,0 +1,119 @@
+"""
+HUD-style player statistics built from small per-hand reducers.
+
+Each ``Stat`` has a reducer that looks at one player's part in one finished
+hand and returns counter increments, plus a formula that turns the summed
+counters into the displayed value. Counters are additive, so totals can be
+maintained incrementally (one hand at a time, flushed in batches) and never
+need a rescan of hand history.
+
+Adding a stat means appending one ``Stat`` to ``STATS``; counters are stored as
+(user_id, counter) rows so no schema change is needed.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+Counters = Dict[str, float]
+
+PREFLOP = "preflop"
+AGGRESSIVE_ACTIONS = {"raise", "all_in"}
+VOLUNTARY_ACTIONS = {"call", "raise", "all_in"}  # Blinds are not voluntary
+
+
+@dataclass
+class PlayerHand:
+    """One player's view of a finished hand, as fed to reducers."""
+    actions: List[Tuple[str, str, int]]  # (street, action, amount) in order, blinds included
+    big_blind: int
+    net: int
+    won: bool
+    board_cards: int
+    went_to_showdown: bool  # The hand reached a showdown (not necessarily with this player)
+
+    @property
+    def folded(self) -> bool:
+        return any(action == "fold" for _, action, _ in self.actions)
+
+    @property
+    def folded_preflop(self) -> bool:
+        return any(street == PREFLOP and action == "fold" for street, action, _ in self.actions)
+
+    @property
+    def saw_flop(self) -> bool:
+        return self.board_cards >= 3 and not self.folded_preflop
+
+    @property
+    def at_showdown(self) -> bool:
+        return self.went_to_showdown and not self.folded
+
+
+@dataclass
+class Stat:
+    name: str
+    reduce: Callable[[PlayerHand], Counters]
+    value: Callable[[Counters], Optional[float]]
+
+
+def _ratio(numerator: str, denominator: str, scale: float = 100.0) -> Callable[[Counters], Optional[float]]:
+    def value(c: Counters) -> Optional[float]:
+        den = c.get(denominator, 0)
+        return round(c.get(numerator, 0) / den * scale, 2) if den else None
+    return value
+
+
+def _hands(h: PlayerHand) -> Counters:
+    return {"hands": 1}
+
+
+def _vpip(h: PlayerHand) -> Counters:
+    return {"vpip": int(any(s == PREFLOP and a in VOLUNTARY_ACTIONS for s, a, _ in h.actions))}
+
+
+def _pfr(h: PlayerHand) -> Counters:
+    return {"pfr": int(any(s == PREFLOP and a in AGGRESSIVE_ACTIONS for s, a, _ in h.actions))}
+
+
+def _af(h: PlayerHand) -> Counters:
+    postflop = [a for s, a, _ in h.actions if s != PREFLOP]
+    return {
+        "postflop_aggressive": sum(a in AGGRESSIVE_ACTIONS for a in postflop),
+        "postflop_calls": sum(a == "call" for a in postflop),
+    }
+
+
+def _wtsd(h: PlayerHand) -> Counters:
+    return {"saw_flop": int(h.saw_flop), "showdowns": int(h.saw_flop and h.at_showdown)}
+
+
+def _wsd(h: PlayerHand) -> Counters:
+    return {"showdowns_won": int(h.saw_flop and h.at_showdown and h.won)}
+
+
+def _winrate(h: PlayerHand) -> Counters:
+    return {"net_chips": h.net, "net_big_blinds": h.net / h.big_blind if h.big_blind else 0}
+
+
+STATS: List[Stat] = [
+    Stat("hands", _hands, lambda c: c.get("hands", 0)),
+    Stat("vpip", _vpip, _ratio("vpip", "hands")),
+    Stat("pfr", _pfr, _ratio("pfr", "hands")),
+    Stat("af", _af, _ratio("postflop_aggressive", "postflop_calls", scale=1.0)),
+    Stat("wtsd", _wtsd, _ratio("showdowns", "saw_flop")),
+    Stat("wsd", _wsd, _ratio("showdowns_won", "showdowns")),
+    Stat("bb_per_100", _winrate, _ratio("net_big_blinds", "hands")),
+]
+
+
+def reduce_hand(hand: PlayerHand, into: Optional[Counters] = None) -> Counters:
+    """Add one hand's counter increments to ``into`` (a new dict if None)."""
+    counters = {} if into is None else into
+    for stat in STATS:
+        for key, inc in stat.reduce(hand).items():
+            if inc:
+                counters[key] = counters.get(key, 0) + inc
+    return counters
+
+
+def compute_stats(counters: Counters) -> Dict[str, Optional[float]]:
+    """Displayed values for every stat (None when there is not enough data yet)."""
+    return {stat.name: stat.value(counters) for stat in STATS}